@@ -0,0 +1,43 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:47
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_groups_user_user_permissions'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='user',
+            name='cpf_digits',
+            field=models.GeneratedField(db_persist=True, expression=models.Func(models.F('cpf'), models.Value('[^0-9]'), models.Value(''), models.Value('g'), function='REGEXP_REPLACE'), output_field=models.CharField(max_length=14)),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='phone_digits',
+            field=models.GeneratedField(db_persist=True, expression=models.Func(models.F('phone'), models.Value('[^0-9]'), models.Value(''), models.Value('g'), function='REGEXP_REPLACE'), output_field=models.CharField(max_length=20)),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['name'], name='user_name_trgm_idx', opclasses=['gist_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['email'], name='user_email_trgm_idx', opclasses=['gist_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['cpf_digits'], name='user_cpf_digits_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['phone_digits'], name='user_phone_digits_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
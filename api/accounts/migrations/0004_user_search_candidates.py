@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:39
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_search'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_name_trgm_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_email_trgm_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['name'], name='user_name_trgm_idx', opclasses=['gist_trgm_ops(siglen=128)']),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Lower('email'), name='text_pattern_ops'), name='user_email_prefix_idx'),
+        ),
+    ]
@@ -1,7 +1,26 @@
+from django.contrib.postgres.indexes import GistIndex, OpClass
 from django.db import models
+from django.db.models import F, Func, Value
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
 
+def only_digits(field):
+    """
+    Expressão que remove de um campo tudo o que não for dígito.
+
+    Usada nas colunas geradas de CPF e telefone, para que '123.456.789-00'
+    e '12345678900' sejam encontrados pela mesma busca.
+
+    Args:
+        field: Nome do campo de origem.
+
+    Returns:
+        Expressão REGEXP_REPLACE sobre o campo.
+    """
+    return Func(F(field), Value('[^0-9]'), Value(''), Value('g'), function='REGEXP_REPLACE')
+
+
 class UserManager(BaseUserManager):
 
     def create_user(self, email, password=None, **extra_fields):
@@ -69,6 +88,16 @@ class User(AbstractBaseUser, PermissionsMixin):
         null=True,
         help_text="Telefone do usuário"
     )
+    cpf_digits = models.GeneratedField(
+        expression=only_digits('cpf'),
+        output_field=models.CharField(max_length=14),
+        db_persist=True,
+    )
+    phone_digits = models.GeneratedField(
+        expression=only_digits('phone'),
+        output_field=models.CharField(max_length=20),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
@@ -83,5 +112,13 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['name', 'cpf']
 
+    class Meta:
+        indexes = [
+            GistIndex(fields=['name'], opclasses=['gist_trgm_ops(siglen=128)'], name='user_name_trgm_idx'),
+            models.Index(OpClass(Lower('email'), name='text_pattern_ops'), name='user_email_prefix_idx'),
+            models.Index(fields=['cpf_digits'], opclasses=['varchar_pattern_ops'], name='user_cpf_digits_idx'),
+            models.Index(fields=['phone_digits'], opclasses=['varchar_pattern_ops'], name='user_phone_digits_idx'),
+        ]
+
     def __str__(self):
         return f'{self.name} - {self.email} - {self.cpf}'
\ No newline at end of file
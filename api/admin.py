@@ -1,3 +1,4 @@
 from django.contrib import admin
+from api.models import IdempotencyRecord
 
-# Register your models here.
\ No newline at end of file
+admin.site.register(IdempotencyRecord)
@@ -0,0 +1,42 @@
+import json
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from api.exceptions import ValidationError
+from api.client.service import ClientOnboardingService
+
+
+class Command(BaseCommand):
+    """
+    Cadastra usuários e clientes de um arquivo CSV ou JSON (base de parceiro).
+
+    Uso: python manage.py onboard_clients clientes.csv --workers 8
+    """
+    help = 'Cadastra clientes em lote, com o hash das senhas em um pool de processos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'json'], default=None)
+        parser.add_argument('--chunk-size', type=int, default=ClientOnboardingService.chunk_size)
+        parser.add_argument('--workers', type=int, default=None)
+
+    def handle(self, *args, **options):
+        service = ClientOnboardingService()
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        try:
+            with open(path, 'rb') as stream:
+                rows = service.read(stream, file_format)
+            report = service.onboard(rows, chunk_size=options['chunk_size'], workers=options['workers'])
+        except OSError as e:
+            raise CommandError(f'Não foi possível ler o arquivo: {e}')
+        except ValidationError as e:
+            raise CommandError(str(e.detail))
+
+        for row in report:
+            if 'error' in row:
+                self.stderr.write(f"linha {row['index']}: {row['status']} {json.dumps(row['error'], ensure_ascii=False)}")
+        summary = Counter(row['status'] for row in report)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(report)} linhas: " + ', '.join(f'{status} {total}' for status, total in sorted(summary.items()))
+        ))
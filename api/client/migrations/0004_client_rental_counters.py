@@ -0,0 +1,53 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0003_client_soft_delete'),
+        ('rent', '0007_fleet_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='open_rentals',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='returned_rentals',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE client_client AS client
+                SET total_rentals = counted.open_rentals + counted.returned_rentals,
+                    open_rentals = counted.open_rentals,
+                    returned_rentals = counted.returned_rentals
+                FROM (
+                    SELECT client.id,
+                           COALESCE(rented.open_rentals, 0) AS open_rentals,
+                           COALESCE(rented.returned_rentals, 0) + COALESCE(archived.returned_rentals, 0) AS returned_rentals
+                    FROM client_client AS client
+                    LEFT JOIN (
+                        SELECT client_id,
+                               COUNT(*) FILTER (WHERE NOT returned) AS open_rentals,
+                               COUNT(*) FILTER (WHERE returned) AS returned_rentals
+                        FROM rent_rental
+                        WHERE deleted_at IS NULL
+                        GROUP BY client_id
+                    ) AS rented ON rented.client_id = client.id
+                    LEFT JOIN (
+                        SELECT client_id, COUNT(*) AS returned_rentals
+                        FROM rent_archivedrental
+                        GROUP BY client_id
+                    ) AS archived ON archived.client_id = client.id
+                ) AS counted
+                WHERE client.id = counted.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
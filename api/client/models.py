@@ -1,17 +1,25 @@
 from uuid import uuid4
 from django.db import models
 from api.accounts.models import User
+from api.utils.soft_delete import SoftDeleteModel
 
 
-class Client(models.Model):
+class Client(SoftDeleteModel):
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     total_rentals = models.PositiveIntegerField(default=0)
+    open_rentals = models.PositiveIntegerField(default=0)
+    returned_rentals = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='client_deleted_idx'
+            ),
+        ]
     
     def __str__(self):
         return self.user.name
-    
-    @property
-    def total_rentals_count(self):
-        from rent.models import Rental
-        return Rental.objects.filter(client=self).count()
@@ -0,0 +1,54 @@
+from django.core.exceptions import ValidationError
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import NotFound
+from api.utils.pagination import KeysetPagination
+
+
+class ClientCursorPagination(KeysetPagination):
+    """
+    Paginação por cursor das listagens de clientes.
+
+    Ordena pela chave primária, de modo que cada página é uma leitura
+    do índice da chave seguida do join com o usuário, sem OFFSET nem
+    COUNT(*), com o mesmo custo em qualquer profundidade.
+    """
+    ordering = ('id',)
+
+
+class ClientSearchPagination(KeysetPagination):
+    """
+    Paginação por cursor da busca de clientes.
+
+    Ordena pela distância ao termo (anotação 'distance' da busca) e
+    pela chave primária, que desempata clientes igualmente parecidos.
+
+    A distância de trigramas é um real (float4) no PostgreSQL e volta
+    ao cursor com a menor representação decimal desse real. O cursor é
+    comparado como real ('%s::real'), e não como double precision, para
+    que a igualdade do desempate reconheça o último cliente da página.
+    """
+    ordering = ('distance', 'id')
+
+    def parse_position(self, model, position):
+        """
+        Converte a distância do cursor para real e o id para UUID.
+
+        Args:
+            model: Modelo do queryset paginado.
+            position: Valores lidos do cursor.
+
+        Returns:
+            Lista [expressão da distância como real, id].
+
+        Raises:
+            NotFound: Se algum valor não for válido.
+        """
+        distance, pk = position
+        try:
+            pk = model._meta.pk.to_python(pk)
+            if pk is None:
+                raise ValueError('id')
+            return [RawSQL('%s::real', [float(distance)], output_field=FloatField()), pk]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
@@ -1,6 +1,10 @@
+import re
 from rest_framework import serializers
 from api.client.models import Client
 from api.accounts.serializer import UserSerializer
+from api.rent.models import Rental
+from api.utils.serializer import MemoizedRepresentationMixin
+from api.vehicle.serializer import VehicleSerializer
 
 
 class ClientSerializer(serializers.ModelSerializer):
@@ -14,16 +18,18 @@ class ClientSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Client
-        fields = ['id', 'total_rentals', 'user_data']
-        read_only_fields = ['id', 'total_rentals']
+        fields = ['id', 'total_rentals', 'open_rentals', 'returned_rentals', 'user_data']
+        read_only_fields = ['id', 'total_rentals', 'open_rentals', 'returned_rentals']
 
 
-class ClientDetailsSerializer(serializers.ModelSerializer):
+class ClientDetailsSerializer(MemoizedRepresentationMixin, serializers.ModelSerializer):
     """
     Serializer para detalhes completos do cliente.
-    
+
     Inclui o ID do usuário e dados completos do usuário aninhados.
-    
+    Com 'representation_cache' no contexto, cada cliente é serializado
+    uma única vez por resposta.
+
     Attributes:
         client_data: Dados completos do usuário associado ao cliente.
     """
@@ -31,5 +37,109 @@ class ClientDetailsSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Client
-        fields = ['id', 'user', 'total_rentals', 'client_data']
-        read_only_fields = ['id', 'total_rentals']
+        fields = ['id', 'user', 'total_rentals', 'open_rentals', 'returned_rentals', 'client_data']
+        read_only_fields = ['id', 'total_rentals', 'open_rentals', 'returned_rentals']
+
+    def memo_key(self, instance):
+        """
+        Usa o updated_at do cliente e o do usuário.
+
+        O do cliente muda junto com os contadores de aluguéis; o do
+        usuário, com os dados aninhados em client_data.
+
+        Args:
+            instance: Instância de Client.
+            
+        Returns:
+            Tupla usada como chave de memorização.
+        """
+        return type(self), instance.pk, instance.updated_at, instance.user.updated_at
+
+
+class ClientRentalSerializer(serializers.ModelSerializer):
+    """
+    Serializer de um aluguel dentro do perfil do cliente.
+
+    Mesmo formato do RentListSerializer sem o bloco do cliente, que já
+    é o próprio perfil.
+
+    Attributes:
+        vehicle_data: Dados do veículo alugado.
+    """
+    vehicle_data = VehicleSerializer(source='vehicle', read_only=True)
+
+    class Meta:
+        model = Rental
+        fields = [
+            'id',
+            'start_date',
+            'expected_end_date',
+            'end_date',
+            'returned',
+            'vehicle_data',
+            'created_at',
+            'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class ClientProfileSerializer(ClientSerializer):
+    """
+    Serializer do perfil do cliente com o histórico recente de aluguéis.
+
+    Os aluguéis vêm dos atributos preenchidos pelos Prefetch da view
+    (recent_rental_list e open_rental_list), já limitados por cliente.
+    Os contadores indicam quantos aluguéis existem além dos embutidos.
+
+    Attributes:
+        recent_rentals: Aluguéis mais recentes, do mais novo ao mais antigo.
+        current_rentals: Aluguéis em aberto.
+    """
+    recent_rentals = ClientRentalSerializer(source='recent_rental_list', many=True, read_only=True)
+    current_rentals = ClientRentalSerializer(source='open_rental_list', many=True, read_only=True)
+
+    class Meta(ClientSerializer.Meta):
+        fields = ClientSerializer.Meta.fields + ['recent_rentals', 'current_rentals']
+
+
+class ClientProfileQuerySerializer(serializers.Serializer):
+    """
+    Serializer para os parâmetros do perfil do cliente.
+
+    Attributes:
+        rentals: Quantidade de aluguéis recentes embutidos (1 a 50).
+    """
+    rentals = serializers.IntegerField(required=False, default=10, min_value=1, max_value=50)
+
+
+class ClientOnboardingRowSerializer(serializers.Serializer):
+    """
+    Serializer para uma linha do cadastro de clientes em lote.
+
+    Valida apenas o formato da linha, sem consultar o banco. Os
+    conflitos de email e CPF são verificados por ClientOnboardingService
+    para todo o bloco de uma só vez.
+    """
+    name = serializers.CharField(max_length=100)
+    email = serializers.EmailField(max_length=255)
+    cpf = serializers.CharField(max_length=14)
+    password = serializers.CharField(write_only=True)
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True, allow_null=True, default=None)
+    address = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True, default=None)
+
+    def validate_cpf(self, value):
+        """
+        Valida que o CPF tenha 11 dígitos, com ou sem pontuação.
+
+        Args:
+            value: CPF informado.
+
+        Returns:
+            CPF sem espaços nas pontas.
+
+        Raises:
+            ValidationError: Se o CPF não tiver 11 dígitos.
+        """
+        if len(re.sub(r'\D', '', value)) != 11:
+            raise serializers.ValidationError('O CPF deve ter 11 dígitos.')
+        return value.strip()
@@ -0,0 +1,327 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from django.contrib.postgres.search import TrigramWordDistance
+from django.db import IntegrityError, transaction
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import Lower
+from api.accounts.models import User
+from api.client.models import Client
+from api.client.serializer import ClientOnboardingRowSerializer
+from api.client.types import ClientOnboardingRowType
+from api.exceptions import ValidationError
+from api.utils.hashing import hash_passwords
+
+
+class ClientSearchService:
+    """
+    Busca de clientes por nome, email, CPF ou telefone do usuário.
+
+    O formato do termo escolhe o campo e o índice usados:
+
+    - só dígitos e pontuação (ao menos min_digits dígitos): prefixo do
+      CPF ou do telefone normalizados (colunas geradas cpf_digits e
+      phone_digits, índices varchar_pattern_ops), de modo que
+      '123.456' encontra '12345678900';
+    - com '@': prefixo do email, sem diferenciar maiúsculas (índice
+      text_pattern_ops sobre LOWER(email));
+    - demais termos: nome parcial.
+
+    O nome usa trigramas (pg_trgm): o filtro exige similaridade de
+    palavra acima do limiar do pg_trgm e os max_results clientes mais
+    próximos do termo (<<->) são lidos em ordem do índice GiST (busca
+    por vizinhos mais próximos). Só esses candidatos são ordenados por
+    distância e id para a paginação: nomes comuns empatam na distância
+    em milhares de clientes, e desempatar todos eles pelo id obrigaria
+    a ler o grupo inteiro a cada página.
+
+    Attributes:
+        max_length: Tamanho máximo do termo considerado.
+        min_digits: Quantidade mínima de dígitos de uma busca por CPF ou telefone.
+        max_results: Quantidade máxima de clientes de uma busca por nome.
+        digits_pattern: Expressão de termos formados só por dígitos e pontuação.
+    """
+    max_length = 100
+    min_digits = 3
+    max_results = 200
+    digits_pattern = re.compile(r'^[\d\s.\-/()+]+$')
+
+    def parse(self, text):
+        """
+        Normaliza o termo digitado e identifica o campo buscado.
+
+        Args:
+            text: Termo de busca livre.
+
+        Returns:
+            Tupla (campo, termo normalizado), com campo 'digits', 'email' ou 'name'.
+
+        Raises:
+            ValidationError: Se o termo estiver vazio ou tiver poucos dígitos.
+        """
+        term = ' '.join((text or '').split())[:self.max_length]
+        if not term:
+            raise ValidationError('Informe o termo de busca.')
+        if self.digits_pattern.match(term):
+            digits = re.sub(r'\D', '', term)
+            if len(digits) < self.min_digits:
+                raise ValidationError(f'Informe ao menos {self.min_digits} dígitos do CPF ou telefone.')
+            return 'digits', digits
+        if '@' in term:
+            return 'email', term.lower()
+        return 'name', term
+
+    def search(self, queryset, text):
+        """
+        Filtra e ordena os clientes pelo termo de busca.
+
+        Args:
+            queryset: QuerySet de Client.
+            text: Termo de busca livre.
+
+        Returns:
+            QuerySet anotado com 'distance' (0 é o mais parecido),
+            ordenado por distance e id.
+
+        Raises:
+            ValidationError: Se o termo for inválido.
+        """
+        field, term = self.parse(text)
+        if field == 'digits':
+            return queryset.filter(
+                Q(user__cpf_digits__startswith=term) | Q(user__phone_digits__startswith=term)
+            ).annotate(
+                distance=Value(0.0, output_field=FloatField()),
+            ).order_by('distance', 'id')
+        if field == 'email':
+            return queryset.alias(
+                email_lower=Lower('user__email'),
+            ).filter(email_lower__startswith=term).annotate(
+                distance=Value(0.0, output_field=FloatField()),
+            ).order_by('distance', 'id')
+        distance = TrigramWordDistance(term, 'user__name')
+        nearest = queryset.filter(user__name__trigram_word_similar=term).order_by(distance).values('pk')
+        return queryset.filter(
+            pk__in=nearest[:self.max_results],
+        ).annotate(distance=distance).order_by('distance', 'id')
+
+
+class ClientOnboardingService:
+    """
+    Cadastro em lote de usuários e clientes (migração de bases de parceiros).
+
+    Cada linha é validada e tem email e CPF normalizados. Linhas que
+    repetem o email ou o CPF de uma linha anterior do próprio arquivo
+    são descartadas, e os conflitos com usuários já cadastrados (email,
+    ou CPF comparado só pelos dígitos) são verificados por bloco, com
+    uma consulta por bloco.
+
+    O hash das senhas (PBKDF2, o trecho caro de create_user) é feito
+    antes da gravação, em um pool de processos, em lotes de hash_batch
+    senhas, usando todos os núcleos. Os usuários e clientes de cada
+    bloco são gravados com bulk_create em uma transação curta, com o
+    mesmo hash que create_user geraria. Se um cadastro simultâneo
+    ocupar um email ou CPF entre a verificação e a gravação, o bloco é
+    verificado de novo e gravado sem as linhas em conflito.
+
+    O relatório tem uma entrada por linha, na ordem recebida, com o
+    status created, duplicate, conflict ou invalid.
+
+    Attributes:
+        chunk_size: Quantidade padrão de linhas gravadas por transação.
+        hash_batch: Quantidade de senhas por tarefa do pool.
+        workers: Processos do pool (padrão: quantidade de CPUs).
+    """
+    chunk_size = 1000
+    hash_batch = 16
+    workers = None
+
+    def read(self, stream, file_format):
+        """
+        Lê as linhas de um arquivo CSV (com cabeçalho) ou JSON (lista).
+
+        Args:
+            stream: Arquivo aberto em modo binário ou texto.
+            file_format: 'csv' ou 'json'.
+
+        Returns:
+            Lista de dicionários, um por linha.
+
+        Raises:
+            ValidationError: Se o formato for desconhecido ou o conteúdo inválido.
+        """
+        content = stream.read()
+        if isinstance(content, bytes):
+            try:
+                content = content.decode('utf-8-sig')
+            except UnicodeDecodeError:
+                raise ValidationError('O arquivo deve estar em UTF-8.')
+        if file_format == 'csv':
+            return list(csv.DictReader(io.StringIO(content)))
+        if file_format == 'json':
+            try:
+                rows = json.loads(content)
+            except ValueError:
+                raise ValidationError('JSON inválido.')
+            if not isinstance(rows, list):
+                raise ValidationError('O JSON deve ser uma lista de clientes.')
+            return rows
+        raise ValidationError('Formato inválido. Use csv ou json.')
+
+    def onboard(self, rows, chunk_size=None, workers=None) -> list[ClientOnboardingRowType]:
+        """
+        Cadastra as linhas e retorna o relatório por linha.
+
+        Args:
+            rows: Linhas com name, email, cpf, password e, opcionalmente,
+                phone e address.
+            chunk_size: Linhas por transação (padrão: chunk_size).
+            workers: Processos do pool de hashing (padrão: workers).
+
+        Returns:
+            Relatório alinhado com rows.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        report: list[ClientOnboardingRowType] = [None] * len(rows)
+        pending = []
+        emails, cpfs = {}, {}
+        for index, row in enumerate(rows):
+            serializer = ClientOnboardingRowSerializer(data=row if isinstance(row, dict) else {})
+            if not serializer.is_valid():
+                report[index] = {'index': index, 'status': 'invalid', 'error': serializer.errors}
+                continue
+            item = dict(serializer.validated_data)
+            item['email'] = User.objects.normalize_email(item['email'])
+            item['cpf_digits'] = re.sub(r'\D', '', item['cpf'])
+            repeated = emails.get(item['email'], cpfs.get(item['cpf_digits']))
+            if repeated is not None:
+                report[index] = {'index': index, 'status': 'duplicate', 'error': f"Repete a linha {repeated}."}
+                continue
+            emails[item['email']] = cpfs[item['cpf_digits']] = index
+            pending.append((index, item))
+
+        accepted = []
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            conflicts = self.conflicts(chunk)
+            for index, item in chunk:
+                if index in conflicts:
+                    report[index] = {'index': index, 'status': 'conflict', 'error': conflicts[index]}
+                else:
+                    accepted.append((index, item))
+
+        hashes = self.hash_all([item['password'] for _, item in accepted], workers)
+        for (_, item), password in zip(accepted, hashes):
+            item['password'] = password
+        for start in range(0, len(accepted), chunk_size):
+            for index, entry in self.write(accepted[start:start + chunk_size]).items():
+                report[index] = {'index': index, **entry}
+        return report
+
+    def conflicts(self, chunk) -> dict:
+        """
+        Verifica os emails e CPFs do bloco já cadastrados, em uma consulta.
+
+        Args:
+            chunk: Lista de (posição, item normalizado).
+
+        Returns:
+            Dicionário posição -> erros por campo, só das linhas em conflito.
+        """
+        existing = User.objects.filter(
+            Q(email__in={item['email'] for _, item in chunk})
+            | Q(cpf_digits__in={item['cpf_digits'] for _, item in chunk})
+        ).values_list('email', 'cpf_digits')
+        taken_emails, taken_cpfs = set(), set()
+        for email, cpf_digits in existing:
+            taken_emails.add(email)
+            taken_cpfs.add(cpf_digits)
+
+        conflicts = {}
+        for index, item in chunk:
+            errors = {}
+            if item['email'] in taken_emails:
+                errors['email'] = 'E-mail já cadastrado.'
+            if item['cpf_digits'] in taken_cpfs:
+                errors['cpf'] = 'CPF já cadastrado.'
+            if errors:
+                conflicts[index] = errors
+        return conflicts
+
+    def hash_all(self, passwords, workers=None):
+        """
+        Gera o hash das senhas em um pool de processos.
+
+        Com um único processo ou um único lote, o hash é feito no próprio
+        processo, sem o custo de iniciar o pool. Os processos são criados
+        com 'spawn', sem herdar as conexões abertas com o banco.
+
+        Args:
+            passwords: Lista de senhas em texto.
+            workers: Processos do pool (padrão: workers ou a quantidade de CPUs).
+
+        Returns:
+            Lista de hashes, na mesma ordem.
+        """
+        workers = workers or self.workers or os.cpu_count() or 1
+        batches = [passwords[start:start + self.hash_batch] for start in range(0, len(passwords), self.hash_batch)]
+        if workers == 1 or len(batches) <= 1:
+            return [password for batch in batches for password in hash_passwords(batch)]
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(batches)),
+            mp_context=multiprocessing.get_context('spawn'),
+        ) as executor:
+            return [password for hashes in executor.map(hash_passwords, batches) for password in hashes]
+
+    def write(self, chunk) -> dict:
+        """
+        Grava um bloco, verificando de novo os conflitos se a gravação falhar.
+
+        Args:
+            chunk: Lista de (posição, item com a senha já em hash).
+
+        Returns:
+            Dicionário posição -> status (e id ou erro) de cada linha.
+        """
+        try:
+            return self.create(chunk)
+        except IntegrityError:
+            conflicts = self.conflicts(chunk)
+            report = {index: {'status': 'conflict', 'error': errors} for index, errors in conflicts.items()}
+            report.update(self.create([(index, item) for index, item in chunk if index not in conflicts]))
+            return report
+
+    def create(self, chunk) -> dict:
+        """
+        Insere os usuários e os clientes de um bloco com bulk_create.
+
+        Args:
+            chunk: Lista de (posição, item com a senha já em hash).
+
+        Returns:
+            Dicionário posição -> status, id do cliente e id do usuário.
+        """
+        if not chunk:
+            return {}
+        users = [
+            User(
+                name=item['name'],
+                email=item['email'],
+                cpf=item['cpf'],
+                phone=item['phone'] or None,
+                address=item['address'] or None,
+                password=item['password'],
+            )
+            for _, item in chunk
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            clients = Client.objects.bulk_create([Client(user=user) for user in users])
+        return {
+            index: {'status': 'created', 'id': str(client.pk), 'user': user.pk}
+            for (index, _), user, client in zip(chunk, users, clients)
+        }
@@ -1,3 +1,629 @@
+from django.contrib.postgres.search import TrigramWordDistance
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from datetime import date, timedelta
+from uuid import uuid4
+from api.accounts.models import User
+from api.client.models import Client
+from api.client.serializer import ClientDetailsSerializer
+from api.vehicle.models import Vehicle, TypeVehicle
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from api.rent.models import Rental
+from api.rent.service import RentService
 
-# Create your tests here.
+
+class ClientListPaginationTestCase(TestCase):
+    """
+    Testes para as listagens paginadas de clientes.
+    """
+
+    def setUp(self):
+        """
+        Configura 25 clientes com seus usuários.
+        """
+        self.factory = APIRequestFactory()
+        users = User.objects.bulk_create([
+            User(email=f'client{index}@example.com', name=f'Cliente {index}', cpf=f'{index:011d}', password='x')
+            for index in range(25)
+        ])
+        self.clients = Client.objects.bulk_create([Client(user=user) for user in users])
+        self.user = users[0]
+
+    def _get(self, view, url, params=None):
+        """
+        Executa a view autenticada e retorna (resposta, queries).
+        """
+        request = self.factory.get(url, params)
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = view.as_view()(request)
+        return response, queries
+
+    def _walk(self, view, url):
+        """
+        Percorre todas as páginas e retorna os ids e as queries de cada página.
+        """
+        ids, counts = [], []
+        while url:
+            response, queries = self._get(view, url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item['id'] for item in response.data['results'])
+            counts.append(len(queries))
+            url = response.data['next']
+        return ids, counts
+
+    def test_client_list_pages_cost_one_query(self):
+        """
+        Testa que cada página da listagem custa uma única query com join.
+        """
+        from api.client.views import ClientListView
+        ids, counts = self._walk(ClientListView, '/api/v1/client/list/')
+        self.assertEqual(sorted(ids), sorted(str(client.pk) for client in self.clients))
+        self.assertEqual(counts, [1, 1, 1])
+
+        response, queries = self._get(ClientListView, '/api/v1/client/list/')
+        sql = queries.captured_queries[0]['sql']
+        self.assertIn('JOIN "accounts_user"', sql)
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('"accounts_user"."password"', sql)
+        item = response.data['results'][0]
+        self.assertEqual(set(item), {'id', 'user', 'total_rentals', 'open_rentals', 'returned_rentals', 'client_data'})
+        self.assertEqual(set(item['client_data']), {'id', 'email', 'name', 'avatar'})
+
+    def test_client_with_user_list_pages_cost_one_query(self):
+        """
+        Testa a listagem com dados do usuário e o limite do tamanho da página.
+        """
+        from api.client.views import ClientWithUserView
+        ids, counts = self._walk(ClientWithUserView, '/api/v1/client/user/list/')
+        self.assertEqual(len(set(ids)), 25)
+        self.assertEqual(counts, [1, 1, 1])
+
+        response, queries = self._get(ClientWithUserView, '/api/v1/client/user/list/', {'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 25)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(set(response.data['results'][0]['user_data']), {'id', 'email', 'name', 'avatar'})
+
+    def test_deleted_clients_are_not_listed(self):
+        """
+        Testa que clientes excluídos logicamente não aparecem nas páginas.
+        """
+        from api.client.views import ClientListView
+        self.clients[0].soft_delete()
+        ids, _ = self._walk(ClientListView, '/api/v1/client/list/')
+        self.assertEqual(len(ids), 24)
+        self.assertNotIn(str(self.clients[0].pk), ids)
+
+
+class ClientRentalCounterTestCase(TestCase):
+    """
+    Testes para os contadores de aluguéis mantidos no cliente.
+    """
+
+    def setUp(self):
+        """
+        Configura dois clientes e um veículo com estoque.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.other = Client.objects.create(user=User.objects.create_user(
+            email='other@example.com', password='testpass123', name='Other User', cpf='98765432100'
+        ))
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota', model='Corolla', year=2024, quantity=10, type_vehicle=TypeVehicle.CAR
+        )
+        self.service = RentService()
+        self.today = date.today()
+
+    def _counters(self, client):
+        """
+        Retorna (total, em aberto, devolvidos) do cliente no banco.
+        """
+        client.refresh_from_db(fields=['total_rentals', 'open_rentals', 'returned_rentals'])
+        return client.total_rentals, client.open_rentals, client.returned_rentals
+
+    def test_create_view_increments_counters(self):
+        """
+        Testa que a criação pela view incrementa o total e os em aberto.
+        """
+        from api.rent.views import RentCreateView
+        request = self.factory.post('/api/v1/rent/create/', {
+            'client': str(self.client.id),
+            'vehicle': str(self.vehicle.id),
+            'start_date': self.today.strftime('%d-%m-%Y')
+        }, format='json')
+        force_authenticate(request, user=self.user)
+        response = RentCreateView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._counters(self.client), (1, 1, 0))
+        self.assertEqual(response.data['result']['client_data']['open_rentals'], 1)
+
+    def test_bulk_create_and_returns_move_counters(self):
+        """
+        Testa a criação em lote e as devoluções individual e em lote.
+        """
+        results = self.service.bulk_create_rentals([
+            {'client': self.client.pk, 'vehicle': self.vehicle.pk, 'start_date': self.today},
+            {'client': self.client.pk, 'vehicle': self.vehicle.pk, 'start_date': self.today},
+            {'client': self.other.pk, 'vehicle': self.vehicle.pk, 'start_date': self.today},
+        ])
+        self.assertEqual(self._counters(self.client), (2, 2, 0))
+        self.assertEqual(self._counters(self.other), (1, 1, 0))
+
+        self.service.return_rental(results[0]['rental'], self.today)
+        self.assertEqual(self._counters(self.client), (2, 1, 1))
+
+        self.service.bulk_return_rentals([
+            {'rental': results[1]['rental'].pk, 'end_date': self.today},
+            {'rental': results[2]['rental'].pk, 'end_date': self.today},
+        ])
+        self.assertEqual(self._counters(self.client), (2, 0, 2))
+        self.assertEqual(self._counters(self.other), (1, 0, 1))
+
+    def test_delete_and_purge_discount_counters(self):
+        """
+        Testa que a exclusão e a limpeza de um veículo descontam os aluguéis.
+        """
+        from api.rent.service import PurgeService
+        opened = self.service.create_rental(self.client, self.vehicle, self.today)
+        returned = self.service.create_rental(self.client, self.vehicle, self.today)
+        self.service.return_rental(returned, self.today)
+        self.service.create_rental(self.other, self.vehicle, self.today)
+
+        self.service.delete_rental(opened)
+        self.assertEqual(self._counters(self.client), (1, 0, 1))
+
+        self.vehicle.soft_delete()
+        PurgeService(sleep=lambda seconds: None).purge()
+        self.assertEqual(self._counters(self.client), (0, 0, 0))
+        self.assertEqual(self._counters(self.other), (0, 0, 0))
+
+    def test_recompute_fixes_drift_and_counts_archive(self):
+        """
+        Testa que a recontagem corrige os contadores e conta o arquivo como devolvido.
+        """
+        from api.rent.models import ArchivedRental
+        from api.rent.service import ArchiveService, ClientCounterService
+        old = self.service.create_rental(self.client, self.vehicle, self.today - timedelta(days=400))
+        self.service.return_rental(old, self.today - timedelta(days=399))
+        self.service.create_rental(self.client, self.vehicle, self.today)
+        ArchiveService().archive(days=30)
+        self.assertTrue(ArchivedRental.objects.filter(pk=old.pk).exists())
+        self.assertEqual(self._counters(self.client), (2, 1, 1))
+
+        service = ClientCounterService()
+        self.assertEqual(service.recompute(), 0)
+        Client.objects.filter(pk=self.client.pk).update(total_rentals=7, open_rentals=0, returned_rentals=7)
+        Rental.objects.create(client=self.other, vehicle=self.vehicle, start_date=self.today)
+        self.assertEqual(service.recompute(batch_size=1), 2)
+        self.assertEqual(self._counters(self.client), (2, 1, 1))
+        self.assertEqual(self._counters(self.other), (1, 1, 0))
+
+    def test_counter_change_invalidates_memoized_details(self):
+        """
+        Testa que a variação dos contadores muda a chave de memorização do cliente.
+        """
+        cache = {}
+        client = Client.objects.select_related('user').get(pk=self.client.pk)
+        before = ClientDetailsSerializer(client, context={'representation_cache': cache}).data
+        self.service.create_rental(self.client, self.vehicle, self.today)
+        client = Client.objects.select_related('user').get(pk=self.client.pk)
+        after = ClientDetailsSerializer(client, context={'representation_cache': cache}).data
+        self.assertEqual(before['open_rentals'], 0)
+        self.assertEqual(after['open_rentals'], 1)
+
+    def test_counters_never_go_negative(self):
+        """
+        Testa que descontar de um contador zerado não falha nem fica negativo.
+        """
+        rental = self.service.create_rental(self.client, self.vehicle, self.today)
+        Client.objects.filter(pk=self.client.pk).update(total_rentals=0, open_rentals=0)
+        self.service.delete_rental(rental)
+        self.assertEqual(self._counters(self.client), (0, 0, 0))
+
+
+class ClientProfileViewTestCase(TestCase):
+    """
+    Testes para o perfil do cliente com o histórico de aluguéis.
+    """
+
+    def setUp(self):
+        """
+        Configura um cliente com 15 aluguéis (os 3 mais antigos em aberto) e outro cliente.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.other = Client.objects.create(user=User.objects.create_user(
+            email='other@example.com', password='testpass123', name='Other User', cpf='98765432100'
+        ))
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota', model='Corolla', year=2024, quantity=50, type_vehicle=TypeVehicle.CAR
+        )
+        self.today = date.today()
+        self.rentals = Rental.objects.bulk_create([
+            Rental(
+                client=self.client, vehicle=self.vehicle, start_date=self.today - timedelta(days=index),
+                end_date=None if index >= 12 else self.today - timedelta(days=index), returned=index < 12,
+            )
+            for index in range(15)
+        ])
+        Rental.objects.create(client=self.other, vehicle=self.vehicle, start_date=self.today)
+
+    def _get(self, pk, params=None):
+        """
+        Executa a view do perfil autenticada e retorna a resposta e as queries.
+        """
+        from api.client.views import ClientProfileView
+        request = self.factory.get(f'/api/v1/clients/{pk}/profile/', params)
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = ClientProfileView.as_view()(request, pk=pk)
+        return response, queries
+
+    def test_profile_embeds_recent_and_open_rentals(self):
+        """
+        Testa os aluguéis recentes (limitados) e os em aberto com uma query por relação.
+        """
+        response, queries = self._get(self.client.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 3)
+        self.assertIn('ROW_NUMBER', queries.captured_queries[1]['sql'])
+        recent = response.data['recent_rentals']
+        self.assertEqual([item['id'] for item in recent], [str(rental.pk) for rental in self.rentals[:10]])
+        self.assertEqual(
+            {item['id'] for item in response.data['current_rentals']},
+            {str(rental.pk) for rental in self.rentals[12:]}
+        )
+        self.assertEqual(recent[0]['vehicle_data']['model'], 'Corolla')
+        self.assertNotIn('client_data', recent[0])
+        self.assertEqual(response.data['user_data']['email'], 'test@example.com')
+
+    def test_profile_limit_and_deleted_rentals(self):
+        """
+        Testa o parâmetro rentals e que aluguéis excluídos não aparecem.
+        """
+        self.rentals[0].soft_delete()
+        response, queries = self._get(self.client.pk, {'rentals': 2})
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(
+            [item['id'] for item in response.data['recent_rentals']],
+            [str(rental.pk) for rental in self.rentals[1:3]]
+        )
+
+    def test_profile_errors(self):
+        """
+        Testa cliente inexistente e limite inválido.
+        """
+        response, _ = self._get(uuid4())
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response, _ = self._get(self.client.pk, {'rentals': 500})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ClientSearchViewTestCase(TestCase):
+    """
+    Testes para a busca de clientes por nome, email, CPF e telefone.
+    """
+
+    def setUp(self):
+        """
+        Configura clientes com nomes, emails, CPFs e telefones variados.
+        """
+        self.factory = APIRequestFactory()
+        people = [
+            ('Maria Aparecida Souza', 'maria.souza@example.com', '123.456.789-00', '(11) 98765-4321'),
+            ('Mariana Lima', 'mari.lima@example.com', '98765432100', '11 91234-5678'),
+            ('João Pedro Souza', 'jp@example.com', '111.222.333-44', None),
+            ('Carlos Alberto', 'carlos@empresa.com.br', '555.666.777-88', '(21) 3333-4444'),
+        ]
+        self.clients = {}
+        for name, email, cpf, phone in people:
+            user = User.objects.create_user(email=email, password='testpass123', name=name, cpf=cpf, phone=phone)
+            self.clients[name] = Client.objects.create(user=user)
+        self.user = self.clients['Carlos Alberto'].user
+
+    def _search(self, params):
+        """
+        Executa a busca autenticada e retorna a resposta e as queries.
+        """
+        from api.client.views import ClientSearchView
+        request = self.factory.get('/api/v1/client/search/', params)
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = ClientSearchView.as_view()(request)
+        return response, queries
+
+    def _names(self, response):
+        """
+        Retorna os nomes dos clientes de uma página.
+        """
+        return [item['client_data']['name'] for item in response.data['results']]
+
+    def test_partial_name_is_ranked(self):
+        """
+        Testa a busca parcial por nome, do mais parecido ao menos, em uma query.
+        """
+        response, queries = self._search({'q': 'souza'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(set(self._names(response)), {'Maria Aparecida Souza', 'João Pedro Souza'})
+
+        response, _ = self._search({'q': 'mariana'})
+        self.assertEqual(self._names(response)[0], 'Mariana Lima')
+        self.assertNotIn('João Pedro Souza', self._names(response))
+
+    def test_email_cpf_and_phone(self):
+        """
+        Testa o início do email e CPF/telefone com ou sem pontuação.
+        """
+        response, _ = self._search({'q': 'carlos@empresa'})
+        self.assertEqual(self._names(response), ['Carlos Alberto'])
+        response, _ = self._search({'q': 'Mari.Lima@'})
+        self.assertEqual(self._names(response), ['Mariana Lima'])
+        response, _ = self._search({'q': 'lima@example'})
+        self.assertEqual(self._names(response), [])
+        response, _ = self._search({'q': '12345678900'})
+        self.assertEqual(self._names(response), ['Maria Aparecida Souza'])
+        response, _ = self._search({'q': '987.654'})
+        self.assertEqual(self._names(response), ['Mariana Lima'])
+        response, _ = self._search({'q': '(11) 9123'})
+        self.assertEqual(self._names(response), ['Mariana Lima'])
+        response, _ = self._search({'q': '2133'})
+        self.assertEqual(self._names(response), ['Carlos Alberto'])
+
+    def test_pages_follow_ranking_and_skip_deleted(self):
+        """
+        Testa a paginação por cursor sobre a distância e a exclusão lógica.
+        """
+        self.clients['João Pedro Souza'].soft_delete()
+        names = []
+        url, params = '/api/v1/client/search/', {'q': 'maria', 'page_size': 1}
+        response, _ = self._search(params)
+        names.extend(self._names(response))
+        while response.data['next']:
+            from api.client.views import ClientSearchView
+            request = self.factory.get(response.data['next'])
+            force_authenticate(request, user=self.user)
+            response = ClientSearchView.as_view()(request)
+            names.extend(self._names(response))
+        self.assertEqual(names[0], 'Maria Aparecida Souza')
+        self.assertEqual(set(names), {'Maria Aparecida Souza', 'Mariana Lima'})
+        self.assertEqual(len(names), 2)
+
+        response, _ = self._search({'q': 'pedro souza'})
+        self.assertEqual(self._names(response), [])
+
+    def test_tied_distances_span_pages(self):
+        """
+        Testa que clientes com a mesma distância fracionária não se repetem entre páginas.
+        """
+        from api.client.views import ClientSearchView
+        for index in range(5):
+            user = User.objects.create_user(
+                email=f'marina{index}@example.com', password='testpass123',
+                name='Marina Ribeiro', cpf=f'000.000.000-0{index}'
+            )
+            self.clients[user.email] = Client.objects.create(user=user)
+        response, _ = self._search({'q': 'marin', 'page_size': 2})
+        distance = Client.objects.annotate(
+            distance=TrigramWordDistance('marin', 'user__name')
+        ).get(user__email='marina0@example.com').distance
+        self.assertNotIn(distance, (0, 1))
+        ids = [item['id'] for item in response.data['results']]
+        for _ in range(5):
+            if not response.data['next']:
+                break
+            request = self.factory.get(response.data['next'])
+            force_authenticate(request, user=self.user)
+            response = ClientSearchView.as_view()(request)
+            ids.extend(item['id'] for item in response.data['results'])
+        self.assertIsNone(response.data['next'])
+        tied = {str(client.id) for email, client in self.clients.items() if email.startswith('marina')}
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertLessEqual(tied, set(ids))
+
+    def test_name_results_are_capped(self):
+        """
+        Testa que a busca por nome retorna só os max_results clientes mais próximos.
+        """
+        from api.client.service import ClientSearchService
+        service = ClientSearchService()
+        self.assertEqual(service.search(Client.objects.all(), 'maria').count(), 2)
+        service.max_results = 1
+        results = list(service.search(Client.objects.all(), 'maria'))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].user.name, 'Maria Aparecida Souza')
+
+    def test_invalid_terms(self):
+        """
+        Testa termo vazio e CPF com poucos dígitos.
+        """
+        response, _ = self._search({'q': '  '})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tampered_cursor_returns_not_found(self):
+        """
+        Testa que cursores com distância ou id nulos são rejeitados.
+        """
+        import base64
+        import json
+        for position in ([None, str(uuid4())], [0.5, None], ['x', str(uuid4())]):
+            cursor = base64.urlsafe_b64encode(json.dumps({'p': position}).encode('utf-8')).decode('ascii')
+            response, _ = self._search({'q': 'maria', 'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+
+
+class ClientOnboardingTestCase(TestCase):
+    """
+    Testes para o cadastro de clientes em lote.
+    """
+
+    def setUp(self):
+        """
+        Configura um administrador autenticado, que também ocupa um email e um CPF.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='123.456.789-00',
+            is_staff=True
+        )
+
+    def _row(self, number, **fields):
+        """
+        Monta uma linha válida do cadastro.
+        """
+        return {
+            'name': f'Cliente {number}',
+            'email': f'cliente{number}@example.com',
+            'cpf': f'{number:011d}',
+            'password': f'senha-{number}',
+            **fields,
+        }
+
+    def _onboard(self, data, **kwargs):
+        """
+        Executa a view de cadastro em lote autenticada.
+        """
+        from api.client.views import ClientOnboardingView
+        request = self.factory.post('/api/v1/client/onboard/', data, **kwargs)
+        force_authenticate(request, user=self.user)
+        return ClientOnboardingView.as_view()(request)
+
+    def test_onboard_report_dedupe_and_conflicts(self):
+        """
+        Testa o relatório por linha, as repetições no arquivo e os conflitos com a base.
+        """
+        from api.client.service import ClientOnboardingService
+        rows = [
+            self._row(1, phone='(11) 99999-0001', address='Rua A'),
+            self._row(2, email='cliente1@example.com'),
+            self._row(3, cpf='000.000.000-01'),
+            self._row(4, email='TEST@example.com'),
+            self._row(5, email='test@EXAMPLE.com'),
+            self._row(6, cpf='12345678900'),
+            self._row(7, cpf='123'),
+            {'name': 'Sem email'},
+            'linha inválida',
+            self._row(8),
+        ]
+        report = ClientOnboardingService().onboard(rows, chunk_size=2, workers=1)
+        self.assertEqual([row['index'] for row in report], list(range(len(rows))))
+        self.assertEqual(
+            [row['status'] for row in report],
+            ['created', 'duplicate', 'duplicate', 'created', 'conflict', 'conflict', 'invalid', 'invalid', 'invalid', 'created']
+        )
+        self.assertEqual(report[1]['error'], 'Repete a linha 0.')
+        self.assertEqual(report[4]['error'], {'email': 'E-mail já cadastrado.'})
+        self.assertEqual(report[5]['error'], {'cpf': 'CPF já cadastrado.'})
+        self.assertIn('cpf', report[6]['error'])
+
+        client = Client.objects.select_related('user').get(pk=report[0]['id'])
+        self.assertEqual(client.user.pk, report[0]['user'])
+        self.assertEqual((client.user.name, client.user.phone, client.user.address), ('Cliente 1', '(11) 99999-0001', 'Rua A'))
+        self.assertEqual(client.user.cpf_digits, '00000000001')
+        self.assertTrue(client.user.check_password('senha-1'))
+        self.assertFalse(client.user.is_staff)
+        self.assertEqual(client.total_rentals, 0)
+        self.assertEqual(User.objects.get(pk=report[3]['user']).email, 'TEST@example.com')
+        self.assertEqual(Client.objects.count(), 3)
+
+    def test_onboard_hashes_in_process_pool(self):
+        """
+        Testa o hash das senhas em mais de um processo, preservando a ordem.
+        """
+        from api.client.service import ClientOnboardingService
+        service = ClientOnboardingService()
+        service.hash_batch = 1
+        report = service.onboard([self._row(number) for number in range(1, 4)], workers=2)
+        self.assertEqual([row['status'] for row in report], ['created'] * 3)
+        for number, row in enumerate(report, start=1):
+            user = User.objects.get(pk=row['user'])
+            self.assertEqual(user.email, f'cliente{number}@example.com')
+            self.assertTrue(user.check_password(f'senha-{number}'))
+
+    def test_write_retries_without_concurrent_conflicts(self):
+        """
+        Testa o bloco gravado de novo, sem a linha ocupada após a verificação.
+        """
+        from django.contrib.auth.hashers import make_password
+        from api.client.service import ClientOnboardingService
+        service = ClientOnboardingService()
+        chunk = []
+        for index, number in enumerate((1, 2)):
+            row = self._row(number)
+            chunk.append((index, {**row, 'phone': None, 'address': None, 'cpf_digits': row['cpf'], 'password': make_password(row['password'])}))
+        User.objects.create_user(email='other@example.com', password='x', name='Outro', cpf='00000000002')
+        report = service.write(chunk)
+        self.assertEqual(report[0]['status'], 'created')
+        self.assertEqual(report[1], {'status': 'conflict', 'error': {'cpf': 'CPF já cadastrado.'}})
+        self.assertEqual(Client.objects.count(), 1)
+
+    def test_onboard_view_and_command(self):
+        """
+        Testa a view com JSON e CSV e o comando onboard_clients.
+        """
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.core.management import call_command
+        response = self._onboard([self._row(1), self._row(2)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['result']['summary'], {'created': 2})
+        self.assertNotIn('password', response.data['result']['rows'][0])
+
+        content = 'name,email,cpf,password\nCliente 3,cliente3@example.com,000.000.000-03,senha-3\nCliente,cliente1@example.com,999,x\n'
+        upload = SimpleUploadedFile('clientes.csv', content.encode('utf-8'), content_type='text/csv')
+        response = self._onboard({'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['result']['summary'], {'created': 1, 'invalid': 1})
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as handle:
+            handle.write('name,email,cpf,password\nCliente 4,cliente4@example.com,00000000004,senha-4\n'
+                         'Cliente,cliente2@example.com,00000000099,x\n')
+        self.addCleanup(os.remove, handle.name)
+        out, err = StringIO(), StringIO()
+        call_command('onboard_clients', handle.name, '--workers', '1', stdout=out, stderr=err)
+        self.assertIn('created 1', out.getvalue())
+        self.assertIn('conflict 1', out.getvalue())
+        self.assertIn('linha 1: conflict', err.getvalue())
+        self.assertTrue(Client.objects.filter(user__email='cliente4@example.com').exists())
+
+        self.assertEqual(self._onboard({'name': 'x'}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._onboard([], format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        response = self._onboard([self._row(5, cpf='1')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['result']['summary'], {'invalid': 1})
+
+    def test_onboard_view_is_admin_only_and_hashes_in_process(self):
+        """
+        Testa a view restrita a administradores, o limite de linhas e o hash sem pool.
+        """
+        from unittest.mock import patch
+        from api.client.views import ClientOnboardingView
+        rows = [self._row(number) for number in range(1, ClientOnboardingView.max_rows + 2)]
+        with patch('api.client.service.ProcessPoolExecutor', side_effect=AssertionError):
+            response = self._onboard(rows[:-1], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['result']['summary'], {'created': ClientOnboardingView.max_rows})
+        self.assertEqual(self._onboard(rows, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.user.is_staff = False
+        self.assertEqual(self._onboard([self._row(99)], format='json').status_code, status.HTTP_403_FORBIDDEN)
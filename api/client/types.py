@@ -0,0 +1,9 @@
+from typing import NotRequired, TypedDict
+
+
+class ClientOnboardingRowType(TypedDict):
+    index: int
+    status: str
+    id: NotRequired[str]
+    user: NotRequired[int]
+    error: NotRequired[dict | str]
@@ -1,11 +1,14 @@
 from django.urls import path
-from api.client.views import ClientCreateView, ClientDeleteView, ClientDetailView, ClientListView, ClientWithUserView
+from api.client.views import ClientCreateView, ClientOnboardingView, ClientDeleteView, ClientDetailView, ClientListView, ClientProfileView, ClientSearchView, ClientWithUserView
 
 
 urlpatterns = [
 path('client/create/', ClientCreateView.as_view(), name='Criar cliente associando os aluguéis dos carros.'),
+path('client/onboard/', ClientOnboardingView.as_view(), name='Cadastro de clientes em lote'),
 path('clients/<uuid:pk>', ClientDetailView.as_view(), name='Detalhes do Cliente'),
+path('clients/<uuid:pk>/profile/', ClientProfileView.as_view(), name='Perfil do Cliente com aluguéis'),
 path('client/list/',  ClientListView.as_view(), name='Detalhes dos Clientes'),
+path('client/search/', ClientSearchView.as_view(), name='Busca de clientes'),
 path('client/user/list/', ClientWithUserView.as_view(), name='Lista de Clientes associadas ao usuário'),
 path('client/delete/<uuid:pk>', ClientDeleteView.as_view(), name='Exclui um cliente'),
 ]
\ No newline at end of file
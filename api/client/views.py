@@ -1,12 +1,23 @@
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from collections import Counter
 from rest_framework import generics
-from api.client.serializer import ClientDetailsSerializer, ClientSerializer
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils.decorators import method_decorator
+from api.client.pagination import ClientCursorPagination, ClientSearchPagination
+from api.client.serializer import (
+    ClientDetailsSerializer, ClientProfileQuerySerializer, ClientProfileSerializer, ClientSerializer
+)
 from api.client.models import Client
+from api.client.service import ClientOnboardingService, ClientSearchService
 from api.accounts.models import User
+from api.rent.models import Rental
+from api.utils.conditional import ConditionalGetMixin
+from api.utils.idempotency import IdempotencyMixin
 
-class ClientCreateView(generics.CreateAPIView):
+class ClientCreateView(IdempotencyMixin, generics.CreateAPIView):
 
     permission_classes = [IsAuthenticated]
 
@@ -24,6 +35,9 @@ class ClientCreateView(generics.CreateAPIView):
         except Exception as e:
             return Response({"message": "Erro ao criar cliente!", "error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        if Client.all_objects.deleted().filter(user=user).exists():
+            return Response({"error": "O cliente deste usuário está em exclusão. Tente novamente mais tarde."}, status=status.HTTP_409_CONFLICT)
+
         client = Client.objects.create(
             user=user,
             total_rentals=0
@@ -32,26 +46,51 @@ class ClientCreateView(generics.CreateAPIView):
         serializer = self.get_serializer(client)
         return Response({"message": "Cliente criado com sucesso!", "result": serializer.data}, status=status.HTTP_201_CREATED)
 
-class ClientWithUserView(generics.ListAPIView):
+class ClientListMixin:
+    """
+    Base das listagens de clientes com os dados do usuário.
+
+    Cada página é lida com uma única consulta: o usuário vem no mesmo
+    SELECT (select_related) e apenas as colunas usadas pelos
+    serializers são carregadas. A paginação é por cursor, sem COUNT(*).
+    """
+    pagination_class = ClientCursorPagination
+    list_fields = (
+        'id', 'user_id', 'total_rentals', 'open_rentals', 'returned_rentals',
+        'user__id', 'user__email', 'user__name', 'user__avatar', 'user__updated_at',
+    )
+
+    def get_queryset(self):
+        """
+        Retorna os clientes com o usuário carregado no mesmo SELECT.
+
+        Returns:
+            QuerySet de Client com select_related e only.
+        """
+        return Client.objects.select_related('user').only(*self.list_fields)
+
+class ClientWithUserView(ClientListMixin, generics.ListAPIView):
 
     permission_classes = [IsAuthenticated]
 
     serializer_class = ClientSerializer
-    queryset = Client.objects.all()
-
-    def get(self, request, *args, **kwargs):
-        clients = self.get_queryset()
-        serializer = self.get_serializer(clients, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
-class ClientDetailView(generics.RetrieveAPIView):
+class ClientDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
 
     permission_classes = [IsAuthenticated]
 
     queryset = Client.objects.all()
     serializer_class = ClientSerializer
 
-    def get(self, request, *args, **kwargs):
+    def get_validators(self):
+        versions = Client.objects.filter(pk=self.kwargs.get('pk')).values_list(
+            'updated_at', 'user__updated_at'
+        ).first()
+        if versions is None:
+            return None
+        return self.make_etag(self.kwargs.get('pk'), *versions), max(versions)
+
+    def retrieve(self, request, *args, **kwargs):
         client_id = self.kwargs.get('pk')
         try:
             client = self.get_queryset().get(id=client_id)
@@ -60,18 +99,86 @@ class ClientDetailView(generics.RetrieveAPIView):
         except Client.DoesNotExist:
             return Response({'error': 'Cliente não encontrado.'}, status=status.HTTP_404_NOT_FOUND)
 
-class ClientListView(generics.ListAPIView):
+class ClientSearchView(ClientListMixin, generics.ListAPIView):
+    """
+    Busca de clientes por nome, email, CPF ou telefone (?q=), ordenada
+    por relevância e paginada por cursor, no formato de client/list/.
+    """
 
     permission_classes = [IsAuthenticated]
 
-    queryset = Client.objects.all()
     serializer_class = ClientDetailsSerializer
+    pagination_class = ClientSearchPagination
+    service_class = ClientSearchService
+
+    def filter_queryset(self, queryset):
+        """
+        Aplica a busca ao queryset da listagem.
+        """
+        return self.service_class().search(queryset, self.request.query_params.get('q'))
+
+class ClientProfileView(generics.RetrieveAPIView):
+    """
+    Perfil do cliente com os aluguéis recentes e os aluguéis em aberto.
+
+    O cliente e o usuário vêm em um SELECT, e cada lista de aluguéis em
+    um único Prefetch com o veículo no mesmo SELECT. As listas são
+    limitadas por cliente no banco: o Prefetch com fatiamento numera os
+    aluguéis de cada cliente com ROW_NUMBER() OVER (PARTITION BY client_id)
+    e a leitura usa o índice rent_client_start_date_idx.
+
+    Attributes:
+        max_open_rentals: Limite de aluguéis em aberto embutidos.
+    """
+    permission_classes = [IsAuthenticated]
+
+    serializer_class = ClientProfileSerializer
+    max_open_rentals = 50
+
+    def get_queryset(self, rentals=10):
+        """
+        Retorna os clientes com os aluguéis pré-carregados.
+
+        Args:
+            rentals: Quantidade de aluguéis recentes por cliente.
+
+        Returns:
+            QuerySet de Client com select_related e os Prefetch dos aluguéis.
+        """
+        history = Rental.objects.select_related('vehicle').order_by('-start_date', 'id')
+        return Client.objects.select_related('user').prefetch_related(
+            Prefetch('rentals', queryset=history[:rentals], to_attr='recent_rental_list'),
+            Prefetch(
+                'rentals',
+                queryset=history.filter(returned=False)[:self.max_open_rentals],
+                to_attr='open_rental_list'
+            ),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Busca o perfil do cliente.
+
+        Args:
+            request: Objeto de requisição com rentals (opcional) na query string.
 
-    def get(self, request, *args, **kwargs):
-        clients = Client.objects.all()
-        serializer = self.get_serializer(clients, many=True)
+        Returns:
+            Response com o cliente, os aluguéis recentes e os em aberto.
+        """
+        query = ClientProfileQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        client = self.get_queryset(query.validated_data['rentals']).filter(pk=self.kwargs.get('pk')).first()
+        if client is None:
+            return Response({'error': 'Cliente não encontrado.'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = self.get_serializer(client)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+class ClientListView(ClientListMixin, generics.ListAPIView):
+
+    permission_classes = [IsAuthenticated]
+
+    serializer_class = ClientDetailsSerializer
+
 class ClientDeleteView(generics.DestroyAPIView):
 
     permission_classes = [IsAuthenticated]
@@ -82,9 +189,71 @@ class ClientDeleteView(generics.DestroyAPIView):
     def delete(self, request, *args, **kwargs):
         try:
             client = self.get_object()
-            client.delete()
+            client.soft_delete()
             return Response({"message": "Cliente excluído com sucesso!"}, status=status.HTTP_204_NO_CONTENT)
         except Client.DoesNotExist:
             return Response({"error": "Cliente não encontrado."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            return Response({"error": f"Erro ao excluir cliente: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response({"error": f"Erro ao excluir cliente: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class ClientOnboardingView(generics.GenericAPIView):
+    """
+    Cadastro em lote de usuários e clientes.
+
+    Restrito a administradores (is_staff). Aceita um arquivo CSV ou JSON
+    no campo 'file' (multipart) ou uma lista JSON no corpo, e cadastra
+    as linhas com ClientOnboardingService. O hash das senhas é feito no
+    próprio processo da requisição, sem pool de processos, por isso o
+    limite de linhas é pequeno; bases maiores devem usar o comando
+    onboard_clients, que usa o pool.
+
+    Attributes:
+        max_rows: Quantidade máxima de linhas por requisição.
+    """
+    permission_classes = [IsAdminUser]
+    service_class = ClientOnboardingService
+    max_rows = 50
+
+    def post(self, request, *args, **kwargs):
+        """
+        Cadastra os clientes enviados.
+
+        Args:
+            request: Requisição com o arquivo ou a lista de clientes.
+
+        Returns:
+            Response com o resumo e o relatório de cada linha.
+        """
+        service = self.service_class()
+        upload = request.FILES.get('file')
+        if upload is not None:
+            file_format = request.data.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+            rows = service.read(upload, file_format)
+        else:
+            rows = request.data
+            if not isinstance(rows, list):
+                return Response({"error": "Envie um arquivo CSV/JSON ou uma lista de clientes."}, status=status.HTTP_400_BAD_REQUEST)
+        if not rows:
+            return Response({"error": "Nenhum cliente para cadastrar."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > self.max_rows:
+            return Response(
+                {"error": f"O cadastro em lote aceita no máximo {self.max_rows} clientes por requisição."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        report = service.onboard(rows, workers=1)
+        summary = Counter(row['status'] for row in report)
+        if summary['created'] == len(report):
+            response_status = status.HTTP_201_CREATED
+        elif summary['created']:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {
+                "message": f"{summary['created']} clientes criados de {len(report)}.",
+                "result": {"summary": dict(summary), "rows": report}
+            },
+            status=response_status
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from api.utils.idempotency import get_idempotency_backend
+
+
+class Command(BaseCommand):
+    """
+    Remove as chaves de idempotência expiradas do backend configurado.
+
+    Pode ser agendado (cron) junto das demais rotinas de manutenção.
+    Uso: python manage.py purge_idempotency_keys
+    """
+    help = 'Remove as chaves de idempotência com mais de IDEMPOTENCY_TTL segundos.'
+
+    def handle(self, *args, **options):
+        removed = get_idempotency_backend().purge()
+        self.stdout.write(self.style.SUCCESS(f'Chaves de idempotência removidas: {removed}.'))
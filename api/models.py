@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.db import models
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Resposta armazenada de uma requisição com Idempotency-Key.
+
+    Usado por DatabaseIdempotencyBackend. Enquanto a primeira requisição
+    está em processamento, status_code e body ficam nulos.
+
+    Attributes:
+        user: Usuário dono da chave.
+        key: Valor do cabeçalho Idempotency-Key.
+        fingerprint: Hash do método, caminho e corpo da requisição original.
+        status_code: Status da resposta armazenada.
+        body: Corpo da resposta armazenada, em JSON.
+        created_at: Data em que a chave foi registrada.
+        expires_at: Data a partir da qual a chave pode ser reutilizada.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='idempotency_records'
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    body = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='idempotency_user_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.key}"
@@ -1,4 +1,5 @@
 from django.contrib import admin
-from api.rent.models import Rental
+from api.rent.models import ArchivedRental, Rental
 
-admin.site.register(Rental)
\ No newline at end of file
+admin.site.register(Rental)
+admin.site.register(ArchivedRental)
\ No newline at end of file
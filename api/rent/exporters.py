@@ -0,0 +1,130 @@
+import csv
+import json
+from itertools import islice
+from django.db import transaction
+from api.rent.readers import RentalReader
+
+
+class EchoBuffer:
+    """
+    Buffer que devolve o texto escrito, para usar csv.writer em streaming.
+    """
+
+    def write(self, value):
+        return value
+
+
+class RentalExporter:
+    """
+    Exportação de aluguéis em streaming (NDJSON ou CSV).
+
+    As linhas são lidas com RentalReader por um cursor do servidor
+    (QuerySet.iterator), em blocos de chunk_size, dentro de uma
+    transação própria mantida aberta enquanto a resposta é consumida.
+    Cada bloco vira um único pedaço de texto, de modo que a memória do
+    processo não depende da quantidade de aluguéis exportados.
+
+    Attributes:
+        chunk_size: Quantidade de linhas lidas do cursor por vez.
+        csv_columns: Cabeçalho do CSV, na ordem das colunas.
+    """
+    chunk_size = 2000
+    csv_columns = (
+        'id',
+        'start_date',
+        'expected_end_date',
+        'end_date',
+        'returned',
+        'client_id',
+        'client_name',
+        'client_email',
+        'vehicle_id',
+        'vehicle_brand',
+        'vehicle_model',
+        'vehicle_year',
+        'vehicle_type',
+        'created_at',
+        'updated_at',
+    )
+
+    def __init__(self, reader=None):
+        self.reader = reader or RentalReader()
+
+    def chunks(self, queryset):
+        """
+        Percorre o queryset em blocos por um cursor do servidor.
+
+        Args:
+            queryset: QuerySet de Rental já filtrado e ordenado.
+
+        Yields:
+            Listas de linhas de values() com até chunk_size itens.
+        """
+        with transaction.atomic():
+            rows = self.reader.values(queryset).iterator(chunk_size=self.chunk_size)
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    return
+                yield chunk
+                self.reader.clear_memo()
+
+    def ndjson(self, queryset):
+        """
+        Gera os aluguéis como JSON delimitado por linha.
+
+        Cada linha tem o mesmo formato de um item de rent/list/.
+
+        Args:
+            queryset: QuerySet de Rental já filtrado e ordenado.
+
+        Yields:
+            Blocos de texto com uma linha JSON por aluguel.
+        """
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        for chunk in self.chunks(queryset):
+            yield ''.join(f'{dumps(item)}\n' for item in self.reader.list_items(chunk))
+
+    def csv(self, queryset):
+        """
+        Gera os aluguéis como CSV com cabeçalho.
+
+        Args:
+            queryset: QuerySet de Rental já filtrado e ordenado.
+
+        Yields:
+            Blocos de texto CSV, começando pelo cabeçalho.
+        """
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(self.csv_columns)
+        for chunk in self.chunks(queryset):
+            yield ''.join(writer.writerow(self.csv_row(row)) for row in chunk)
+
+    def csv_row(self, row):
+        """
+        Converte uma linha de values() nas colunas do CSV.
+
+        Args:
+            row: Linha retornada por RentalReader.values().
+
+        Returns:
+            Lista de valores na ordem de csv_columns.
+        """
+        reader = self.reader
+        return [
+            row['id'],
+            reader.format_date(row['start_date']),
+            reader.format_date(row['expected_end_date']),
+            reader.format_date(row['end_date']),
+            row['returned'],
+            row['client_key'],
+            row['client__user__name'],
+            row['client__user__email'],
+            row['vehicle_key'],
+            row['vehicle__brand'],
+            row['vehicle__model'],
+            row['vehicle__year'],
+            row['vehicle__type_vehicle'],
+            reader.format_datetime(row['created_at']),
+            reader.format_datetime(row['updated_at']),
+        ]
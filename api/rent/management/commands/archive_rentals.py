@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.rent.service import ArchiveService
+
+
+class Command(BaseCommand):
+    """
+    Move aluguéis devolvidos antigos para o arquivo (ArchivedRental).
+
+    Pode ser agendado (cron) para manter a tabela quente pequena.
+    Uso: python manage.py archive_rentals --days 365 --batch-size 5000
+    """
+    help = 'Arquiva, em lotes, aluguéis devolvidos há mais de RENT_ARCHIVE_AFTER_DAYS dias.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.RENT_ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--batch-size', type=int, default=ArchiveService.batch_size)
+        parser.add_argument('--max-batches', type=int, default=None)
+
+    def handle(self, *args, **options):
+        moved = ArchiveService().archive(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Aluguéis arquivados: {moved}.'))
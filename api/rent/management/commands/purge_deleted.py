@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from api.rent.service import PurgeService
+
+
+class Command(BaseCommand):
+    """
+    Remove veículos, clientes e aluguéis excluídos logicamente.
+
+    Pode ser agendado (cron) logo após o horário de pico; os dependentes
+    são removidos em lotes curtos com pausa entre eles.
+    Uso: python manage.py purge_deleted --batch-size 500 --pause 0.05
+    """
+    help = 'Remove, em lotes, as linhas excluídas logicamente e seus dependentes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PurgeService.batch_size)
+        parser.add_argument('--pause', type=float, default=PurgeService.pause)
+        parser.add_argument('--max-batches', type=int, default=None)
+
+    def handle(self, *args, **options):
+        totals = PurgeService().purge(
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            max_batches=options['max_batches']
+        )
+        for name, removed in totals.items():
+            self.stdout.write(f'{name}: {removed}')
+        self.stdout.write(self.style.SUCCESS(f'Linhas removidas: {sum(totals.values())}.'))
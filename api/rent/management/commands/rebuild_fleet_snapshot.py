@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from api.rent.service import FleetSnapshotService
+
+
+class Command(BaseCommand):
+    """
+    Reconstrói os contadores do snapshot da frota (FleetCounter).
+
+    Útil após cargas com os triggers desativados ou para conferir e
+    corrigir divergências; as diferenças encontradas são exibidas.
+    Uso: python manage.py rebuild_fleet_snapshot
+    """
+    help = 'Recalcula do zero os contadores do snapshot da frota a partir de veículos e aluguéis.'
+
+    def handle(self, *args, **options):
+        drift = FleetSnapshotService().rebuild()
+        for type_vehicle, difference in sorted(drift.items()):
+            changes = ', '.join(f'{field} {value:+d}' for field, value in difference.items() if value)
+            self.stdout.write(self.style.WARNING(f'{type_vehicle}: divergência corrigida ({changes}).'))
+        self.stdout.write(self.style.SUCCESS('Snapshot da frota reconstruído.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from api.rent.service import AvailabilityService
+
+
+class Command(BaseCommand):
+    """
+    Reconstrói o índice de ocupação diária (VehicleOccupancy).
+
+    Útil após cargas feitas fora da API ou para corrigir divergências.
+    Uso: python manage.py rebuild_occupancy
+    """
+    help = 'Reconstrói o índice de ocupação diária dos veículos a partir dos aluguéis.'
+
+    def handle(self, *args, **options):
+        rows = AvailabilityService().rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Índice de ocupação reconstruído: {rows} linhas.'))
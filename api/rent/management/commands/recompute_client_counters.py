@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from api.rent.service import ClientCounterService
+
+
+class Command(BaseCommand):
+    """
+    Recalcula os contadores de aluguéis dos clientes.
+
+    Corrige total_rentals, open_rentals e returned_rentals a partir dos
+    aluguéis e do arquivo, em lotes. Pode ser agendado (cron) fora do
+    horário de pico.
+    Uso: python manage.py recompute_client_counters --batch-size 1000
+    """
+    help = 'Recalcula os contadores de aluguéis dos clientes a partir dos aluguéis e do arquivo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        fixed = ClientCounterService().recompute(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Clientes corrigidos: {fixed}.'))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from api.rent.service import StockReconciliationService
+
+
+class Command(BaseCommand):
+    """
+    Concilia o estoque dos veículos com os aluguéis em aberto.
+
+    Com --dry-run, apenas lista as divergências. Pode ser agendado
+    (cron) fora do horário de pico.
+    Uso: python manage.py reconcile_stock --dry-run
+    """
+    help = 'Compara Vehicle.quantity com a frota menos os aluguéis em aberto e corrige as divergências.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true')
+        parser.add_argument('--show', type=int, default=50)
+
+    def handle(self, *args, **options):
+        drift = StockReconciliationService().reconcile(dry_run=options['dry_run'])
+        for row in drift[:options['show']]:
+            self.stdout.write(
+                f"{row['id']} {row['brand']} {row['model']}: estoque {row['quantity']}, "
+                f"esperado {row['expected']} (frota {row['capacity']}, em aberto {row['open_rentals']})"
+            )
+        if len(drift) > options['show']:
+            self.stdout.write(f'... e mais {len(drift) - options["show"]} veículos.')
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'Veículos com divergência: {len(drift)} (nada foi alterado).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Veículos corrigidos: {len(drift)}.'))
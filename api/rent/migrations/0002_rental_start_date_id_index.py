@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0001_initial'),
+        ('rent', '0001_initial'),
+        ('vehicle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['-start_date', 'id'], name='rent_start_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent', '0002_rental_start_date_id_index'),
+        ('vehicle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rental',
+            name='expected_end_date',
+            field=models.DateField(blank=True, help_text='Data prevista de devolução do veículo', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(condition=models.Q(('returned', False)), fields=['vehicle', 'start_date'], name='rent_open_vehicle_idx'),
+        ),
+        migrations.CreateModel(
+            name='VehicleOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Dia da ocupação')),
+                ('units', models.IntegerField(default=0, help_text='Unidades ocupadas no dia')),
+                ('vehicle', models.ForeignKey(help_text='Veículo ocupado', on_delete=django.db.models.deletion.CASCADE, related_name='occupancy', to='vehicle.vehicle')),
+            ],
+            options={
+                'verbose_name': 'Ocupação diária',
+                'verbose_name_plural': 'Ocupações diárias',
+                'indexes': [models.Index(fields=['day', 'vehicle'], name='rent_occupancy_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('vehicle', 'day'), name='rent_occupancy_vehicle_day_uniq')],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO rent_vehicleoccupancy (vehicle_id, day, units)
+                SELECT rental.vehicle_id, day::date, COUNT(*)
+                FROM rent_rental AS rental,
+                    generate_series(
+                        rental.start_date,
+                        CASE WHEN rental.returned THEN rental.end_date ELSE rental.expected_end_date END,
+                        interval '1 day'
+                    ) AS day
+                GROUP BY rental.vehicle_id, day
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0002_client_updated_at'),
+        ('rent', '0003_vehicle_occupancy_index'),
+        ('vehicle', '0002_vehicle_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRental',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('start_date', models.DateField(help_text='Data de início do aluguel')),
+                ('expected_end_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('returned', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Aluguel arquivado',
+                'verbose_name_plural': 'Aluguéis arquivados',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(condition=models.Q(('returned', True)), fields=['end_date'], name='rent_returned_end_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedrental',
+            name='client',
+            field=models.ForeignKey(help_text='Cliente que realizou o aluguel', on_delete=django.db.models.deletion.CASCADE, related_name='archived_rentals', to='client.client'),
+        ),
+        migrations.AddField(
+            model_name='archivedrental',
+            name='vehicle',
+            field=models.ForeignKey(help_text='Veículo alugado', on_delete=django.db.models.deletion.CASCADE, related_name='archived_rentals', to='vehicle.vehicle'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedrental',
+            index=models.Index(fields=['-start_date', 'id'], name='rent_archive_start_id_idx'),
+        ),
+    ]
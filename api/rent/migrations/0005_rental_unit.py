@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent', '0004_archived_rental'),
+        ('vehicle', '0006_vehicle_units'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedrental',
+            name='unit',
+            field=models.ForeignKey(blank=True, help_text='Unidade física alugada', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_rentals', to='vehicle.vehicleunit'),
+        ),
+        migrations.AddField(
+            model_name='rental',
+            name='unit',
+            field=models.ForeignKey(blank=True, help_text='Unidade física alugada', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='rentals', to='vehicle.vehicleunit'),
+        ),
+    ]
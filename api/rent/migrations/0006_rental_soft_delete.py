@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0003_client_soft_delete'),
+        ('rent', '0005_rental_unit'),
+        ('vehicle', '0007_vehicle_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rental',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='rent_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,151 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:15
+
+from django.db import migrations, models
+
+COUNTER_UPSERT = """
+    INSERT INTO rent_fleetcounter (type_vehicle, slot, vehicles, available_vehicles, units, open_rentals)
+    SELECT change.type_vehicle, pg_backend_pid() % 16, SUM(change.vehicles), SUM(change.available_vehicles),
+           SUM(change.units), SUM(change.open_rentals)
+    FROM ({changes}) AS change
+    GROUP BY change.type_vehicle
+    HAVING SUM(change.vehicles) <> 0 OR SUM(change.available_vehicles) <> 0
+        OR SUM(change.units) <> 0 OR SUM(change.open_rentals) <> 0
+    ON CONFLICT (type_vehicle, slot) DO UPDATE SET
+        vehicles = rent_fleetcounter.vehicles + EXCLUDED.vehicles,
+        available_vehicles = rent_fleetcounter.available_vehicles + EXCLUDED.available_vehicles,
+        units = rent_fleetcounter.units + EXCLUDED.units,
+        open_rentals = rent_fleetcounter.open_rentals + EXCLUDED.open_rentals;
+"""
+
+VEHICLE_ROWS = """
+    SELECT type_vehicle, {sign} AS vehicles, {sign} * is_available::int AS available_vehicles,
+           {sign} * quantity AS units, 0 AS open_rentals
+    FROM {rows} WHERE deleted_at IS NULL
+"""
+
+RENTAL_ROWS = """
+    SELECT vehicle.type_vehicle, 0 AS vehicles, 0 AS available_vehicles, 0 AS units, {sign} AS open_rentals
+    FROM {rows} AS rental JOIN vehicle_vehicle AS vehicle ON vehicle.id = rental.vehicle_id
+    WHERE NOT rental.returned AND rental.deleted_at IS NULL
+"""
+
+
+def counter_function(name, rows):
+    """
+    Monta a função de trigger que aplica a variação das linhas alteradas.
+
+    Args:
+        name: Nome da função.
+        rows: Modelo do SELECT de variações (VEHICLE_ROWS ou RENTAL_ROWS).
+
+    Returns:
+        SQL de criação da função.
+    """
+    inserted = rows.format(sign=1, rows='new_rows')
+    deleted = rows.format(sign=-1, rows='old_rows')
+    return f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {COUNTER_UPSERT.format(changes=inserted)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {COUNTER_UPSERT.format(changes=deleted)}
+            ELSE
+                {COUNTER_UPSERT.format(changes=inserted + ' UNION ALL ' + deleted)}
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """
+
+
+def counter_triggers(table, function):
+    """
+    Monta os triggers de instrução (INSERT, UPDATE e DELETE) de uma tabela.
+
+    Args:
+        table: Tabela observada.
+        function: Função de trigger.
+
+    Returns:
+        SQL de criação dos triggers.
+    """
+    return f"""
+        CREATE TRIGGER {table}_fleet_insert AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+        CREATE TRIGGER {table}_fleet_update AFTER UPDATE ON {table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+        CREATE TRIGGER {table}_fleet_delete AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+    """
+
+
+def drop_triggers(table, function):
+    """
+    Monta a remoção dos triggers e da função de uma tabela.
+    """
+    return f"""
+        DROP TRIGGER IF EXISTS {table}_fleet_insert ON {table};
+        DROP TRIGGER IF EXISTS {table}_fleet_update ON {table};
+        DROP TRIGGER IF EXISTS {table}_fleet_delete ON {table};
+        DROP FUNCTION IF EXISTS {function}();
+    """
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent', '0006_rental_soft_delete'),
+        ('vehicle', '0007_vehicle_soft_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FleetCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type_vehicle', models.CharField(choices=[('Carro', 'Car'), ('Moto', 'Motorcycle')], max_length=10)),
+                ('slot', models.SmallIntegerField(default=0)),
+                ('vehicles', models.BigIntegerField(default=0)),
+                ('available_vehicles', models.BigIntegerField(default=0)),
+                ('units', models.BigIntegerField(default=0)),
+                ('open_rentals', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Contador da frota',
+                'verbose_name_plural': 'Contadores da frota',
+                'constraints': [models.UniqueConstraint(fields=('type_vehicle', 'slot'), name='rent_fleet_type_slot_uniq')],
+            },
+        ),
+        migrations.RunSQL(
+            sql=counter_function('rent_fleet_vehicle_counter', VEHICLE_ROWS)
+            + counter_triggers('vehicle_vehicle', 'rent_fleet_vehicle_counter')
+            + counter_function('rent_fleet_rental_counter', RENTAL_ROWS)
+            + counter_triggers('rent_rental', 'rent_fleet_rental_counter'),
+            reverse_sql=drop_triggers('vehicle_vehicle', 'rent_fleet_vehicle_counter')
+            + drop_triggers('rent_rental', 'rent_fleet_rental_counter'),
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO rent_fleetcounter (type_vehicle, slot, vehicles, available_vehicles, units, open_rentals)
+                SELECT fleet.type_vehicle, 0, SUM(fleet.vehicles), SUM(fleet.available_vehicles),
+                       SUM(fleet.units), SUM(fleet.open_rentals)
+                FROM (
+                    SELECT type_vehicle, COUNT(*) AS vehicles, COUNT(*) FILTER (WHERE is_available) AS available_vehicles,
+                           SUM(quantity) AS units, 0 AS open_rentals
+                    FROM vehicle_vehicle WHERE deleted_at IS NULL
+                    GROUP BY type_vehicle
+                    UNION ALL
+                    SELECT vehicle.type_vehicle, 0, 0, 0, COUNT(*)
+                    FROM rent_rental AS rental JOIN vehicle_vehicle AS vehicle ON vehicle.id = rental.vehicle_id
+                    WHERE NOT rental.returned AND rental.deleted_at IS NULL
+                    GROUP BY vehicle.type_vehicle
+                ) AS fleet
+                GROUP BY fleet.type_vehicle
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0004_client_rental_counters'),
+        ('rent', '0007_fleet_counter'),
+        ('vehicle', '0009_stock_ledger'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['client', '-start_date', 'id'], name='rent_client_start_date_idx'),
+        ),
+    ]
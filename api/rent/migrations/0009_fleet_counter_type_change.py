@@ -0,0 +1,63 @@
+# Generated by Django 5.1.1 on 2026-10-18 10:05
+
+from importlib import import_module
+
+from django.db import migrations
+
+fleet_counter = import_module('api.rent.migrations.0007_fleet_counter')
+
+MOVED_RENTAL_ROWS = """
+    SELECT {side}.type_vehicle, 0 AS vehicles, 0 AS available_vehicles, 0 AS units, {sign} AS open_rentals
+    FROM old_rows
+    JOIN new_rows ON new_rows.id = old_rows.id AND new_rows.type_vehicle <> old_rows.type_vehicle
+    JOIN rent_rental AS rental ON rental.vehicle_id = new_rows.id
+    WHERE NOT rental.returned AND rental.deleted_at IS NULL
+"""
+
+
+def vehicle_counter_function():
+    """
+    Monta a função de trigger de veículos que também move os aluguéis em aberto.
+
+    Quando um UPDATE troca o type_vehicle de um veículo, os seus aluguéis
+    em aberto saem do contador do tipo anterior e entram no do novo tipo,
+    na mesma instrução.
+
+    Returns:
+        SQL de criação da função.
+    """
+    inserted = fleet_counter.VEHICLE_ROWS.format(sign=1, rows='new_rows')
+    deleted = fleet_counter.VEHICLE_ROWS.format(sign=-1, rows='old_rows')
+    moved = ' UNION ALL '.join([
+        MOVED_RENTAL_ROWS.format(side='new_rows', sign=1),
+        MOVED_RENTAL_ROWS.format(side='old_rows', sign=-1),
+    ])
+    upsert = fleet_counter.COUNTER_UPSERT
+    return f"""
+        CREATE OR REPLACE FUNCTION rent_fleet_vehicle_counter() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {upsert.format(changes=inserted)}
+            ELSIF TG_OP = 'DELETE' THEN
+                {upsert.format(changes=deleted)}
+            ELSE
+                {upsert.format(changes=' UNION ALL '.join([inserted, deleted, moved]))}
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rent', '0008_rental_client_start_date_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=vehicle_counter_function(),
+            reverse_sql=fleet_counter.counter_function('rent_fleet_vehicle_counter', fleet_counter.VEHICLE_ROWS),
+        ),
+    ]
@@ -1,10 +1,11 @@
 from django.db import models
 from uuid import uuid4
-from api.vehicle.models import Vehicle
+from api.vehicle.models import TypeVehicle, Vehicle, VehicleUnit
 from api.client.models import Client
+from api.utils.soft_delete import SoftDeleteModel
 
 
-class Rental(models.Model):
+class Rental(SoftDeleteModel):
     """
     Modelo para representar aluguéis de veículos.
     
@@ -12,9 +13,12 @@ class Rental(models.Model):
         id: Identificador único UUID do aluguel.
         client: Cliente que realizou o aluguel (ForeignKey para Client).
         vehicle: Veículo alugado (ForeignKey para Vehicle).
+        unit: Unidade física alugada, para veículos controlados por unidade.
         start_date: Data de início do aluguel.
+        expected_end_date: Data prevista de devolução (opcional, usada no índice de ocupação).
         end_date: Data de devolução do veículo (pode ser None se ainda não devolvido).
         returned: Indica se o veículo foi devolvido.
+        deleted_at: Momento da exclusão lógica (None se ativo).
     """
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     client = models.ForeignKey(
@@ -29,7 +33,20 @@ class Rental(models.Model):
         related_name='rentals',
         help_text="Veículo alugado"
     )
+    unit = models.ForeignKey(
+        VehicleUnit,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='rentals',
+        help_text="Unidade física alugada"
+    )
     start_date = models.DateField(null=False, help_text="Data de início do aluguel")
+    expected_end_date = models.DateField(
+        blank=True,
+        null=True,
+        help_text="Data prevista de devolução do veículo"
+    )
     end_date = models.DateField(
         blank=True,
         null=True,
@@ -44,8 +61,173 @@ class Rental(models.Model):
 
     class Meta:
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['-start_date', 'id'], name='rent_start_date_id_idx'),
+            models.Index(fields=['client', '-start_date', 'id'], name='rent_client_start_date_idx'),
+            models.Index(
+                fields=['vehicle', 'start_date'],
+                condition=models.Q(returned=False),
+                name='rent_open_vehicle_idx'
+            ),
+            models.Index(
+                fields=['end_date'],
+                condition=models.Q(returned=True),
+                name='rent_returned_end_date_idx'
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='rent_deleted_idx'
+            ),
+        ]
         verbose_name = 'Aluguel'
         verbose_name_plural = 'Aluguéis'
 
     def __str__(self):
         return f"Aluguel de {self.vehicle} por {self.client.user.name}"
+
+    @property
+    def occupancy_end_date(self):
+        """
+        Último dia em que o aluguel ocupa uma unidade do veículo.
+
+        Returns:
+            end_date se já devolvido, senão expected_end_date (None quando
+            o aluguel está em aberto sem data prevista).
+        """
+        return self.end_date if self.returned else self.expected_end_date
+
+
+class VehicleOccupancy(models.Model):
+    """
+    Índice de ocupação diária dos veículos (day-bucket).
+
+    Cada linha guarda quantas unidades de um veículo estão ocupadas em um
+    dia por aluguéis com intervalo conhecido (devolvidos ou com data
+    prevista de devolução). É mantido por AvailabilityService na criação,
+    devolução e exclusão de aluguéis.
+
+    Attributes:
+        vehicle: Veículo ocupado.
+        day: Dia da ocupação.
+        units: Quantidade de unidades ocupadas no dia.
+    """
+    vehicle = models.ForeignKey(
+        Vehicle,
+        on_delete=models.CASCADE,
+        related_name='occupancy',
+        help_text="Veículo ocupado"
+    )
+    day = models.DateField(help_text="Dia da ocupação")
+    units = models.IntegerField(default=0, help_text="Unidades ocupadas no dia")
+
+    class Meta:
+        verbose_name = 'Ocupação diária'
+        verbose_name_plural = 'Ocupações diárias'
+        constraints = [
+            models.UniqueConstraint(fields=['vehicle', 'day'], name='rent_occupancy_vehicle_day_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'vehicle'], name='rent_occupancy_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.vehicle} - {self.day}: {self.units}"
+
+
+class FleetCounter(models.Model):
+    """
+    Contadores agregados da frota por tipo de veículo (snapshot).
+
+    Mantidos por triggers de instrução em vehicle_vehicle e rent_rental,
+    que somam a cada escrita apenas a variação das linhas alteradas.
+    Cada tipo é dividido em faixas (slot, escolhida pelo pid da sessão),
+    para que escritas simultâneas não disputem a mesma linha; a leitura
+    soma as faixas. FleetSnapshotService.rebuild() recalcula tudo.
+
+    Attributes:
+        type_vehicle: Tipo do veículo (Carro ou Moto).
+        slot: Faixa do contador.
+        vehicles: Modelos cadastrados (não excluídos).
+        available_vehicles: Modelos com is_available.
+        units: Soma de quantity (unidades livres em estoque).
+        open_rentals: Aluguéis em aberto (não devolvidos e não excluídos).
+    """
+    type_vehicle = models.CharField(max_length=10, choices=TypeVehicle.choices)
+    slot = models.SmallIntegerField(default=0)
+    vehicles = models.BigIntegerField(default=0)
+    available_vehicles = models.BigIntegerField(default=0)
+    units = models.BigIntegerField(default=0)
+    open_rentals = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Contador da frota'
+        verbose_name_plural = 'Contadores da frota'
+        constraints = [
+            models.UniqueConstraint(fields=['type_vehicle', 'slot'], name='rent_fleet_type_slot_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.type_vehicle} [{self.slot}]"
+
+
+class ArchivedRental(models.Model):
+    """
+    Aluguel devolvido movido para o arquivo (camada fria).
+
+    Mantém os mesmos dados de Rental para aluguéis devolvidos há mais
+    tempo que RENT_ARCHIVE_AFTER_DAYS, retirados da tabela quente por
+    ArchiveService em lotes. As views de aluguel continuam lendo apenas
+    Rental; o arquivo é consultado pelos endpoints de arquivo.
+
+    Attributes:
+        id: Mesmo UUID do aluguel original.
+        client: Cliente que realizou o aluguel.
+        vehicle: Veículo alugado.
+        unit: Unidade física alugada, se houver.
+        start_date: Data de início do aluguel.
+        expected_end_date: Data prevista de devolução.
+        end_date: Data de devolução do veículo.
+        returned: Sempre True para aluguéis arquivados.
+        created_at: Criação do aluguel original.
+        updated_at: Última alteração do aluguel original.
+        archived_at: Momento em que o aluguel foi arquivado.
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        related_name='archived_rentals',
+        help_text="Cliente que realizou o aluguel"
+    )
+    vehicle = models.ForeignKey(
+        Vehicle,
+        on_delete=models.CASCADE,
+        related_name='archived_rentals',
+        help_text="Veículo alugado"
+    )
+    unit = models.ForeignKey(
+        VehicleUnit,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_rentals',
+        help_text="Unidade física alugada"
+    )
+    start_date = models.DateField(help_text="Data de início do aluguel")
+    expected_end_date = models.DateField(blank=True, null=True)
+    end_date = models.DateField(blank=True, null=True)
+    returned = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-start_date', 'id'], name='rent_archive_start_id_idx'),
+        ]
+        verbose_name = 'Aluguel arquivado'
+        verbose_name_plural = 'Aluguéis arquivados'
+
+    def __str__(self):
+        return f"Aluguel arquivado de {self.vehicle} ({self.start_date})"
@@ -0,0 +1,21 @@
+from api.utils.pagination import KeysetPagination
+
+
+class RentCursorPagination(KeysetPagination):
+    """
+    Paginação por cursor da listagem de aluguéis.
+
+    Ordena por data de início decrescente com o id como desempate,
+    acompanhando o índice rent_start_date_id_idx de Rental.
+    """
+    ordering = ('-start_date', 'id')
+
+
+class ArchiveCursorPagination(KeysetPagination):
+    """
+    Paginação por cursor da listagem do arquivo de aluguéis.
+
+    Mesma ordenação de RentCursorPagination, sobre o índice
+    rent_archive_start_id_idx de ArchivedRental.
+    """
+    ordering = ('-start_date', 'id')
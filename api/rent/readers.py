@@ -0,0 +1,335 @@
+from django.conf import settings
+from django.db.models import CharField
+from django.db.models.functions import Cast
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from api.accounts.models import User
+
+
+class RentalReader:
+    """
+    Caminho de leitura enxuto para listagem e detalhe de aluguéis.
+
+    Busca linhas planas com values() já com as colunas de cliente,
+    usuário e veículo, e monta o mesmo JSON de RentListSerializer e
+    RentDetailSerializer com formatadores preparados uma única vez por
+    requisição, sem instanciar serializers aninhados por linha.
+
+    A formatação de datas e do avatar reproduz a dos campos do DRF e
+    do UserSerializer, de modo que a resposta renderizada é idêntica
+    byte a byte à dos serializers.
+
+    Os ids de cliente, veículo e unidade são lidos já como texto, evitando
+    converter cada um em UUID só para voltar a string no JSON.
+
+    Os blocos client_data e vehicle_data são memorizados por leitor,
+    ou seja, por resposta: cada cliente (chave: id e updated_at do
+    cliente e do usuário) e cada veículo (chave: id e updated_at) é
+    montado uma única vez, e as linhas que o repetem compartilham o
+    mesmo dicionário.
+
+    Attributes:
+        columns: Colunas lidas com values().
+        text_columns: Chaves estrangeiras lidas como texto.
+        timestamp_columns: Colunas updated_at que compõem a versão de uma linha.
+    """
+    columns = (
+        'id',
+        'start_date',
+        'expected_end_date',
+        'end_date',
+        'returned',
+        'created_at',
+        'updated_at',
+        'client__user_id',
+        'client__total_rentals',
+        'client__open_rentals',
+        'client__returned_rentals',
+        'client__user__email',
+        'client__user__name',
+        'client__user__avatar',
+        'client__user__updated_at',
+        'client__updated_at',
+        'vehicle__updated_at',
+        'vehicle__brand',
+        'vehicle__model',
+        'vehicle__year',
+        'vehicle__quantity',
+        'vehicle__type_vehicle',
+        'vehicle__description',
+        'vehicle__is_available',
+        'vehicle__tracks_units',
+    )
+    text_columns = {
+        'client_key': 'client_id',
+        'vehicle_key': 'vehicle_id',
+        'unit_key': 'unit_id',
+    }
+    timestamp_columns = (
+        'updated_at',
+        'client__updated_at',
+        'client__user__updated_at',
+        'vehicle__updated_at',
+    )
+
+    def __init__(self, request=None):
+        """
+        Prepara os formatadores usados em todas as linhas.
+
+        Args:
+            request: Requisição usada para montar a URL absoluta do avatar,
+                como faz o contexto dos serializers nas views.
+        """
+        self.request = request
+        self.format_date = self.date_formatter()
+        self.format_datetime = self.datetime_formatter()
+        self.avatar_storage = User._meta.get_field('avatar').storage
+        self.avatar_base = getattr(settings, 'CURRENT_URL', '')
+        self.avatar_urls = {}
+        self.clients = {}
+        self.vehicles = {}
+
+    def date_formatter(self):
+        """
+        Monta o formatador de datas equivalente ao DateField do DRF.
+
+        Como muitos aluguéis compartilham as mesmas datas, cada data é
+        formatada uma única vez por leitor.
+
+        Returns:
+            Função que recebe uma data e retorna o texto ou None.
+        """
+        output_format = api_settings.DATE_FORMAT
+        if output_format is None or output_format.lower() == ISO_8601:
+            return serializers.DateField().to_representation
+        formatted = {}
+
+        def format_date(value):
+            if not value:
+                return None
+            text = formatted.get(value)
+            if text is None:
+                text = formatted[value] = value.strftime(output_format)
+            return text
+        return format_date
+
+    def datetime_formatter(self):
+        """
+        Monta o formatador de data e hora equivalente ao DateTimeField do DRF.
+
+        O fuso de saída é resolvido uma vez, em vez de a cada valor.
+
+        Returns:
+            Função que recebe um datetime e retorna o texto ou None.
+        """
+        field = serializers.DateTimeField()
+        output_format = api_settings.DATETIME_FORMAT
+        field_timezone = field.default_timezone()
+        if output_format is None or output_format.lower() == ISO_8601 or field_timezone is None:
+            return field.to_representation
+
+        def format_datetime(value):
+            if not value:
+                return None
+            if value.tzinfo is None:
+                return field.to_representation(value)
+            return value.astimezone(field_timezone).strftime(output_format)
+        return format_datetime
+
+    def values(self, queryset):
+        """
+        Converte o queryset de aluguéis em linhas planas.
+
+        Args:
+            queryset: QuerySet de Rental.
+
+        Returns:
+            QuerySet de dicionários com as colunas do leitor.
+        """
+        return queryset.values(*self.columns, **{
+            name: Cast(column, output_field=CharField())
+            for name, column in self.text_columns.items()
+        })
+
+    def version(self, row):
+        """
+        Retorna o que identifica o conteúdo de uma linha para a ETag.
+
+        Args:
+            row: Linha retornada por values().
+
+        Returns:
+            Tupla com o id do aluguel e os updated_at da linha.
+        """
+        return (row['id'], *(row[column] for column in self.timestamp_columns))
+
+    def last_modified(self, rows):
+        """
+        Retorna a alteração mais recente entre as linhas.
+
+        Args:
+            rows: Linhas retornadas por values().
+
+        Returns:
+            Maior updated_at das linhas ou None se não houver linhas.
+        """
+        return max(
+            (row[column] for row in rows for column in self.timestamp_columns),
+            default=None
+        )
+
+    def avatar_url(self, name):
+        """
+        Retorna a URL do avatar como o UserSerializer a apresenta.
+
+        Cada nome é resolvido uma vez por leitor, já que muitos aluguéis
+        compartilham o avatar padrão.
+
+        Args:
+            name: Nome do arquivo armazenado no campo avatar.
+
+        Returns:
+            URL do avatar ou None se não houver arquivo.
+        """
+        if not name:
+            return None
+        url = self.avatar_urls.get(name)
+        if url is None:
+            url = self.avatar_storage.url(name)
+            if self.request is not None:
+                url = self.request.build_absolute_uri(url)
+            if not (url.startswith('http://') or url.startswith('https://')):
+                url = f"{self.avatar_base}{url}"
+            self.avatar_urls[name] = url
+        return url
+
+    def client_data(self, row):
+        """
+        Monta o bloco client_data de uma linha (ClientDetailsSerializer).
+
+        Args:
+            row: Linha retornada por values().
+
+        Returns:
+            Dicionário com os dados do cliente e do usuário, compartilhado
+            pelas linhas do mesmo cliente.
+        """
+        key = (row['client_key'], row['client__updated_at'], row['client__user__updated_at'])
+        data = self.clients.get(key)
+        if data is not None:
+            return data
+        data = self.clients[key] = {
+            'id': row['client_key'],
+            'user': row['client__user_id'],
+            'total_rentals': row['client__total_rentals'],
+            'open_rentals': row['client__open_rentals'],
+            'returned_rentals': row['client__returned_rentals'],
+            'client_data': {
+                'id': row['client__user_id'],
+                'email': row['client__user__email'],
+                'name': row['client__user__name'],
+                'avatar': self.avatar_url(row['client__user__avatar']),
+            },
+        }
+        return data
+
+    def vehicle_data(self, row):
+        """
+        Monta o bloco vehicle_data de uma linha (VehicleSerializer).
+
+        Args:
+            row: Linha retornada por values().
+
+        Returns:
+            Dicionário com os dados do veículo, compartilhado pelas linhas
+            do mesmo veículo.
+        """
+        key = (row['vehicle_key'], row['vehicle__updated_at'])
+        data = self.vehicles.get(key)
+        if data is not None:
+            return data
+        data = self.vehicles[key] = {
+            'id': row['vehicle_key'],
+            'brand': row['vehicle__brand'],
+            'model': row['vehicle__model'],
+            'year': row['vehicle__year'],
+            'quantity': row['vehicle__quantity'],
+            'type_vehicle': row['vehicle__type_vehicle'],
+            'description': row['vehicle__description'],
+            'is_available': row['vehicle__is_available'],
+            'tracks_units': row['vehicle__tracks_units'],
+        }
+        return data
+
+    def list_item(self, row):
+        """
+        Monta um item no formato do RentListSerializer.
+
+        Args:
+            row: Linha retornada por values().
+
+        Returns:
+            Dicionário do aluguel com client_data e vehicle_data.
+        """
+        format_date = self.format_date
+        return {
+            'id': str(row['id']),
+            'start_date': format_date(row['start_date']),
+            'expected_end_date': format_date(row['expected_end_date']),
+            'end_date': format_date(row['end_date']),
+            'returned': row['returned'],
+            'client_data': self.client_data(row),
+            'vehicle_data': self.vehicle_data(row),
+            'created_at': self.format_datetime(row['created_at']),
+            'updated_at': self.format_datetime(row['updated_at']),
+        }
+
+    def detail_item(self, row):
+        """
+        Monta um item no formato do RentDetailSerializer.
+
+        Args:
+            row: Linha retornada por values().
+
+        Returns:
+            Dicionário do aluguel com os ids e os dados aninhados.
+        """
+        format_date = self.format_date
+        return {
+            'id': str(row['id']),
+            'start_date': format_date(row['start_date']),
+            'expected_end_date': format_date(row['expected_end_date']),
+            'end_date': format_date(row['end_date']),
+            'returned': row['returned'],
+            'client': row['client_key'],
+            'vehicle': row['vehicle_key'],
+            'unit': row['unit_key'],
+            'client_data': self.client_data(row),
+            'vehicle_data': self.vehicle_data(row),
+            'created_at': self.format_datetime(row['created_at']),
+            'updated_at': self.format_datetime(row['updated_at']),
+        }
+
+    def clear_memo(self):
+        """
+        Descarta os blocos de cliente e veículo e as URLs de avatar memorizados.
+
+        Usado em leituras longas, como a exportação, para que a memória
+        não cresça com a quantidade de clientes e veículos distintos.
+        """
+        self.clients.clear()
+        self.vehicles.clear()
+        self.avatar_urls.clear()
+
+    def list_items(self, rows):
+        """
+        Monta a lista de itens no formato do RentListSerializer.
+
+        Args:
+            rows: Linhas retornadas por values().
+
+        Returns:
+            Lista de dicionários de aluguel.
+        """
+        list_item = self.list_item
+        return [list_item(row) for row in rows]
@@ -1,21 +1,54 @@
 from rest_framework import serializers
 from django.utils import timezone
-from api.rent.models import Rental
+from api.rent.models import ArchivedRental, Rental
+from api.client.models import Client
 from api.client.serializer import ClientDetailsSerializer
+from api.vehicle.models import TypeVehicle
 from api.vehicle.serializer import VehicleSerializer
 
 
+def within_max_period(start_date, end_date):
+    """
+    Indica se o intervalo cabe no período máximo de um aluguel.
+
+    Cada dia do intervalo vira uma linha do índice de ocupação, por isso
+    o período de um aluguel tem o mesmo limite da consulta de
+    disponibilidade (AvailabilityQuerySerializer.max_period_days).
+
+    Args:
+        start_date: Data de início.
+        end_date: Data final (prevista ou de devolução).
+
+    Returns:
+        True se o intervalo tiver no máximo max_period_days dias.
+    """
+    return (end_date - start_date).days + 1 <= AvailabilityQuerySerializer.max_period_days
+
+
+def max_period_message():
+    """
+    Mensagem de erro de um período maior que o limite.
+    """
+    return f'O aluguel pode ter no máximo {AvailabilityQuerySerializer.max_period_days} dias.'
+
+
 class RentSerializer(serializers.ModelSerializer):
     """
     Serializer para criação e leitura de aluguéis.
     
-    Valida que a data de início não seja no passado e que o veículo
-    esteja disponível.
+    Valida que a data de início não seja no passado, que o veículo
+    esteja disponível e que o período previsto caiba no índice de
+    ocupação (AvailabilityQuerySerializer.max_period_days).
     """
+    client = serializers.PrimaryKeyRelatedField(
+        queryset=Client.objects.select_related('user'),
+        help_text="Cliente que realizou o aluguel"
+    )
+
     class Meta:
         model = Rental
         fields = '__all__'
-        read_only_fields = ('id', 'returned', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'unit', 'returned', 'created_at', 'updated_at')
 
     def validate_start_date(self, value):
         """
@@ -38,7 +71,8 @@ class RentSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         """
-        Valida que o veículo esteja disponível antes de criar o aluguel.
+        Valida a data prevista de devolução e que o veículo esteja
+        disponível antes de criar o aluguel.
         
         Args:
             attrs: Dicionário com os atributos validados.
@@ -47,8 +81,17 @@ class RentSerializer(serializers.ModelSerializer):
             Dicionário de atributos validados.
             
         Raises:
-            ValidationError: Se o veículo não estiver disponível.
+            ValidationError: Se a data prevista for anterior ao início ou
+                além do período máximo, ou se o veículo não estiver disponível.
         """
+        start_date = attrs.get('start_date')
+        expected_end_date = attrs.get('expected_end_date')
+        if start_date and expected_end_date and expected_end_date < start_date:
+            raise serializers.ValidationError({
+                'expected_end_date': 'A data prevista de devolução não pode ser anterior à data de início.'
+            })
+        if start_date and expected_end_date and not within_max_period(start_date, expected_end_date):
+            raise serializers.ValidationError({'expected_end_date': max_period_message()})
         vehicle = attrs.get('vehicle')
         if vehicle and not vehicle.is_available:
             raise serializers.ValidationError({
@@ -76,6 +119,7 @@ class RentListSerializer(serializers.ModelSerializer):
         fields = [
             'id',
             'start_date',
+            'expected_end_date',
             'end_date',
             'returned',
             'client_data',
@@ -101,16 +145,46 @@ class RentDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id',
             'start_date',
+            'expected_end_date',
             'end_date',
             'returned',
             'client',
             'vehicle',
+            'unit',
             'client_data',
             'vehicle_data',
             'created_at',
             'updated_at'
         ]
-        read_only_fields = ('id', 'client', 'vehicle', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'client', 'vehicle', 'unit', 'created_at', 'updated_at')
+
+
+class ArchivedRentalSerializer(serializers.ModelSerializer):
+    """
+    Serializer de leitura de aluguéis arquivados.
+    
+    Mesmo formato do RentDetailSerializer, acrescido de archived_at.
+    """
+    client_data = ClientDetailsSerializer(source='client', read_only=True)
+    vehicle_data = VehicleSerializer(source='vehicle', read_only=True)
+
+    class Meta:
+        model = ArchivedRental
+        fields = [
+            'id',
+            'start_date',
+            'expected_end_date',
+            'end_date',
+            'returned',
+            'client',
+            'vehicle',
+            'client_data',
+            'vehicle_data',
+            'created_at',
+            'updated_at',
+            'archived_at'
+        ]
+        read_only_fields = fields
 
 
 class RentServiceUpdateSerializer(serializers.ModelSerializer):
@@ -130,7 +204,8 @@ class RentServiceUpdateSerializer(serializers.ModelSerializer):
 
     def validate_end_date(self, value):
         """
-        Valida que a data de devolução não seja anterior à data de início.
+        Valida que a data de devolução não seja anterior à data de início
+        nem além do período máximo de um aluguel.
         
         Args:
             value: Data de devolução.
@@ -139,12 +214,15 @@ class RentServiceUpdateSerializer(serializers.ModelSerializer):
             Data validada.
             
         Raises:
-            ValidationError: Se a data de devolução for anterior à data de início.
+            ValidationError: Se a data de devolução for anterior à data de
+                início ou além do período máximo.
         """
         if self.instance and value < self.instance.start_date:
             raise serializers.ValidationError(
                 'A data de devolução não pode ser anterior à data de início.'
             )
+        if self.instance and not within_max_period(self.instance.start_date, value):
+            raise serializers.ValidationError(max_period_message())
         return value
 
     def validate(self, attrs):
@@ -165,3 +243,151 @@ class RentServiceUpdateSerializer(serializers.ModelSerializer):
                 'Este aluguel já foi devolvido e não pode ser atualizado.'
             )
         return attrs
+
+
+class RentBulkItemSerializer(serializers.Serializer):
+    """
+    Serializer para um item da criação de aluguéis em lote.
+
+    Valida apenas o formato do item, sem consultar o banco. A existência
+    de clientes e veículos e o estoque são resolvidos de uma só vez por
+    RentService.bulk_create_rentals para todo o lote.
+    """
+    client = serializers.UUIDField()
+    vehicle = serializers.UUIDField()
+    start_date = serializers.DateField()
+    expected_end_date = serializers.DateField(required=False, allow_null=True)
+
+    def validate_start_date(self, value):
+        """
+        Valida que a data de início não seja no passado.
+        
+        Args:
+            value: Data de início do aluguel.
+            
+        Returns:
+            Data validada.
+            
+        Raises:
+            ValidationError: Se a data for no passado.
+        """
+        if value < timezone.now().date():
+            raise serializers.ValidationError(
+                'A data de início não pode ser no passado.'
+            )
+        return value
+
+    def validate(self, attrs):
+        """
+        Valida que a data prevista de devolução não seja anterior ao início.
+        
+        Args:
+            attrs: Dicionário com os atributos validados.
+            
+        Returns:
+            Dicionário de atributos validados.
+            
+        Raises:
+            ValidationError: Se a data prevista for anterior à data de início
+                ou além do período máximo.
+        """
+        expected_end_date = attrs.get('expected_end_date')
+        if expected_end_date and expected_end_date < attrs['start_date']:
+            raise serializers.ValidationError({
+                'expected_end_date': 'A data prevista de devolução não pode ser anterior à data de início.'
+            })
+        if expected_end_date and not within_max_period(attrs['start_date'], expected_end_date):
+            raise serializers.ValidationError({'expected_end_date': max_period_message()})
+        return attrs
+
+
+class RentBulkReturnItemSerializer(serializers.Serializer):
+    """
+    Serializer para um item da devolução de aluguéis em lote.
+
+    Valida apenas o formato do item. As regras de
+    RentServiceUpdateSerializer (data de devolução não anterior ao
+    início nem além do período máximo e aluguel ainda não devolvido) são
+    aplicadas por RentService.bulk_return_rentals sobre os aluguéis
+    carregados.
+    """
+    rental = serializers.UUIDField()
+    end_date = serializers.DateField()
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    """
+    Serializer para os parâmetros da consulta de disponibilidade.
+
+    Attributes:
+        start_date: Primeiro dia do período consultado.
+        end_date: Último dia do período consultado.
+        type_vehicle: Filtro opcional pelo tipo do veículo.
+        max_period_days: Tamanho máximo do período em dias.
+    """
+    max_period_days = 366
+
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    type_vehicle = serializers.ChoiceField(choices=TypeVehicle.choices, required=False)
+
+    def validate(self, attrs):
+        """
+        Valida a ordem e o tamanho do período.
+        
+        Args:
+            attrs: Dicionário com os atributos validados.
+            
+        Returns:
+            Dicionário de atributos validados.
+            
+        Raises:
+            ValidationError: Se o período for invertido ou maior que o limite.
+        """
+        if attrs['end_date'] < attrs['start_date']:
+            raise serializers.ValidationError({
+                'end_date': 'A data final não pode ser anterior à data inicial.'
+            })
+        days = (attrs['end_date'] - attrs['start_date']).days + 1
+        if days > self.max_period_days:
+            raise serializers.ValidationError({
+                'end_date': f'O período pode ter no máximo {self.max_period_days} dias.'
+            })
+        return attrs
+
+
+class RentExportQuerySerializer(serializers.Serializer):
+    """
+    Serializer para os parâmetros da exportação de aluguéis.
+
+    Attributes:
+        output: Formato do arquivo (ndjson ou csv).
+        start_date: Início opcional do período (data de início do aluguel).
+        end_date: Fim opcional do período (data de início do aluguel).
+        returned: Filtro opcional pela devolução.
+    """
+    output = serializers.ChoiceField(choices=['ndjson', 'csv'], default='ndjson')
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    returned = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate(self, attrs):
+        """
+        Valida a ordem do período.
+        
+        Args:
+            attrs: Dicionário com os atributos validados.
+            
+        Returns:
+            Dicionário de atributos validados.
+            
+        Raises:
+            ValidationError: Se a data final for anterior à inicial.
+        """
+        start_date = attrs.get('start_date')
+        end_date = attrs.get('end_date')
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({
+                'end_date': 'A data final não pode ser anterior à data inicial.'
+            })
+        return attrs
@@ -0,0 +1,1287 @@
+import time
+from collections import Counter
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, DateField, Exists, F, OuterRef, PositiveIntegerField, Sum, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from api.client.models import Client
+from api.exceptions import ValidationError
+from api.rent.models import ArchivedRental, FleetCounter, Rental, VehicleOccupancy
+from api.rent.serializer import max_period_message, within_max_period
+from api.rent.types import BulkRentResultType, StockDriftType
+from api.vehicle.models import MovementReason, TypeVehicle, Vehicle, VehicleUnit
+from api.vehicle.service import StockLedgerService, VehicleUnitService
+
+
+class AvailabilityService:
+    """
+    Camada de serviço do índice de ocupação diária dos veículos.
+
+    Mantém VehicleOccupancy com um contador de unidades ocupadas por
+    veículo e por dia, e responde perguntas de disponibilidade por
+    período para toda a frota a partir dele, sem varrer os aluguéis.
+    """
+
+    upsert_sql = """
+        INSERT INTO {table} (vehicle_id, day, units)
+        SELECT span.vehicle_id, day::date, SUM(span.delta)
+        FROM unnest(%s::uuid[], %s::date[], %s::date[], %s::integer[])
+            AS span(vehicle_id, start_date, end_date, delta),
+            generate_series(span.start_date, span.end_date, interval '1 day') AS day
+        GROUP BY span.vehicle_id, day
+        ON CONFLICT (vehicle_id, day)
+        DO UPDATE SET units = {table}.units + EXCLUDED.units
+    """
+
+    rebuild_sql = """
+        INSERT INTO {table} (vehicle_id, day, units)
+        SELECT rental.vehicle_id, day::date, COUNT(*)
+        FROM (
+            SELECT vehicle_id, start_date, expected_end_date, end_date, returned
+            FROM {rental_table}
+            WHERE deleted_at IS NULL
+            UNION ALL
+            SELECT vehicle_id, start_date, expected_end_date, end_date, returned
+            FROM {archive_table}
+        ) AS rental,
+            generate_series(
+                rental.start_date,
+                CASE WHEN rental.returned THEN rental.end_date ELSE rental.expected_end_date END,
+                interval '1 day'
+            ) AS day
+        GROUP BY rental.vehicle_id, day
+    """
+
+    peak_sql = """
+        WITH period AS (
+            SELECT %s::date + span.shift AS day
+            FROM generate_series(0, %s) AS span(shift)
+        ),
+        bucket AS (
+            SELECT occupancy.vehicle_id, occupancy.day, occupancy.units
+            FROM {table} AS occupancy
+            WHERE occupancy.day BETWEEN %s AND %s
+                AND occupancy.vehicle_id IN ({vehicles})
+            UNION ALL
+            SELECT rental.vehicle_id, period.day, 1
+            FROM {rental_table} AS rental
+            JOIN period
+                ON period.day >= CASE
+                    WHEN rental.expected_end_date IS NULL
+                        OR rental.expected_end_date < rental.start_date
+                    THEN rental.start_date
+                    ELSE rental.expected_end_date + 1
+                END
+            WHERE NOT rental.returned
+                AND rental.deleted_at IS NULL
+                AND rental.start_date <= %s
+                AND (
+                    rental.expected_end_date IS NULL
+                    OR rental.expected_end_date < rental.start_date
+                    OR rental.expected_end_date < %s
+                )
+                AND rental.vehicle_id IN ({vehicles})
+        )
+        SELECT daily.vehicle_id, MAX(daily.units)
+        FROM (
+            SELECT vehicle_id, day, SUM(units) AS units
+            FROM bucket
+            GROUP BY vehicle_id, day
+        ) AS daily
+        GROUP BY daily.vehicle_id
+    """
+
+    def interval_for(self, rental):
+        """
+        Retorna o intervalo de ocupação conhecido de um aluguel.
+
+        Args:
+            rental: Instância de Rental.
+
+        Returns:
+            Tupla (vehicle_id, início, fim) ou None se o aluguel está em
+            aberto sem data prevista de devolução.
+        """
+        end_date = rental.occupancy_end_date
+        if end_date is None or end_date < rental.start_date:
+            return None
+        return rental.vehicle_id, rental.start_date, end_date
+
+    def apply(self, changes):
+        """
+        Aplica variações de ocupação em uma única instrução.
+
+        Args:
+            changes: Iterável de tuplas (vehicle_id, início, fim, delta).
+        """
+        changes = [change for change in changes if change is not None]
+        if not changes:
+            return
+        vehicle_ids, start_dates, end_dates, deltas = zip(*changes)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                self.upsert_sql.format(table=VehicleOccupancy._meta.db_table),
+                [[str(pk) for pk in vehicle_ids], list(start_dates), list(end_dates), list(deltas)]
+            )
+
+    def occupy(self, rentals):
+        """
+        Registra a ocupação de aluguéis novos no índice.
+
+        Args:
+            rentals: Iterável de instâncias de Rental.
+        """
+        self.apply(self.changes_for(rentals, 1))
+
+    def release(self, rentals):
+        """
+        Remove a ocupação de aluguéis do índice.
+
+        Args:
+            rentals: Iterável de instâncias de Rental.
+        """
+        self.apply(self.changes_for(rentals, -1))
+
+    def rebuild(self):
+        """
+        Reconstrói o índice inteiro a partir dos aluguéis e do arquivo.
+
+        Returns:
+            Quantidade de linhas de ocupação geradas.
+        """
+        table = VehicleOccupancy._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(self.rebuild_sql.format(
+                table=table,
+                rental_table=Rental._meta.db_table,
+                archive_table=ArchivedRental._meta.db_table
+            ))
+            return cursor.rowcount
+
+    def fleet_availability(self, start_date, end_date, vehicles=None):
+        """
+        Calcula as unidades livres de cada veículo em um período.
+
+        A capacidade de um veículo é a sua frota (Vehicle.capacity). A
+        ocupação de cada dia vem do índice, acrescida dos aluguéis em
+        aberto que não têm intervalo conhecido (sem data prevista ou já
+        atrasados), que ocupam a unidade até a devolução.
+        O pico de ocupação do período é calculado no banco, e apenas uma
+        linha por veículo chega ao Python.
+
+        Args:
+            start_date: Primeiro dia do período.
+            end_date: Último dia do período.
+            vehicles: QuerySet de Vehicle a considerar (padrão: toda a frota).
+
+        Returns:
+            Lista de dicionários com os dados do veículo, capacity e available_units.
+        """
+        if vehicles is None:
+            vehicles = Vehicle.objects.all()
+        vehicle_ids, vehicle_params = vehicles.values('pk').query.sql_with_params()
+        params = [
+            start_date, (end_date - start_date).days,
+            start_date, end_date, *vehicle_params,
+            end_date, timezone.localdate(), *vehicle_params,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(self.peak_sql.format(
+                table=VehicleOccupancy._meta.db_table,
+                rental_table=Rental._meta.db_table,
+                vehicles=vehicle_ids,
+            ), params)
+            peaks = dict(cursor.fetchall())
+
+        result = []
+        for vehicle in vehicles.values('id', 'brand', 'model', 'year', 'type_vehicle', 'capacity'):
+            vehicle['available_units'] = max(vehicle['capacity'] - peaks.get(vehicle['id'], 0), 0)
+            result.append(vehicle)
+        return result
+
+    def changes_for(self, rentals, delta):
+        """
+        Converte aluguéis em variações de ocupação para apply().
+
+        Args:
+            rentals: Iterável de instâncias de Rental.
+            delta: Variação aplicada a cada dia do intervalo (1 ou -1).
+
+        Yields:
+            Tuplas (vehicle_id, início, fim, delta) dos aluguéis com intervalo conhecido.
+        """
+        for rental in rentals:
+            interval = self.interval_for(rental)
+            if interval is not None:
+                yield (*interval, delta)
+
+
+class FleetSnapshotService:
+    """
+    Camada de serviço do snapshot da frota (FleetCounter).
+
+    Os contadores são mantidos pelos triggers de instrução criados na
+    migração rent.0007, a cada INSERT, UPDATE ou DELETE em veículos e
+    aluguéis (inclusive escritas em lote e SQL direto), e a leitura soma
+    no máximo algumas faixas por tipo, sem depender do tamanho da frota.
+    Desde a rent.0009, a troca de type_vehicle de um veículo também move
+    os seus aluguéis em aberto para o novo tipo.
+
+    Attributes:
+        fields: Contadores mantidos por tipo.
+    """
+    fields = ('vehicles', 'available_vehicles', 'units', 'open_rentals')
+
+    compute_sql = """
+        SELECT fleet.type_vehicle, SUM(fleet.vehicles), SUM(fleet.available_vehicles),
+               SUM(fleet.units), SUM(fleet.open_rentals)
+        FROM (
+            SELECT type_vehicle, COUNT(*) AS vehicles,
+                   COUNT(*) FILTER (WHERE is_available) AS available_vehicles,
+                   SUM(quantity) AS units, 0 AS open_rentals
+            FROM {vehicle_table}
+            WHERE deleted_at IS NULL
+            GROUP BY type_vehicle
+            UNION ALL
+            SELECT vehicle.type_vehicle, 0, 0, 0, COUNT(*)
+            FROM {rental_table} AS rental
+            JOIN {vehicle_table} AS vehicle ON vehicle.id = rental.vehicle_id
+            WHERE NOT rental.returned AND rental.deleted_at IS NULL
+            GROUP BY vehicle.type_vehicle
+        ) AS fleet
+        GROUP BY fleet.type_vehicle
+    """
+
+    def read(self):
+        """
+        Lê os contadores atuais, somando as faixas de cada tipo.
+
+        Returns:
+            Dicionário tipo -> dicionário com os contadores.
+        """
+        return {
+            row.pop('type_vehicle'): row
+            for row in FleetCounter.objects.values('type_vehicle').annotate(
+                **{field: Sum(field) for field in self.fields}
+            ).order_by()
+        }
+
+    def compute(self):
+        """
+        Calcula os contadores do zero, varrendo veículos e aluguéis.
+
+        Returns:
+            Dicionário tipo -> dicionário com os contadores.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(self.compute_sql.format(
+                vehicle_table=Vehicle._meta.db_table,
+                rental_table=Rental._meta.db_table,
+            ))
+            return {
+                type_vehicle: dict(zip(self.fields, map(int, values)))
+                for type_vehicle, *values in cursor.fetchall()
+            }
+
+    def snapshot(self):
+        """
+        Monta o snapshot da frota por tipo e o total.
+
+        Returns:
+            Dicionário com by_type (um item por tipo de veículo) e total.
+        """
+        counters = self.read()
+        by_type = []
+        for type_vehicle in TypeVehicle.values:
+            values = {field: int(counters.get(type_vehicle, {}).get(field) or 0) for field in self.fields}
+            by_type.append({
+                'type_vehicle': type_vehicle,
+                'vehicles': values['vehicles'],
+                'available_vehicles': values['available_vehicles'],
+                'unavailable_vehicles': values['vehicles'] - values['available_vehicles'],
+                'available_units': values['units'],
+                'open_rentals': values['open_rentals'],
+            })
+        total = {
+            key: sum(item[key] for item in by_type)
+            for key in by_type[0] if key != 'type_vehicle'
+        }
+        return {'by_type': by_type, 'total': total}
+
+    def rebuild(self):
+        """
+        Recalcula os contadores do zero, em uma faixa por tipo.
+
+        A tabela de contadores é bloqueada (EXCLUSIVE) antes do cálculo:
+        escritas em andamento terminam antes e entram na contagem, e as
+        seguintes esperam o fim da reconstrução para somar sua variação.
+
+        Returns:
+            Dicionário tipo -> diferença encontrada (contador anterior
+            menos o recalculado), apenas para os tipos com divergência.
+        """
+        table = FleetCounter._meta.db_table
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+            previous = self.read()
+            current = self.compute()
+            FleetCounter.objects.all().delete()
+            FleetCounter.objects.bulk_create([
+                FleetCounter(type_vehicle=type_vehicle, slot=0, **values)
+                for type_vehicle, values in current.items()
+            ])
+
+        drift = {}
+        for type_vehicle in set(previous) | set(current):
+            difference = {
+                field: int(previous.get(type_vehicle, {}).get(field) or 0)
+                - current.get(type_vehicle, {}).get(field, 0)
+                for field in self.fields
+            }
+            if any(difference.values()):
+                drift[type_vehicle] = difference
+        return drift
+
+
+class StockReconciliationService:
+    """
+    Conciliação do estoque (Vehicle.quantity) com os aluguéis em aberto.
+
+    O estoque esperado de cada veículo é a sua frota (capacity) menos os
+    aluguéis em aberto, contados em uma única consulta agrupada sobre
+    os aluguéis. Nos veículos controlados por unidade (tracks_units), o
+    esperado é a quantidade de unidades livres: a unidade é ocupada na
+    transação da reserva, enquanto o agregado só é recontado depois do
+    commit, e a frota menos os aluguéis contaria como divergente uma
+    reserva ainda não recontada. Veículos cujo quantity ou is_available
+    divergem do esperado são corrigidos com um único UPDATE a partir de
+    arrays.
+
+    Antes da correção, as linhas dos veículos divergentes são bloqueadas
+    e a divergência é recalculada: reservas e devoluções em andamento
+    terminam antes e entram na contagem, e as seguintes esperam o fim
+    da conciliação.
+    """
+
+    drift_sql = """
+        SELECT id, brand, model, capacity, open_rentals, quantity, expected
+        FROM (
+            SELECT vehicle.id, vehicle.brand, vehicle.model, vehicle.capacity,
+                   vehicle.quantity, vehicle.is_available,
+                   COALESCE(rented.open_rentals, 0) AS open_rentals,
+                   CASE WHEN vehicle.tracks_units THEN COALESCE(free.units, 0)
+                        ELSE GREATEST(vehicle.capacity - COALESCE(rented.open_rentals, 0), 0)
+                   END AS expected
+            FROM {vehicle_table} AS vehicle
+            LEFT JOIN (
+                SELECT vehicle_id, COUNT(*) AS open_rentals
+                FROM {rental_table}
+                WHERE NOT returned AND deleted_at IS NULL {rental_filter}
+                GROUP BY vehicle_id
+            ) AS rented ON rented.vehicle_id = vehicle.id
+            LEFT JOIN (
+                SELECT vehicle_id, COUNT(*) AS units
+                FROM {unit_table}
+                WHERE is_available {unit_filter}
+                GROUP BY vehicle_id
+            ) AS free ON free.vehicle_id = vehicle.id
+            WHERE vehicle.deleted_at IS NULL {vehicle_filter}
+        ) AS stock
+        WHERE quantity <> expected OR is_available <> (expected > 0)
+        ORDER BY id
+    """
+
+    fix_sql = """
+        UPDATE {table} AS vehicle
+        SET quantity = fixed.expected, is_available = fixed.expected > 0, updated_at = %s
+        FROM unnest(%s::uuid[], %s::integer[]) AS fixed(id, expected)
+        WHERE vehicle.id = fixed.id
+    """
+
+    def drift(self, vehicle_ids=None) -> list[StockDriftType]:
+        """
+        Lista os veículos cujo estoque diverge do esperado.
+
+        Args:
+            vehicle_ids: Veículos a verificar (padrão: todos os ativos).
+
+        Returns:
+            Lista ordenada por id, com o estoque atual (quantity), o
+            esperado (expected), a frota e os aluguéis em aberto.
+        """
+        params = []
+        rental_filter = unit_filter = vehicle_filter = ''
+        if vehicle_ids is not None:
+            rental_filter = unit_filter = 'AND vehicle_id = ANY(%s::uuid[])'
+            vehicle_filter = 'AND vehicle.id = ANY(%s::uuid[])'
+            params = [list(vehicle_ids)] * 3
+        sql = self.drift_sql.format(
+            vehicle_table=Vehicle._meta.db_table,
+            rental_table=Rental._meta.db_table,
+            unit_table=VehicleUnit._meta.db_table,
+            rental_filter=rental_filter,
+            unit_filter=unit_filter,
+            vehicle_filter=vehicle_filter,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = [column.name for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def reconcile(self, dry_run=False) -> list[StockDriftType]:
+        """
+        Corrige o estoque dos veículos divergentes.
+
+        Args:
+            dry_run: Se True, apenas retorna a divergência, sem corrigir.
+
+        Returns:
+            Divergências encontradas (e corrigidas, se não for dry_run).
+        """
+        drift = self.drift()
+        if dry_run or not drift:
+            return drift
+        with transaction.atomic():
+            ids = [row['id'] for row in drift]
+            list(Vehicle.objects.select_for_update().filter(pk__in=ids).order_by('pk').values_list('pk', flat=True))
+            drift = self.drift(ids)
+            with connection.cursor() as cursor:
+                cursor.execute(self.fix_sql.format(table=Vehicle._meta.db_table), [
+                    timezone.now(),
+                    [row['id'] for row in drift],
+                    [row['expected'] for row in drift],
+                ])
+        return drift
+
+
+class ClientCounterService:
+    """
+    Recontagem dos contadores de aluguéis dos clientes.
+
+    Client.total_rentals, open_rentals e returned_rentals são mantidos
+    pelo RentService a cada criação, devolução e exclusão de aluguel.
+    Este serviço os recalcula a partir dos aluguéis ativos e do arquivo
+    (aluguéis arquivados contam como devolvidos), para corrigir
+    divergências de escritas feitas fora do serviço.
+
+    Os clientes são percorridos em lotes pela chave primária. Cada lote
+    é bloqueado antes da contagem: criações e devoluções em andamento
+    terminam antes e entram na contagem, e as seguintes esperam o fim
+    do lote para aplicar o seu incremento sobre o valor recalculado.
+
+    Attributes:
+        batch_size: Quantidade padrão de clientes por lote.
+    """
+    batch_size = 1000
+
+    recompute_sql = """
+        UPDATE {client_table} AS client
+        SET total_rentals = counted.open_rentals + counted.returned_rentals,
+            open_rentals = counted.open_rentals,
+            returned_rentals = counted.returned_rentals,
+            updated_at = %s
+        FROM (
+            SELECT batch.id,
+                   COALESCE(rented.open_rentals, 0) AS open_rentals,
+                   COALESCE(rented.returned_rentals, 0) + COALESCE(archived.returned_rentals, 0) AS returned_rentals
+            FROM unnest(%s::uuid[]) AS batch(id)
+            LEFT JOIN (
+                SELECT client_id,
+                       COUNT(*) FILTER (WHERE NOT returned) AS open_rentals,
+                       COUNT(*) FILTER (WHERE returned) AS returned_rentals
+                FROM {rental_table}
+                WHERE deleted_at IS NULL AND client_id = ANY(%s::uuid[])
+                GROUP BY client_id
+            ) AS rented ON rented.client_id = batch.id
+            LEFT JOIN (
+                SELECT client_id, COUNT(*) AS returned_rentals
+                FROM {archive_table}
+                WHERE client_id = ANY(%s::uuid[])
+                GROUP BY client_id
+            ) AS archived ON archived.client_id = batch.id
+        ) AS counted
+        WHERE client.id = counted.id
+          AND (client.total_rentals, client.open_rentals, client.returned_rentals) IS DISTINCT FROM
+              (counted.open_rentals + counted.returned_rentals, counted.open_rentals, counted.returned_rentals)
+    """
+
+    def recompute_batch(self, after=None, batch_size=None):
+        """
+        Recalcula os contadores de um lote de clientes.
+
+        Args:
+            after: Último id do lote anterior (None para o primeiro lote).
+            batch_size: Tamanho do lote (padrão: batch_size).
+
+        Returns:
+            Tupla (ids do lote, quantidade de clientes corrigidos).
+        """
+        with transaction.atomic():
+            queryset = Client.objects.select_for_update().order_by('pk')
+            if after is not None:
+                queryset = queryset.filter(pk__gt=after)
+            pks = list(queryset.values_list('pk', flat=True)[:batch_size or self.batch_size])
+            if not pks:
+                return pks, 0
+            sql = self.recompute_sql.format(
+                client_table=Client._meta.db_table,
+                rental_table=Rental._meta.db_table,
+                archive_table=ArchivedRental._meta.db_table,
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [timezone.now(), pks, pks, pks])
+                return pks, cursor.rowcount
+
+    def recompute(self, batch_size=None):
+        """
+        Recalcula os contadores de todos os clientes ativos.
+
+        Args:
+            batch_size: Tamanho de cada lote (padrão: batch_size).
+
+        Returns:
+            Quantidade de clientes cujos contadores foram corrigidos.
+        """
+        batch_size = batch_size or self.batch_size
+        fixed = 0
+        after = None
+        while True:
+            pks, changed = self.recompute_batch(after, batch_size)
+            fixed += changed
+            if len(pks) < batch_size:
+                return fixed
+            after = pks[-1]
+
+
+class ArchiveService:
+    """
+    Camada de serviço do arquivo de aluguéis (camada fria).
+
+    Move aluguéis devolvidos há mais de RENT_ARCHIVE_AFTER_DAYS dias da
+    tabela quente (Rental) para ArchivedRental, em lotes. Cada lote é uma
+    única instrução (DELETE ... RETURNING dentro de INSERT ... SELECT) em
+    uma transação curta, com SKIP LOCKED para não disputar linhas com
+    devoluções em andamento. O índice de ocupação não muda, já que os
+    dias ocupados pelos aluguéis arquivados continuam valendo.
+
+    Attributes:
+        batch_size: Quantidade padrão de aluguéis movidos por lote.
+    """
+    batch_size = 5000
+
+    columns = (
+        'id', 'client_id', 'vehicle_id', 'unit_id', 'start_date', 'expected_end_date',
+        'end_date', 'returned', 'created_at', 'updated_at',
+    )
+
+    move_sql = """
+        WITH moved AS (
+            DELETE FROM {rental_table}
+            WHERE id IN (
+                SELECT id FROM {rental_table}
+                WHERE returned AND end_date < %s AND deleted_at IS NULL
+                ORDER BY end_date
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {columns}
+        )
+        INSERT INTO {archive_table} ({columns}, archived_at)
+        SELECT {columns}, %s FROM moved
+    """
+
+    def cutoff(self, days=None):
+        """
+        Retorna a data limite de devolução para arquivamento.
+
+        Args:
+            days: Idade mínima da devolução em dias (padrão: RENT_ARCHIVE_AFTER_DAYS).
+
+        Returns:
+            Data; aluguéis devolvidos antes dela podem ser arquivados.
+        """
+        if days is None:
+            days = settings.RENT_ARCHIVE_AFTER_DAYS
+        return timezone.localdate() - timedelta(days=days)
+
+    def archive_batch(self, cutoff, batch_size=None):
+        """
+        Move um lote de aluguéis devolvidos antes de cutoff.
+
+        Args:
+            cutoff: Data limite de devolução.
+            batch_size: Tamanho do lote (padrão: batch_size).
+
+        Returns:
+            Quantidade de aluguéis movidos.
+        """
+        columns = ', '.join(self.columns)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                self.move_sql.format(
+                    rental_table=Rental._meta.db_table,
+                    archive_table=ArchivedRental._meta.db_table,
+                    columns=columns,
+                ),
+                [cutoff, batch_size or self.batch_size, timezone.now()]
+            )
+            return cursor.rowcount
+
+    def archive(self, days=None, batch_size=None, max_batches=None):
+        """
+        Arquiva aluguéis devolvidos antigos até não restar nenhum.
+
+        Args:
+            days: Idade mínima da devolução em dias (padrão: RENT_ARCHIVE_AFTER_DAYS).
+            batch_size: Tamanho de cada lote (padrão: batch_size).
+            max_batches: Limite opcional de lotes por execução.
+
+        Returns:
+            Quantidade total de aluguéis movidos.
+        """
+        cutoff = self.cutoff(days)
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            moved = self.archive_batch(cutoff, batch_size)
+            total += moved
+            batches += 1
+            if moved < (batch_size or self.batch_size):
+                break
+        return total
+
+
+class RentService:
+    """
+    Camada de serviço para operações de aluguel.
+
+    Concentra as regras de estoque para que a reserva de uma unidade
+    e a criação do aluguel aconteçam na mesma transação curta, sem
+    depender da transação global da requisição (ATOMIC_REQUESTS).
+    Também mantém o índice de ocupação e os contadores de aluguéis do
+    cliente a cada criação, devolução e exclusão de aluguel.
+
+    Veículos com tracks_units reservam uma unidade física (VehicleUnit)
+    com SELECT ... FOR UPDATE SKIP LOCKED em vez de disputar a linha do
+    veículo: reservas simultâneas do mesmo modelo bloqueiam unidades
+    diferentes, e o contador quantity é recontado a partir das unidades
+    livres depois da transação da reserva, em uma instrução isolada. As
+    devoluções também recontam o agregado desses veículos, em vez de
+    incrementá-lo.
+    """
+
+    allocate_sql = """
+        UPDATE {table} SET is_available = false, updated_at = %s
+        WHERE id IN (
+            SELECT unit.id
+            FROM unnest(%s::uuid[], %s::integer[]) AS wanted(vehicle_id, units),
+                LATERAL (
+                    SELECT id FROM {table}
+                    WHERE vehicle_id = wanted.vehicle_id AND is_available
+                    LIMIT wanted.units
+                    FOR UPDATE SKIP LOCKED
+                ) AS unit
+        )
+        RETURNING id, vehicle_id
+    """
+
+    counter_fields = ('total_rentals', 'open_rentals', 'returned_rentals')
+
+    def __init__(self, availability=None, ledger=None):
+        self.availability = availability or AvailabilityService()
+        self.ledger = ledger or StockLedgerService()
+
+    def counter_changes(self, rentals, delta, changes=None) -> dict:
+        """
+        Calcula a variação dos contadores de aluguéis por cliente.
+
+        Args:
+            rentals: Aluguéis (com client_id e returned preenchidos).
+            delta: +1 para contar os aluguéis, -1 para descontá-los.
+            changes: Variações já calculadas, acumuladas no resultado.
+
+        Returns:
+            Dicionário id do cliente -> [total, em aberto, devolvidos].
+        """
+        changes = {} if changes is None else changes
+        for rental in rentals:
+            counters = changes.setdefault(rental.client_id, [0, 0, 0])
+            counters[0] += delta
+            counters[2 if rental.returned else 1] += delta
+        return changes
+
+    def apply_counters(self, changes):
+        """
+        Aplica as variações aos contadores dos clientes em um único UPDATE.
+
+        Os contadores são incrementados no banco a partir do valor atual
+        da coluna, sem o ciclo ler-modificar-salvar, e nunca ficam
+        negativos.
+
+        Args:
+            changes: Dicionário id do cliente -> [total, em aberto, devolvidos].
+        """
+        changes = {pk: counters for pk, counters in changes.items() if any(counters)}
+        if not changes:
+            return
+        Client.all_objects.filter(pk__in=changes).update(
+            **{
+                field: Case(
+                    *[
+                        When(pk=pk, then=Greatest(F(field) + Value(counters[index]), Value(0)))
+                        for pk, counters in changes.items() if counters[index]
+                    ],
+                    default=F(field),
+                    output_field=PositiveIntegerField(),
+                )
+                for index, field in enumerate(self.counter_fields)
+            },
+            updated_at=timezone.now(),
+        )
+
+    def reserve_vehicle(self, vehicle_id) -> bool:
+        """
+        Reserva uma unidade do veículo com um único UPDATE condicional.
+
+        O decremento só acontece se ainda houver estoque (quantity > 0),
+        e o is_available é recalculado na mesma instrução a partir do
+        valor anterior da coluna, evitando o ciclo ler-modificar-salvar
+        que permitia vender mais unidades do que o estoque.
+
+        Veículos controlados por unidade não são decrementados: se o
+        veículo passou a ter unidades depois de lido, a reserva falha e
+        deve ser feita por unidade.
+
+        Args:
+            vehicle_id: Identificador do veículo.
+
+        Returns:
+            True se a unidade foi reservada, False se não havia estoque.
+        """
+        with self.ledger.reason(MovementReason.RENT_OUT):
+            reserved = Vehicle.objects.filter(pk=vehicle_id, quantity__gt=0, tracks_units=False).update(
+                quantity=F('quantity') - 1,
+                is_available=Case(
+                    When(quantity__gt=1, then=Value(True)),
+                    default=Value(False),
+                ),
+                updated_at=timezone.now(),
+            )
+        return reserved == 1
+
+    def allocate_units(self, wanted) -> dict:
+        """
+        Reserva unidades livres de vários veículos em uma instrução.
+
+        Unidades bloqueadas por outras reservas em andamento são puladas
+        (SKIP LOCKED), então o resultado pode ter menos unidades que o
+        pedido mesmo havendo reservas que ainda serão desfeitas.
+
+        Args:
+            wanted: Mapeamento id do veículo -> quantidade de unidades.
+
+        Returns:
+            Dicionário id do veículo -> lista de ids das unidades reservadas.
+        """
+        allocated = {pk: [] for pk in wanted}
+        if not wanted:
+            return allocated
+        with connection.cursor() as cursor:
+            cursor.execute(
+                self.allocate_sql.format(table=VehicleUnit._meta.db_table),
+                [timezone.now(), list(wanted), list(wanted.values())]
+            )
+            for unit_id, vehicle_id in cursor.fetchall():
+                allocated[vehicle_id].append(unit_id)
+        return allocated
+
+    def release_units(self, unit_ids):
+        """
+        Devolve unidades físicas à frota livre.
+
+        Args:
+            unit_ids: Ids das unidades (None é ignorado).
+        """
+        unit_ids = [pk for pk in unit_ids if pk is not None]
+        if unit_ids:
+            VehicleUnit.objects.filter(pk__in=unit_ids).update(
+                is_available=True,
+                updated_at=timezone.now(),
+            )
+
+    def restock(self, rentals):
+        """
+        Devolve ao estoque as unidades de aluguéis em aberto.
+
+        As unidades físicas alugadas voltam a ficar livres e, na mesma
+        instrução para todos os veículos do lote, os veículos com
+        tracks_units têm o agregado recontado a partir das unidades
+        livres; os demais recebem um único incremento com o total de
+        aluguéis do lote. Aluguéis já devolvidos são ignorados.
+
+        Args:
+            rentals: Lista de instâncias de Rental.
+        """
+        rentals = [rental for rental in rentals if not rental.returned]
+        units = Counter(rental.vehicle_id for rental in rentals)
+        if not units:
+            return
+        self.release_units(rental.unit_id for rental in rentals)
+        with self.ledger.reason(MovementReason.RETURN):
+            Vehicle.objects.filter(pk__in=units).update(
+                quantity=Case(
+                    When(tracks_units=True, then=VehicleUnitService().free_units()),
+                    *[
+                        When(pk=pk, then=F('quantity') + Value(count))
+                        for pk, count in units.items()
+                    ],
+                    default=F('quantity'),
+                    output_field=PositiveIntegerField(),
+                ),
+                is_available=Case(
+                    When(tracks_units=True, then=Exists(
+                        VehicleUnit.objects.filter(vehicle=OuterRef('pk'), is_available=True)
+                    )),
+                    default=Value(True),
+                ),
+                updated_at=timezone.now(),
+            )
+
+    def create_rental(self, client, vehicle, start_date, expected_end_date=None) -> Rental:
+        """
+        Reserva uma unidade do veículo e cria o aluguel atomicamente.
+
+        Args:
+            client: Instância de Client que realiza o aluguel.
+            vehicle: Instância de Vehicle a ser alugada.
+            start_date: Data de início do aluguel.
+            expected_end_date: Data prevista de devolução (opcional).
+
+        Returns:
+            Instância de Rental criada, com o veículo já atualizado.
+
+        Raises:
+            ValidationError: Se não houver unidades disponíveis do veículo.
+
+        Em veículos com tracks_units, a unidade é reservada com SKIP LOCKED
+        e o contador do veículo só é recontado após o commit da reserva.
+        Um veículo convertido para unidades depois de lido também é
+        reservado por unidade.
+        """
+        with transaction.atomic():
+            unit_id = None
+            tracks_units = vehicle.tracks_units
+            if not tracks_units and not self.reserve_vehicle(vehicle.pk):
+                tracks_units = Vehicle.objects.filter(pk=vehicle.pk, tracks_units=True).exists()
+                if not tracks_units:
+                    raise ValidationError('Veículo não disponível.')
+            if tracks_units:
+                unit_id = next(iter(self.allocate_units({vehicle.pk: 1})[vehicle.pk]), None)
+                if unit_id is None:
+                    raise ValidationError('Veículo não disponível.')
+
+            rental = Rental.objects.create(
+                client=client,
+                vehicle=vehicle,
+                unit_id=unit_id,
+                start_date=start_date,
+                expected_end_date=expected_end_date,
+                returned=False
+            )
+            self.availability.occupy([rental])
+            self.apply_counters(self.counter_changes([rental], 1))
+
+        if unit_id is not None:
+            with self.ledger.reason(MovementReason.RENT_OUT):
+                VehicleUnitService().refresh_quantities([vehicle.pk])
+        vehicle.refresh_from_db(fields=['quantity', 'is_available', 'updated_at'])
+        client.refresh_from_db(fields=[*self.counter_fields, 'updated_at'])
+        return rental
+
+    def bulk_create_rentals(self, items: list[dict]) -> list[BulkRentResultType]:
+        """
+        Cria um lote de aluguéis com um número constante de queries.
+
+        Clientes e veículos do lote são carregados em uma consulta cada,
+        os veículos com bloqueio de linha para que o estoque lido seja o
+        estoque decrementado. Cada veículo recebe um único decremento com
+        o total de unidades alocadas no lote e os aluguéis são inseridos
+        com bulk_create. Veículos com tracks_units recebem suas unidades
+        físicas em uma única instrução com SKIP LOCKED. Itens sem estoque
+        suficiente falham individualmente, na ordem em que aparecem no lote.
+
+        Args:
+            items: Itens validados com client, vehicle e start_date.
+
+        Returns:
+            Lista alinhada com items, com o aluguel criado ou o erro de cada item.
+        """
+        clients = Client.objects.select_related('user').in_bulk(
+            {item['client'] for item in items}
+        )
+        results: list[BulkRentResultType] = []
+
+        with transaction.atomic():
+            vehicles = {
+                vehicle.pk: vehicle
+                for vehicle in Vehicle.objects.select_for_update().filter(
+                    pk__in={item['vehicle'] for item in items}
+                ).order_by('pk')
+            }
+            units = self.allocate_units(Counter(
+                item['vehicle'] for item in items
+                if item['client'] in clients
+                and item['vehicle'] in vehicles
+                and vehicles[item['vehicle']].tracks_units
+            ))
+            reserved = Counter()
+            rentals = []
+
+            for item in items:
+                client = clients.get(item['client'])
+                vehicle = vehicles.get(item['vehicle'])
+                if client is None:
+                    results.append({'rental': None, 'error': 'Cliente não encontrado.'})
+                    continue
+                if vehicle is None:
+                    results.append({'rental': None, 'error': 'Veículo não encontrado.'})
+                    continue
+                capacity = len(units[vehicle.pk]) if vehicle.tracks_units else vehicle.quantity
+                if capacity - reserved[vehicle.pk] <= 0:
+                    results.append({
+                        'rental': None,
+                        'error': 'Não há unidades disponíveis deste veículo.'
+                    })
+                    continue
+
+                unit_id = units[vehicle.pk][reserved[vehicle.pk]] if vehicle.tracks_units else None
+                reserved[vehicle.pk] += 1
+                rental = Rental(
+                    client=client,
+                    vehicle=vehicle,
+                    unit_id=unit_id,
+                    start_date=item['start_date'],
+                    expected_end_date=item.get('expected_end_date'),
+                    returned=False
+                )
+                rentals.append(rental)
+                results.append({'rental': rental, 'error': None})
+
+            if rentals:
+                now = timezone.now()
+                with self.ledger.reason(MovementReason.RENT_OUT):
+                    Vehicle.objects.filter(pk__in=reserved).update(
+                        quantity=Case(
+                            *[
+                                When(pk=pk, then=F('quantity') - Value(count))
+                                for pk, count in reserved.items()
+                            ],
+                            default=F('quantity'),
+                            output_field=PositiveIntegerField(),
+                        ),
+                        is_available=Case(
+                            *[
+                                When(pk=pk, then=Value(vehicles[pk].quantity > count))
+                                for pk, count in reserved.items()
+                            ],
+                            default=F('is_available'),
+                        ),
+                        updated_at=now,
+                    )
+                Rental.objects.bulk_create(rentals)
+                self.availability.occupy(rentals)
+                self.apply_counters(self.counter_changes(rentals, 1))
+
+        for pk, count in reserved.items():
+            vehicles[pk].quantity -= count
+            vehicles[pk].is_available = vehicles[pk].quantity > 0
+            vehicles[pk].updated_at = now
+        return results
+
+    def bulk_return_rentals(self, items: list[dict]) -> list[BulkRentResultType]:
+        """
+        Finaliza um lote de aluguéis com atualizações em conjunto.
+
+        Os aluguéis do lote são carregados e bloqueados em uma consulta,
+        validados com as mesmas regras da devolução individual, marcados
+        como devolvidos em um único UPDATE e as unidades voltam ao estoque
+        com um incremento agregado por veículo (ou a recontagem das
+        unidades livres, nos veículos com tracks_units) em uma instrução,
+        junto com a liberação das unidades físicas alugadas. O índice de ocupação troca o intervalo previsto pelo intervalo real em uma
+        única atualização.
+
+        Args:
+            items: Itens validados com rental e end_date.
+
+        Returns:
+            Lista alinhada com items, com o aluguel devolvido ou o erro de cada item.
+        """
+        results: list[BulkRentResultType] = []
+
+        with transaction.atomic():
+            rentals = Rental.objects.select_for_update().only(
+                'id', 'client_id', 'vehicle_id', 'unit_id', 'start_date', 'expected_end_date',
+                'end_date', 'returned'
+            ).in_bulk({item['rental'] for item in items})
+            returned = {}
+
+            for item in items:
+                rental = rentals.get(item['rental'])
+                if rental is None:
+                    results.append({'rental': None, 'error': 'Aluguel não encontrado.'})
+                    continue
+                if rental.returned or rental.pk in returned:
+                    results.append({
+                        'rental': None,
+                        'error': 'Este aluguel já foi devolvido e não pode ser atualizado.'
+                    })
+                    continue
+                if item['end_date'] < rental.start_date:
+                    results.append({
+                        'rental': None,
+                        'error': 'A data de devolução não pode ser anterior à data de início.'
+                    })
+                    continue
+                if not within_max_period(rental.start_date, item['end_date']):
+                    results.append({'rental': None, 'error': max_period_message()})
+                    continue
+
+                returned[rental.pk] = item['end_date']
+                results.append({'rental': rental, 'error': None})
+
+            if returned:
+                Rental.objects.filter(pk__in=returned).update(
+                    end_date=Case(
+                        *[When(pk=pk, then=Value(end_date)) for pk, end_date in returned.items()],
+                        output_field=DateField(),
+                    ),
+                    returned=True,
+                    updated_at=timezone.now(),
+                )
+                self.restock([rentals[pk] for pk in returned])
+
+                changes = list(self.availability.changes_for((rentals[pk] for pk in returned), -1))
+                counters = self.counter_changes((rentals[pk] for pk in returned), -1)
+                for pk, end_date in returned.items():
+                    rentals[pk].end_date = end_date
+                    rentals[pk].returned = True
+                changes.extend(self.availability.changes_for((rentals[pk] for pk in returned), 1))
+                self.availability.apply(changes)
+                self.apply_counters(self.counter_changes((rentals[pk] for pk in returned), 1, counters))
+
+        return results
+
+    def return_rental(self, rental, end_date) -> Rental:
+        """
+        Finaliza um aluguel e devolve a unidade ao estoque.
+
+        O aluguel é bloqueado e relido antes de qualquer efeito, como em
+        delete_rental: devoluções simultâneas do mesmo aluguel, ou uma
+        devolução concorrente com a exclusão, esperam a primeira terminar
+        e são recusadas, sem devolver a unidade duas vezes. O estoque é
+        devolvido por restock, no banco, sem o ciclo ler-modificar-salvar,
+        a unidade física alugada (se houver) volta a ficar livre, o índice
+        de ocupação troca o intervalo previsto pelo intervalo real e o
+        aluguel passa de em aberto a devolvido nos contadores do cliente.
+
+        Args:
+            rental: Instância de Rental ainda não devolvida.
+            end_date: Data de devolução.
+
+        Returns:
+            Instância de Rental atualizada, com o veículo já atualizado.
+
+        Raises:
+            ValidationError: Se o aluguel já foi devolvido ou excluído.
+        """
+        with transaction.atomic():
+            locked = Rental.objects.select_for_update().only('id', 'returned').filter(pk=rental.pk).first()
+            if locked is None:
+                raise ValidationError('Aluguel não encontrado.')
+            if locked.returned:
+                raise ValidationError('Este aluguel já foi devolvido e não pode ser atualizado.')
+            self.availability.release([rental])
+            counters = self.counter_changes([rental], -1)
+            self.restock([rental])
+            rental.end_date = end_date
+            rental.returned = True
+            rental.save(update_fields=['end_date', 'returned', 'updated_at'])
+            self.availability.occupy([rental])
+            self.apply_counters(self.counter_changes([rental], 1, counters))
+            rental.vehicle.refresh_from_db(fields=['quantity', 'is_available', 'updated_at'])
+            rental.client.refresh_from_db(fields=[*self.counter_fields, 'updated_at'])
+        return rental
+
+    def delete_rental(self, rental):
+        """
+        Exclui logicamente um aluguel e desfaz seus efeitos na frota.
+
+        O aluguel é bloqueado e relido para que uma devolução simultânea
+        não devolva a mesma unidade duas vezes. Se ainda estava em aberto,
+        a unidade volta ao estoque; em qualquer caso, a ocupação sai do
+        índice e o aluguel é descontado dos contadores do cliente. A
+        linha é removida depois pelo PurgeService.
+
+        Args:
+            rental: Instância de Rental a ser excluída.
+
+        Raises:
+            Rental.DoesNotExist: Se o aluguel já foi excluído.
+        """
+        with transaction.atomic():
+            locked = Rental.objects.select_for_update().only(
+                'id', 'client_id', 'vehicle_id', 'unit_id', 'start_date', 'expected_end_date',
+                'end_date', 'returned', 'updated_at'
+            ).get(pk=rental.pk)
+            self.availability.release([locked])
+            self.restock([locked])
+            self.apply_counters(self.counter_changes([locked], -1))
+            locked.soft_delete()
+            rental.deleted_at = locked.deleted_at
+
+
+class PurgeService:
+    """
+    Remoção em segundo plano de linhas excluídas logicamente.
+
+    Veículos, clientes e aluguéis são excluídos nas views apenas com
+    deleted_at (uma linha por requisição). Este serviço remove depois
+    os aluguéis, o arquivo, a ocupação e as unidades que dependem deles,
+    em lotes pequenos, cada um em uma transação curta com SKIP LOCKED e
+    uma pausa entre lotes, para não disputar o banco com as requisições.
+    Por fim, remove os próprios veículos e clientes que não têm mais
+    dependentes.
+
+    Aluguéis em aberto de um cliente excluído devolvem suas unidades ao
+    estoque e sua ocupação ao índice antes de serem removidos, e os
+    aluguéis (e o arquivo) de um veículo excluído são descontados dos
+    contadores dos clientes. Até a
+    limpeza, aluguéis de veículos e clientes excluídos continuam
+    aparecendo nas listagens de aluguel.
+
+    Attributes:
+        batch_size: Quantidade padrão de linhas removidas por lote.
+        pause: Pausa padrão entre lotes, em segundos.
+    """
+    batch_size = 500
+    pause = 0.05
+
+    def __init__(self, rent_service=None, sleep=time.sleep):
+        self.rent_service = rent_service or RentService()
+        self.sleep = sleep
+
+    def steps(self):
+        """
+        Retorna as etapas da limpeza, na ordem em que devem rodar.
+
+        Os ids de veículos e clientes excluídos são lidos uma vez (pelos
+        índices parciais de deleted_at), para que cada lote filtre os
+        dependentes pelos índices das chaves estrangeiras.
+
+        Returns:
+            Lista de (nome, QuerySet das linhas a remover, preparo do lote ou None).
+        """
+        deleted_vehicles = list(Vehicle.all_objects.deleted().values_list('pk', flat=True))
+        deleted_clients = list(Client.all_objects.deleted().values_list('pk', flat=True))
+        return [
+            ('rentals', Rental.all_objects.deleted(), None),
+            ('vehicle_rentals', Rental.all_objects.filter(vehicle__in=deleted_vehicles), self.discount_rentals),
+            ('client_rentals', Rental.all_objects.filter(client__in=deleted_clients), self.release_rentals),
+            ('vehicle_archive', ArchivedRental.objects.filter(vehicle__in=deleted_vehicles), self.discount_archive),
+            ('client_archive', ArchivedRental.objects.filter(client__in=deleted_clients), None),
+            ('occupancy', VehicleOccupancy.objects.filter(vehicle__in=deleted_vehicles), None),
+            ('units', VehicleUnit.objects.filter(vehicle__in=deleted_vehicles), None),
+            ('vehicles', Vehicle.all_objects.deleted(), None),
+            ('clients', Client.all_objects.deleted(), None),
+        ]
+
+    def release_rentals(self, pks):
+        """
+        Desfaz a ocupação e o estoque de aluguéis antes de removê-los.
+
+        Args:
+            pks: Ids dos aluguéis do lote, já bloqueados.
+        """
+        rentals = list(Rental.all_objects.filter(pk__in=pks, deleted_at__isnull=True).only(
+            'id', 'vehicle_id', 'unit_id', 'start_date', 'expected_end_date', 'end_date', 'returned'
+        ))
+        self.rent_service.availability.release(rentals)
+        self.rent_service.restock(rentals)
+
+    def discount_rentals(self, pks):
+        """
+        Desconta dos contadores dos clientes os aluguéis de um lote.
+
+        Aluguéis já excluídos logicamente foram descontados na exclusão.
+
+        Args:
+            pks: Ids dos aluguéis do lote, já bloqueados.
+        """
+        rentals = Rental.all_objects.filter(pk__in=pks, deleted_at__isnull=True).only('id', 'client_id', 'returned')
+        self.rent_service.apply_counters(self.rent_service.counter_changes(rentals, -1))
+
+    def discount_archive(self, pks):
+        """
+        Desconta dos contadores dos clientes os aluguéis arquivados de um lote.
+
+        Args:
+            pks: Ids dos aluguéis arquivados do lote, já bloqueados.
+        """
+        rentals = ArchivedRental.objects.filter(pk__in=pks).only('id', 'client_id', 'returned')
+        self.rent_service.apply_counters(self.rent_service.counter_changes(rentals, -1))
+
+    def purge_batch(self, queryset, prepare=None, batch_size=None):
+        """
+        Remove um lote de linhas de uma etapa.
+
+        Args:
+            queryset: Linhas candidatas da etapa.
+            prepare: Função chamada com os ids do lote antes da remoção.
+            batch_size: Tamanho do lote (padrão: batch_size).
+
+        Returns:
+            Quantidade de linhas removidas da etapa.
+        """
+        with transaction.atomic():
+            pks = list(
+                queryset.select_for_update(skip_locked=True, of=('self',))
+                .order_by().values_list('pk', flat=True)[:batch_size or self.batch_size]
+            )
+            if not pks:
+                return 0
+            if prepare is not None:
+                prepare(pks)
+            _, deleted = queryset.model._base_manager.filter(pk__in=pks).delete()
+        return deleted.get(queryset.model._meta.label, 0)
+
+    def purge(self, batch_size=None, pause=None, max_batches=None):
+        """
+        Executa todas as etapas até não restar nada a remover.
+
+        Args:
+            batch_size: Tamanho de cada lote (padrão: batch_size).
+            pause: Pausa entre lotes em segundos (padrão: pause).
+            max_batches: Limite opcional de lotes por execução.
+
+        Returns:
+            Dicionário etapa -> quantidade de linhas removidas.
+        """
+        batch_size = batch_size or self.batch_size
+        pause = self.pause if pause is None else pause
+        totals = {}
+        batches = 0
+        for name, queryset, prepare in self.steps():
+            totals[name] = 0
+            while max_batches is None or batches < max_batches:
+                removed = self.purge_batch(queryset, prepare, batch_size)
+                totals[name] += removed
+                batches += 1
+                if removed < batch_size:
+                    break
+                if pause:
+                    self.sleep(pause)
+        return totals
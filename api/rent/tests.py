@@ -1,15 +1,25 @@
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from datetime import date, timedelta
+from uuid import uuid4
 from api.accounts.models import User
 from api.client.models import Client
 from api.vehicle.models import Vehicle, TypeVehicle
-from api.rent.models import Rental
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from api.exceptions import ValidationError
+from api.rent.models import Rental, VehicleOccupancy
 from api.rent.serializer import (
+    AvailabilityQuerySerializer,
+    RentBulkItemSerializer,
     RentSerializer,
     RentListSerializer,
     RentServiceUpdateSerializer
 )
+from api.rent.service import AvailabilityService, RentService
 
 
 class RentalModelTestCase(TestCase):
@@ -209,6 +219,31 @@ class RentSerializerTestCase(TestCase):
         serializer = RentServiceUpdateSerializer(rental, data=data, partial=True)
         self.assertFalse(serializer.is_valid())
 
+    def test_rental_period_is_capped(self):
+        """
+        Testa o limite de max_period_days na data prevista e na devolução.
+        """
+        days = AvailabilityQuerySerializer.max_period_days
+        today = date.today()
+        data = {'client': self.client.id, 'vehicle': self.vehicle.id, 'start_date': today}
+        self.assertTrue(RentSerializer(data={**data, 'expected_end_date': today + timedelta(days=days - 1)}).is_valid())
+        serializer = RentSerializer(data={**data, 'expected_end_date': date(9999, 12, 31)})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('expected_end_date', serializer.errors)
+        serializer = RentBulkItemSerializer(data={**data, 'expected_end_date': today + timedelta(days=days)})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('expected_end_date', serializer.errors)
+
+        rental = RentService().create_rental(self.client, self.vehicle, today)
+        serializer = RentServiceUpdateSerializer(rental, data={'end_date': today + timedelta(days=days)}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('end_date', serializer.errors)
+        results = RentService().bulk_return_rentals([{'rental': rental.id, 'end_date': date(9999, 12, 31)}])
+        self.assertEqual(results[0]['error'], f'O aluguel pode ter no máximo {days} dias.')
+        self.assertFalse(VehicleOccupancy.objects.filter(day__gt=today + timedelta(days=days)).exists())
+        rental.refresh_from_db()
+        self.assertFalse(rental.returned)
+
 
 class RentViewTestCase(TestCase):
     """
@@ -263,3 +298,1781 @@ class RentViewTestCase(TestCase):
         queryset = view.get_queryset()
         self.assertIn('client__user', str(queryset.query))
         self.assertIn('vehicle', str(queryset.query))
+
+
+class RentServiceTestCase(TestCase):
+    """
+    Testes para a reserva atômica de estoque do RentService.
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste.
+        """
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=2,
+            type_vehicle=TypeVehicle.CAR
+        )
+        self.service = RentService()
+
+    def test_reserve_vehicle_decrements_quantity(self):
+        """
+        Testa que a reserva decrementa o estoque no banco.
+        """
+        self.assertTrue(self.service.reserve_vehicle(self.vehicle.id))
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 1)
+        self.assertTrue(self.vehicle.is_available)
+
+    def test_reserve_last_unit_marks_vehicle_unavailable(self):
+        """
+        Testa que reservar a última unidade recalcula is_available.
+        """
+        self.service.reserve_vehicle(self.vehicle.id)
+        self.service.reserve_vehicle(self.vehicle.id)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 0)
+        self.assertFalse(self.vehicle.is_available)
+
+    def test_reserve_without_stock_fails(self):
+        """
+        Testa que não é possível reservar sem estoque.
+        """
+        Vehicle.objects.filter(id=self.vehicle.id).update(quantity=0, is_available=False)
+        self.assertFalse(self.service.reserve_vehicle(self.vehicle.id))
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 0)
+
+    def test_create_rental_without_stock_does_not_insert(self):
+        """
+        Testa que nenhum aluguel é criado quando a reserva falha.
+        """
+        Vehicle.objects.filter(id=self.vehicle.id).update(quantity=0, is_available=False)
+        with self.assertRaises(ValidationError):
+            self.service.create_rental(self.client, self.vehicle, date.today())
+        self.assertFalse(Rental.objects.exists())
+
+    def test_create_rental_refreshes_vehicle(self):
+        """
+        Testa que o aluguel criado carrega o estoque atualizado do veículo.
+        """
+        rental = self.service.create_rental(self.client, self.vehicle, date.today())
+        self.assertEqual(rental.vehicle.quantity, 1)
+        self.assertEqual(Rental.objects.filter(vehicle=self.vehicle).count(), 1)
+
+    def test_returning_the_same_rental_twice_restocks_once(self):
+        """
+        Testa que uma segunda devolução (ou a devolução de um aluguel excluído) é recusada.
+        """
+        rental = self.service.create_rental(self.client, self.vehicle, date.today())
+        stale = Rental.objects.get(pk=rental.pk)
+        self.service.return_rental(rental, date.today())
+        with self.assertRaises(ValidationError):
+            self.service.return_rental(stale, date.today())
+        self.vehicle.refresh_from_db()
+        self.client.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 2)
+        self.assertEqual((self.client.open_rentals, self.client.returned_rentals), (0, 1))
+
+        other = self.service.create_rental(self.client, self.vehicle, date.today())
+        stale = Rental.objects.get(pk=other.pk)
+        self.service.delete_rental(other)
+        with self.assertRaises(ValidationError):
+            self.service.return_rental(stale, date.today())
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 2)
+
+
+class RentCreateViewTestCase(TestCase):
+    """
+    Testes para a view de criação de aluguel.
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=1,
+            type_vehicle=TypeVehicle.CAR
+        )
+
+    def _post(self, data):
+        """
+        Executa a view de criação autenticada com os dados informados.
+        """
+        from api.rent.views import RentCreateView
+        request = self.factory.post('/api/v1/rent/create/', data, format='json')
+        force_authenticate(request, user=self.user)
+        return RentCreateView.as_view()(request)
+
+    def test_create_rental_decrements_stock(self):
+        """
+        Testa que a criação do aluguel consome uma unidade do veículo.
+        """
+        response = self._post({
+            'client': str(self.client.id),
+            'vehicle': str(self.vehicle.id),
+            'start_date': date.today().strftime('%d-%m-%Y')
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['result']['vehicle_data']['quantity'], 0)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 0)
+        self.assertFalse(self.vehicle.is_available)
+
+    def test_create_view_opts_out_of_atomic_requests(self):
+        """
+        Testa que a view não roda dentro da transação global da requisição.
+        """
+        from api.rent.views import RentCreateView
+        view = RentCreateView.as_view()
+        self.assertIn('default', getattr(view, '_non_atomic_requests', set()))
+
+
+class RentBulkCreateViewTestCase(TestCase):
+    """
+    Testes para a criação de aluguéis em lote.
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=20,
+            type_vehicle=TypeVehicle.CAR
+        )
+        self.other_vehicle = Vehicle.objects.create(
+            brand='Honda',
+            model='Civic',
+            year=2024,
+            quantity=2,
+            type_vehicle=TypeVehicle.CAR
+        )
+        self.start_date = date.today().strftime('%d-%m-%Y')
+
+    def _item(self, vehicle, client=None):
+        """
+        Monta um item do lote.
+        """
+        return {
+            'client': str(client or self.client.id),
+            'vehicle': str(vehicle.id),
+            'start_date': self.start_date
+        }
+
+    def _post(self, data):
+        """
+        Executa a view de criação em lote autenticada.
+        """
+        from api.rent.views import RentBulkCreateView
+        request = self.factory.post('/api/v1/rent/bulk/create/', data, format='json')
+        force_authenticate(request, user=self.user)
+        return RentBulkCreateView.as_view()(request)
+
+    def test_bulk_create_decrements_each_vehicle_once(self):
+        """
+        Testa que o lote consome o estoque de cada veículo.
+        """
+        response = self._post([
+            self._item(self.vehicle),
+            self._item(self.vehicle),
+            self._item(self.other_vehicle),
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Rental.objects.count(), 3)
+        self.vehicle.refresh_from_db()
+        self.other_vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 18)
+        self.assertEqual(self.other_vehicle.quantity, 1)
+
+    def test_bulk_create_reports_failures_per_item(self):
+        """
+        Testa que itens sem estoque, inexistentes ou inválidos falham sozinhos.
+        """
+        response = self._post([
+            self._item(self.other_vehicle),
+            self._item(self.other_vehicle),
+            self._item(self.other_vehicle),
+            self._item(self.vehicle, client=uuid4()),
+            {'client': 'invalido', 'vehicle': str(self.vehicle.id)},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        success = [item['success'] for item in response.data['result']]
+        self.assertEqual(success, [True, True, False, False, False])
+        self.assertEqual(response.data['result'][2]['error'], 'Não há unidades disponíveis deste veículo.')
+        self.other_vehicle.refresh_from_db()
+        self.assertEqual(self.other_vehicle.quantity, 0)
+        self.assertFalse(self.other_vehicle.is_available)
+
+    def test_bulk_create_query_count_is_constant(self):
+        """
+        Testa que o número de queries não cresce com o tamanho do lote.
+        """
+        with CaptureQueriesContext(connection) as small:
+            self._post([self._item(self.vehicle)])
+        with CaptureQueriesContext(connection) as large:
+            self._post([self._item(self.vehicle) for _ in range(10)] + [self._item(self.other_vehicle)])
+        self.assertEqual(len(small), len(large))
+
+    def test_bulk_create_rejects_empty_payload(self):
+        """
+        Testa que o lote precisa ser uma lista não vazia.
+        """
+        response = self._post([])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RentBulkReturnViewTestCase(TestCase):
+    """
+    Testes para a devolução de aluguéis em lote.
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=0,
+            type_vehicle=TypeVehicle.CAR
+        )
+        self.rentals = [
+            Rental.objects.create(client=self.client, vehicle=self.vehicle, start_date=date.today())
+            for _ in range(3)
+        ]
+
+    def _item(self, rental, end_date=None):
+        """
+        Monta um item do lote.
+        """
+        end_date = end_date or date.today() + timedelta(days=3)
+        return {'rental': str(rental.id), 'end_date': end_date.strftime('%d-%m-%Y')}
+
+    def _patch(self, data):
+        """
+        Executa a view de devolução em lote autenticada.
+        """
+        from api.rent.views import RentBulkReturnView
+        request = self.factory.patch('/api/v1/rent/bulk/return/', data, format='json')
+        force_authenticate(request, user=self.user)
+        return RentBulkReturnView.as_view()(request)
+
+    def test_bulk_return_marks_rentals_and_restores_stock(self):
+        """
+        Testa que o lote finaliza os aluguéis e devolve as unidades.
+        """
+        response = self._patch([self._item(rental) for rental in self.rentals])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Rental.objects.filter(returned=True, end_date__isnull=False).count(), 3)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 3)
+        self.assertTrue(self.vehicle.is_available)
+
+    def test_bulk_return_keeps_single_return_rules(self):
+        """
+        Testa as regras de data de devolução e de aluguel já devolvido.
+        """
+        Rental.objects.filter(id=self.rentals[0].id).update(returned=True)
+        response = self._patch([
+            self._item(self.rentals[0]),
+            self._item(self.rentals[1], end_date=date.today() - timedelta(days=1)),
+            self._item(self.rentals[2]),
+            self._item(self.rentals[2]),
+        ])
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        success = [item['success'] for item in response.data['result']]
+        self.assertEqual(success, [False, False, True, False])
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 1)
+
+    def test_bulk_return_query_count_is_constant(self):
+        """
+        Testa que o número de queries não cresce com o tamanho do lote.
+        """
+        other_vehicle = Vehicle.objects.create(
+            brand='Honda', model='Civic', year=2024, quantity=0, type_vehicle=TypeVehicle.CAR
+        )
+        other_rental = Rental.objects.create(
+            client=self.client, vehicle=other_vehicle, start_date=date.today()
+        )
+        with CaptureQueriesContext(connection) as small:
+            self._patch([self._item(self.rentals[0])])
+        with CaptureQueriesContext(connection) as large:
+            self._patch([self._item(rental) for rental in self.rentals[1:]] + [self._item(other_rental)])
+        self.assertEqual(len(small), len(large))
+
+
+class RentListPaginationTestCase(TestCase):
+    """
+    Testes para a paginação por cursor da listagem de aluguéis.
+    """
+
+    def setUp(self):
+        """
+        Configura dados de teste com vários aluguéis na mesma data.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=5,
+            type_vehicle=TypeVehicle.CAR
+        )
+        self.rentals = [
+            Rental.objects.create(
+                client=self.client,
+                vehicle=self.vehicle,
+                start_date=date.today() - timedelta(days=index % 3)
+            )
+            for index in range(12)
+        ]
+
+    def _get(self, url):
+        """
+        Executa a view de listagem autenticada.
+        """
+        from api.rent.views import RentListView
+        request = self.factory.get(url)
+        force_authenticate(request, user=self.user)
+        response = RentListView.as_view()(request)
+        response.render()
+        return response
+
+    def test_cursor_walks_all_rentals_in_order(self):
+        """
+        Testa que as páginas cobrem todos os aluguéis sem repetição.
+        """
+        expected = [
+            str(rental.id)
+            for rental in sorted(
+                self.rentals,
+                key=lambda rental: (-rental.start_date.toordinal(), rental.id)
+            )
+        ]
+        seen = []
+        url = '/api/v1/rent/list/?page_size=5'
+        while url:
+            response = self._get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+
+    def test_previous_link_returns_previous_page(self):
+        """
+        Testa que o link anterior devolve a mesma página já visitada.
+        """
+        first = self._get('/api/v1/rent/list/?page_size=4')
+        second = self._get(first.data['next'])
+        back = self._get(second.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in back.data['results']],
+            [item['id'] for item in first.data['results']]
+        )
+
+    def test_page_query_uses_keyset_without_offset_or_count(self):
+        """
+        Testa que páginas profundas não usam OFFSET nem COUNT.
+        """
+        first = self._get('/api/v1/rent/list/?page_size=5')
+        with CaptureQueriesContext(connection) as queries:
+            self._get(first.data['next'])
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('COUNT(', sql)
+        self.assertEqual(len(queries), 1)
+
+    def test_keyset_bounds_first_ordering_field(self):
+        """
+        Testa que o cursor limita start_date como faixa do índice, nas duas direções.
+        """
+        from api.rent.pagination import RentCursorPagination
+        pagination = RentCursorPagination()
+        position = [date.today(), self.rentals[0].id]
+        queryset = Rental.objects.filter(pagination.build_keyset_filter(position)).order_by('-start_date', 'id')
+        self.assertEqual(
+            set(queryset.values_list('id', flat=True)),
+            {
+                rental.id for rental in self.rentals
+                if (rental.start_date, rental.id) != (date.today(), self.rentals[0].id)
+                and (rental.start_date < date.today() or rental.id > self.rentals[0].id)
+            }
+        )
+        self.assertIn('"rent_rental"."start_date" <= ', str(queryset.query))
+        reverse = str(Rental.objects.filter(pagination.build_keyset_filter(position, reverse=True)).query)
+        self.assertIn('"rent_rental"."start_date" >= ', reverse)
+
+        first = self._get('/api/v1/rent/list/?page_size=5')
+        with CaptureQueriesContext(connection) as queries:
+            self._get(first.data['next'])
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f"EXPLAIN {queries.captured_queries[0]['sql']}")
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertRegex(plan, r'Index Cond: \(.*start_date <= ')
+
+    def test_invalid_cursor_returns_not_found(self):
+        """
+        Testa que cursores malformados são rejeitados.
+        """
+        response = self._get('/api/v1/rent/list/?cursor=invalido')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor_returns_not_found(self):
+        """
+        Testa que cursores com valores nulos ou de tipo errado são rejeitados.
+        """
+        import base64
+        import json
+        rental_id = str(self.rentals[0].id)
+        for position in ([123, rental_id], [None, rental_id], [str(date.today()), None], [[], rental_id]):
+            cursor = base64.urlsafe_b64encode(json.dumps({'p': position}).encode('utf-8')).decode('ascii')
+            response = self._get(f'/api/v1/rent/list/?cursor={cursor}')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+
+
+class AvailabilityServiceTestCase(TestCase):
+    """
+    Testes para o índice de ocupação e a consulta de disponibilidade.
+    """
+
+    def setUp(self):
+        """
+        Configura um veículo com três unidades.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=3,
+            type_vehicle=TypeVehicle.CAR
+        )
+        self.service = RentService()
+        self.today = date.today()
+
+    def _available(self, start_offset, end_offset):
+        """
+        Retorna as unidades livres do veículo no período relativo a hoje.
+        """
+        result = AvailabilityService().fleet_availability(
+            self.today + timedelta(days=start_offset),
+            self.today + timedelta(days=end_offset)
+        )
+        return {item['id']: item['available_units'] for item in result}[self.vehicle.id]
+
+    def _occupancy(self):
+        """
+        Retorna o índice de ocupação do veículo como dicionário dia -> unidades.
+        """
+        return dict(
+            VehicleOccupancy.objects.filter(vehicle=self.vehicle)
+            .exclude(units=0)
+            .values_list('day', 'units')
+        )
+
+    def test_create_with_expected_end_date_fills_index(self):
+        """
+        Testa que a criação registra cada dia do intervalo previsto.
+        """
+        self.service.create_rental(
+            self.client, self.vehicle, self.today + timedelta(days=10),
+            expected_end_date=self.today + timedelta(days=14)
+        )
+        occupancy = self._occupancy()
+        self.assertEqual(len(occupancy), 5)
+        self.assertEqual(self._available(10, 14), 2)
+        self.assertEqual(self._available(15, 20), 3)
+
+    def test_open_rental_without_expected_date_occupies_until_returned(self):
+        """
+        Testa que aluguéis sem data prevista ocupam a unidade indefinidamente.
+        """
+        self.service.create_rental(self.client, self.vehicle, self.today)
+        self.assertEqual(self._occupancy(), {})
+        self.assertEqual(self._available(100, 110), 2)
+
+    def test_return_replaces_expected_interval(self):
+        """
+        Testa que a devolução troca o intervalo previsto pelo real.
+        """
+        rental = self.service.create_rental(
+            self.client, self.vehicle, self.today,
+            expected_end_date=self.today + timedelta(days=9)
+        )
+        self.service.return_rental(rental, self.today + timedelta(days=2))
+        self.assertEqual(len(self._occupancy()), 3)
+        self.assertEqual(self._available(3, 9), 3)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 3)
+
+    def test_bulk_return_updates_index(self):
+        """
+        Testa que a devolução em lote atualiza o índice.
+        """
+        rental = self.service.create_rental(
+            self.client, self.vehicle, self.today,
+            expected_end_date=self.today + timedelta(days=9)
+        )
+        self.service.bulk_return_rentals([{'rental': rental.id, 'end_date': self.today}])
+        self.assertEqual(self._occupancy(), {self.today: 1})
+
+    def test_delete_releases_occupancy(self):
+        """
+        Testa que a exclusão remove a ocupação do aluguel.
+        """
+        rental = self.service.create_rental(
+            self.client, self.vehicle, self.today,
+            expected_end_date=self.today + timedelta(days=3)
+        )
+        self.service.delete_rental(rental)
+        self.assertEqual(self._occupancy(), {})
+
+    def test_rebuild_matches_incremental_index(self):
+        """
+        Testa que a reconstrução gera o mesmo índice da manutenção incremental.
+        """
+        self.service.bulk_create_rentals([
+            {
+                'client': self.client.id,
+                'vehicle': self.vehicle.id,
+                'start_date': self.today + timedelta(days=offset),
+                'expected_end_date': self.today + timedelta(days=offset + 4),
+            }
+            for offset in range(3)
+        ])
+        incremental = self._occupancy()
+        AvailabilityService().rebuild()
+        self.assertEqual(self._occupancy(), incremental)
+        self.assertEqual(incremental[self.today + timedelta(days=3)], 3)
+
+    def test_availability_view_answers_for_the_fleet(self):
+        """
+        Testa a consulta de disponibilidade por período via API.
+        """
+        from api.rent.views import VehicleAvailabilityView
+        self.service.create_rental(
+            self.client, self.vehicle, self.today,
+            expected_end_date=self.today + timedelta(days=2)
+        )
+        request = self.factory.get('/api/v1/rent/availability/', {
+            'start_date': self.today.strftime('%d-%m-%Y'),
+            'end_date': (self.today + timedelta(days=5)).strftime('%d-%m-%Y'),
+        })
+        force_authenticate(request, user=self.user)
+        response = VehicleAvailabilityView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['result'][0]['capacity'], 3)
+        self.assertEqual(response.data['result'][0]['available_units'], 2)
+
+    def test_capacity_is_the_vehicle_fleet(self):
+        """
+        Testa que a capacidade vem de Vehicle.capacity, e não do estoque atual.
+        """
+        self.service.create_rental(
+            self.client, self.vehicle, self.today,
+            expected_end_date=self.today + timedelta(days=2)
+        )
+        Vehicle.objects.filter(pk=self.vehicle.pk).update(quantity=0)
+        result = AvailabilityService().fleet_availability(self.today, self.today + timedelta(days=1))
+        self.assertEqual(result[0]['capacity'], 3)
+        self.assertEqual(result[0]['available_units'], 2)
+
+    def test_availability_view_rejects_inverted_period(self):
+        """
+        Testa que períodos invertidos são rejeitados.
+        """
+        from api.rent.views import VehicleAvailabilityView
+        request = self.factory.get('/api/v1/rent/availability/', {
+            'start_date': '10-01-2026',
+            'end_date': '01-01-2026',
+        })
+        force_authenticate(request, user=self.user)
+        response = VehicleAvailabilityView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RentalReaderTestCase(TestCase):
+    """
+    Testes para o caminho de leitura enxuto de aluguéis.
+    """
+
+    def setUp(self):
+        """
+        Configura aluguéis abertos e devolvidos com dados variados.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.other_user = User.objects.create_user(
+            email='other@example.com',
+            password='testpass123',
+            name='Outro Usuário',
+            cpf='12345678901',
+            avatar='avatars/outro.png'
+        )
+        self.client = Client.objects.create(user=self.user, total_rentals=2)
+        self.other_client = Client.objects.create(user=self.other_user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=5,
+            type_vehicle=TypeVehicle.CAR,
+            description='Sedan automático'
+        )
+        self.motorcycle = Vehicle.objects.create(
+            brand='Honda',
+            model='CG 160',
+            year=2023,
+            quantity=0,
+            type_vehicle=TypeVehicle.MOTORCYCLE
+        )
+        self.rentals = [
+            Rental.objects.create(
+                client=self.client,
+                vehicle=self.vehicle,
+                start_date=date.today(),
+                expected_end_date=date.today() + timedelta(days=3)
+            ),
+            Rental.objects.create(
+                client=self.other_client,
+                vehicle=self.motorcycle,
+                start_date=date.today() - timedelta(days=5),
+                end_date=date.today() - timedelta(days=1),
+                returned=True
+            ),
+        ]
+
+    def _render(self, data):
+        """
+        Renderiza os dados em JSON como a resposta da API.
+        """
+        from rest_framework.renderers import JSONRenderer
+        return JSONRenderer().render(data)
+
+    def test_list_matches_serializer_bytes(self):
+        """
+        Testa que a listagem é idêntica à do RentListSerializer.
+        """
+        from api.rent.views import RentListView
+        request = self.factory.get('/api/v1/rent/list/')
+        force_authenticate(request, user=self.user)
+        response = RentListView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        queryset = Rental.objects.select_related('client__user', 'vehicle').order_by('-start_date', 'id')
+        expected = RentListSerializer(queryset, many=True, context={'request': response.renderer_context['request']})
+        self.assertEqual(self._render(response.data['results']), self._render(expected.data))
+
+    def test_detail_matches_serializer_bytes(self):
+        """
+        Testa que o detalhe é idêntico ao do RentDetailSerializer.
+        """
+        from api.rent.serializer import RentDetailSerializer
+        from api.rent.views import RentDetailView
+        for rental in self.rentals:
+            request = self.factory.get(f'/api/v1/rent/detail/{rental.id}/')
+            force_authenticate(request, user=self.user)
+            response = RentDetailView.as_view()(request, pk=rental.id)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            expected = RentDetailSerializer(rental, context={'request': response.renderer_context['request']})
+            self.assertEqual(self._render(response.data), self._render(expected.data))
+
+    def test_detail_not_found(self):
+        """
+        Testa que um aluguel inexistente retorna 404.
+        """
+        from api.rent.views import RentDetailView
+        request = self.factory.get('/api/v1/rent/detail/x/')
+        force_authenticate(request, user=self.user)
+        response = RentDetailView.as_view()(request, pk=uuid4())
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_reader_without_request_matches_serializer(self):
+        """
+        Testa que, sem requisição, o avatar segue o prefixo CURRENT_URL do serializer.
+        """
+        from api.rent.readers import RentalReader
+        reader = RentalReader()
+        queryset = Rental.objects.select_related('client__user', 'vehicle').order_by('-start_date', 'id')
+        self.assertEqual(
+            self._render(reader.list_items(reader.values(queryset))),
+            self._render(RentListSerializer(queryset, many=True).data)
+        )
+
+    def test_list_uses_single_query(self):
+        """
+        Testa que a página é carregada com uma única consulta.
+        """
+        from api.rent.views import RentListView
+        request = self.factory.get('/api/v1/rent/list/')
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = RentListView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+
+    def test_reader_memoizes_nested_blocks_per_response(self):
+        """
+        Testa que cliente e veículo repetidos são montados uma única vez.
+        """
+        from api.rent.readers import RentalReader
+        Rental.objects.create(client=self.client, vehicle=self.vehicle, start_date=date.today())
+        reader = RentalReader()
+        items = reader.list_items(reader.values(Rental.objects.filter(client=self.client).order_by('id')))
+
+        self.assertEqual(len(items), 2)
+        self.assertIs(items[0]['client_data'], items[1]['client_data'])
+        self.assertIs(items[0]['vehicle_data'], items[1]['vehicle_data'])
+        self.assertEqual(len(reader.clients), 1)
+        self.assertEqual(len(reader.vehicles), 1)
+
+    def test_reader_memo_is_keyed_by_user_updated_at(self):
+        """
+        Testa que uma alteração do usuário gera um novo bloco de cliente.
+        """
+        from api.rent.readers import RentalReader
+        reader = RentalReader()
+        rows = list(reader.values(Rental.objects.filter(client=self.client)))
+        first = reader.client_data(rows[0])
+
+        self.user.name = 'Nome Alterado'
+        self.user.save()
+        rows = list(reader.values(Rental.objects.filter(client=self.client)))
+        second = reader.client_data(rows[0])
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second['client_data']['name'], 'Nome Alterado')
+
+    def test_serializer_memoizes_nested_blocks_with_cache_context(self):
+        """
+        Testa que os serializers aninhados reutilizam a representação com o cache no contexto.
+        """
+        Rental.objects.create(client=self.client, vehicle=self.vehicle, start_date=date.today())
+        queryset = Rental.objects.select_related('client__user', 'vehicle').filter(client=self.client)
+
+        plain = RentListSerializer(queryset, many=True).data
+        memoized = RentListSerializer(queryset, many=True, context={'representation_cache': {}}).data
+
+        self.assertEqual(self._render(plain), self._render(memoized))
+        self.assertIs(memoized[0]['client_data'], memoized[1]['client_data'])
+        self.assertIs(memoized[0]['vehicle_data'], memoized[1]['vehicle_data'])
+        self.assertIsNot(plain[0]['vehicle_data'], plain[1]['vehicle_data'])
+
+
+class RentConditionalGetTestCase(TestCase):
+    """
+    Testes para o GET condicional (ETag / Last-Modified).
+    """
+
+    def setUp(self):
+        """
+        Configura um aluguel em aberto.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=5,
+            type_vehicle=TypeVehicle.CAR
+        )
+        self.rental = RentService().create_rental(self.client, self.vehicle, date.today())
+
+    def _get(self, view_class, url, etag=None, **kwargs):
+        """
+        Executa uma view GET autenticada, opcionalmente com If-None-Match.
+        """
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        request = self.factory.get(url, **headers)
+        force_authenticate(request, user=self.user)
+        response = view_class.as_view()(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_detail_returns_304_when_unchanged(self):
+        """
+        Testa que o detalhe responde 304 sem corpo para a mesma ETag.
+        """
+        from api.rent.views import RentDetailView
+        url = f'/api/v1/rent/detail/{self.rental.id}/'
+        first = self._get(RentDetailView, url, pk=self.rental.id)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', first.headers)
+        self.assertIn('Last-Modified', first.headers)
+
+        second = self._get(RentDetailView, url, etag=first.headers['ETag'], pk=self.rental.id)
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second.content, b'')
+        self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+
+    def test_detail_etag_changes_with_nested_vehicle(self):
+        """
+        Testa que uma reserva do veículo invalida a ETag do aluguel.
+        """
+        from api.rent.views import RentDetailView
+        url = f'/api/v1/rent/detail/{self.rental.id}/'
+        first = self._get(RentDetailView, url, pk=self.rental.id)
+
+        RentService().create_rental(self.client, self.vehicle, date.today())
+        second = self._get(RentDetailView, url, etag=first.headers['ETag'], pk=self.rental.id)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(second.headers['ETag'], first.headers['ETag'])
+        self.assertEqual(second.data['vehicle_data']['quantity'], 3)
+
+    def test_list_returns_304_when_page_unchanged(self):
+        """
+        Testa que a página da listagem responde 304 até a devolução de um aluguel.
+        """
+        from api.rent.views import RentListView
+        first = self._get(RentListView, '/api/v1/rent/list/')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        second = self._get(RentListView, '/api/v1/rent/list/', etag=first.headers['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        RentService().return_rental(self.rental, date.today())
+        third = self._get(RentListView, '/api/v1/rent/list/', etag=first.headers['ETag'])
+        self.assertEqual(third.status_code, status.HTTP_200_OK)
+        self.assertTrue(third.data['results'][0]['returned'])
+
+    def test_vehicle_list_uses_collection_validator(self):
+        """
+        Testa que a listagem de veículos muda de ETag quando o estoque muda.
+        """
+        from api.vehicle.views import VehicleListView
+        first = self._get(VehicleListView, '/api/v1/vehicle/list/')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self._get(VehicleListView, '/api/v1/vehicle/list/', etag=first.headers['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 1)
+
+        RentService().return_rental(self.rental, date.today())
+        third = self._get(VehicleListView, '/api/v1/vehicle/list/', etag=first.headers['ETag'])
+        self.assertEqual(third.status_code, status.HTTP_200_OK)
+
+    def test_collection_etag_sees_rows_older_than_the_newest(self):
+        """
+        Testa que a ETag da coleção muda com linhas que não alteram o maior updated_at.
+        """
+        from api.vehicle.views import VehicleListView
+        first = self._get(VehicleListView, '/api/v1/vehicle/list/')
+        past = self.vehicle.updated_at - timedelta(days=1)
+
+        late = Vehicle.objects.create(brand='Fiat', model='Uno', year=2010, quantity=1)
+        Vehicle.objects.filter(pk=late.pk).update(updated_at=past)
+        second = self._get(VehicleListView, '/api/v1/vehicle/list/', etag=first.headers['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+
+        Vehicle.objects.filter(pk=late.pk).delete()
+        replacement = Vehicle.objects.create(brand='Fiat', model='Palio', year=2011, quantity=1)
+        Vehicle.objects.filter(pk=replacement.pk).update(updated_at=past)
+        third = self._get(VehicleListView, '/api/v1/vehicle/list/', etag=second.headers['ETag'])
+        self.assertEqual(third.status_code, status.HTTP_200_OK)
+
+    def test_collections_send_only_etag(self):
+        """
+        Testa que listagens não enviam Last-Modified e que exclusões mudam a ETag.
+        """
+        from django.utils.http import http_date
+        from api.rent.views import RentListView
+        from api.vehicle.views import VehicleListView
+        Vehicle.objects.create(brand='Fiat', model='Uno', year=2010, quantity=1)
+        rentals = self._get(RentListView, '/api/v1/rent/list/')
+        self.assertIn('ETag', rentals.headers)
+        self.assertNotIn('Last-Modified', rentals.headers)
+
+        first = self._get(VehicleListView, '/api/v1/vehicle/list/')
+        self.assertIn('ETag', first.headers)
+        self.assertNotIn('Last-Modified', first.headers)
+
+        Vehicle.objects.get(brand='Fiat').soft_delete()
+        request = self.factory.get(
+            '/api/v1/vehicle/list/', HTTP_IF_MODIFIED_SINCE=http_date(timezone.now().timestamp() + 60)
+        )
+        force_authenticate(request, user=self.user)
+        second = VehicleListView.as_view()(request)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(second.headers['ETag'], first.headers['ETag'])
+
+    def test_client_detail_returns_304_until_user_changes(self):
+        """
+        Testa que o detalhe do cliente usa o updated_at do cliente e do usuário.
+        """
+        from api.client.views import ClientDetailView
+        url = f'/api/v1/clients/{self.client.id}'
+        first = self._get(ClientDetailView, url, pk=self.client.id)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        second = self._get(ClientDetailView, url, etag=first.headers['ETag'], pk=self.client.id)
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.user.name = 'Nome Alterado'
+        self.user.save()
+        third = self._get(ClientDetailView, url, etag=first.headers['ETag'], pk=self.client.id)
+        self.assertEqual(third.status_code, status.HTTP_200_OK)
+
+    def test_client_detail_not_found_has_no_validators(self):
+        """
+        Testa que um cliente inexistente continua respondendo 404.
+        """
+        from api.client.views import ClientDetailView
+        response = self._get(ClientDetailView, '/api/v1/clients/x', pk=uuid4())
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response.headers)
+
+
+class RentExportViewTestCase(TestCase):
+    """
+    Testes para a exportação de aluguéis em streaming.
+    """
+
+    def setUp(self):
+        """
+        Configura aluguéis abertos e devolvidos em datas diferentes.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=5,
+            type_vehicle=TypeVehicle.CAR
+        )
+        self.rentals = [
+            Rental.objects.create(
+                client=self.client,
+                vehicle=self.vehicle,
+                start_date=date(2024, 1, 1) + timedelta(days=index),
+                end_date=date(2024, 1, 2) + timedelta(days=index) if index % 2 else None,
+                returned=bool(index % 2)
+            )
+            for index in range(7)
+        ]
+
+    def _export(self, query=''):
+        """
+        Executa a exportação autenticada e consome o streaming.
+        """
+        from api.rent.views import RentExportView
+        request = self.factory.get(f'/api/v1/rent/export/{query}')
+        force_authenticate(request, user=self.user)
+        response = RentExportView.as_view()(request)
+        if response.streaming:
+            response.body = b''.join(response.streaming_content).decode('utf-8')
+        return response
+
+    def test_ndjson_matches_list_items(self):
+        """
+        Testa que cada linha NDJSON tem o formato de um item da listagem.
+        """
+        import json
+        response = self._export()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = [json.loads(line) for line in response.body.splitlines()]
+        queryset = Rental.objects.select_related('client__user', 'vehicle').order_by('-start_date', 'id')
+        context = {'request': self.factory.get('/api/v1/rent/export/')}
+        expected = json.loads(json.dumps(RentListSerializer(queryset, many=True, context=context).data))
+        self.assertEqual(lines, expected)
+
+    def test_csv_with_filters(self):
+        """
+        Testa o CSV com filtro de período e de devolução.
+        """
+        import csv
+        import io
+        response = self._export('?output=csv&start_date=02-01-2024&end_date=06-01-2024&returned=true')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('alugueis.csv', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(io.StringIO(response.body)))
+        self.assertEqual([row['start_date'] for row in rows], ['06-01-2024', '04-01-2024', '02-01-2024'])
+        self.assertTrue(all(row['returned'] == 'True' for row in rows))
+        self.assertEqual(rows[0]['client_email'], 'test@example.com')
+        self.assertEqual(rows[0]['vehicle_id'], str(self.vehicle.id))
+
+    def test_export_reads_in_chunks(self):
+        """
+        Testa que blocos pequenos produzem a mesma saída e liberam a memória.
+        """
+        from api.rent.exporters import RentalExporter
+        exporter = RentalExporter()
+        exporter.chunk_size = 2
+        queryset = Rental.objects.order_by('-start_date', 'id')
+
+        chunks = list(exporter.ndjson(queryset))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(sum(chunk.count('\n') for chunk in chunks), 7)
+        self.assertEqual(exporter.reader.clients, {})
+
+    def test_invalid_output_returns_400(self):
+        """
+        Testa que um formato desconhecido é rejeitado.
+        """
+        response = self._export('?output=xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ArchiveServiceTestCase(TestCase):
+    """
+    Testes para o arquivamento de aluguéis devolvidos.
+    """
+
+    def setUp(self):
+        """
+        Configura aluguéis antigos, recentes e em aberto.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=5,
+            type_vehicle=TypeVehicle.CAR
+        )
+        today = date.today()
+        self.old = [
+            Rental.objects.create(
+                client=self.client,
+                vehicle=self.vehicle,
+                start_date=today - timedelta(days=400 + index),
+                end_date=today - timedelta(days=398 + index),
+                returned=True
+            )
+            for index in range(5)
+        ]
+        self.recent = Rental.objects.create(
+            client=self.client,
+            vehicle=self.vehicle,
+            start_date=today - timedelta(days=10),
+            end_date=today - timedelta(days=5),
+            returned=True
+        )
+        self.open = Rental.objects.create(
+            client=self.client,
+            vehicle=self.vehicle,
+            start_date=today - timedelta(days=500)
+        )
+
+    def test_archive_moves_only_old_returned_rentals(self):
+        """
+        Testa que apenas aluguéis devolvidos antes do limite são movidos.
+        """
+        from api.rent.models import ArchivedRental
+        from api.rent.service import ArchiveService
+        moved = ArchiveService().archive(days=365, batch_size=2)
+
+        self.assertEqual(moved, 5)
+        self.assertEqual(
+            set(Rental.objects.values_list('id', flat=True)),
+            {self.recent.id, self.open.id}
+        )
+        archived = ArchivedRental.objects.get(pk=self.old[0].id)
+        self.assertEqual(archived.start_date, self.old[0].start_date)
+        self.assertEqual(archived.end_date, self.old[0].end_date)
+        self.assertEqual(archived.created_at, self.old[0].created_at)
+        self.assertIsNotNone(archived.archived_at)
+
+    def test_archive_respects_max_batches(self):
+        """
+        Testa que max_batches limita o trabalho de uma execução.
+        """
+        from api.rent.service import ArchiveService
+        moved = ArchiveService().archive(days=365, batch_size=2, max_batches=1)
+        self.assertEqual(moved, 2)
+        self.assertEqual(Rental.objects.count(), 5)
+
+    def test_rebuild_keeps_archived_occupancy(self):
+        """
+        Testa que o índice de ocupação reconstruído inclui o arquivo.
+        """
+        from api.rent.service import ArchiveService
+        service = AvailabilityService()
+        service.rebuild()
+        before = sorted(VehicleOccupancy.objects.values_list('day', 'units'))
+
+        ArchiveService().archive(days=365)
+        service.rebuild()
+        self.assertEqual(sorted(VehicleOccupancy.objects.values_list('day', 'units')), before)
+
+    def test_archive_views(self):
+        """
+        Testa a listagem e o detalhe do arquivo, separados da listagem quente.
+        """
+        from api.rent.service import ArchiveService
+        from api.rent.views import ArchivedRentalDetailView, ArchivedRentalListView, RentListView
+        ArchiveService().archive(days=365)
+
+        request = self.factory.get(f'/api/v1/rent/archive/list/?client={self.client.id}')
+        force_authenticate(request, user=self.user)
+        response = ArchivedRentalListView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['id'] for item in response.data['results']],
+            [str(rental.id) for rental in self.old]
+        )
+        self.assertIn('archived_at', response.data['results'][0])
+
+        request = self.factory.get('/api/v1/rent/list/')
+        force_authenticate(request, user=self.user)
+        response = RentListView.as_view()(request)
+        self.assertEqual(len(response.data['results']), 2)
+
+        request = self.factory.get(f'/api/v1/rent/archive/detail/{self.old[0].id}/')
+        force_authenticate(request, user=self.user)
+        response = ArchivedRentalDetailView.as_view()(request, pk=self.old[0].id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['vehicle_data']['id'], str(self.vehicle.id))
+
+
+class IdempotencyKeyTestCase(TestCase):
+    """
+    Testes para o cabeçalho Idempotency-Key nas rotas de criação.
+    """
+
+    def setUp(self):
+        """
+        Configura um cliente e um veículo com duas unidades.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota',
+            model='Corolla',
+            year=2024,
+            quantity=2,
+            type_vehicle=TypeVehicle.CAR
+        )
+        self.payload = {
+            'client': str(self.client.id),
+            'vehicle': str(self.vehicle.id),
+            'start_date': date.today().strftime('%d-%m-%Y')
+        }
+
+    def _post(self, view_name, url, data, key=None, user=None):
+        """
+        Executa uma view de criação autenticada, opcionalmente com Idempotency-Key.
+        """
+        from importlib import import_module
+        module, name = view_name.rsplit('.', 1)
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        request = self.factory.post(url, data, format='json', **headers)
+        force_authenticate(request, user=user or self.user)
+        response = getattr(import_module(module), name).as_view()(request)
+        response.render()
+        return response
+
+    def _rent(self, data=None, key='chave-1', user=None):
+        """
+        Executa a criação de aluguel.
+        """
+        return self._post('api.rent.views.RentCreateView', '/api/v1/rent/create/', data or self.payload, key, user)
+
+    def test_retry_replays_without_touching_domain_tables(self):
+        """
+        Testa que a repetição devolve a mesma resposta sem reservar outra unidade.
+        """
+        first = self._rent()
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        with CaptureQueriesContext(connection) as queries:
+            second = self._rent()
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        for query in queries.captured_queries:
+            self.assertNotIn('rent_rental', query['sql'])
+            self.assertNotIn('vehicle_vehicle', query['sql'])
+        self.assertEqual(Rental.objects.count(), 1)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 1)
+
+    def test_keys_are_scoped_by_user_and_optional(self):
+        """
+        Testa que a chave vale por usuário e que sem chave nada muda.
+        """
+        other = User.objects.create_user(email='other@example.com', password='x', name='Other', cpf='98765432100')
+        self.assertEqual(self._rent().status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._rent(user=other).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Rental.objects.count(), 2)
+        response = self._rent(key=None)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn('Idempotent-Replayed', response)
+
+    def test_reused_key_with_other_body_and_in_progress(self):
+        """
+        Testa os conflitos: outra requisição com a mesma chave (422) e chave em processamento (409).
+        """
+        from api.utils.idempotency import get_idempotency_backend
+        self._rent()
+        response = self._rent(data={**self.payload, 'expected_end_date': date.today().strftime('%d-%m-%Y')})
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+        view = self._view_fingerprint()
+        get_idempotency_backend().begin(self.user.pk, 'chave-2', view, 60)
+        response = self._rent(key='chave-2')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Rental.objects.count(), 1)
+
+    def _view_fingerprint(self):
+        """
+        Calcula o fingerprint da requisição padrão de aluguel.
+        """
+        from rest_framework.request import Request
+        from rest_framework.parsers import JSONParser
+        from api.rent.views import RentCreateView
+        request = Request(
+            self.factory.post('/api/v1/rent/create/', self.payload, format='json'),
+            parsers=[JSONParser()]
+        )
+        return RentCreateView().request_fingerprint(request)
+
+    def test_expired_key_and_failures_release(self):
+        """
+        Testa que chaves expiradas e falhas 5xx permitem nova execução.
+        """
+        from unittest.mock import patch
+        from django.test import override_settings
+        from api.models import IdempotencyRecord
+        Vehicle.objects.filter(pk=self.vehicle.pk).update(quantity=5)
+        with override_settings(IDEMPOTENCY_TTL=0):
+            self.assertEqual(self._rent().status_code, status.HTTP_201_CREATED)
+            self.assertEqual(self._rent().status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Rental.objects.count(), 2)
+
+        with patch('api.rent.views.RentSerializer.is_valid', side_effect=RuntimeError('falha')):
+            with self.assertRaises(RuntimeError):
+                self._rent(key='chave-3')
+        self.assertFalse(IdempotencyRecord.objects.filter(key='chave-3').exists())
+        self.assertEqual(self._rent(key='chave-3').status_code, status.HTTP_201_CREATED)
+
+    def test_vehicle_and_client_create(self):
+        """
+        Testa a idempotência nas rotas de criação de veículo e cliente.
+        """
+        data = {'brand': 'Honda', 'model': 'Civic', 'year': 2024, 'quantity': 1, 'description': 'Sedan'}
+        first = self._post('api.vehicle.views.VehicleCreateView', '/api/v1/vehicle/create/', data, key='v-1')
+        second = self._post('api.vehicle.views.VehicleCreateView', '/api/v1/vehicle/create/', data, key='v-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((second.status_code, second.content), (first.status_code, first.content))
+
+        user = User.objects.create_user(email='new@example.com', password='x', name='Novo', cpf='11122233344')
+        first = self._post('api.client.views.ClientCreateView', '/api/v1/client/create/', {'user': str(user.id)}, key='c-1')
+        second = self._post('api.client.views.ClientCreateView', '/api/v1/client/create/', {'user': str(user.id)}, key='c-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(Client.objects.filter(user=user).count(), 1)
+
+    def test_locmem_backend(self):
+        """
+        Testa o backend em memória com as mesmas regras do backend de banco.
+        """
+        from django.test import override_settings
+        from api.models import IdempotencyRecord
+        from api.utils.idempotency import LocMemIdempotencyBackend
+        with override_settings(IDEMPOTENCY_BACKEND='api.utils.idempotency.LocMemIdempotencyBackend'):
+            first = self._rent(key='mem-1')
+            second = self._rent(key='mem-1')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(Rental.objects.count(), 1)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+        backend = LocMemIdempotencyBackend()
+        self.assertIsNone(backend.begin(1, 'k', 'f', 0))
+        self.assertIsNone(backend.begin(1, 'k', 'f', 60))
+        self.assertEqual(backend.begin(1, 'k', 'g', 60).fingerprint, 'f')
+        backend.release(1, 'k')
+        self.assertIsNone(backend.begin(1, 'k', 'g', 0))
+        self.assertEqual(backend.purge(), 1)
+
+    def test_purge_command(self):
+        """
+        Testa a remoção das chaves expiradas pelo comando.
+        """
+        from io import StringIO
+        from django.core.management import call_command
+        from django.test import override_settings
+        from api.models import IdempotencyRecord
+        with override_settings(IDEMPOTENCY_TTL=0):
+            self._rent(key='old')
+        self._rent(key='new', data={**self.payload, 'expected_end_date': date.today().strftime('%d-%m-%Y')})
+        out = StringIO()
+        call_command('purge_idempotency_keys', stdout=out)
+        self.assertIn('removidas: 1', out.getvalue())
+        self.assertEqual(list(IdempotencyRecord.objects.values_list('key', flat=True)), ['new'])
+
+
+class SoftDeleteTestCase(TestCase):
+    """
+    Testes para a exclusão lógica e a limpeza em lotes.
+    """
+
+    def setUp(self):
+        """
+        Configura um cliente e um veículo com estoque.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota', model='Corolla', year=2024, quantity=5, type_vehicle=TypeVehicle.CAR
+        )
+        self.service = RentService()
+        self.today = date.today()
+
+    def _delete(self, view_class, pk):
+        """
+        Executa uma view de exclusão autenticada.
+        """
+        request = self.factory.delete('/')
+        force_authenticate(request, user=self.user)
+        return view_class.as_view()(request, pk=pk)
+
+    def test_rent_delete_restores_stock(self):
+        """
+        Testa que excluir um aluguel em aberto devolve a unidade e oculta o aluguel.
+        """
+        from api.rent.views import RentDeleteView
+        rental = self.service.create_rental(
+            self.client, self.vehicle, self.today, expected_end_date=self.today + timedelta(days=2)
+        )
+        response = self._delete(RentDeleteView, rental.id)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 5)
+        self.assertFalse(Rental.objects.filter(pk=rental.pk).exists())
+        self.assertTrue(Rental.all_objects.deleted().filter(pk=rental.pk).exists())
+        self.assertFalse(VehicleOccupancy.objects.filter(units__gt=0).exists())
+        self.assertNotEqual(self._delete(RentDeleteView, rental.id).status_code, status.HTTP_204_NO_CONTENT)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 5)
+
+    def test_rent_delete_of_returned_rental_keeps_stock(self):
+        """
+        Testa que excluir um aluguel devolvido não altera o estoque.
+        """
+        rental = self.service.create_rental(self.client, self.vehicle, self.today)
+        self.service.return_rental(rental, self.today)
+        self.service.delete_rental(rental)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 5)
+        with self.assertRaises(Rental.DoesNotExist):
+            self.service.delete_rental(rental)
+
+    def test_vehicle_delete_is_logical(self):
+        """
+        Testa que o veículo excluído some do catálogo e libera marca e modelo.
+        """
+        from api.vehicle.service import VehicleImportService
+        from api.vehicle.views import VehicleDeleteView
+        rental = self.service.create_rental(self.client, self.vehicle, self.today)
+        response = self._delete(VehicleDeleteView, self.vehicle.id)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Vehicle.objects.filter(pk=self.vehicle.pk).exists())
+        self.assertTrue(Rental.objects.filter(pk=rental.pk).exists())
+        self.assertEqual(Rental.objects.get(pk=rental.pk).vehicle, self.vehicle)
+        with self.assertRaises(ValidationError):
+            self.service.create_rental(self.client, self.vehicle, self.today)
+
+        report = VehicleImportService().import_rows([{'brand': 'toyota', 'model': 'corolla', 'year': 2025}])
+        self.assertEqual(report[0]['status'], 'created')
+
+    def test_purge_removes_dependents_in_batches(self):
+        """
+        Testa a limpeza em lotes, com a devolução do estoque de clientes excluídos.
+        """
+        from api.client.views import ClientDeleteView
+        from api.rent.service import PurgeService
+        other_user = User.objects.create_user(
+            email='other@example.com', password='testpass123', name='Other', cpf='98765432100'
+        )
+        other_client = Client.objects.create(user=other_user)
+        doomed = Vehicle.objects.create(brand='Fiat', model='Uno', year=2010, quantity=10)
+        for _ in range(5):
+            self.service.create_rental(
+                self.client, doomed, self.today, expected_end_date=self.today + timedelta(days=1)
+            )
+        for _ in range(3):
+            self.service.create_rental(
+                other_client, self.vehicle, self.today, expected_end_date=self.today + timedelta(days=1)
+            )
+        doomed.soft_delete()
+        self.assertEqual(self._delete(ClientDeleteView, other_client.id).status_code, status.HTTP_204_NO_CONTENT)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 2)
+
+        pauses = []
+        totals = PurgeService(sleep=pauses.append).purge(batch_size=2, pause=0.01)
+        self.assertEqual(totals['vehicle_rentals'], 5)
+        self.assertEqual(totals['client_rentals'], 3)
+        self.assertEqual(totals['vehicles'], 1)
+        self.assertEqual(totals['clients'], 1)
+        self.assertTrue(pauses)
+        self.assertFalse(Vehicle.all_objects.filter(pk=doomed.pk).exists())
+        self.assertFalse(Client.all_objects.filter(pk=other_client.pk).exists())
+        self.assertEqual(Rental.all_objects.count(), 0)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 5)
+        self.assertFalse(VehicleOccupancy.objects.filter(vehicle=self.vehicle, units__gt=0).exists())
+
+
+class FleetSnapshotTestCase(TestCase):
+    """
+    Testes para o snapshot da frota mantido por triggers.
+    """
+
+    def setUp(self):
+        """
+        Configura um cliente e uma frota com carros e motos.
+        """
+        from api.rent.service import FleetSnapshotService
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.car = Vehicle.objects.create(brand='Toyota', model='Corolla', year=2024, quantity=3)
+        Vehicle.objects.create(brand='Fiat', model='Uno', year=2010, quantity=0)
+        self.moto = Vehicle.objects.create(
+            brand='Honda', model='CG', year=2022, quantity=2, type_vehicle=TypeVehicle.MOTORCYCLE
+        )
+        self.service = RentService()
+        self.snapshot = FleetSnapshotService()
+        self.today = date.today()
+
+    def _by_type(self):
+        """
+        Retorna o snapshot indexado por tipo.
+        """
+        return {item['type_vehicle']: item for item in self.snapshot.snapshot()['by_type']}
+
+    def _assert_fresh(self):
+        """
+        Verifica que os contadores incrementais batem com o cálculo do zero.
+        """
+        counters = {
+            type_vehicle: {field: int(value) for field, value in values.items()}
+            for type_vehicle, values in self.snapshot.read().items()
+        }
+        self.assertEqual(counters, self.snapshot.compute())
+
+    def test_snapshot_counts_by_type(self):
+        """
+        Testa as contagens iniciais por tipo e o total.
+        """
+        snapshot = self.snapshot.snapshot()
+        cars = self._by_type()[TypeVehicle.CAR]
+        self.assertEqual(cars['vehicles'], 2)
+        self.assertEqual(cars['available_vehicles'], 1)
+        self.assertEqual(cars['unavailable_vehicles'], 1)
+        self.assertEqual(cars['available_units'], 3)
+        self.assertEqual(snapshot['total']['available_units'], 5)
+        self.assertEqual(snapshot['total']['open_rentals'], 0)
+
+    def test_rent_writes_update_snapshot(self):
+        """
+        Testa que criação, devolução, exclusão e lotes mantêm o snapshot.
+        """
+        rental = self.service.create_rental(self.client, self.car, self.today)
+        self.assertEqual(self._by_type()[TypeVehicle.CAR]['open_rentals'], 1)
+        self.assertEqual(self._by_type()[TypeVehicle.CAR]['available_units'], 2)
+        self._assert_fresh()
+
+        results = self.service.bulk_create_rentals([
+            {'client': self.client.id, 'vehicle': self.moto.id, 'start_date': self.today}
+            for _ in range(2)
+        ])
+        motos = self._by_type()[TypeVehicle.MOTORCYCLE]
+        self.assertEqual(motos['open_rentals'], 2)
+        self.assertEqual(motos['available_vehicles'], 0)
+        self._assert_fresh()
+
+        self.service.return_rental(rental, self.today)
+        self.service.bulk_return_rentals([{'rental': results[0]['rental'].id, 'end_date': self.today}])
+        self.service.delete_rental(results[1]['rental'])
+        self.assertEqual(self.snapshot.snapshot()['total']['open_rentals'], 0)
+        self.assertEqual(self.snapshot.snapshot()['total']['available_units'], 5)
+        self._assert_fresh()
+
+        self.car.soft_delete()
+        self.assertEqual(self._by_type()[TypeVehicle.CAR]['vehicles'], 1)
+        self._assert_fresh()
+
+    def test_type_change_moves_open_rentals(self):
+        """
+        Testa que trocar o tipo do veículo move os seus aluguéis em aberto de tipo.
+        """
+        from api.vehicle.service import VehicleImportService
+        self.service.create_rental(self.client, self.car, self.today)
+        self.service.create_rental(self.client, self.moto, self.today)
+        Vehicle.objects.filter(pk=self.car.pk).update(type_vehicle=TypeVehicle.MOTORCYCLE)
+        self.assertEqual(self._by_type()[TypeVehicle.CAR]['open_rentals'], 0)
+        self.assertEqual(self._by_type()[TypeVehicle.MOTORCYCLE]['open_rentals'], 2)
+        self._assert_fresh()
+
+        VehicleImportService().import_rows([
+            {'brand': 'Toyota', 'model': 'Corolla', 'year': 2024, 'quantity': 0, 'type_vehicle': TypeVehicle.CAR},
+        ], on_conflict='update')
+        self.assertEqual(self._by_type()[TypeVehicle.CAR]['open_rentals'], 1)
+        self.assertEqual(self._by_type()[TypeVehicle.MOTORCYCLE]['open_rentals'], 1)
+        self._assert_fresh()
+
+    def test_snapshot_view_reads_counters_only(self):
+        """
+        Testa que a view lê apenas a tabela de contadores.
+        """
+        from api.rent.views import FleetSnapshotView
+        request = self.factory.get('/api/v1/rent/fleet/snapshot/')
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = FleetSnapshotView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertIn('rent_fleetcounter', queries.captured_queries[0]['sql'])
+        self.assertEqual(response.data['result']['total']['vehicles'], 3)
+
+    def test_rebuild_reports_and_fixes_drift(self):
+        """
+        Testa que a reconstrução corrige e informa divergências.
+        """
+        from django.core.management import call_command
+        from io import StringIO
+        from api.rent.models import FleetCounter
+        FleetCounter.objects.filter(type_vehicle=TypeVehicle.CAR).update(units=F('units') + 5)
+        output = StringIO()
+        call_command('rebuild_fleet_snapshot', stdout=output)
+        self.assertIn('units +5', output.getvalue())
+        self.assertEqual(self._by_type()[TypeVehicle.CAR]['available_units'], 3)
+        self.assertEqual(self.snapshot.rebuild(), {})
+        self._assert_fresh()
+
+
+class StockReconciliationTestCase(TestCase):
+    """
+    Testes para a conciliação do estoque com os aluguéis em aberto.
+    """
+
+    def setUp(self):
+        """
+        Configura um cliente, dois veículos e um aluguel em aberto.
+        """
+        from api.rent.service import StockReconciliationService
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.car = Vehicle.objects.create(brand='Toyota', model='Corolla', year=2024, quantity=3)
+        self.other = Vehicle.objects.create(brand='Fiat', model='Uno', year=2010, quantity=2)
+        self.service = StockReconciliationService()
+        RentService().create_rental(self.client, self.car, date.today())
+
+    def test_capacity_defaults_to_initial_quantity(self):
+        """
+        Testa que a frota de um veículo novo é o estoque informado.
+        """
+        self.car.refresh_from_db()
+        self.assertEqual(self.car.capacity, 3)
+        self.assertEqual(self.car.quantity, 2)
+        self.assertEqual(self.service.drift(), [])
+
+    def test_dry_run_reports_without_changing(self):
+        """
+        Testa que o dry-run lista a divergência sem alterar o estoque.
+        """
+        Vehicle.objects.filter(pk=self.car.pk).update(quantity=3)
+        drift = self.service.reconcile(dry_run=True)
+        self.assertEqual(len(drift), 1)
+        self.assertEqual(drift[0]['id'], self.car.pk)
+        self.assertEqual(drift[0]['quantity'], 3)
+        self.assertEqual(drift[0]['expected'], 2)
+        self.assertEqual(drift[0]['open_rentals'], 1)
+        self.car.refresh_from_db()
+        self.assertEqual(self.car.quantity, 3)
+
+    def test_reconcile_fixes_quantity_and_availability(self):
+        """
+        Testa que a correção atualiza quantity e is_available de uma vez.
+        """
+        Vehicle.objects.filter(pk=self.car.pk).update(quantity=5)
+        Vehicle.objects.filter(pk=self.other.pk).update(quantity=0, is_available=False)
+        drift = self.service.reconcile()
+        self.assertEqual({row['id'] for row in drift}, {self.car.pk, self.other.pk})
+        self.car.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.car.quantity, self.car.is_available), (2, True))
+        self.assertEqual((self.other.quantity, self.other.is_available), (2, True))
+        self.assertEqual(self.service.drift(), [])
+
+    def test_ignores_deleted_rentals_and_vehicles(self):
+        """
+        Testa que aluguéis e veículos excluídos não entram na conta.
+        """
+        Rental.objects.filter(vehicle=self.car).soft_delete()
+        Vehicle.objects.filter(pk=self.other.pk).update(quantity=9)
+        self.other.soft_delete()
+        drift = self.service.reconcile()
+        self.assertEqual([row['id'] for row in drift], [self.car.pk])
+        self.car.refresh_from_db()
+        self.assertEqual(self.car.quantity, 3)
+
+    def test_overbooked_vehicle_is_clamped_to_zero(self):
+        """
+        Testa que aluguéis além da frota deixam o veículo sem estoque.
+        """
+        Rental.objects.create(client=self.client, vehicle=self.car, start_date=date.today())
+        Rental.objects.create(client=self.client, vehicle=self.car, start_date=date.today())
+        Rental.objects.create(client=self.client, vehicle=self.car, start_date=date.today())
+        self.service.reconcile()
+        self.car.refresh_from_db()
+        self.assertEqual((self.car.quantity, self.car.is_available), (0, False))
+
+    def test_unit_tracked_vehicle_expects_free_units(self):
+        """
+        Testa que o esperado dos veículos por unidade são as unidades livres.
+        """
+        from api.vehicle.models import VehicleUnit
+        from api.vehicle.service import VehicleUnitService
+        VehicleUnitService().add_units(self.other, ['FIA1A11', 'FIA1A12'])
+        RentService().create_rental(self.client, Vehicle.objects.get(pk=self.other.pk), date.today())
+        self.assertEqual(self.service.drift(), [])
+
+        VehicleUnit.objects.filter(vehicle=self.other).update(is_available=False)
+        drift = self.service.reconcile()
+        self.assertEqual([(row['id'], row['quantity'], row['expected']) for row in drift], [(self.other.pk, 1, 0)])
+        self.other.refresh_from_db()
+        self.assertEqual((self.other.quantity, self.other.is_available), (0, False))
+
+    def test_admin_quantity_edit_moves_capacity(self):
+        """
+        Testa que o ajuste do estoque pelo admin não é desfeito pela conciliação.
+        """
+        from django.contrib.admin.sites import site
+        from django.test import RequestFactory
+        from api.vehicle.service import VehicleUnitService
+        request = RequestFactory().post('/admin/')
+        request.user = User.objects.create_superuser(
+            email='admin@example.com', password='testpass123', name='Admin', cpf='11122233344'
+        )
+        admin = site._registry[Vehicle]
+        car = Vehicle.objects.get(pk=self.car.pk)
+        form_class = admin.get_form(request, car, change=True)
+        data = {field: form_class(instance=car).initial[field] for field in form_class.base_fields}
+        data['quantity'] = 5
+        form = form_class(data, instance=car)
+        self.assertTrue(form.is_valid(), form.errors)
+        admin.save_model(request, form.save(commit=False), form, change=True)
+        self.car.refresh_from_db()
+        self.assertEqual((self.car.quantity, self.car.capacity), (5, 6))
+        self.assertEqual(self.service.reconcile(), [])
+
+        VehicleUnitService().add_units(self.other, ['FIA1A11'])
+        self.assertEqual(admin.get_readonly_fields(request, Vehicle.objects.get(pk=self.other.pk)), ('quantity', 'capacity'))
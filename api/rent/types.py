@@ -0,0 +1,17 @@
+from typing import TypedDict
+from api.rent.models import Rental
+
+
+class BulkRentResultType(TypedDict):
+    rental: Rental | None
+    error: str | None
+
+
+class StockDriftType(TypedDict):
+    id: str
+    brand: str
+    model: str
+    capacity: int
+    open_rentals: int
+    quantity: int
+    expected: int
@@ -1,16 +1,30 @@
 from django.urls import path
 from api.rent.views import (
+    ArchivedRentalDetailView,
+    ArchivedRentalListView,
+    FleetSnapshotView,
+    RentBulkCreateView,
+    RentBulkReturnView,
     RentCreateView,
     RentDeleteView,
     RentDetailView,
+    RentExportView,
     RentListView,
-    RentServiceUpdateView
+    RentServiceUpdateView,
+    VehicleAvailabilityView
 )
 
 urlpatterns = [
     path('rent/create/', RentCreateView.as_view(), name='Criar Aluguel'),
+    path('rent/bulk/create/', RentBulkCreateView.as_view(), name='Criar Aluguéis em Lote'),
     path('rent/list/', RentListView.as_view(), name='Lista de Alugueis'),
+    path('rent/export/', RentExportView.as_view(), name='Exportar Aluguéis'),
     path('rent/detail/<uuid:pk>/', RentDetailView.as_view(), name='Detalhes do Aluguel'),
     path('rent/update/<uuid:pk>/', RentServiceUpdateView.as_view(), name='Atualiza um aluguel'),
+    path('rent/bulk/return/', RentBulkReturnView.as_view(), name='Devolver Aluguéis em Lote'),
+    path('rent/availability/', VehicleAvailabilityView.as_view(), name='Disponibilidade da Frota'),
+    path('rent/fleet/snapshot/', FleetSnapshotView.as_view(), name='Snapshot da Frota'),
     path('rent/delete/<uuid:pk>/', RentDeleteView.as_view(), name='Exclui um aluguel'),
+    path('rent/archive/list/', ArchivedRentalListView.as_view(), name='Arquivo de Aluguéis'),
+    path('rent/archive/detail/<uuid:pk>/', ArchivedRentalDetailView.as_view(), name='Detalhes do Aluguel Arquivado'),
 ]
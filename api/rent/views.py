@@ -1,34 +1,54 @@
 from rest_framework import generics
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from django.utils.dateparse import parse_date
-from api.rent.models import Rental
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from api.exceptions import ValidationError
+from api.rent.models import ArchivedRental, Rental
+from api.rent.pagination import ArchiveCursorPagination, RentCursorPagination
+from api.rent.exporters import RentalExporter
+from api.rent.readers import RentalReader
+from api.utils.conditional import ConditionalGetMixin
+from api.utils.idempotency import IdempotencyMixin
+from api.rent.service import AvailabilityService, FleetSnapshotService, RentService
+from api.vehicle.models import Vehicle
 from api.rent.serializer import (
+    ArchivedRentalSerializer,
+    AvailabilityQuerySerializer,
+    RentBulkItemSerializer,
+    RentBulkReturnItemSerializer,
+    RentExportQuerySerializer,
     RentSerializer,
     RentListSerializer,
     RentDetailSerializer,
     RentServiceUpdateSerializer
 )
-from api.client.models import Client
-from api.vehicle.models import Vehicle
 import logging
+from uuid import UUID
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class RentCreateView(generics.CreateAPIView):
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class RentCreateView(IdempotencyMixin, generics.CreateAPIView):
     """
     View para criação de aluguéis.
     
     Requer autenticação e valida disponibilidade do veículo
-    antes de criar o aluguel. Decrementa automaticamente
-    a quantidade do veículo.
+    antes de criar o aluguel. A reserva da unidade é feita por
+    RentService com um decremento condicional no banco, em uma
+    transação própria e curta em vez da transação da requisição.
+    Repetições com o mesmo Idempotency-Key recebem a resposta da
+    primeira requisição, sem reservar outra unidade.
     """
     permission_classes = [IsAuthenticated]
     queryset = Rental.objects.select_related('client__user', 'vehicle')
     serializer_class = RentSerializer
+    service_class = RentService
 
     def post(self, request, *args, **kwargs):
         """
@@ -43,30 +63,12 @@ class RentCreateView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        client_id = request.data.get("client")
-        vehicle_id = request.data.get("vehicle")
-        start_date = request.data.get("start_date")
-
         try:
-            client = Client.objects.select_related('user').get(id=client_id)
-            vehicle = Vehicle.objects.get(id=vehicle_id)
-
-            if vehicle.quantity <= 0:
-                return Response(
-                    {"error": "Veículo não disponível."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            vehicle.quantity -= 1
-            if vehicle.quantity == 0:
-                vehicle.is_available = False
-            vehicle.save()
-
-            rental = Rental.objects.create(
-                client=client,
-                vehicle=vehicle,
-                start_date=start_date,
-                returned=False
+            rental = self.service_class().create_rental(
+                client=serializer.validated_data['client'],
+                vehicle=serializer.validated_data['vehicle'],
+                start_date=serializer.validated_data['start_date'],
+                expected_end_date=serializer.validated_data.get('expected_end_date')
             )
 
             serializer = RentListSerializer(rental)
@@ -74,15 +76,10 @@ class RentCreateView(generics.CreateAPIView):
                 {"message": "Aluguel criado com sucesso!", "result": serializer.data},
                 status=status.HTTP_201_CREATED
             )
-        except Client.DoesNotExist:
-            return Response(
-                {"error": "Cliente não encontrado."},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        except Vehicle.DoesNotExist:
+        except ValidationError as e:
             return Response(
-                {"error": "Veículo não encontrado."},
-                status=status.HTTP_404_NOT_FOUND
+                {"error": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
             logger.error(f"Erro ao criar aluguel: {str(e)}")
@@ -92,16 +89,146 @@ class RentCreateView(generics.CreateAPIView):
             )
 
 
-class RentListView(generics.ListAPIView):
+class RentBatchMixin:
+    """
+    Mixin com o fluxo comum das views de aluguel em lote.
+    
+    Valida o formato de cada item com o serializer da view, envia os
+    itens válidos de uma só vez para o serviço e monta a resposta com
+    o resultado de cada item na ordem recebida. Clientes e veículos
+    repetidos no lote são serializados uma única vez na resposta.
+    
+    Attributes:
+        max_batch_size: Quantidade máxima de itens aceita por lote.
+    """
+    max_batch_size = 500
+
+    def process_batch(self, request, handler, result_serializer_class, success_status, action):
+        """
+        Processa um lote de itens.
+        
+        Args:
+            request: Objeto de requisição contendo a lista de itens.
+            handler: Método do serviço que recebe os itens válidos.
+            result_serializer_class: Serializer usado nos itens com sucesso.
+            success_status: Status retornado quando todos os itens têm sucesso.
+            action: Verbo usado nas mensagens (ex.: "criados").
+            
+        Returns:
+            Response com o resultado de cada item.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "Envie uma lista de aluguéis."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.max_batch_size:
+            return Response(
+                {"error": f"O lote pode ter no máximo {self.max_batch_size} aluguéis."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = [None] * len(items)
+        valid_items = []
+        positions = []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                valid_items.append(serializer.validated_data)
+                positions.append(index)
+            else:
+                results[index] = {"index": index, "success": False, "error": serializer.errors}
+
+        try:
+            outcomes = handler(valid_items) if valid_items else []
+        except Exception as e:
+            logger.error(f"Erro ao processar aluguéis em lote: {str(e)}")
+            return Response(
+                {"error": f"Erro ao processar aluguéis em lote: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        context = {'representation_cache': {}}
+        for index, outcome in zip(positions, outcomes):
+            if outcome['rental'] is None:
+                results[index] = {"index": index, "success": False, "error": outcome['error']}
+            else:
+                results[index] = {
+                    "index": index,
+                    "success": True,
+                    "result": result_serializer_class(outcome['rental'], context=context).data
+                }
+
+        total_success = sum(1 for result in results if result['success'])
+        if total_success == len(results):
+            response_status = success_status
+        elif total_success:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        return Response(
+            {
+                "message": f"{total_success} de {len(results)} aluguéis {action}.",
+                "result": results
+            },
+            status=response_status
+        )
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class RentBulkCreateView(RentBatchMixin, generics.CreateAPIView):
+    """
+    View para criação de aluguéis em lote.
+    
+    Recebe uma lista de itens (client, vehicle, start_date), valida
+    todos juntos e cria os aluguéis com um número constante de queries
+    por lote, informando sucesso ou falha de cada item.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = RentBulkItemSerializer
+    service_class = RentService
+
+    def post(self, request, *args, **kwargs):
+        """
+        Cria os aluguéis do lote.
+        
+        Args:
+            request: Objeto de requisição contendo a lista de itens.
+            
+        Returns:
+            Response com o resultado de cada item, na ordem recebida.
+        """
+        return self.process_batch(
+            request,
+            self.service_class().bulk_create_rentals,
+            RentListSerializer,
+            status.HTTP_201_CREATED,
+            "criados"
+        )
+
+
+class RentListView(ConditionalGetMixin, generics.ListAPIView):
     """
     View para listagem de aluguéis.
     
-    Retorna lista paginada de aluguéis com dados aninhados
+    Retorna lista paginada por cursor de aluguéis com dados aninhados
     de cliente e veículo. Otimizada com select_related para
-    evitar N+1 queries.
+    evitar N+1 queries e com paginação por chave para que páginas
+    profundas custem o mesmo que a primeira. A resposta é montada por
+    RentalReader a partir de linhas planas, no mesmo formato do
+    RentListSerializer.
+
+    A ETag é calculada a partir das linhas da página (ids e updated_at
+    do aluguel, cliente, usuário e veículo), já carregadas pela
+    paginação, e uma página inalterada responde 304 sem montar o JSON.
+    Como coleção, a página não envia Last-Modified.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = RentListSerializer
+    pagination_class = RentCursorPagination
+    reader_class = RentalReader
 
     def get_queryset(self):
         """
@@ -113,18 +240,51 @@ class RentListView(generics.ListAPIView):
         return Rental.objects.select_related(
             'client__user',
             'vehicle'
-        ).order_by('-start_date')
+        ).order_by('-start_date', 'id')
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lista os aluguéis da página atual.
+        
+        Args:
+            request: Objeto de requisição com os parâmetros de paginação.
+            
+        Returns:
+            Response paginada com os aluguéis.
+        """
+        reader = self.reader_class(request)
+        queryset = reader.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(reader.list_items(queryset))
+
+        etag = self.make_etag(
+            self.paginator.has_next,
+            self.paginator.has_previous,
+            *(reader.version(row) for row in page)
+        )
+        response = self.check_not_modified(request, etag, None)
+        if response is not None:
+            return response
+        return self.set_validators(
+            self.get_paginated_response(reader.list_items(page)),
+            etag,
+            None
+        )
 
 
-class RentDetailView(generics.RetrieveAPIView):
+class RentDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     View para detalhes de um aluguel específico.
     
     Retorna informações completas de um aluguel incluindo
-    dados aninhados de cliente e veículo.
+    dados aninhados de cliente e veículo, montadas por RentalReader no
+    mesmo formato do RentDetailSerializer. Responde 304 quando nem o
+    aluguel nem o cliente, usuário ou veículo mudaram.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = RentDetailSerializer
+    reader_class = RentalReader
 
     def get_queryset(self):
         """
@@ -138,6 +298,31 @@ class RentDetailView(generics.RetrieveAPIView):
             'vehicle'
         )
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retorna os detalhes de um aluguel.
+        
+        Args:
+            request: Objeto de requisição.
+            
+        Returns:
+            Response com os dados do aluguel.
+        """
+        reader = self.reader_class(request)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            reader.values(self.filter_queryset(self.get_queryset())),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(request, row)
+
+        etag = self.make_etag(*reader.version(row))
+        last_modified = reader.last_modified([row])
+        response = self.check_not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return self.set_validators(Response(reader.detail_item(row)), etag, last_modified)
+
 
 class RentServiceUpdateView(generics.UpdateAPIView):
     """
@@ -148,6 +333,7 @@ class RentServiceUpdateView(generics.UpdateAPIView):
     """
     permission_classes = [IsAuthenticated]
     serializer_class = RentServiceUpdateSerializer
+    service_class = RentService
 
     def get_queryset(self):
         """
@@ -182,30 +368,15 @@ class RentServiceUpdateView(generics.UpdateAPIView):
         serializer = self.get_serializer(rental, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
 
-        end_date = request.data.get("end_date")
+        end_date = serializer.validated_data.get("end_date")
         if not end_date:
             return Response(
                 {"error": "Necessário ter a data de devolução."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        end_date = parse_date(end_date)
-        if not end_date:
-            return Response(
-                {"error": "Formato de data inválido."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
         try:
-            rental.end_date = end_date
-            rental.returned = True
-
-            vehicle = rental.vehicle
-            vehicle.quantity += 1
-            vehicle.is_available = True
-            vehicle.save()
-
-            rental.save()
+            rental = self.service_class().return_rental(rental, end_date)
 
             serializer = RentDetailSerializer(rental)
             return Response(
@@ -226,6 +397,38 @@ class RentServiceUpdateView(generics.UpdateAPIView):
             )
 
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class RentBulkReturnView(RentBatchMixin, generics.GenericAPIView):
+    """
+    View para devolução de aluguéis em lote.
+    
+    Recebe uma lista de itens (rental, end_date) e finaliza todos os
+    aluguéis com uma atualização em conjunto, devolvendo as unidades
+    ao estoque com um único incremento agregado por veículo.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = RentBulkReturnItemSerializer
+    service_class = RentService
+
+    def patch(self, request, *args, **kwargs):
+        """
+        Finaliza os aluguéis do lote.
+        
+        Args:
+            request: Objeto de requisição contendo a lista de itens.
+            
+        Returns:
+            Response com o resultado de cada item, na ordem recebida.
+        """
+        return self.process_batch(
+            request,
+            self.service_class().bulk_return_rentals,
+            RentServiceUpdateSerializer,
+            status.HTTP_200_OK,
+            "devolvidos"
+        )
+
+
 class RentDeleteView(generics.DestroyAPIView):
     """
     View para exclusão de aluguéis.
@@ -234,6 +437,7 @@ class RentDeleteView(generics.DestroyAPIView):
     """
     permission_classes = [IsAuthenticated]
     serializer_class = RentSerializer
+    service_class = RentService
 
     def get_queryset(self):
         """
@@ -259,7 +463,7 @@ class RentDeleteView(generics.DestroyAPIView):
         """
         try:
             rental = self.get_object()
-            rental.delete()
+            self.service_class().delete_rental(rental)
             return Response(
                 {"message": "Aluguel excluído com sucesso!"},
                 status=status.HTTP_204_NO_CONTENT
@@ -275,3 +479,182 @@ class RentDeleteView(generics.DestroyAPIView):
                 {"error": f"Erro ao excluir aluguel: {str(e)}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+
+class VehicleAvailabilityView(generics.GenericAPIView):
+    """
+    View de disponibilidade da frota por período.
+    
+    Responde, em uma única chamada, quantas unidades de cada veículo
+    estão livres entre start_date e end_date, usando o índice de
+    ocupação diária em vez de varrer os aluguéis.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = AvailabilityQuerySerializer
+    service_class = AvailabilityService
+
+    def get_queryset(self):
+        """
+        Retorna os veículos considerados na consulta.
+        
+        Returns:
+            QuerySet de Vehicle ordenado por marca e modelo.
+        """
+        return Vehicle.objects.order_by('brand', 'model')
+
+    def get(self, request, *args, **kwargs):
+        """
+        Consulta a disponibilidade da frota no período.
+        
+        Args:
+            request: Objeto de requisição com start_date, end_date e
+                type_vehicle (opcional) na query string.
+            
+        Returns:
+            Response com capacity e available_units de cada veículo.
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        vehicles = self.get_queryset()
+        if params.get('type_vehicle'):
+            vehicles = vehicles.filter(type_vehicle=params['type_vehicle'])
+
+        result = self.service_class().fleet_availability(
+            params['start_date'],
+            params['end_date'],
+            vehicles
+        )
+        return Response({"result": result}, status=status.HTTP_200_OK)
+
+
+class FleetSnapshotView(generics.GenericAPIView):
+    """
+    View do snapshot da frota.
+
+    Responde, por tipo de veículo e no total, quantos modelos estão
+    cadastrados, disponíveis e indisponíveis, as unidades livres em
+    estoque e os aluguéis em aberto. Lê apenas a tabela de contadores,
+    mantida a cada escrita, sem varrer veículos nem aluguéis.
+    """
+    permission_classes = [IsAuthenticated]
+    service_class = FleetSnapshotService
+
+    def get(self, request, *args, **kwargs):
+        """
+        Retorna o snapshot atual da frota.
+
+        Returns:
+            Response com by_type e total.
+        """
+        return Response({"result": self.service_class().snapshot()}, status=status.HTTP_200_OK)
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class RentExportView(generics.GenericAPIView):
+    """
+    View de exportação de aluguéis em streaming.
+    
+    Usa as mesmas junções da listagem (cliente, usuário e veículo) e
+    envia os aluguéis em NDJSON ou CSV com StreamingHttpResponse,
+    lendo por um cursor do servidor em blocos. Não há paginação nem
+    COUNT, e a memória fica estável para qualquer volume.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = RentExportQuerySerializer
+    exporter_class = RentalExporter
+    content_types = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv; charset=utf-8',
+    }
+
+    def get_queryset(self):
+        """
+        Retorna os aluguéis na ordem da listagem.
+        
+        Returns:
+            QuerySet de Rental com relacionamentos otimizados.
+        """
+        return Rental.objects.select_related(
+            'client__user',
+            'vehicle'
+        ).order_by('-start_date', 'id')
+
+    def get(self, request, *args, **kwargs):
+        """
+        Exporta os aluguéis filtrados.
+        
+        Args:
+            request: Objeto de requisição com output, start_date, end_date
+                e returned (todos opcionais) na query string.
+            
+        Returns:
+            StreamingHttpResponse com o arquivo exportado.
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        queryset = self.get_queryset()
+        if params.get('start_date'):
+            queryset = queryset.filter(start_date__gte=params['start_date'])
+        if params.get('end_date'):
+            queryset = queryset.filter(start_date__lte=params['end_date'])
+        if params.get('returned') is not None:
+            queryset = queryset.filter(returned=params['returned'])
+
+        output = params['output']
+        exporter = self.exporter_class(RentalReader(request))
+        response = StreamingHttpResponse(
+            getattr(exporter, output)(queryset),
+            content_type=self.content_types[output]
+        )
+        response['Content-Disposition'] = f'attachment; filename="alugueis.{output}"'
+        return response
+
+
+class ArchivedRentalListView(generics.ListAPIView):
+    """
+    View de listagem do arquivo de aluguéis.
+    
+    Consulta explícita dos aluguéis devolvidos movidos para
+    ArchivedRental, paginada por cursor. Aceita o filtro opcional
+    ?client=<uuid>.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = ArchivedRentalSerializer
+    pagination_class = ArchiveCursorPagination
+
+    def get_queryset(self):
+        """
+        Retorna o arquivo com os relacionamentos carregados.
+        
+        Returns:
+            QuerySet de ArchivedRental.
+        """
+        queryset = ArchivedRental.objects.select_related('client__user', 'vehicle')
+        client = self.request.query_params.get('client')
+        if client:
+            try:
+                queryset = queryset.filter(client=UUID(client))
+            except ValueError:
+                raise ValidationError('Cliente inválido.')
+        return queryset.order_by('-start_date', 'id')
+
+
+class ArchivedRentalDetailView(generics.RetrieveAPIView):
+    """
+    View de detalhes de um aluguel arquivado.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = ArchivedRentalSerializer
+
+    def get_queryset(self):
+        """
+        Retorna o arquivo com os relacionamentos carregados.
+        
+        Returns:
+            QuerySet de ArchivedRental.
+        """
+        return ArchivedRental.objects.select_related('client__user', 'vehicle')
@@ -0,0 +1,173 @@
+import hashlib
+
+from django.db.models import BigIntegerField, Count, F, Func, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def row_digest(*fields):
+    """
+    Monta o resumo de 64 bits de uma linha a partir dos campos informados.
+
+    Somado sobre a coleção, o resumo não depende da ordem das linhas e
+    muda com qualquer linha incluída, removida ou alterada.
+
+    Args:
+        *fields: Campos da linha (inclusive de relações).
+
+    Returns:
+        Expressão bigint com os 16 primeiros dígitos do MD5 da linha.
+    """
+    return Func(
+        *(F(field) for field in fields),
+        template="('x' || SUBSTR(MD5(CONCAT_WS('|', %(expressions)s)), 1, 16))::bit(64)::bigint",
+        output_field=BigIntegerField(),
+    )
+
+
+class ConditionalGetMixin:
+    """
+    Suporte a GET condicional (ETag / Last-Modified) para views do DRF.
+
+    A view informa os validadores do recurso em get_validators(), a
+    partir de updated_at, com uma consulta barata. Se o cliente enviar
+    If-None-Match ou If-Modified-Since compatíveis, a resposta é um
+    304 Not Modified, sem executar serializers. Caso contrário, a
+    resposta normal recebe os cabeçalhos ETag e Last-Modified.
+
+    Coleções enviam só a ETag: a exclusão de um item não altera o maior
+    updated_at dos restantes, e um Last-Modified da coleção faria um
+    If-Modified-Since responder 304 com a lista desatualizada. Recursos
+    individuais mantêm o Last-Modified.
+
+    Views que já carregam as linhas do recurso (como a listagem de
+    aluguéis) podem usar check_not_modified() e set_validators()
+    diretamente, sem a consulta extra.
+
+    Attributes:
+        collection_timestamp_fields: Campos updated_at usados como
+            validador de coleção em listagens (vazio desativa).
+    """
+    collection_timestamp_fields = ()
+
+    def get_validators(self):
+        """
+        Retorna os validadores do recurso da requisição.
+
+        Por padrão, usa collection_validators() sobre o queryset da view
+        quando collection_timestamp_fields está definido.
+
+        Returns:
+            Tupla (etag, last_modified) ou None quando o recurso não tem
+            validador (por exemplo, quando não existe).
+        """
+        if not self.collection_timestamp_fields:
+            return None
+        return self.collection_validators(
+            self.filter_queryset(self.get_queryset()),
+            *self.collection_timestamp_fields
+        )
+
+    def make_etag(self, *parts):
+        """
+        Gera uma ETag a partir das partes que identificam a representação.
+
+        O formato da resposta negociado faz parte da ETag, já que JSON e
+        a API navegável do DRF têm corpos diferentes para o mesmo recurso.
+
+        Args:
+            *parts: Valores que mudam sempre que o corpo muda.
+
+        Returns:
+            ETag entre aspas.
+        """
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        payload = '|'.join(str(part) for part in (*parts, getattr(renderer, 'format', '')))
+        return f'"{hashlib.md5(payload.encode("utf-8"), usedforsecurity=False).hexdigest()}"'
+
+    def collection_validators(self, queryset, *timestamp_fields):
+        """
+        Calcula os validadores de uma coleção com uma única agregação.
+
+        Usa a quantidade de registros e a soma do resumo (row_digest) do
+        id e dos campos de data de cada linha. Diferente do maior
+        updated_at, a soma muda quando uma transação confirma depois uma
+        linha com updated_at mais antigo que o já visto, ou quando uma
+        linha é trocada por outra sem alterar a contagem.
+        Não há Last-Modified: o maior updated_at não muda em exclusões.
+
+        Args:
+            queryset: QuerySet da coleção, já filtrado.
+            *timestamp_fields: Campos updated_at (inclusive de relações).
+
+        Returns:
+            Tupla (etag, None).
+        """
+        aggregates = queryset.order_by().aggregate(
+            total=Count('pk'),
+            digest=Sum(row_digest('pk', *timestamp_fields)),
+        )
+        return self.make_etag(aggregates['total'], aggregates['digest']), None
+
+    def check_not_modified(self, request, etag, last_modified):
+        """
+        Retorna um 304 se a cópia do cliente ainda for válida.
+
+        Args:
+            request: Requisição com os cabeçalhos condicionais.
+            etag: ETag atual do recurso.
+            last_modified: Data da última alteração do recurso ou None.
+
+        Returns:
+            Resposta 304 com os validadores, ou None.
+        """
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is None:
+            return None
+        return self.set_validators(response, etag, last_modified)
+
+    def set_validators(self, response, etag, last_modified):
+        """
+        Adiciona os validadores a uma resposta de sucesso.
+
+        A resposta é marcada como privada e sempre revalidada, pois é
+        autenticada e pode mudar a qualquer alteração do recurso.
+
+        Args:
+            response: Resposta da view.
+            etag: ETag atual do recurso.
+            last_modified: Data da última alteração do recurso ou None.
+
+        Returns:
+            A mesma resposta.
+        """
+        if response.status_code not in (200, 304):
+            return response
+        response.headers['ETag'] = etag
+        if last_modified:
+            response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        """
+        Responde 304 quando possível, sem executar a view.
+
+        Args:
+            request: Requisição GET.
+
+        Returns:
+            Resposta 304 ou a resposta da view com os validadores.
+        """
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+        etag, last_modified = validators
+        response = self.check_not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return self.set_validators(super().get(request, *args, **kwargs), etag, last_modified)
@@ -0,0 +1,18 @@
+from django.contrib.auth.hashers import make_password
+
+
+def hash_passwords(passwords):
+    """
+    Gera o hash de um lote de senhas com o hasher padrão do projeto.
+
+    Usada como tarefa de um pool de processos: o módulo não importa
+    modelos, então pode ser carregado por um processo novo ('spawn')
+    apenas com DJANGO_SETTINGS_MODULE, sem django.setup().
+
+    Args:
+        passwords: Lista de senhas em texto.
+
+    Returns:
+        Lista de hashes, na mesma ordem, como os de make_password.
+    """
+    return [make_password(password) for password in passwords]
@@ -0,0 +1,349 @@
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.response import Response
+from api.models import IdempotencyRecord
+
+
+@dataclass
+class IdempotencyEntry:
+    """
+    Estado de uma chave já registrada.
+
+    Attributes:
+        fingerprint: Hash da requisição original.
+        status_code: Status da resposta armazenada ou None se em processamento.
+        body: Corpo da resposta armazenada, em JSON.
+    """
+    fingerprint: str
+    status_code: int | None = None
+    body: str | None = None
+
+
+class BaseIdempotencyBackend:
+    """
+    Interface dos armazenamentos de chaves de idempotência.
+
+    Uma chave é reservada por begin() antes da execução da view,
+    recebe a resposta em complete() e é liberada por release() se a
+    view falhar, para que uma nova tentativa possa ser executada.
+    """
+
+    def begin(self, user_id, key, fingerprint, ttl):
+        """
+        Reserva a chave, se ainda não existir ou estiver expirada.
+
+        Args:
+            user_id: Id do usuário dono da chave.
+            key: Valor do cabeçalho Idempotency-Key.
+            fingerprint: Hash da requisição.
+            ttl: Validade da chave em segundos.
+
+        Returns:
+            None se a chave foi reservada, ou o IdempotencyEntry existente.
+        """
+        raise NotImplementedError
+
+    def complete(self, user_id, key, status_code, body):
+        """
+        Armazena a resposta de uma chave reservada.
+
+        Args:
+            user_id: Id do usuário dono da chave.
+            key: Valor do cabeçalho Idempotency-Key.
+            status_code: Status da resposta.
+            body: Corpo da resposta, em JSON.
+        """
+        raise NotImplementedError
+
+    def release(self, user_id, key):
+        """
+        Libera uma chave reservada cuja requisição falhou.
+
+        Args:
+            user_id: Id do usuário dono da chave.
+            key: Valor do cabeçalho Idempotency-Key.
+        """
+        raise NotImplementedError
+
+    def purge(self):
+        """
+        Remove as chaves expiradas.
+
+        Returns:
+            Quantidade de chaves removidas.
+        """
+        raise NotImplementedError
+
+
+class DatabaseIdempotencyBackend(BaseIdempotencyBackend):
+    """
+    Armazena as chaves na tabela IdempotencyRecord.
+
+    A reserva é um único INSERT ... ON CONFLICT sobre a restrição
+    (user, key), que só sobrescreve chaves expiradas. Requisições
+    concorrentes com a mesma chave disputam o índice único, e apenas
+    uma executa a view.
+    """
+
+    claim_sql = """
+        INSERT INTO {table} (user_id, key, fingerprint, status_code, body, created_at, expires_at)
+        VALUES (%s, %s, %s, NULL, NULL, %s, %s)
+        ON CONFLICT (user_id, key) DO UPDATE SET
+            fingerprint = EXCLUDED.fingerprint,
+            status_code = NULL,
+            body = NULL,
+            created_at = EXCLUDED.created_at,
+            expires_at = EXCLUDED.expires_at
+        WHERE {table}.expires_at <= EXCLUDED.created_at
+        RETURNING id
+    """
+
+    model = IdempotencyRecord
+
+    def begin(self, user_id, key, fingerprint, ttl):
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                self.claim_sql.format(table=self.model._meta.db_table),
+                [user_id, key, fingerprint, now, now + timedelta(seconds=ttl)]
+            )
+            if cursor.fetchone() is not None:
+                return None
+        record = self.model.objects.filter(user_id=user_id, key=key).values(
+            'fingerprint', 'status_code', 'body'
+        ).first()
+        if record is None:
+            return self.begin(user_id, key, fingerprint, ttl)
+        return IdempotencyEntry(**record)
+
+    def complete(self, user_id, key, status_code, body):
+        self.model.objects.filter(user_id=user_id, key=key).update(status_code=status_code, body=body)
+
+    def release(self, user_id, key):
+        try:
+            with transaction.atomic():
+                self.model.objects.filter(user_id=user_id, key=key, status_code__isnull=True).delete()
+        except DatabaseError:
+            pass
+
+    def purge(self):
+        deleted, _ = self.model.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+
+class LocMemIdempotencyBackend(BaseIdempotencyBackend):
+    """
+    Armazena as chaves em memória, no processo atual.
+
+    Indicado para desenvolvimento, testes e implantações de um único
+    processo; chaves não são compartilhadas entre workers.
+    """
+
+    def __init__(self):
+        """
+        Inicializa o armazenamento vazio, protegido por um lock.
+        """
+        self.entries = {}
+        self.expirations = {}
+        self.lock = threading.Lock()
+
+    def begin(self, user_id, key, fingerprint, ttl):
+        now = timezone.now()
+        with self.lock:
+            entry = self.entries.get((user_id, key))
+            if entry is not None and self.expirations[(user_id, key)] > now:
+                return IdempotencyEntry(entry.fingerprint, entry.status_code, entry.body)
+            self.entries[(user_id, key)] = IdempotencyEntry(fingerprint)
+            self.expirations[(user_id, key)] = now + timedelta(seconds=ttl)
+            return None
+
+    def complete(self, user_id, key, status_code, body):
+        with self.lock:
+            entry = self.entries.get((user_id, key))
+            if entry is not None:
+                entry.status_code = status_code
+                entry.body = body
+
+    def release(self, user_id, key):
+        with self.lock:
+            entry = self.entries.get((user_id, key))
+            if entry is not None and entry.status_code is None:
+                del self.entries[(user_id, key)]
+                del self.expirations[(user_id, key)]
+
+    def purge(self):
+        now = timezone.now()
+        with self.lock:
+            expired = [item for item, expires_at in self.expirations.items() if expires_at <= now]
+            for item in expired:
+                del self.entries[item]
+                del self.expirations[item]
+        return len(expired)
+
+
+_backends = {}
+
+
+def get_idempotency_backend(path=None):
+    """
+    Retorna a instância do backend configurado em IDEMPOTENCY_BACKEND.
+
+    Cada backend é instanciado uma vez por processo, para que o
+    armazenamento em memória seja compartilhado entre requisições.
+
+    Args:
+        path: Caminho de importação do backend (padrão: IDEMPOTENCY_BACKEND).
+
+    Returns:
+        Instância de BaseIdempotencyBackend.
+    """
+    path = path or settings.IDEMPOTENCY_BACKEND
+    backend = _backends.get(path)
+    if backend is None:
+        backend = _backends[path] = import_string(path)()
+    return backend
+
+
+class IdempotentReplay(Exception):
+    """
+    Interrompe a view para devolver uma resposta já armazenada.
+    """
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class IdempotencyMixin:
+    """
+    Suporte ao cabeçalho Idempotency-Key em views de criação (POST).
+
+    A primeira requisição com uma chave executa a view e sua resposta
+    (exceto erros 5xx) é armazenada por usuário e chave durante
+    IDEMPOTENCY_TTL segundos. Repetições com a mesma chave e o mesmo
+    corpo recebem a resposta armazenada, com o cabeçalho
+    Idempotent-Replayed, sem executar a view nem consultar as tabelas
+    de domínio. A mesma chave com outro corpo responde 422, e uma
+    repetição enquanto a primeira ainda está em processamento, 409.
+
+    Attributes:
+        idempotency_header: Cabeçalho HTTP lido.
+        idempotency_max_length: Tamanho máximo aceito para a chave.
+    """
+    idempotency_header = 'Idempotency-Key'
+    idempotency_max_length = 255
+
+    def get_idempotency_backend(self):
+        """
+        Retorna o backend de armazenamento das chaves.
+        """
+        return get_idempotency_backend()
+
+    def request_fingerprint(self, request):
+        """
+        Gera o hash que identifica o conteúdo da requisição.
+
+        Args:
+            request: Requisição do DRF, já com o corpo interpretado.
+
+        Returns:
+            Hash SHA-256 do método, caminho e corpo.
+        """
+        payload = json.dumps(
+            [request.method, request.path, request.data],
+            sort_keys=True, default=str, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Reserva a chave ou interrompe a view com a resposta armazenada.
+
+        Executado após autenticação e permissões, de modo que a chave é
+        sempre associada a um usuário autenticado.
+        """
+        super().initial(request, *args, **kwargs)
+        self.idempotency_key = None
+        key = request.headers.get(self.idempotency_header)
+        if request.method != 'POST' or not key:
+            return
+        if len(key) > self.idempotency_max_length:
+            raise IdempotentReplay(Response(
+                {"error": f"{self.idempotency_header} pode ter no máximo {self.idempotency_max_length} caracteres."},
+                status=status.HTTP_400_BAD_REQUEST
+            ))
+
+        fingerprint = self.request_fingerprint(request)
+        entry = self.get_idempotency_backend().begin(request.user.pk, key, fingerprint, settings.IDEMPOTENCY_TTL)
+        if entry is None:
+            self.idempotency_key = key
+            return
+        if entry.fingerprint != fingerprint:
+            raise IdempotentReplay(Response(
+                {"error": f"{self.idempotency_header} já utilizada com outra requisição."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            ))
+        if entry.status_code is None:
+            raise IdempotentReplay(Response(
+                {"error": "Uma requisição com esta chave ainda está em processamento."},
+                status=status.HTTP_409_CONFLICT
+            ))
+        response = Response(json.loads(entry.body), status=entry.status_code)
+        response['Idempotent-Replayed'] = 'true'
+        raise IdempotentReplay(response)
+
+    def handle_exception(self, exc):
+        """
+        Devolve respostas armazenadas e libera a chave em erros não tratados.
+        """
+        if isinstance(exc, IdempotentReplay):
+            return exc.response
+        try:
+            return super().handle_exception(exc)
+        except Exception:
+            self.release_idempotency_key()
+            raise
+
+    def release_idempotency_key(self):
+        """
+        Libera a chave reservada por esta requisição, se houver.
+        """
+        if getattr(self, 'idempotency_key', None):
+            self.get_idempotency_backend().release(self.request.user.pk, self.idempotency_key)
+            self.idempotency_key = None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Armazena a resposta da requisição que reservou a chave.
+
+        Erros 5xx liberam a chave, para que o cliente possa repetir. Se a
+        transação da requisição (ATOMIC_REQUESTS) foi marcada para
+        rollback, a reserva é desfeita junto com ela e nada é armazenado.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if not getattr(self, 'idempotency_key', None):
+            return response
+        if connection.in_atomic_block and transaction.get_rollback():
+            self.idempotency_key = None
+            return response
+        if response.status_code >= 500 or not isinstance(response, Response):
+            self.release_idempotency_key()
+            return response
+        self.get_idempotency_backend().complete(
+            request.user.pk,
+            self.idempotency_key,
+            response.status_code,
+            json.dumps(response.data, cls=DjangoJSONEncoder, ensure_ascii=False)
+        )
+        self.idempotency_key = None
+        return response
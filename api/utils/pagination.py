@@ -0,0 +1,280 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por chave (keyset/cursor) sobre uma ordenação composta.
+
+    O cursor guarda os valores de todos os campos de ordenação do último
+    registro da página, e a próxima página é obtida com um filtro de
+    comparação sobre esses campos em vez de OFFSET. Não há COUNT(*), e o
+    custo de uma página profunda é o mesmo da primeira, desde que exista
+    um índice com a mesma ordenação.
+
+    Diferente do CursorPagination do DRF, que usa apenas o primeiro campo
+    como posição e um OFFSET para desempatar, aqui o desempate também é
+    feito por chave, o que mantém o custo constante mesmo com muitos
+    registros na mesma data.
+
+    Attributes:
+        ordering: Campos de ordenação; o último deve ser único.
+        page_size: Tamanho padrão da página.
+        max_page_size: Limite superior aceito em page_size_query_param.
+        page_size_query_param: Parâmetro de query para o tamanho da página.
+        cursor_query_param: Parâmetro de query com o cursor codificado.
+    """
+    ordering = ('-pk',)
+    page_size = 10
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Retorna a página do queryset indicada pelo cursor da requisição.
+
+        Args:
+            queryset: QuerySet a ser paginado.
+            request: Requisição com os parâmetros de cursor e tamanho.
+            view: View que está paginando.
+
+        Returns:
+            Lista com os registros da página.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.current_size = self.get_page_size(request)
+        position, self.reverse = self.decode_cursor(request)
+
+        ordering = self.get_ordering(self.reverse)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            position = self.parse_position(queryset.model, position)
+            queryset = queryset.filter(self.build_keyset_filter(position, self.reverse))
+
+        results = list(queryset[:self.current_size + 1])
+        has_more = len(results) > self.current_size
+        self.page = results[:self.current_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_previous = has_more
+            self.has_next = position is not None
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        """
+        Monta a resposta paginada sem contagem total.
+
+        Args:
+            data: Dados serializados da página.
+
+        Returns:
+            Response com next, previous e results.
+        """
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        """
+        Descreve a resposta paginada para o drf-spectacular.
+
+        Args:
+            schema: Schema dos itens da página.
+
+        Returns:
+            Dicionário com o schema OpenAPI da resposta.
+        """
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        """
+        Retorna o tamanho da página limitado por max_page_size.
+
+        Args:
+            request: Requisição com o parâmetro opcional de tamanho.
+
+        Returns:
+            Tamanho da página.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, reverse=False):
+        """
+        Retorna a ordenação aplicada ao queryset.
+
+        Args:
+            reverse: Se True, inverte a direção de todos os campos.
+
+        Returns:
+            Tupla de campos de ordenação no formato do order_by.
+        """
+        if not reverse:
+            return tuple(self.ordering)
+        return tuple(
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        )
+
+    def build_keyset_filter(self, position, reverse=False):
+        """
+        Monta o filtro que seleciona os registros após a posição do cursor.
+
+        Para a ordenação (a, b, c) gera a >= x AND ((a > x) OR (a = x AND
+        b > y) OR (a = x AND b = y AND c > z)), respeitando a direção de
+        cada campo. O limite a >= x, redundante para o resultado, é o que
+        o PostgreSQL usa como faixa do índice: sem ele, a disjunção só
+        filtra o índice lido desde o início, e o custo volta a crescer
+        com a profundidade da página.
+
+        Args:
+            position: Valores dos campos de ordenação do último registro.
+            reverse: Se True, seleciona os registros antes da posição.
+
+        Returns:
+            Objeto Q com o filtro de keyset.
+        """
+        ordering = self.get_ordering(reverse)
+        first = ordering[0]
+        bound_lookup = 'lte' if first.startswith('-') else 'gte'
+        bound = Q(**{f"{first.lstrip('-')}__{bound_lookup}": position[0]})
+        keyset = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return bound & keyset
+
+    def parse_position(self, model, position):
+        """
+        Converte os valores do cursor para os tipos dos campos do modelo.
+
+        Args:
+            model: Modelo do queryset paginado.
+            position: Valores lidos do cursor.
+
+        Returns:
+            Lista de valores convertidos.
+
+        Raises:
+            NotFound: Se algum valor for nulo ou não for válido para o campo.
+        """
+        values = []
+        try:
+            for field, value in zip(self.ordering, position):
+                name = field.lstrip('-')
+                model_field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+                value = model_field.to_python(value)
+                if value is None:
+                    raise ValueError(name)
+                values.append(value)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_position(self, instance):
+        """
+        Extrai a posição de um registro para o cursor.
+
+        Args:
+            instance: Registro da página (instância ou linha de values()).
+
+        Returns:
+            Lista com os valores dos campos de ordenação em formato JSON.
+        """
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return values
+
+    def encode_cursor(self, position, reverse):
+        """
+        Gera a URL com o cursor codificado.
+
+        Args:
+            position: Valores dos campos de ordenação.
+            reverse: Se o cursor aponta para a página anterior.
+
+        Returns:
+            URL absoluta com o parâmetro de cursor.
+        """
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """
+        Lê o cursor da requisição.
+
+        Args:
+            request: Requisição com o parâmetro de cursor.
+
+        Returns:
+            Tupla (posição ou None, reverse).
+
+        Raises:
+            NotFound: Se o cursor estiver malformado.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position = payload['p']
+            reverse = bool(int(payload.get('r', 0)))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_next_link(self):
+        """
+        Retorna a URL da próxima página ou None.
+        """
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        """
+        Retorna a URL da página anterior ou None.
+        """
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
@@ -0,0 +1,133 @@
+import json
+import logging
+import random
+
+from django.conf import settings
+from rest_framework.response import Response
+
+
+class PayloadLogger:
+    """
+    Log amostrado e limitado de payloads de resposta.
+
+    Desativado por padrão. Com PAYLOAD_LOG_SAMPLE_RATE entre 0 e 1,
+    apenas essa fração das chamadas é registrada, e o JSON é montado
+    somente quando a amostra é sorteada, cortado em PAYLOAD_LOG_MAX_BYTES.
+
+    Attributes:
+        logger: Logger que recebe as mensagens em nível INFO.
+    """
+
+    def __init__(self, logger, sample_rate=None, max_bytes=None):
+        """
+        Prepara o logger com a amostragem e o limite de tamanho.
+
+        Args:
+            logger: Logger de destino.
+            sample_rate: Fração das chamadas registradas; usa
+                PAYLOAD_LOG_SAMPLE_RATE quando omitido.
+            max_bytes: Tamanho máximo do payload no log; usa
+                PAYLOAD_LOG_MAX_BYTES quando omitido.
+        """
+        self.logger = logger
+        self._sample_rate = sample_rate
+        self._max_bytes = max_bytes
+
+    @property
+    def sample_rate(self):
+        """
+        Fração das chamadas registradas (0 desativa, 1 registra todas).
+        """
+        if self._sample_rate is not None:
+            return self._sample_rate
+        return getattr(settings, 'PAYLOAD_LOG_SAMPLE_RATE', 0)
+
+    @property
+    def max_bytes(self):
+        """
+        Tamanho máximo, em bytes, do payload escrito no log.
+        """
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return getattr(settings, 'PAYLOAD_LOG_MAX_BYTES', 2048)
+
+    def sampled(self):
+        """
+        Sorteia se a chamada atual deve ser registrada.
+
+        Returns:
+            True quando a amostra é sorteada e o logger aceita INFO.
+        """
+        rate = self.sample_rate
+        if rate <= 0 or not self.logger.isEnabledFor(logging.INFO):
+            return False
+        return rate >= 1 or random.random() < rate
+
+    def truncate(self, text):
+        """
+        Corta o texto em max_bytes bytes (UTF-8).
+
+        Args:
+            text: Payload já em JSON.
+
+        Returns:
+            O texto, ou o início dele com a quantidade de bytes omitidos.
+        """
+        encoded = text.encode('utf-8')
+        if len(encoded) <= self.max_bytes:
+            return text
+        head = encoded[:self.max_bytes].decode('utf-8', errors='ignore')
+        return f"{head}... (+{len(encoded) - self.max_bytes} bytes)"
+
+    def log(self, label, payload):
+        """
+        Registra o payload se a amostra for sorteada.
+
+        Args:
+            label: Identificação da chamada (por exemplo, método e caminho).
+            payload: Dados serializáveis ou função que os retorna; a função
+                só é chamada quando a amostra é sorteada.
+
+        Returns:
+            True se o payload foi registrado.
+        """
+        if not self.sampled():
+            return False
+        data = payload() if callable(payload) else payload
+        text = json.dumps(data, ensure_ascii=False, default=str, separators=(',', ':'))
+        self.logger.info('%s %s', label, self.truncate(text))
+        return True
+
+
+class PayloadLoggingMixin:
+    """
+    Registra, por amostragem, o payload das respostas de sucesso da view.
+
+    Usa o logger do módulo da view. O payload registrado é o próprio
+    response.data, sem nova consulta nem nova serialização.
+    """
+
+    def get_payload_logger(self):
+        """
+        Retorna o logger de payloads da view.
+
+        Returns:
+            PayloadLogger sobre o logger do módulo da view.
+        """
+        return PayloadLogger(logging.getLogger(type(self).__module__))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Registra o payload da resposta quando a amostra é sorteada.
+
+        Args:
+            request: Requisição atendida.
+            response: Resposta da view.
+
+        Returns:
+            A resposta finalizada pelo DRF.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response) and response.data is not None and 200 <= response.status_code < 300:
+            self.get_payload_logger().log(f"{request.method} {request.path}", lambda: response.data)
+        return response
@@ -0,0 +1,41 @@
+class MemoizedRepresentationMixin:
+    """
+    Memoriza a representação de um serializer aninhado por resposta.
+
+    Quando o contexto do serializer raiz traz um dicionário em
+    'representation_cache', cada objeto é serializado uma única vez e
+    as demais ocorrências na mesma resposta reutilizam o resultado. Sem
+    esse dicionário o comportamento é o do serializer original.
+    """
+    cache_context_key = 'representation_cache'
+
+    def memo_key(self, instance):
+        """
+        Retorna a chave de memorização de um objeto.
+
+        Args:
+            instance: Objeto serializado.
+
+        Returns:
+            Tupla com a classe do serializer, a pk e o updated_at, se houver.
+        """
+        return type(self), instance.pk, getattr(instance, 'updated_at', None)
+
+    def to_representation(self, instance):
+        """
+        Serializa o objeto ou reutiliza a representação já montada.
+
+        Args:
+            instance: Objeto serializado.
+
+        Returns:
+            Dicionário com a representação do objeto.
+        """
+        cache = self.context.get(self.cache_context_key)
+        if cache is None:
+            return super().to_representation(instance)
+        key = self.memo_key(instance)
+        data = cache.get(key)
+        if data is None:
+            data = cache[key] = super().to_representation(instance)
+        return data
@@ -0,0 +1,76 @@
+from django.db import models
+from django.utils import timezone
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    QuerySet com operações de exclusão lógica.
+    """
+
+    def alive(self):
+        """
+        Retorna apenas as linhas não excluídas.
+        """
+        return self.filter(deleted_at__isnull=True)
+
+    def deleted(self):
+        """
+        Retorna apenas as linhas excluídas logicamente.
+        """
+        return self.filter(deleted_at__isnull=False)
+
+    def soft_delete(self):
+        """
+        Marca as linhas como excluídas com um único UPDATE.
+
+        Returns:
+            Quantidade de linhas marcadas.
+        """
+        now = timezone.now()
+        return self.alive().update(deleted_at=now, updated_at=now)
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """
+    Manager padrão que esconde as linhas excluídas logicamente.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class SoftDeleteModel(models.Model):
+    """
+    Base de modelos com exclusão lógica.
+
+    A exclusão apenas preenche deleted_at, em uma única linha, e o
+    manager padrão (objects) passa a esconder a linha. As linhas
+    dependentes são removidas depois, em lotes, pelo PurgeService.
+    all_objects enxerga também as linhas excluídas; o _base_manager,
+    usado no acesso a chaves estrangeiras, continua sem filtro, de modo
+    que aluguéis antigos ainda leem o veículo e o cliente excluídos.
+
+    Attributes:
+        deleted_at: Momento da exclusão lógica (None se ativa).
+    """
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @property
+    def is_deleted(self):
+        """
+        Indica se a linha foi excluída logicamente.
+        """
+        return self.deleted_at is not None
+
+    def soft_delete(self):
+        """
+        Exclui a linha logicamente, atualizando também updated_at.
+        """
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at', 'updated_at'])
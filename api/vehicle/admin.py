@@ -1,4 +1,37 @@
 from django.contrib import admin
-from api.vehicle.models import Vehicle
+from api.vehicle.models import Vehicle, VehicleUnit
 
-admin.site.register(Vehicle)
\ No newline at end of file
+
+@admin.register(Vehicle)
+class VehicleAdmin(admin.ModelAdmin):
+    """
+    Administração dos veículos.
+
+    Um ajuste manual do estoque (quantity) soma a mesma variação à frota
+    (capacity), que é a base da conciliação do estoque: sem isso, o
+    reconcile_stock desfaria o ajuste. Em veículos controlados por
+    unidade, estoque e frota são recontados a partir das unidades e não
+    são editáveis.
+    """
+    list_display = ('brand', 'model', 'year', 'type_vehicle', 'quantity', 'capacity', 'is_available')
+    list_filter = ('type_vehicle', 'is_available', 'tracks_units')
+    search_fields = ('brand', 'model')
+
+    def get_readonly_fields(self, request, obj=None):
+        """
+        Bloqueia quantity e capacity dos veículos controlados por unidade.
+        """
+        if obj is not None and obj.tracks_units:
+            return ('quantity', 'capacity')
+        return ()
+
+    def save_model(self, request, obj, form, change):
+        """
+        Aplica à frota a variação manual do estoque antes de salvar.
+        """
+        if change and not obj.tracks_units and 'quantity' in form.changed_data and 'capacity' not in form.changed_data:
+            obj.capacity = max(obj.capacity + obj.quantity - form.initial['quantity'], 0)
+        super().save_model(request, obj, form, change)
+
+
+admin.site.register(VehicleUnit)
@@ -0,0 +1,31 @@
+from django_filters import rest_framework as filters
+from api.vehicle.models import TypeVehicle, Vehicle
+
+
+class VehicleFilter(filters.FilterSet):
+    """
+    Filtros do catálogo de veículos.
+
+    Marca e modelo são comparados sem diferenciar maiúsculas, sobre o
+    índice único veh_brand_model_ci_uniq. Os demais filtros acompanham os
+    índices compostos de Vehicle, que já terminam na ordenação do
+    catálogo (marca e id).
+
+    Attributes:
+        type_vehicle: Tipo do veículo (Carro ou Moto).
+        is_available: Disponibilidade para aluguel.
+        brand: Marca exata, sem diferenciar maiúsculas.
+        model: Modelo exato, sem diferenciar maiúsculas.
+        year_min: Ano mínimo (inclusive).
+        year_max: Ano máximo (inclusive).
+    """
+    type_vehicle = filters.ChoiceFilter(choices=TypeVehicle.choices)
+    is_available = filters.BooleanFilter()
+    brand = filters.CharFilter(lookup_expr='iexact')
+    model = filters.CharFilter(lookup_expr='iexact')
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
+
+    class Meta:
+        model = Vehicle
+        fields = ['type_vehicle', 'is_available', 'brand', 'model', 'year_min', 'year_max']
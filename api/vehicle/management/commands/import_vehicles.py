@@ -0,0 +1,42 @@
+import json
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from api.exceptions import ValidationError
+from api.vehicle.service import VehicleImportService
+
+
+class Command(BaseCommand):
+    """
+    Importa veículos de um arquivo CSV ou JSON (catálogo de fornecedor).
+
+    Uso: python manage.py import_vehicles catalogo.csv --on-conflict update
+    """
+    help = 'Importa veículos de um arquivo CSV ou JSON, deduplicando por marca e modelo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'json'], default=None)
+        parser.add_argument('--on-conflict', choices=['skip', 'update'], default='skip')
+        parser.add_argument('--chunk-size', type=int, default=VehicleImportService.chunk_size)
+
+    def handle(self, *args, **options):
+        service = VehicleImportService()
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        try:
+            with open(path, 'rb') as stream:
+                rows = service.read(stream, file_format)
+            report = service.import_rows(rows, on_conflict=options['on_conflict'], chunk_size=options['chunk_size'])
+        except OSError as e:
+            raise CommandError(f'Não foi possível ler o arquivo: {e}')
+        except ValidationError as e:
+            raise CommandError(str(e.detail))
+
+        for row in report:
+            if 'error' in row:
+                self.stderr.write(f"linha {row['index']}: {row['status']} {json.dumps(row['error'], ensure_ascii=False)}")
+        summary = Counter(row['status'] for row in report)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(report)} linhas: " + ', '.join(f'{status} {total}' for status, total in sorted(summary.items()))
+        ))
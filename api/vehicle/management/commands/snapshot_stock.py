@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from api.vehicle.service import StockLedgerService
+
+
+class Command(BaseCommand):
+    """
+    Fotografa o estoque de todos os veículos.
+
+    Deve ser agendado (cron), por exemplo diariamente, para que as
+    consultas de estoque somem apenas os movimentos desde a última
+    fotografia.
+    Uso: python manage.py snapshot_stock
+    """
+    help = 'Grava uma fotografia do estoque da frota para o razão de movimentos.'
+
+    def handle(self, *args, **options):
+        snapshot = StockLedgerService().take_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f'Fotografia {snapshot.pk} gravada (até o movimento {snapshot.last_movement_id}).'
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:35
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicle', '0002_vehicle_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['brand', 'id'], name='veh_brand_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['type_vehicle', 'brand', 'id'], name='veh_type_brand_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['is_available', 'brand', 'id'], name='veh_available_brand_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['type_vehicle', 'is_available', 'brand', 'id'], name='veh_type_available_brand_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(django.db.models.functions.text.Upper('brand'), django.db.models.functions.text.Upper('model'), name='veh_upper_brand_model_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['year'], name='veh_year_idx'),
+        ),
+    ]
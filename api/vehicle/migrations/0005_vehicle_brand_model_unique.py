@@ -0,0 +1,78 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+MERGE_DUPLICATES = r"""
+    SET CONSTRAINTS ALL IMMEDIATE;
+
+    UPDATE vehicle_vehicle
+    SET brand = regexp_replace(btrim(brand), '\s+', ' ', 'g'),
+        model = regexp_replace(btrim(model), '\s+', ' ', 'g')
+    WHERE brand <> regexp_replace(btrim(brand), '\s+', ' ', 'g')
+       OR model <> regexp_replace(btrim(model), '\s+', ' ', 'g');
+
+    CREATE TEMPORARY TABLE vehicle_duplicate AS
+    SELECT id, keeper_id
+    FROM (
+        SELECT id, first_value(id) OVER (
+            PARTITION BY UPPER(brand), UPPER(model) ORDER BY updated_at DESC, id
+        ) AS keeper_id
+        FROM vehicle_vehicle
+    ) AS ranked
+    WHERE id <> keeper_id;
+
+    UPDATE vehicle_vehicle AS keeper
+    SET quantity = keeper.quantity + merged.quantity,
+        is_available = keeper.quantity + merged.quantity > 0
+    FROM (
+        SELECT duplicate.keeper_id, SUM(vehicle.quantity) AS quantity
+        FROM vehicle_duplicate AS duplicate
+        JOIN vehicle_vehicle AS vehicle ON vehicle.id = duplicate.id
+        GROUP BY duplicate.keeper_id
+    ) AS merged
+    WHERE keeper.id = merged.keeper_id;
+
+    UPDATE rent_rental AS rental SET vehicle_id = duplicate.keeper_id
+    FROM vehicle_duplicate AS duplicate WHERE rental.vehicle_id = duplicate.id;
+
+    UPDATE rent_archivedrental AS rental SET vehicle_id = duplicate.keeper_id
+    FROM vehicle_duplicate AS duplicate WHERE rental.vehicle_id = duplicate.id;
+
+    INSERT INTO rent_vehicleoccupancy (vehicle_id, day, units)
+    SELECT duplicate.keeper_id, occupancy.day, SUM(occupancy.units)
+    FROM rent_vehicleoccupancy AS occupancy
+    JOIN vehicle_duplicate AS duplicate ON duplicate.id = occupancy.vehicle_id
+    GROUP BY duplicate.keeper_id, occupancy.day
+    ON CONFLICT (vehicle_id, day) DO UPDATE SET units = rent_vehicleoccupancy.units + EXCLUDED.units;
+
+    DELETE FROM rent_vehicleoccupancy AS occupancy
+    USING vehicle_duplicate AS duplicate WHERE occupancy.vehicle_id = duplicate.id;
+
+    DELETE FROM vehicle_vehicle AS vehicle
+    USING vehicle_duplicate AS duplicate WHERE vehicle.id = duplicate.id;
+
+    DROP TABLE vehicle_duplicate;
+
+    SET CONSTRAINTS ALL DEFERRED;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicle', '0004_vehicle_search_vector'),
+        ('rent', '0004_archived_rental'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=MERGE_DUPLICATES, reverse_sql=migrations.RunSQL.noop),
+        migrations.RemoveIndex(
+            model_name='vehicle',
+            name='veh_upper_brand_model_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='vehicle',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('brand'), django.db.models.functions.text.Upper('model'), name='veh_brand_model_ci_uniq'),
+        ),
+    ]
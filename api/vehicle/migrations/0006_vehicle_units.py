@@ -0,0 +1,37 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:55
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicle', '0005_vehicle_brand_model_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='tracks_units',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='VehicleUnit',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('plate', models.CharField(help_text='Placa da unidade', max_length=10, unique=True)),
+                ('is_available', models.BooleanField(default=True, help_text='Indica se a unidade está livre')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('vehicle', models.ForeignKey(help_text='Modelo da unidade', on_delete=django.db.models.deletion.CASCADE, related_name='units', to='vehicle.vehicle')),
+            ],
+            options={
+                'verbose_name': 'Unidade',
+                'verbose_name_plural': 'Unidades',
+                'ordering': ['plate'],
+                'indexes': [models.Index(condition=models.Q(('is_available', True)), fields=['vehicle'], name='veh_unit_free_idx')],
+            },
+        ),
+    ]
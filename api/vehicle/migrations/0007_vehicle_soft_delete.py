@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:02
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicle', '0006_vehicle_units'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='vehicle',
+            name='veh_brand_model_ci_uniq',
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='veh_deleted_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='vehicle',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('brand'), django.db.models.functions.text.Upper('model'), condition=models.Q(('deleted_at__isnull', True)), name='veh_brand_model_ci_uniq'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:21
+
+from django.db import migrations, models
+
+FILL_CAPACITY = """
+    UPDATE vehicle_vehicle AS vehicle
+    SET capacity = CASE
+        WHEN vehicle.tracks_units THEN (
+            SELECT COUNT(*) FROM vehicle_vehicleunit AS unit WHERE unit.vehicle_id = vehicle.id
+        )
+        ELSE vehicle.quantity + (
+            SELECT COUNT(*) FROM rent_rental AS rental
+            WHERE rental.vehicle_id = vehicle.id AND NOT rental.returned AND rental.deleted_at IS NULL
+        )
+    END
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicle', '0007_vehicle_soft_delete'),
+        ('rent', '0006_rental_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='capacity',
+            field=models.PositiveIntegerField(default=0, help_text='Unidades da frota, disponíveis ou alugadas'),
+        ),
+        migrations.RunSQL(FILL_CAPACITY, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+MOVEMENT_INSERT = """
+    INSERT INTO vehicle_stockmovement (vehicle_id, delta, reason, created_at)
+    SELECT {columns},
+           COALESCE(NULLIF(current_setting('easydrive.stock_reason', true), ''), 'adjust'), now()
+    FROM {rows}
+    WHERE {condition};
+"""
+
+LEDGER_SQL = f"""
+    CREATE OR REPLACE FUNCTION vehicle_stock_movement() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {MOVEMENT_INSERT.format(
+                columns='new_rows.id, new_rows.quantity',
+                rows='new_rows',
+                condition='new_rows.quantity <> 0',
+            )}
+        ELSE
+            {MOVEMENT_INSERT.format(
+                columns='new_rows.id, new_rows.quantity - old_rows.quantity',
+                rows='new_rows JOIN old_rows ON old_rows.id = new_rows.id',
+                condition='new_rows.quantity <> old_rows.quantity',
+            )}
+        END IF;
+        RETURN NULL;
+    END;
+    $$;
+
+    CREATE TRIGGER vehicle_vehicle_stock_insert AFTER INSERT ON vehicle_vehicle
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION vehicle_stock_movement();
+    CREATE TRIGGER vehicle_vehicle_stock_update AFTER UPDATE ON vehicle_vehicle
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION vehicle_stock_movement();
+
+    CREATE OR REPLACE FUNCTION vehicle_stock_movement_append_only() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        RAISE EXCEPTION 'vehicle_stockmovement aceita apenas inserções.';
+    END;
+    $$;
+
+    CREATE TRIGGER vehicle_stockmovement_append_only BEFORE UPDATE OR DELETE ON vehicle_stockmovement
+        FOR EACH STATEMENT EXECUTE FUNCTION vehicle_stock_movement_append_only();
+"""
+
+DROP_LEDGER_SQL = """
+    DROP TRIGGER IF EXISTS vehicle_vehicle_stock_insert ON vehicle_vehicle;
+    DROP TRIGGER IF EXISTS vehicle_vehicle_stock_update ON vehicle_vehicle;
+    DROP FUNCTION IF EXISTS vehicle_stock_movement();
+    DROP TRIGGER IF EXISTS vehicle_stockmovement_append_only ON vehicle_stockmovement;
+    DROP FUNCTION IF EXISTS vehicle_stock_movement_append_only();
+"""
+
+INITIAL_SNAPSHOT_SQL = """
+    WITH snapshot AS (
+        INSERT INTO vehicle_stocksnapshot (taken_at, last_movement_id) VALUES (now(), 0) RETURNING id
+    )
+    INSERT INTO vehicle_stocksnapshotitem (snapshot_id, vehicle_id, quantity)
+    SELECT snapshot.id, vehicle.id, vehicle.quantity
+    FROM snapshot CROSS JOIN vehicle_vehicle AS vehicle
+    WHERE vehicle.deleted_at IS NULL
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicle', '0008_vehicle_capacity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('taken_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('last_movement_id', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Fotografia do estoque',
+                'verbose_name_plural': 'Fotografias do estoque',
+                'ordering': ['-taken_at', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('reason', models.CharField(choices=[('rent_out', 'Aluguel'), ('return', 'Devolução'), ('adjust', 'Ajuste'), ('import', 'Importação')], help_text='Motivo do movimento', max_length=10)),
+                ('delta', models.IntegerField(help_text='Variação do estoque')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('vehicle', models.ForeignKey(db_constraint=False, db_index=False, help_text='Veículo movimentado', on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_movements', to='vehicle.vehicle')),
+            ],
+            options={
+                'verbose_name': 'Movimento de estoque',
+                'verbose_name_plural': 'Movimentos de estoque',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['vehicle', '-id'], name='veh_movement_vehicle_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshotItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField()),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='vehicle.stocksnapshot')),
+                ('vehicle', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='vehicle.vehicle')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('snapshot', 'vehicle'), name='veh_snapshot_item_uniq')],
+            },
+        ),
+        migrations.RunSQL(LEDGER_SQL, DROP_LEDGER_SQL),
+        migrations.RunSQL(INITIAL_SNAPSHOT_SQL, migrations.RunSQL.noop),
+    ]
@@ -1,5 +1,43 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
+from django.utils import timezone
 from uuid import uuid4
+from api.utils.soft_delete import SoftDeleteModel
+
+
+def vehicle_search_vector():
+    """
+    Vetor de busca textual de Vehicle.
+
+    Marca e modelo têm peso A e a descrição peso B, com a configuração
+    'simple' (sem stemming), adequada a nomes próprios e a buscas por
+    prefixo. O vetor é gravado na coluna gerada search_vector, de modo
+    que o ranking não recalcula to_tsvector para cada linha encontrada.
+
+    Returns:
+        SearchVector sobre marca, modelo e descrição.
+    """
+    return (
+        SearchVector('brand', 'model', weight='A', config='simple')
+        + SearchVector('description', weight='B', config='simple')
+    )
+
+
+def collapse_spaces(value):
+    """
+    Remove espaços das pontas e troca sequências de espaços por um só.
+
+    Args:
+        value: Texto ou None.
+
+    Returns:
+        Texto com espaços simples (vazio para None).
+    """
+    if value is None:
+        return ''
+    return ' '.join(str(value).split())
 
 
 class TypeVehicle(models.TextChoices):
@@ -7,20 +45,197 @@ class TypeVehicle(models.TextChoices):
     MOTORCYCLE = 'Moto'
 
 
-class Vehicle(models.Model):
+class Vehicle(SoftDeleteModel):
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     brand = models.CharField(max_length=100)
     model = models.CharField(max_length=100)
     year = models.PositiveIntegerField()
     quantity = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField(
+        default=0, help_text="Unidades da frota, disponíveis ou alugadas")
     type_vehicle = models.CharField(
         max_length=10, choices=TypeVehicle.choices, default=TypeVehicle.CAR)
     description = models.TextField(blank=True)
     is_available = models.BooleanField(default=True)
+    tracks_units = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = models.GeneratedField(
+        expression=vehicle_search_vector(),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['brand', 'id'], name='veh_brand_id_idx'),
+            models.Index(fields=['type_vehicle', 'brand', 'id'], name='veh_type_brand_idx'),
+            models.Index(fields=['is_available', 'brand', 'id'], name='veh_available_brand_idx'),
+            models.Index(fields=['type_vehicle', 'is_available', 'brand', 'id'], name='veh_type_available_brand_idx'),
+            models.Index(fields=['year'], name='veh_year_idx'),
+            GinIndex(fields=['search_vector'], name='veh_search_gin_idx'),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='veh_deleted_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                Upper('brand'),
+                Upper('model'),
+                condition=models.Q(deleted_at__isnull=True),
+                name='veh_brand_model_ci_uniq'
+            ),
+        ]
+
+    def clean(self):
+        self.brand = collapse_spaces(self.brand)
+        self.model = collapse_spaces(self.model)
 
     def save(self, *args, **kwargs):
+        self.brand = collapse_spaces(self.brand)
+        self.model = collapse_spaces(self.model)
+        if self._state.adding and not self.capacity:
+            self.capacity = self.quantity
         self.is_available = self.quantity > 0
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.brand} - {self.model} - {self.year}"
+
+
+class VehicleUnit(models.Model):
+    """
+    Unidade física (carro ou moto com placa) de um modelo de veículo.
+
+    Veículos com tracks_units ativo reservam uma unidade livre por
+    aluguel com SELECT ... FOR UPDATE SKIP LOCKED, de modo que reservas
+    simultâneas do mesmo modelo bloqueiam linhas diferentes. Nesses
+    veículos, Vehicle.quantity é o agregado das unidades livres.
+
+    Attributes:
+        id: Identificador único UUID da unidade.
+        vehicle: Modelo ao qual a unidade pertence.
+        plate: Placa da unidade, única na frota.
+        is_available: Indica se a unidade está livre para aluguel.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    vehicle = models.ForeignKey(
+        Vehicle,
+        on_delete=models.CASCADE,
+        related_name='units',
+        help_text="Modelo da unidade"
+    )
+    plate = models.CharField(max_length=10, unique=True, help_text="Placa da unidade")
+    is_available = models.BooleanField(default=True, help_text="Indica se a unidade está livre")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['plate']
+        indexes = [
+            models.Index(
+                fields=['vehicle'],
+                condition=models.Q(is_available=True),
+                name='veh_unit_free_idx'
+            ),
+        ]
+        verbose_name = 'Unidade'
+        verbose_name_plural = 'Unidades'
+
+    def __str__(self):
+        return f"{self.vehicle} - {self.plate}"
+
+
+class MovementReason(models.TextChoices):
+    RENT_OUT = 'rent_out', 'Aluguel'
+    RETURN = 'return', 'Devolução'
+    ADJUST = 'adjust', 'Ajuste'
+    IMPORT = 'import', 'Importação'
+
+
+class StockMovement(models.Model):
+    """
+    Movimento do estoque (Vehicle.quantity), somente inserção.
+
+    As linhas são gravadas pelos triggers de vehicle_vehicle (migração
+    vehicle.0009) a cada INSERT ou UPDATE que altera quantity, com o
+    motivo definido pela transação (StockLedgerService.reason) ou
+    'adjust'. UPDATE e DELETE na tabela são rejeitados pelo banco, e a
+    referência ao veículo não tem restrição de chave estrangeira, para
+    que o histórico sobreviva à remoção do veículo.
+
+    Attributes:
+        vehicle: Veículo movimentado.
+        reason: Motivo do movimento.
+        delta: Variação do estoque (negativa em saídas).
+        created_at: Início da transação que gerou o movimento.
+    """
+    id = models.BigAutoField(primary_key=True)
+    vehicle = models.ForeignKey(
+        Vehicle,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='stock_movements',
+        help_text="Veículo movimentado"
+    )
+    reason = models.CharField(max_length=10, choices=MovementReason.choices, help_text="Motivo do movimento")
+    delta = models.IntegerField(help_text="Variação do estoque")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['vehicle', '-id'], name='veh_movement_vehicle_idx'),
+        ]
+        verbose_name = 'Movimento de estoque'
+        verbose_name_plural = 'Movimentos de estoque'
+
+    def __str__(self):
+        return f"{self.vehicle_id} {self.delta:+d} ({self.reason})"
+
+
+class StockSnapshot(models.Model):
+    """
+    Fotografia do estoque de toda a frota em um momento.
+
+    O estoque atual ou em uma data é o da fotografia mais recente até a
+    data somado aos movimentos posteriores a last_movement_id, de modo
+    que a consulta lê no máximo os movimentos desde a última fotografia.
+
+    Attributes:
+        taken_at: Momento da fotografia.
+        last_movement_id: Último movimento incluído na fotografia.
+    """
+    id = models.BigAutoField(primary_key=True)
+    taken_at = models.DateTimeField(default=timezone.now, db_index=True)
+    last_movement_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-taken_at', '-id']
+        verbose_name = 'Fotografia do estoque'
+        verbose_name_plural = 'Fotografias do estoque'
+
+    def __str__(self):
+        return f"{self.taken_at:%d-%m-%Y %H:%M} (até o movimento {self.last_movement_id})"
+
+
+class StockSnapshotItem(models.Model):
+    """
+    Estoque de um veículo em uma fotografia.
+    """
+    snapshot = models.ForeignKey(StockSnapshot, on_delete=models.CASCADE, related_name='items')
+    vehicle = models.ForeignKey(
+        Vehicle,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='+',
+    )
+    quantity = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['snapshot', 'vehicle'], name='veh_snapshot_item_uniq'),
+        ]
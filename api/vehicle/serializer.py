@@ -1,12 +1,71 @@
 from rest_framework import serializers
-from api.vehicle.models import TypeVehicle, Vehicle
+from api.utils.serializer import MemoizedRepresentationMixin
+from api.vehicle.models import StockMovement, TypeVehicle, Vehicle, VehicleUnit
 
-class VehicleSerializer(serializers.ModelSerializer):
+class VehicleSerializer(MemoizedRepresentationMixin, serializers.ModelSerializer):
     type_vehicle = serializers.ChoiceField(
         choices=TypeVehicle.choices, default=TypeVehicle.CAR)
 
     class Meta:
         model = Vehicle
         fields = ['id', 'brand', 'model', 'year', 'quantity',
-                  'type_vehicle', 'description', 'is_available']
-        extra_kwargs = {'is_available': {'read_only': True}}
\ No newline at end of file
+                  'type_vehicle', 'description', 'is_available', 'tracks_units']
+        extra_kwargs = {'is_available': {'read_only': True}, 'tracks_units': {'read_only': True}}
+
+class VehicleImportRowSerializer(serializers.Serializer):
+    """
+    Serializer para uma linha da importação de veículos.
+
+    Valida apenas o formato da linha, sem consultar o banco. A
+    deduplicação contra a frota é feita por VehicleImportService
+    para todo o lote de uma só vez.
+    """
+    brand = serializers.CharField(max_length=100)
+    model = serializers.CharField(max_length=100)
+    year = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=0, default=0)
+    type_vehicle = serializers.ChoiceField(choices=TypeVehicle.choices, default=TypeVehicle.CAR)
+    description = serializers.CharField(allow_blank=True, default='')
+
+
+class VehicleUnitSerializer(serializers.ModelSerializer):
+    """
+    Serializer de leitura das unidades físicas de um veículo.
+    """
+
+    class Meta:
+        model = VehicleUnit
+        fields = ['id', 'plate', 'is_available', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+
+class VehicleUnitCreateSerializer(serializers.Serializer):
+    """
+    Serializer para o cadastro de unidades de um veículo.
+    """
+    plates = serializers.ListField(
+        child=serializers.CharField(max_length=10),
+        allow_empty=False,
+        max_length=1000,
+    )
+
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    """
+    Serializer de leitura dos movimentos de estoque de um veículo.
+    """
+
+    class Meta:
+        model = StockMovement
+        fields = ['id', 'reason', 'delta', 'created_at']
+        read_only_fields = fields
+
+
+class VehicleStockQuerySerializer(serializers.Serializer):
+    """
+    Serializer para os parâmetros da consulta de estoque em uma data.
+
+    Attributes:
+        date: Dia consultado (opcional); o estoque é o do fim do dia.
+    """
+    date = serializers.DateField(required=False)
@@ -0,0 +1,489 @@
+import csv
+import io
+import json
+import re
+from contextlib import contextmanager
+from uuid import uuid4
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection, transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Upper
+from django.utils import timezone
+from api.exceptions import ValidationError
+from api.vehicle.models import (
+    MovementReason, StockMovement, StockSnapshot, StockSnapshotItem, Vehicle, VehicleUnit, collapse_spaces,
+)
+from api.vehicle.serializer import VehicleImportRowSerializer
+from api.vehicle.types import VehicleImportRowType
+
+
+def normalize_name(value):
+    """
+    Normaliza marca ou modelo: minúsculas e espaços simples.
+
+    Args:
+        value: Texto informado ou None.
+
+    Returns:
+        Texto normalizado (vazio para None).
+    """
+    return collapse_spaces(value).lower()
+
+
+class VehicleSearchService:
+    """
+    Busca textual no catálogo de veículos.
+
+    Cada palavra do termo vira um prefixo (palavra:*) e todas precisam
+    aparecer em marca, modelo ou descrição, o que cobre nomes parciais
+    como "toy cor" para "Toyota Corolla". O filtro usa o índice GIN
+    veh_search_gin_idx sobre a coluna gerada search_vector, e os
+    resultados são ordenados por relevância (ts_rank, com marca e
+    modelo pesando mais que a descrição).
+
+    Attributes:
+        max_terms: Quantidade máxima de palavras consideradas no termo.
+        word_pattern: Expressão que extrai as palavras do termo.
+    """
+    max_terms = 8
+    word_pattern = re.compile(r'\w+')
+
+    def parse(self, text):
+        """
+        Converte o termo digitado em uma consulta de prefixos.
+
+        Args:
+            text: Termo de busca livre.
+
+        Returns:
+            SearchQuery com as palavras do termo.
+
+        Raises:
+            ValidationError: Se o termo não tiver nenhuma palavra.
+        """
+        words = self.word_pattern.findall((text or '').lower())[:self.max_terms]
+        if not words:
+            raise ValidationError('Informe o termo de busca.')
+        return SearchQuery(
+            ' & '.join(f'{word}:*' for word in words),
+            search_type='raw',
+            config='simple'
+        )
+
+    def search(self, queryset, text):
+        """
+        Filtra e ordena os veículos pelo termo de busca.
+
+        Args:
+            queryset: QuerySet de Vehicle, já com os demais filtros.
+            text: Termo de busca livre.
+
+        Returns:
+            QuerySet anotado com 'rank', do mais relevante ao menos.
+
+        Raises:
+            ValidationError: Se o termo não tiver nenhuma palavra.
+        """
+        query = self.parse(text)
+        return queryset.filter(
+            search_vector=query,
+        ).annotate(
+            rank=SearchRank(F('search_vector'), query),
+        ).order_by('-rank', 'brand', 'id')
+
+
+class VehicleImportService:
+    """
+    Importação em massa de veículos (CSV ou JSON).
+
+    Cada linha é validada e tem marca e modelo normalizados. Linhas
+    repetidas no próprio arquivo são descartadas, e as demais são
+    gravadas em blocos com um único INSERT ... ON CONFLICT por bloco,
+    resolvido contra a restrição única veh_brand_model_ci_uniq (marca e
+    modelo sem diferenciar maiúsculas). Não há consulta por linha.
+
+    Em conflito, on_conflict='skip' mantém o veículo existente e
+    on_conflict='update' atualiza ano, tipo e descrição. O estoque de
+    veículos existentes nunca é alterado pela importação, já que parte
+    dele pode estar alugada.
+
+    O relatório tem uma entrada por linha, na ordem recebida, com o
+    status created, updated, skipped, duplicate ou invalid.
+
+    Attributes:
+        chunk_size: Quantidade padrão de linhas gravadas por instrução.
+        conflict_actions: Cláusula ON CONFLICT de cada modo.
+    """
+    chunk_size = 1000
+
+    conflict_actions = {
+        'skip': 'DO NOTHING',
+        'update': """
+            DO UPDATE SET year = EXCLUDED.year,
+                type_vehicle = EXCLUDED.type_vehicle,
+                description = EXCLUDED.description,
+                updated_at = EXCLUDED.updated_at
+        """,
+    }
+
+    upsert_sql = """
+        INSERT INTO {table} (id, brand, model, year, quantity, capacity, type_vehicle,
+                             description, is_available, tracks_units, updated_at)
+        SELECT item.id, item.brand, item.model, item.year, item.quantity, item.quantity, item.type_vehicle,
+               item.description, item.quantity > 0, false, %s
+        FROM unnest(%s::uuid[], %s::text[], %s::text[], %s::integer[], %s::integer[],
+                    %s::text[], %s::text[])
+            AS item(id, brand, model, year, quantity, type_vehicle, description)
+        ON CONFLICT ((UPPER(brand)), (UPPER(model))) WHERE deleted_at IS NULL {action}
+        RETURNING id, brand, model, (xmax = 0) AS inserted
+    """
+
+    def read(self, stream, file_format):
+        """
+        Lê as linhas de um arquivo CSV (com cabeçalho) ou JSON (lista).
+
+        Args:
+            stream: Arquivo aberto em modo binário ou texto.
+            file_format: 'csv' ou 'json'.
+
+        Returns:
+            Lista de dicionários, um por linha.
+
+        Raises:
+            ValidationError: Se o formato for desconhecido ou o conteúdo inválido.
+        """
+        content = stream.read()
+        if isinstance(content, bytes):
+            try:
+                content = content.decode('utf-8-sig')
+            except UnicodeDecodeError:
+                raise ValidationError('O arquivo deve estar em UTF-8.')
+        if file_format == 'csv':
+            return list(csv.DictReader(io.StringIO(content)))
+        if file_format == 'json':
+            try:
+                rows = json.loads(content)
+            except ValueError:
+                raise ValidationError('JSON inválido.')
+            if not isinstance(rows, list):
+                raise ValidationError('O JSON deve ser uma lista de veículos.')
+            return rows
+        raise ValidationError('Formato inválido. Use csv ou json.')
+
+    def import_rows(self, rows, on_conflict='skip', chunk_size=None) -> list[VehicleImportRowType]:
+        """
+        Importa as linhas e retorna o relatório por linha.
+
+        Args:
+            rows: Linhas com brand, model, year e, opcionalmente,
+                quantity, type_vehicle e description.
+            on_conflict: 'skip' ou 'update'.
+            chunk_size: Linhas por instrução (padrão: chunk_size).
+
+        Returns:
+            Relatório alinhado com rows.
+
+        Raises:
+            ValidationError: Se on_conflict for inválido.
+        """
+        if on_conflict not in self.conflict_actions:
+            raise ValidationError('on_conflict deve ser skip ou update.')
+        chunk_size = chunk_size or self.chunk_size
+
+        report: list[VehicleImportRowType] = [None] * len(rows)
+        pending = {}
+        for index, row in enumerate(rows):
+            serializer = VehicleImportRowSerializer(data=row if isinstance(row, dict) else {})
+            if not serializer.is_valid():
+                report[index] = {'index': index, 'status': 'invalid', 'error': serializer.errors}
+                continue
+            item = dict(serializer.validated_data)
+            item['brand'] = normalize_name(item['brand'])
+            item['model'] = normalize_name(item['model'])
+            if not item['brand'] or not item['model']:
+                report[index] = {'index': index, 'status': 'invalid', 'error': 'Marca e modelo são obrigatórios.'}
+                continue
+            key = (item['brand'], item['model'])
+            if key in pending:
+                report[index] = {'index': index, 'status': 'duplicate', 'error': f"Repete a linha {pending[key][0]}."}
+                continue
+            pending[key] = (index, item)
+
+        items = list(pending.values())
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            for index, entry in zip((index for index, _ in chunk), self.upsert(chunk, on_conflict)):
+                report[index] = {'index': index, **entry}
+        return report
+
+    def upsert(self, chunk, on_conflict):
+        """
+        Grava um bloco de linhas com uma única instrução.
+
+        Args:
+            chunk: Lista de (posição, item normalizado).
+            on_conflict: 'skip' ou 'update'.
+
+        Returns:
+            Lista alinhada com chunk, com status e id de cada linha.
+        """
+        items = [item for _, item in chunk]
+        ids = [uuid4() for _ in items]
+        sql = self.upsert_sql.format(table=Vehicle._meta.db_table, action=self.conflict_actions[on_conflict])
+        with StockLedgerService().reason(MovementReason.IMPORT), connection.cursor() as cursor:
+            cursor.execute(sql, [
+                timezone.now(),
+                ids,
+                [item['brand'] for item in items],
+                [item['model'] for item in items],
+                [item['year'] for item in items],
+                [item['quantity'] for item in items],
+                [item['type_vehicle'] for item in items],
+                [item['description'] for item in items],
+            ])
+            written = {
+                (normalize_name(brand), normalize_name(model)): (str(pk), inserted)
+                for pk, brand, model, inserted in cursor.fetchall()
+            }
+
+        missing = [(item['brand'], item['model']) for item in items if (item['brand'], item['model']) not in written]
+        if missing:
+            existing = Vehicle.objects.annotate(
+                brand_key=Upper('brand'),
+                model_key=Upper('model'),
+            ).filter(
+                brand_key__in={brand.upper() for brand, _ in missing},
+                model_key__in={model.upper() for _, model in missing},
+            ).values_list('pk', 'brand', 'model')
+            for pk, brand, model in existing:
+                written.setdefault((normalize_name(brand), normalize_name(model)), (str(pk), None))
+
+        results = []
+        for item in items:
+            pk, inserted = written.get((item['brand'], item['model']), (None, None))
+            if inserted is None:
+                results.append({'status': 'skipped', 'id': pk} if pk else {'status': 'skipped'})
+            else:
+                results.append({'status': 'created' if inserted else 'updated', 'id': pk})
+        return results
+
+
+class VehicleUnitService:
+    """
+    Cadastro das unidades físicas (placas) de um modelo de veículo.
+
+    Ao receber unidades, o veículo passa a ser controlado por unidade
+    (tracks_units) e seu quantity vira o agregado das unidades livres,
+    recontado pelo RentService a cada reserva e devolução.
+    """
+
+    def normalize_plate(self, value):
+        """
+        Normaliza uma placa: maiúsculas, sem espaços nem hífens.
+
+        Args:
+            value: Placa informada.
+
+        Returns:
+            Placa normalizada.
+        """
+        return re.sub(r'[\s-]', '', str(value)).upper()
+
+    def add_units(self, vehicle, plates) -> list[VehicleUnit]:
+        """
+        Cadastra unidades de um veículo e atualiza o estoque agregado.
+
+        Args:
+            vehicle: Instância de Vehicle.
+            plates: Lista de placas.
+
+        Returns:
+            Lista de VehicleUnit criadas.
+
+        Raises:
+            ValidationError: Se houver placas repetidas ou já cadastradas,
+                ou aluguéis em aberto do veículo sem unidade associada,
+                que devolveriam ao agregado uma unidade que ele não conta.
+        """
+        plates = [self.normalize_plate(plate) for plate in plates]
+        if not all(plates):
+            raise ValidationError('Informe placas válidas.')
+        if len(set(plates)) != len(plates):
+            raise ValidationError('Há placas repetidas na lista.')
+
+        with transaction.atomic():
+            vehicle = Vehicle.objects.select_for_update().get(pk=vehicle.pk)
+            existing = list(VehicleUnit.objects.filter(plate__in=plates).values_list('plate', flat=True))
+            if existing:
+                raise ValidationError(f"Placas já cadastradas: {', '.join(sorted(existing))}.")
+            if vehicle.rentals.filter(returned=False, unit__isnull=True).exists():
+                raise ValidationError('Há aluguéis em aberto deste veículo sem unidade associada.')
+
+            units = VehicleUnit.objects.bulk_create([
+                VehicleUnit(vehicle=vehicle, plate=plate) for plate in plates
+            ])
+            Vehicle.objects.filter(pk=vehicle.pk).update(tracks_units=True)
+            self.refresh_quantities([vehicle.pk])
+        return units
+
+    def free_units(self):
+        """
+        Expressão com a quantidade de unidades livres do veículo (OuterRef('pk')).
+
+        Returns:
+            Expressão para update/annotate sobre Vehicle.
+        """
+        return Coalesce(
+            Subquery(
+                VehicleUnit.objects.filter(vehicle=OuterRef('pk'), is_available=True)
+                .values('vehicle').annotate(total=Count('pk')).values('total')
+            ),
+            Value(0),
+        )
+
+    def refresh_quantities(self, vehicle_ids=None):
+        """
+        Recalcula quantity, is_available e capacity a partir das unidades.
+
+        Usado pelo RentService após cada reserva por unidade e para
+        corrigir o agregado de veículos controlados por unidade; capacity
+        passa a ser o total de unidades cadastradas. Por ser uma
+        contagem, e não um incremento, uma atualização perdida ou
+        repetida não deixa o agregado divergente.
+
+        Args:
+            vehicle_ids: Veículos a recalcular (padrão: todos com tracks_units).
+
+        Returns:
+            Quantidade de veículos atualizados.
+        """
+        vehicles = Vehicle.objects.filter(tracks_units=True)
+        if vehicle_ids is not None:
+            vehicles = vehicles.filter(pk__in=vehicle_ids)
+        units = VehicleUnit.objects.filter(vehicle=OuterRef('pk'))
+        free_units = units.filter(is_available=True)
+        return vehicles.update(
+            quantity=self.free_units(),
+            capacity=Coalesce(
+                Subquery(units.values('vehicle').annotate(total=Count('pk')).values('total')),
+                Value(0),
+            ),
+            is_available=Exists(free_units),
+            updated_at=timezone.now(),
+        )
+
+
+class StockLedgerService:
+    """
+    Razão de movimentos do estoque e consultas de estoque em uma data.
+
+    Cada alteração de Vehicle.quantity gera um StockMovement pelos
+    triggers do banco, inclusive atualizações em lote, SQL direto e o
+    admin; o contador continua sendo o guardião contra overselling, e o
+    razão registra o porquê de cada variação. Fotografias periódicas
+    (take_snapshot) limitam a quantidade de movimentos somados em cada
+    consulta de estoque.
+    """
+
+    reason_setting = 'easydrive.stock_reason'
+
+    stock_sql = """
+        SELECT vehicle_id, SUM(quantity)
+        FROM (
+            SELECT vehicle_id, quantity FROM {item_table}
+            WHERE snapshot_id = %s {vehicle_filter}
+            UNION ALL
+            SELECT vehicle_id, delta FROM {movement_table}
+            WHERE id > %s AND created_at <= %s {vehicle_filter}
+        ) AS stock
+        GROUP BY vehicle_id
+    """
+
+    snapshot_sql = """
+        INSERT INTO {item_table} (snapshot_id, vehicle_id, quantity)
+        SELECT %s, id, quantity FROM {vehicle_table} WHERE deleted_at IS NULL
+    """
+
+    @contextmanager
+    def reason(self, reason):
+        """
+        Define o motivo dos movimentos gerados dentro do bloco.
+
+        O motivo fica em uma configuração local da transação, lida pelos
+        triggers, e é desfeito ao fim do bloco (ou com o savepoint, em
+        caso de erro).
+
+        Args:
+            reason: Valor de MovementReason.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SELECT set_config(%s, %s, true)', [self.reason_setting, reason])
+            yield
+            cursor.execute('SELECT set_config(%s, %s, true)', [self.reason_setting, ''])
+
+    def take_snapshot(self) -> StockSnapshot:
+        """
+        Fotografa o estoque atual de todos os veículos ativos.
+
+        A tabela de movimentos é bloqueada (EXCLUSIVE) durante a
+        fotografia: transações com movimentos em andamento terminam
+        antes e entram na fotografia, e as seguintes esperam e ficam
+        com ids acima de last_movement_id.
+
+        Returns:
+            StockSnapshot criada.
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {StockMovement._meta.db_table} IN EXCLUSIVE MODE')
+                cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {StockMovement._meta.db_table}')
+                last_movement_id = cursor.fetchone()[0]
+                snapshot = StockSnapshot.objects.create(last_movement_id=last_movement_id)
+                cursor.execute(self.snapshot_sql.format(
+                    item_table=StockSnapshotItem._meta.db_table,
+                    vehicle_table=Vehicle._meta.db_table,
+                ), [snapshot.pk])
+        return snapshot
+
+    def stock(self, vehicle_ids=None, at=None) -> dict:
+        """
+        Calcula o estoque a partir da última fotografia e dos movimentos seguintes.
+
+        Args:
+            vehicle_ids: Veículos consultados (padrão: todos).
+            at: Momento da consulta (padrão: agora).
+
+        Returns:
+            Dicionário id do veículo -> estoque no momento; veículos sem
+            fotografia nem movimentos até o momento ficam de fora.
+        """
+        at = at or timezone.now()
+        snapshot = StockSnapshot.objects.filter(taken_at__lte=at).only('id', 'last_movement_id').first()
+        snapshot_id, last_movement_id = (snapshot.pk, snapshot.last_movement_id) if snapshot else (None, 0)
+        vehicle_filter = ''
+        filter_params = []
+        if vehicle_ids is not None:
+            vehicle_filter = 'AND vehicle_id = ANY(%s::uuid[])'
+            filter_params = [list(vehicle_ids)]
+        sql = self.stock_sql.format(
+            item_table=StockSnapshotItem._meta.db_table,
+            movement_table=StockMovement._meta.db_table,
+            vehicle_filter=vehicle_filter,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [snapshot_id, *filter_params, last_movement_id, at, *filter_params])
+            return {vehicle_id: int(quantity) for vehicle_id, quantity in cursor.fetchall()}
+
+    def movements(self, vehicle):
+        """
+        Retorna os movimentos de um veículo, do mais recente ao mais antigo.
+
+        Args:
+            vehicle: Instância de Vehicle.
+
+        Returns:
+            QuerySet de StockMovement.
+        """
+        return StockMovement.objects.filter(vehicle=vehicle).order_by('-id')
@@ -1,3 +1,731 @@
+from django.db import DatabaseError, connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from datetime import date, timedelta
+from api.accounts.models import User
+from api.client.models import Client
+from api.vehicle.models import MovementReason, StockMovement, StockSnapshot, Vehicle, TypeVehicle
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from api.exceptions import ValidationError
+from api.rent.models import Rental
+from api.rent.service import RentService, StockReconciliationService
+from api.vehicle.service import StockLedgerService, VehicleImportService, VehicleUnitService
+from api.vehicle.views import VehicleMovementListView, VehicleStockView, VehicleUnitView
 
-# Create your tests here.
+
+class PayloadLoggingTestCase(TestCase):
+    """
+    Testes para o log amostrado de payloads das views de veículos.
+    """
+
+    def setUp(self):
+        """
+        Configura um usuário e alguns veículos.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        Vehicle.objects.bulk_create([
+            Vehicle(brand=f'marca{index}', model=f'modelo{index}', year=2024, quantity=2, type_vehicle=TypeVehicle.CAR)
+            for index in range(15)
+        ])
+
+    def _list(self):
+        """
+        Executa a listagem de veículos autenticada.
+        """
+        from api.vehicle.views import VehicleListView
+        request = self.factory.get('/api/v1/vehicle/list/')
+        force_authenticate(request, user=self.user)
+        response = VehicleListView.as_view()(request)
+        response.render()
+        return response
+
+    def test_list_disabled_by_default_queries_once(self):
+        """
+        Testa que, sem amostragem, a listagem não loga e não consulta o catálogo inteiro.
+        """
+        from django.test import override_settings
+        with override_settings(PAYLOAD_LOG_SAMPLE_RATE=0):
+            with self.assertNoLogs('api.vehicle.views', level='INFO'):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self._list()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(len(queries), 3)
+
+    def test_list_sampled_is_truncated(self):
+        """
+        Testa que a amostra registra a página da resposta cortada no limite.
+        """
+        from django.test import override_settings
+        with override_settings(PAYLOAD_LOG_SAMPLE_RATE=1, PAYLOAD_LOG_MAX_BYTES=64):
+            with self.assertLogs('api.vehicle.views', level='INFO') as logs:
+                with CaptureQueriesContext(connection) as queries:
+                    self._list()
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(len(logs.records), 1)
+        message = logs.records[0].getMessage()
+        self.assertTrue(message.startswith('GET /api/v1/vehicle/list/ {"count":15'))
+        self.assertRegex(message, r'\.\.\. \(\+\d+ bytes\)$')
+
+    def test_payload_built_only_when_sampled(self):
+        """
+        Testa que o payload só é montado quando a amostra é sorteada.
+        """
+        import logging
+        from api.utils.payload_logging import PayloadLogger
+        calls = []
+
+        def payload():
+            calls.append(1)
+            return {'ok': 'ção'}
+
+        logger = logging.getLogger('api.tests.payload')
+        self.assertFalse(PayloadLogger(logger, sample_rate=0).log('x', payload))
+        self.assertEqual(calls, [])
+        with self.assertLogs(logger, level='INFO') as logs:
+            self.assertTrue(PayloadLogger(logger, sample_rate=1).log('x', payload))
+        self.assertEqual(calls, [1])
+        self.assertEqual(logs.records[0].getMessage(), 'x {"ok":"ção"}')
+        self.assertEqual(PayloadLogger(logger, max_bytes=3).truncate('çãoa'), 'ç... (+3 bytes)')
+
+
+class VehicleCatalogViewTestCase(TestCase):
+    """
+    Testes para o catálogo de veículos e as rotas legadas.
+    """
+
+    def setUp(self):
+        """
+        Configura carros e motos de marcas e anos variados.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.corolla = Vehicle.objects.create(brand='toyota', model='corolla', year=2020, quantity=2)
+        self.yaris = Vehicle.objects.create(brand='Toyota', model='Yaris', year=2023, quantity=0)
+        self.civic = Vehicle.objects.create(brand='honda', model='civic', year=2022, quantity=1)
+        self.cg = Vehicle.objects.create(
+            brand='honda', model='cg 160', year=2024, quantity=3, type_vehicle=TypeVehicle.MOTORCYCLE
+        )
+
+    def _get(self, view_class, url):
+        """
+        Executa uma view de listagem autenticada.
+        """
+        request = self.factory.get(url)
+        force_authenticate(request, user=self.user)
+        return view_class.as_view()(request)
+
+    def _ids(self, response):
+        """
+        Retorna os ids da página, na ordem da resposta.
+        """
+        return [item['id'] for item in response.data['results']]
+
+    def test_catalog_filters(self):
+        """
+        Testa os filtros de tipo, disponibilidade, marca, modelo e anos.
+        """
+        from api.vehicle.views import VehicleCatalogView
+        cases = {
+            '': [self.civic, self.cg, self.corolla, self.yaris],
+            '?type_vehicle=Moto': [self.cg],
+            '?is_available=false': [self.yaris],
+            '?brand=TOYOTA&is_available=true': [self.corolla],
+            '?brand=honda&model=CIVIC': [self.civic],
+            '?year_min=2022&year_max=2023': [self.civic, self.yaris],
+            '?type_vehicle=Carro&year_min=2021': [self.civic, self.yaris],
+        }
+        for query, expected in cases.items():
+            response = self._get(VehicleCatalogView, f'/api/v1/vehicle/catalog/{query}')
+            self.assertEqual(response.status_code, status.HTTP_200_OK, query)
+            self.assertCountEqual(self._ids(response), [str(vehicle.id) for vehicle in expected], query)
+            brands = [item['brand'] for item in response.data['results']]
+            self.assertEqual(brands, sorted(brands), query)
+
+    def test_catalog_invalid_filter(self):
+        """
+        Testa que valores de filtro inválidos retornam 400.
+        """
+        from api.vehicle.views import VehicleCatalogView
+        response = self._get(VehicleCatalogView, '/api/v1/vehicle/catalog/?type_vehicle=Barco')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self._get(VehicleCatalogView, '/api/v1/vehicle/catalog/?year_min=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_legacy_routes_are_aliases(self):
+        """
+        Testa que as rotas legadas aplicam o filtro fixo e aceitam os demais.
+        """
+        from api.vehicle.views import VehicleListByCarView, VehicleListByMotoView, VehicleListIsNotAvailableView
+        response = self._get(VehicleListByCarView, '/api/v1/vehicle/list/car')
+        self.assertCountEqual(self._ids(response), [str(self.corolla.id), str(self.yaris.id), str(self.civic.id)])
+        response = self._get(VehicleListByCarView, '/api/v1/vehicle/list/car?brand=honda')
+        self.assertEqual(self._ids(response), [str(self.civic.id)])
+        response = self._get(VehicleListByMotoView, '/api/v1/vehicle/list/moto')
+        self.assertEqual(self._ids(response), [str(self.cg.id)])
+        response = self._get(VehicleListIsNotAvailableView, '/api/v1/vehicle/list/')
+        self.assertEqual(self._ids(response), [str(self.yaris.id)])
+
+    def test_catalog_filters_can_use_indexes(self):
+        """
+        Testa que as consultas do catálogo têm índice correspondente.
+        """
+        from api.vehicle.views import VehicleCatalogView
+        queries = [
+            '?type_vehicle=Carro',
+            '?is_available=true',
+            '?type_vehicle=Carro&is_available=true',
+            '?brand=Toyota&model=corolla',
+            '?year_min=2022',
+        ]
+        for query in queries:
+            with CaptureQueriesContext(connection) as captured:
+                self._get(VehicleCatalogView, f'/api/v1/vehicle/catalog/{query}')
+            page_sql = captured.captured_queries[-1]['sql']
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {page_sql}')
+                plan = '\n'.join(row[0] for row in cursor.fetchall())
+                cursor.execute('SET LOCAL enable_seqscan = on')
+            self.assertIn('using veh_', plan, query)
+            self.assertNotIn('Seq Scan', plan, query)
+
+
+class VehicleSearchViewTestCase(TestCase):
+    """
+    Testes para a busca textual no catálogo de veículos.
+    """
+
+    def setUp(self):
+        """
+        Configura veículos com marcas, modelos e descrições distintas.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.corolla = Vehicle.objects.create(
+            brand='Toyota', model='Corolla', year=2022, quantity=2, description='Sedan automático'
+        )
+        self.yaris = Vehicle.objects.create(
+            brand='Toyota', model='Yaris', year=2023, quantity=0, description='Hatch compacto, ótimo para a cidade'
+        )
+        self.civic = Vehicle.objects.create(
+            brand='Honda', model='Civic', year=2021, quantity=1, description='Sedan esportivo com teto solar'
+        )
+        self.cg = Vehicle.objects.create(
+            brand='Honda', model='CG 160', year=2024, quantity=3, type_vehicle=TypeVehicle.MOTORCYCLE,
+            description='Moto urbana econômica'
+        )
+
+    def _search(self, query):
+        """
+        Executa a busca autenticada com os parâmetros informados.
+        """
+        from api.vehicle.views import VehicleSearchView
+        request = self.factory.get('/api/v1/vehicle/search/', query)
+        force_authenticate(request, user=self.user)
+        return VehicleSearchView.as_view()(request)
+
+    def _ids(self, response):
+        """
+        Retorna os ids da página, na ordem da resposta.
+        """
+        return [item['id'] for item in response.data['results']]
+
+    def test_search_partial_names(self):
+        """
+        Testa a busca por prefixos de marca e modelo, em qualquer caixa.
+        """
+        response = self._search({'q': 'toy'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(self._ids(response), [str(self.corolla.id), str(self.yaris.id)])
+        response = self._search({'q': 'TOY cor'})
+        self.assertEqual(self._ids(response), [str(self.corolla.id)])
+        self.assertNotIn('search_vector', response.data['results'][0])
+
+    def test_search_description_and_ranking(self):
+        """
+        Testa a busca na descrição, com marca e modelo mais relevantes.
+        """
+        sedan = Vehicle.objects.create(brand='Sedan', model='Motors', year=2020, quantity=1)
+        response = self._search({'q': 'sedan'})
+        self.assertEqual(self._ids(response)[0], str(sedan.id))
+        self.assertCountEqual(self._ids(response)[1:], [str(self.corolla.id), str(self.civic.id)])
+        response = self._search({'q': 'ótimo cidade'})
+        self.assertEqual(self._ids(response), [str(self.yaris.id)])
+
+    def test_search_with_catalog_filters(self):
+        """
+        Testa a busca combinada com os filtros do catálogo.
+        """
+        response = self._search({'q': 'honda', 'type_vehicle': 'Moto'})
+        self.assertEqual(self._ids(response), [str(self.cg.id)])
+        response = self._search({'q': 'toyota', 'is_available': 'true'})
+        self.assertEqual(self._ids(response), [str(self.corolla.id)])
+
+    def test_search_reflects_updates(self):
+        """
+        Testa que o vetor de busca acompanha alterações do veículo.
+        """
+        Vehicle.objects.filter(pk=self.cg.pk).update(description='Moto trail para estrada de terra')
+        self.assertEqual(self._ids(self._search({'q': 'trail'})), [str(self.cg.id)])
+        self.assertEqual(self._ids(self._search({'q': 'urbana'})), [])
+
+    def test_search_requires_term(self):
+        """
+        Testa que a busca sem palavras retorna 400.
+        """
+        for query in ({}, {'q': ''}, {'q': ' & !:* '}):
+            response = self._search(query)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+            self.assertEqual(response.data['detail'], 'Informe o termo de busca.')
+
+
+class VehicleImportTestCase(TestCase):
+    """
+    Testes para a importação em massa de veículos.
+    """
+
+    def setUp(self):
+        """
+        Configura um usuário e um veículo já cadastrado.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.existing = Vehicle.objects.create(
+            brand='Toyota', model='Corolla', year=2020, quantity=3, description='Original'
+        )
+
+    def _import(self, data, query='', **kwargs):
+        """
+        Executa a view de importação autenticada.
+        """
+        from api.vehicle.views import VehicleImportView
+        request = self.factory.post(f'/api/v1/vehicle/import/{query}', data, **kwargs)
+        force_authenticate(request, user=self.user)
+        return VehicleImportView.as_view()(request)
+
+    def test_import_json_report_and_dedupe(self):
+        """
+        Testa normalização, deduplicação no arquivo e contra a frota, e o relatório.
+        """
+        rows = [
+            {'brand': '  Honda ', 'model': 'Civic  EXL', 'year': 2022, 'quantity': 2},
+            {'brand': 'TOYOTA', 'model': 'corolla', 'year': 2024, 'quantity': 9},
+            {'brand': 'honda', 'model': 'civic exl', 'year': 2023},
+            {'brand': 'Fiat', 'model': 'Uno', 'year': 'abc'},
+            {'brand': 'Yamaha', 'model': 'Fazer', 'year': 2021, 'type_vehicle': 'Moto'},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self._import(rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        report = response.data['result']['rows']
+        self.assertEqual([row['status'] for row in report], ['created', 'skipped', 'duplicate', 'invalid', 'created'])
+        self.assertEqual(report[1]['id'], str(self.existing.id))
+        self.assertEqual(response.data['result']['summary'], {'created': 2, 'skipped': 1, 'duplicate': 1, 'invalid': 1})
+        self.assertLessEqual(len(queries), 6)
+
+        civic = Vehicle.objects.get(pk=report[0]['id'])
+        self.assertEqual((civic.brand, civic.model, civic.quantity, civic.is_available), ('honda', 'civic exl', 2, True))
+        self.assertEqual(Vehicle.objects.get(pk=report[4]['id']).type_vehicle, TypeVehicle.MOTORCYCLE)
+        self.existing.refresh_from_db()
+        self.assertEqual((self.existing.year, self.existing.quantity), (2020, 3))
+
+    def test_import_csv_update(self):
+        """
+        Testa a importação de CSV com atualização dos veículos existentes.
+        """
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        content = 'brand,model,year,quantity,description\ntoyota,COROLLA,2025,0,Novo texto\nford,ka,2019,0,\n'
+        upload = SimpleUploadedFile('catalogo.csv', content.encode('utf-8'), content_type='text/csv')
+        response = self._import({'file': upload}, query='?on_conflict=update', format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        report = response.data['result']['rows']
+        self.assertEqual([row['status'] for row in report], ['updated', 'created'])
+        self.existing.refresh_from_db()
+        self.assertEqual((self.existing.year, self.existing.description, self.existing.quantity), (2025, 'Novo texto', 3))
+        self.assertFalse(Vehicle.objects.get(pk=report[1]['id']).is_available)
+
+    def test_import_rejects_invalid_payloads(self):
+        """
+        Testa corpos vazios, formatos desconhecidos e on_conflict inválido.
+        """
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        self.assertEqual(self._import([], format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        upload = SimpleUploadedFile('catalogo.xml', b'<xml/>')
+        self.assertEqual(self._import({'file': upload}, format='multipart').status_code, status.HTTP_400_BAD_REQUEST)
+        response = self._import([{'brand': 'a', 'model': 'b', 'year': 1}], query='?on_conflict=replace', format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unique_constraint_is_case_insensitive(self):
+        """
+        Testa que a restrição única impede marca e modelo repetidos em outra caixa.
+        """
+        from django.db import IntegrityError, transaction
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Vehicle.objects.create(brand='TOYOTA', model='COROLLA', year=2021, quantity=1)
+
+    def test_model_collapses_spaces_outside_the_import(self):
+        """
+        Testa que save() e full_clean() usam a mesma normalização de espaços da importação.
+        """
+        from django.core.exceptions import ValidationError
+        from django.db import IntegrityError, transaction
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Vehicle.objects.create(brand=' Toyota ', model='Corolla', year=2021, quantity=1)
+        vehicle = Vehicle(brand='Fiat', model='Grand  Siena ', year=2015, quantity=1)
+        vehicle.save()
+        self.assertEqual(vehicle.model, 'Grand Siena')
+        with self.assertRaises(ValidationError):
+            Vehicle(brand='FIAT', model=' grand   siena', year=2015, quantity=1).full_clean()
+
+    def test_create_view_duplicate_returns_existing(self):
+        """
+        Testa que o cadastro de um modelo repetido retorna apenas o veículo existente.
+        """
+        from api.vehicle.views import VehicleCreateView
+        Vehicle.objects.create(brand='honda', model='civic', year=2021, quantity=1)
+        request = self.factory.post('/api/v1/vehicle/create/', {
+            'brand': ' TOYOTA ', 'model': 'Corolla', 'year': 2024, 'quantity': 1
+        }, format='json')
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = VehicleCreateView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['result']['id'], str(self.existing.id))
+        self.assertEqual(len(queries), 1)
+
+    def test_import_command(self):
+        """
+        Testa o comando import_vehicles com um arquivo JSON.
+        """
+        import json
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as handle:
+            json.dump([{'brand': 'Renault', 'model': 'Kwid', 'year': 2023, 'quantity': 4}, {'brand': 'x'}], handle)
+        self.addCleanup(os.remove, handle.name)
+        out, err = StringIO(), StringIO()
+        call_command('import_vehicles', handle.name, stdout=out, stderr=err)
+        self.assertIn('created 1', out.getvalue())
+        self.assertIn('invalid 1', out.getvalue())
+        self.assertIn('linha 1: invalid', err.getvalue())
+        self.assertTrue(Vehicle.objects.filter(brand='renault', model='kwid', quantity=4).exists())
+
+
+class VehicleUnitTestCase(TestCase):
+    """
+    Testes para o controle de veículos por unidade física.
+    """
+
+    def setUp(self):
+        """
+        Configura um cliente e um veículo com três unidades.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(
+            brand='Toyota', model='Corolla', year=2024, quantity=10, type_vehicle=TypeVehicle.CAR
+        )
+        self.units = VehicleUnitService().add_units(self.vehicle, ['abc-1d23', 'ABC1D24', 'ABC 1D25'])
+        self.vehicle.refresh_from_db()
+        self.service = RentService()
+
+    def test_add_units_makes_quantity_an_aggregate(self):
+        """
+        Testa que o cadastro normaliza as placas e recalcula o estoque.
+        """
+        self.assertTrue(self.vehicle.tracks_units)
+        self.assertEqual(self.vehicle.quantity, 3)
+        self.assertEqual(sorted(unit.plate for unit in self.units), ['ABC1D23', 'ABC1D24', 'ABC1D25'])
+
+    def test_unit_view_lists_and_rejects_duplicates(self):
+        """
+        Testa a listagem das unidades e a recusa de placas já cadastradas.
+        """
+        request = self.factory.get(f'/api/v1/vehicle/{self.vehicle.id}/units/')
+        force_authenticate(request, user=self.user)
+        response = VehicleUnitView.as_view()(request, pk=self.vehicle.id)
+        self.assertEqual(response.data['count'], 3)
+
+        request = self.factory.post(
+            f'/api/v1/vehicle/{self.vehicle.id}/units/', {'plates': ['XYZ9A99', 'abc1d23']}, format='json'
+        )
+        force_authenticate(request, user=self.user)
+        response = VehicleUnitView.as_view()(request, pk=self.vehicle.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ABC1D23', response.data['error'])
+
+        request = self.factory.post(
+            f'/api/v1/vehicle/{self.vehicle.id}/units/', {'plates': ['XYZ9A99']}, format='json'
+        )
+        force_authenticate(request, user=self.user)
+        response = VehicleUnitView.as_view()(request, pk=self.vehicle.id)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['result']['vehicle']['quantity'], 4)
+
+    def test_add_units_rejects_open_rentals_without_unit(self):
+        """
+        Testa que um veículo com aluguéis em aberto sem unidade não é convertido.
+        """
+        vehicle = Vehicle.objects.create(brand='Honda', model='Civic', year=2024, quantity=2)
+        self.service.create_rental(self.client, vehicle, date.today())
+        with self.assertRaises(ValidationError):
+            VehicleUnitService().add_units(vehicle, ['HON1A11'])
+
+    def test_create_rental_allocates_unit_with_skip_locked(self):
+        """
+        Testa que a reserva usa SKIP LOCKED e mantém o agregado do veículo.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            rental = self.service.create_rental(self.client, self.vehicle, date.today())
+        self.assertTrue(any('SKIP LOCKED' in query['sql'] for query in queries.captured_queries))
+        self.assertIn(rental.unit_id, {unit.id for unit in self.units})
+        self.assertEqual(self.vehicle.quantity, 2)
+        rental.unit.refresh_from_db()
+        self.assertFalse(rental.unit.is_available)
+
+        self.service.create_rental(self.client, self.vehicle, date.today())
+        self.service.create_rental(self.client, self.vehicle, date.today())
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 0)
+        self.assertFalse(self.vehicle.is_available)
+        with self.assertRaises(ValidationError):
+            self.service.create_rental(self.client, self.vehicle, date.today())
+        self.assertEqual(Rental.objects.filter(vehicle=self.vehicle).values('unit').distinct().count(), 3)
+
+    def test_return_rental_frees_unit(self):
+        """
+        Testa que a devolução libera a unidade e devolve o estoque.
+        """
+        rental = self.service.create_rental(self.client, self.vehicle, date.today())
+        self.service.return_rental(rental, date.today())
+        rental.unit.refresh_from_db()
+        self.assertTrue(rental.unit.is_available)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 3)
+
+    def test_bulk_create_and_return_use_units(self):
+        """
+        Testa que o lote recebe unidades distintas e falha quando elas acabam.
+        """
+        items = [
+            {'client': self.client.id, 'vehicle': self.vehicle.id, 'start_date': date.today()}
+            for _ in range(4)
+        ]
+        results = self.service.bulk_create_rentals(items)
+        rentals = [result['rental'] for result in results if result['rental']]
+        self.assertEqual(len(rentals), 3)
+        self.assertEqual(results[3]['error'], 'Não há unidades disponíveis deste veículo.')
+        self.assertEqual(len({rental.unit_id for rental in rentals}), 3)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 0)
+
+        self.service.bulk_return_rentals([
+            {'rental': rental.id, 'end_date': date.today()} for rental in rentals
+        ])
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 3)
+        self.assertFalse(self.vehicle.units.filter(is_available=False).exists())
+
+    def test_refresh_quantities_fixes_drift(self):
+        """
+        Testa que o agregado é recalculado a partir das unidades livres.
+        """
+        Vehicle.objects.filter(pk=self.vehicle.pk).update(quantity=7)
+        self.units[0].is_available = False
+        self.units[0].save()
+        self.assertEqual(VehicleUnitService().refresh_quantities(), 1)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 2)
+        self.assertTrue(self.vehicle.is_available)
+
+    def test_add_units_rejects_unit_less_rentals_of_tracked_vehicle(self):
+        """
+        Testa que um veículo já convertido não recebe unidades com aluguéis em aberto sem unidade.
+        """
+        Rental.objects.create(client=self.client, vehicle=self.vehicle, start_date=date.today())
+        with self.assertRaises(ValidationError):
+            VehicleUnitService().add_units(self.vehicle, ['XYZ9A99'])
+
+    def test_returns_recount_free_units(self):
+        """
+        Testa que devoluções de aluguéis sem unidade não inflam o agregado.
+        """
+        legacy = [
+            Rental.objects.create(client=self.client, vehicle=self.vehicle, start_date=date.today())
+            for _ in range(2)
+        ]
+        rental = self.service.create_rental(self.client, self.vehicle, date.today())
+        self.assertEqual(self.vehicle.quantity, 2)
+        self.service.return_rental(legacy[0], date.today())
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.quantity, 2)
+        self.service.bulk_return_rentals([
+            {'rental': legacy[1].id, 'end_date': date.today()},
+            {'rental': rental.id, 'end_date': date.today()},
+        ])
+        self.vehicle.refresh_from_db()
+        self.assertEqual((self.vehicle.quantity, self.vehicle.is_available), (3, True))
+
+    def test_reservation_recounts_drifted_aggregate(self):
+        """
+        Testa que a reserva por unidade corrige um agregado divergente.
+        """
+        Vehicle.objects.filter(pk=self.vehicle.pk).update(quantity=0, is_available=False)
+        self.service.create_rental(self.client, self.vehicle, date.today())
+        self.assertEqual((self.vehicle.quantity, self.vehicle.is_available), (2, True))
+
+    def test_stale_vehicle_reserves_by_unit(self):
+        """
+        Testa que um veículo lido antes da conversão é reservado por unidade.
+        """
+        vehicle = Vehicle.objects.create(brand='Honda', model='Civic', year=2024, quantity=2)
+        VehicleUnitService().add_units(Vehicle.objects.get(pk=vehicle.pk), ['HON1A11', 'HON1A12'])
+        self.assertFalse(vehicle.tracks_units)
+        rental = self.service.create_rental(self.client, vehicle, date.today())
+        self.assertIsNotNone(rental.unit_id)
+        self.assertEqual(vehicle.quantity, 1)
+
+
+class StockLedgerTestCase(TestCase):
+    """
+    Testes para o razão de movimentos do estoque.
+    """
+
+    def setUp(self):
+        """
+        Configura um cliente e um veículo com estoque.
+        """
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            cpf='12345678900'
+        )
+        self.client = Client.objects.create(user=self.user)
+        self.vehicle = Vehicle.objects.create(brand='Toyota', model='Corolla', year=2024, quantity=3)
+        self.ledger = StockLedgerService()
+        self.service = RentService()
+
+    def _movements(self):
+        """
+        Retorna (motivo, variação) dos movimentos do veículo, em ordem.
+        """
+        return list(self.vehicle.stock_movements.order_by('id').values_list('reason', 'delta'))
+
+    def test_every_stock_change_is_recorded_with_reason(self):
+        """
+        Testa os movimentos de criação, aluguel, devolução e ajuste.
+        """
+        rental = self.service.create_rental(self.client, self.vehicle, date.today())
+        self.service.bulk_create_rentals([
+            {'client': self.client.pk, 'vehicle': self.vehicle.pk, 'start_date': date.today()},
+        ])
+        self.service.return_rental(rental, date.today())
+        Vehicle.objects.filter(pk=self.vehicle.pk).update(quantity=7)
+        StockReconciliationService().reconcile()
+        self.assertEqual(self._movements(), [
+            ('adjust', 3), ('rent_out', -1), ('rent_out', -1), ('return', 1), ('adjust', 5), ('adjust', -5),
+        ])
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.ledger.stock([self.vehicle.pk]), {self.vehicle.pk: self.vehicle.quantity})
+
+    def test_import_movements_and_unchanged_updates(self):
+        """
+        Testa que a importação registra a entrada e que updates sem
+        mudança de estoque não geram movimentos.
+        """
+        report = VehicleImportService().import_rows([{'brand': 'Fiat', 'model': 'Uno', 'year': 2010, 'quantity': 4}])
+        imported = Vehicle.objects.get(pk=report[0]['id'])
+        self.assertEqual(list(imported.stock_movements.values_list('reason', 'delta')), [('import', 4)])
+        Vehicle.objects.filter(pk=imported.pk).update(description='revisado')
+        self.assertEqual(imported.stock_movements.count(), 1)
+
+    def test_ledger_is_append_only(self):
+        """
+        Testa que o banco rejeita alterações e remoções de movimentos.
+        """
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            StockMovement.objects.update(delta=0)
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            StockMovement.objects.all().delete()
+        self.assertEqual(self._movements(), [('adjust', 3)])
+
+    def test_stock_at_date_uses_latest_snapshot_and_tail(self):
+        """
+        Testa o estoque em datas passadas a partir de fotografia e movimentos.
+        """
+        now = timezone.now()
+        StockSnapshot.objects.update(taken_at=now - timedelta(days=30))
+        snapshot = self.ledger.take_snapshot()
+        StockSnapshot.objects.filter(pk=snapshot.pk).update(taken_at=now - timedelta(days=10))
+        StockMovement.objects.bulk_create([
+            StockMovement(vehicle=self.vehicle, reason=MovementReason.RENT_OUT, delta=-1, created_at=now - timedelta(days=5)),
+            StockMovement(vehicle=self.vehicle, reason=MovementReason.RETURN, delta=1, created_at=now - timedelta(days=2)),
+            StockMovement(vehicle=self.vehicle, reason=MovementReason.RENT_OUT, delta=-2, created_at=now - timedelta(days=1)),
+        ])
+        stock = lambda days: self.ledger.stock([self.vehicle.pk], now - timedelta(days=days)).get(self.vehicle.pk)
+        self.assertEqual(stock(20), None)
+        self.assertEqual(stock(8), 3)
+        self.assertEqual(stock(3), 2)
+        self.assertEqual(stock(0), 1)
+        with CaptureQueriesContext(connection) as queries:
+            self.ledger.stock([self.vehicle.pk])
+        self.assertEqual(len(queries), 2)
+
+    def test_stock_and_movement_views(self):
+        """
+        Testa as views de estoque e de histórico do veículo.
+        """
+        self.service.create_rental(self.client, self.vehicle, date.today())
+        request = self.factory.get(f'/api/v1/vehicle/{self.vehicle.pk}/stock/')
+        force_authenticate(request, user=self.user)
+        response = VehicleStockView.as_view()(request, pk=self.vehicle.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['result']['quantity'], 2)
+
+        request = self.factory.get(f'/api/v1/vehicle/{self.vehicle.pk}/movements/')
+        force_authenticate(request, user=self.user)
+        response = VehicleMovementListView.as_view()(request, pk=self.vehicle.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item['reason'], item['delta']) for item in response.data['results']],
+            [('rent_out', -1), ('adjust', 3)]
+        )
+
+        request = self.factory.get(f'/api/v1/vehicle/{self.vehicle.pk}/stock/', {'date': 'x'})
+        force_authenticate(request, user=self.user)
+        response = VehicleStockView.as_view()(request, pk=self.vehicle.pk)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
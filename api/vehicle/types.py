@@ -0,0 +1,8 @@
+from typing import NotRequired, TypedDict
+
+
+class VehicleImportRowType(TypedDict):
+    index: int
+    status: str
+    id: NotRequired[str]
+    error: NotRequired[dict | str]
@@ -1,10 +1,16 @@
 from django.urls import path
-from api.vehicle.views import VehicleCreateView, VehicleDeleteView, VehicleListByCarView, VehicleListByMotoView, VehicleListView
+from api.vehicle.views import VehicleCatalogView, VehicleCreateView, VehicleDeleteView, VehicleImportView, VehicleListByCarView, VehicleListByMotoView, VehicleListView, VehicleMovementListView, VehicleSearchView, VehicleStockView, VehicleUnitView
 
 urlpatterns = [
     path('vehicle/create/', VehicleCreateView.as_view(), name='Criar Veículo'),
+    path('vehicle/import/', VehicleImportView.as_view(), name='Importar Veiculos'),
+    path('vehicle/catalog/', VehicleCatalogView.as_view(), name='Catalogo de Veiculos'),
+    path('vehicle/search/', VehicleSearchView.as_view(), name='Busca de Veiculos'),
     path('vehicle/list/', VehicleListView.as_view(), name='Lista de Veiculos'),
     path('vehicle/list/car', VehicleListByCarView.as_view(), name='Lista de Veiculos por Carro'),
     path('vehicle/list/moto', VehicleListByMotoView.as_view(), name='Lista de Veiculos por Moto'),
+    path('vehicle/<uuid:pk>/units/', VehicleUnitView.as_view(), name='Unidades do Veiculo'),
+    path('vehicle/<uuid:pk>/stock/', VehicleStockView.as_view(), name='Estoque do Veiculo'),
+    path('vehicle/<uuid:pk>/movements/', VehicleMovementListView.as_view(), name='Movimentos de Estoque do Veiculo'),
     path('vehicle/delete/<uuid:pk>', VehicleDeleteView.as_view(), name='Exclui um veiculo'),
 ]
\ No newline at end of file
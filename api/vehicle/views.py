@@ -1,70 +1,295 @@
+from collections import Counter
+from datetime import datetime, time
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
-from api.vehicle.models import TypeVehicle, Vehicle
-import json
-import logging
+from api.exceptions import ValidationError
+from api.utils.conditional import ConditionalGetMixin
+from api.utils.idempotency import IdempotencyMixin
+from api.utils.payload_logging import PayloadLoggingMixin
+from api.vehicle.filters import VehicleFilter
+from api.vehicle.models import TypeVehicle, Vehicle, VehicleUnit
 from rest_framework.permissions import IsAuthenticated
 
-from api.vehicle.serializer import VehicleSerializer
-
-logger = logging.getLogger(__name__)
-
-class VehicleListView(generics.ListAPIView):
+from api.vehicle.serializer import (
+    StockMovementSerializer,
+    VehicleSerializer,
+    VehicleStockQuerySerializer,
+    VehicleUnitCreateSerializer,
+    VehicleUnitSerializer
+)
+from api.vehicle.service import (
+    StockLedgerService,
+    VehicleImportService,
+    VehicleSearchService,
+    VehicleUnitService,
+    normalize_name
+)
+
+
+class VehicleCatalogView(PayloadLoggingMixin, ConditionalGetMixin, generics.ListAPIView):
+    """
+    Catálogo de veículos com filtros por tipo, disponibilidade, marca,
+    modelo e faixa de anos (VehicleFilter), ordenado por marca.
+
+    Cada combinação comum de filtro e ordenação tem um índice composto
+    em Vehicle, de modo que a página e a contagem são lidas por índice.
+
+    Attributes:
+        preset_filters: Filtros fixos aplicados antes dos da query string,
+            usados pelas rotas legadas.
+    """
 
     permission_classes = [IsAuthenticated]
+    collection_timestamp_fields = ('updated_at',)
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = VehicleFilter
+    preset_filters = {}
 
-    queryset = Vehicle.objects.all().order_by('brand')
+    queryset = Vehicle.objects.all()
     serializer_class = VehicleSerializer
 
-    def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        logger.info(json.dumps(serializer.data, indent=4, ensure_ascii=False))
-        return super().get(request, *args, **kwargs)
+    def get_queryset(self):
+        """
+        Aplica os filtros fixos e a ordenação coberta pelos índices.
+        """
+        return super().get_queryset().filter(**self.preset_filters).order_by('brand', 'id')
 
 
-class VehicleListIsNotAvailableView(generics.ListAPIView):
+class VehicleListView(VehicleCatalogView):
+    """
+    Rota legada vehicle/list/, equivalente ao catálogo sem filtros fixos.
+    """
 
-    permission_classes = [IsAuthenticated]
 
-    queryset = Vehicle.objects.all().order_by('brand').filter(is_available=False)
-    serializer_class = VehicleSerializer
+class VehicleListIsNotAvailableView(VehicleCatalogView):
+    """
+    Veículos indisponíveis; equivale a vehicle/catalog/?is_available=false.
+    """
+    preset_filters = {'is_available': False}
 
-    def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        logger.info(json.dumps(serializer.data, indent=4, ensure_ascii=False))
-        return super().get(request, *args, **kwargs)
+
+class VehicleListByCarView(VehicleCatalogView):
+    """
+    Rota legada vehicle/list/car; equivale a vehicle/catalog/?type_vehicle=Carro.
+    """
+    preset_filters = {'type_vehicle': TypeVehicle.CAR}
+
+
+class VehicleListByMotoView(VehicleCatalogView):
+    """
+    Rota legada vehicle/list/moto; equivale a vehicle/catalog/?type_vehicle=Moto.
+    """
+    preset_filters = {'type_vehicle': TypeVehicle.MOTORCYCLE}
 
 
-class VehicleListByCarView(generics.ListAPIView):
+class VehicleSearchView(PayloadLoggingMixin, generics.ListAPIView):
+    """
+    Busca textual no catálogo por marca, modelo e descrição (?q=),
+    ordenada por relevância e combinável com os filtros do catálogo.
+    """
 
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = VehicleFilter
+    service_class = VehicleSearchService
 
-    queryset = Vehicle.objects.all().order_by(
-        'brand').filter(type_vehicle=TypeVehicle.CAR)
+    queryset = Vehicle.objects.all()
     serializer_class = VehicleSerializer
 
-    def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        logger.info(json.dumps(serializer.data, indent=4, ensure_ascii=False))
-        return super().get(request, *args, **kwargs)
-
+    def filter_queryset(self, queryset):
+        """
+        Aplica os filtros do catálogo e, em seguida, a busca textual.
+        """
+        return self.service_class().search(
+            super().filter_queryset(queryset),
+            self.request.query_params.get('q')
+        )
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class VehicleImportView(PayloadLoggingMixin, generics.GenericAPIView):
+    """
+    Importação em massa de veículos.
+
+    Aceita um arquivo CSV ou JSON no campo 'file' (multipart) ou uma
+    lista JSON no corpo, e grava os veículos com VehicleImportService em
+    blocos, cada um em sua própria transação. ?on_conflict=update
+    atualiza os veículos já cadastrados em vez de ignorá-los.
+
+    Attributes:
+        max_rows: Quantidade máxima de linhas por requisição.
+    """
+    permission_classes = [IsAuthenticated]
+    service_class = VehicleImportService
+    max_rows = 5000
 
-class VehicleListByMotoView(generics.ListAPIView):
+    def post(self, request, *args, **kwargs):
+        """
+        Importa os veículos enviados.
+
+        Args:
+            request: Requisição com o arquivo ou a lista de veículos.
+
+        Returns:
+            Response com o resumo e o relatório de cada linha.
+        """
+        service = self.service_class()
+        upload = request.FILES.get('file')
+        if upload is not None:
+            file_format = request.data.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+            rows = service.read(upload, file_format)
+        else:
+            rows = request.data
+            if not isinstance(rows, list):
+                return Response({"error": "Envie um arquivo CSV/JSON ou uma lista de veículos."}, status=status.HTTP_400_BAD_REQUEST)
+        if not rows:
+            return Response({"error": "Nenhum veículo para importar."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > self.max_rows:
+            return Response(
+                {"error": f"A importação pode ter no máximo {self.max_rows} veículos."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        report = service.import_rows(rows, on_conflict=request.query_params.get('on_conflict', 'skip'))
+        summary = Counter(row['status'] for row in report)
+        total_success = summary['created'] + summary['updated'] + summary['skipped']
+        if total_success == len(report):
+            response_status = status.HTTP_201_CREATED
+        elif total_success:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {
+                "message": f"{summary['created']} criados, {summary['updated']} atualizados e "
+                           f"{summary['skipped']} já cadastrados, de {len(report)} veículos.",
+                "result": {"summary": dict(summary), "rows": report}
+            },
+            status=response_status
+        )
+
+
+class VehicleUnitView(PayloadLoggingMixin, generics.ListCreateAPIView):
+    """
+    View das unidades físicas (placas) de um veículo.
+
+    GET lista as unidades do veículo; POST recebe {"plates": [...]},
+    cadastra as unidades e passa o veículo a ser controlado por unidade,
+    com o estoque recalculado a partir das unidades livres.
+    """
     permission_classes = [IsAuthenticated]
+    serializer_class = VehicleUnitSerializer
+    service_class = VehicleUnitService
 
-    queryset = Vehicle.objects.all().order_by(
-        'brand').filter(type_vehicle=TypeVehicle.MOTORCYCLE)
-    serializer_class = VehicleSerializer
+    def get_vehicle(self):
+        """
+        Retorna o veículo da URL ou 404.
+        """
+        return generics.get_object_or_404(Vehicle, pk=self.kwargs['pk'])
+
+    def get_queryset(self):
+        """
+        Retorna as unidades do veículo da URL.
+        """
+        return VehicleUnit.objects.filter(vehicle_id=self.kwargs['pk'])
+
+    def post(self, request, *args, **kwargs):
+        """
+        Cadastra unidades do veículo.
+
+        Args:
+            request: Objeto de requisição contendo a lista de placas.
+
+        Returns:
+            Response com as unidades criadas e o veículo atualizado.
+        """
+        vehicle = self.get_vehicle()
+        serializer = VehicleUnitCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            units = self.service_class().add_units(vehicle, serializer.validated_data['plates'])
+        except ValidationError as e:
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        vehicle.refresh_from_db()
+        return Response(
+            {
+                "message": "Unidades cadastradas com sucesso!",
+                "result": {
+                    "vehicle": VehicleSerializer(vehicle).data,
+                    "units": VehicleUnitSerializer(units, many=True).data,
+                },
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+
+class VehicleStockView(PayloadLoggingMixin, generics.GenericAPIView):
+    """
+    View do estoque de um veículo, atual ou no fim de um dia.
+
+    O estoque é calculado pelo razão de movimentos: a fotografia mais
+    recente até a data somada aos movimentos seguintes.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = VehicleStockQuerySerializer
+    service_class = StockLedgerService
 
     def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        logger.info(json.dumps(serializer.data, indent=4, ensure_ascii=False))
-        return super().get(request, *args, **kwargs)
+        """
+        Consulta o estoque do veículo.
+
+        Args:
+            request: Objeto de requisição com date (opcional) na query string.
+
+        Returns:
+            Response com o estoque do veículo na data.
+        """
+        vehicle = generics.get_object_or_404(Vehicle.all_objects, pk=self.kwargs['pk'])
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        day = serializer.validated_data.get('date')
+        at = timezone.make_aware(datetime.combine(day, time.max)) if day else None
+
+        stock = self.service_class().stock([vehicle.pk], at)
+        return Response(
+            {
+                "result": {
+                    "vehicle": vehicle.pk,
+                    "date": serializer.data.get('date'),
+                    "quantity": stock.get(vehicle.pk, 0),
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class VehicleMovementListView(PayloadLoggingMixin, generics.ListAPIView):
+    """
+    View do histórico de movimentos de estoque de um veículo.
+
+    Lista os movimentos do mais recente ao mais antigo, com o motivo
+    (aluguel, devolução, ajuste ou importação) e a variação de cada um.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = StockMovementSerializer
+    service_class = StockLedgerService
+
+    def get_queryset(self):
+        """
+        Retorna os movimentos do veículo da URL.
+        """
+        vehicle = generics.get_object_or_404(Vehicle.all_objects, pk=self.kwargs['pk'])
+        return self.service_class().movements(vehicle)
 
 
-class VehicleCreateView(generics.CreateAPIView):
+class VehicleCreateView(IdempotencyMixin, PayloadLoggingMixin, generics.CreateAPIView):
 
     permission_classes = [IsAuthenticated]
 
@@ -73,39 +298,39 @@ class VehicleCreateView(generics.CreateAPIView):
 
     def post(self, request, *args, **kwargs):
         try:
-            brand = request.data.get("brand").strip().lower()
-            model = request.data.get("model").strip().lower()
+            brand = normalize_name(request.data.get("brand"))
+            model = normalize_name(request.data.get("model"))
             year = request.data.get("year")
             quantity = request.data.get("quantity")
             type_vehicle = request.data.get("type_vehicle", TypeVehicle.CAR)
             description = request.data.get("description")
 
-            if Vehicle.objects.filter(brand__iexact=brand, model__iexact=model).exists():
-                existing_vehicles = Vehicle.objects.exclude(
-                    brand__iexact=brand, model__iexact=model)
-                serializer = self.get_serializer(existing_vehicles, many=True)
+            if not brand or not model:
+                return Response({"message": "Erro ao criar veículo!", "error": "Marca e modelo são obrigatórios."}, status=status.HTTP_400_BAD_REQUEST)
+
+            existing = Vehicle.objects.filter(brand__iexact=brand, model__iexact=model).first()
+            if existing is not None:
+                serializer = self.get_serializer(existing)
                 return Response({"message": "Modelo já registrado.", "result": serializer.data}, status=status.HTTP_200_OK)
 
-            vehicle = Vehicle.objects.create(
-                brand=brand,
-                model=model,
-                year=year,
-                quantity=quantity,
-                type_vehicle=type_vehicle,
-                description=description
-            )
+            with transaction.atomic():
+                vehicle = Vehicle.objects.create(
+                    brand=brand,
+                    model=model,
+                    year=year,
+                    quantity=quantity,
+                    type_vehicle=type_vehicle,
+                    description=description
+                )
 
             serializer = self.get_serializer(vehicle)
 
-            logger.info(json.dumps(serializer.data,
-                        indent=4, ensure_ascii=False))
-
             return Response({"message": "Veículo criado com sucesso!", "result": serializer.data}, status=status.HTTP_201_CREATED)
         except Exception as e:
             return Response({"message": "Erro ao criar veículo!", "error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class VehicleDeleteView(generics.DestroyAPIView):
+class VehicleDeleteView(PayloadLoggingMixin, generics.DestroyAPIView):
 
     permission_classes = [IsAuthenticated]
 
@@ -115,7 +340,7 @@ class VehicleDeleteView(generics.DestroyAPIView):
     def delete(self, request, *args, **kwargs):
         try:
             vehicle = self.get_object()
-            vehicle.delete()
+            vehicle.soft_delete()
             return Response({"message": "Veiculo excluído com sucesso!"}, status=status.HTTP_204_NO_CONTENT)
         except Vehicle.DoesNotExist:
             return Response({"error": "Veiculo não encontrado."}, status=status.HTTP_404_NOT_FOUND)
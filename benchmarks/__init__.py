@@ -0,0 +1,7 @@
+"""
+Benchmarks de performance do EasyDrive.
+
+Cada módulo é executável com ``python -m benchmarks.<nome>`` a partir da
+raiz do projeto. Os cenários rodam em um banco de testes descartável,
+criado a partir da configuração de ``core.settings`` e destruído ao final.
+"""
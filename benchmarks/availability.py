@@ -0,0 +1,176 @@
+"""
+Benchmark da consulta de disponibilidade da frota por período.
+
+Gera um histórico de aluguéis (100k por padrão), monta o índice de
+ocupação diária e compara a latência de AvailabilityService com uma
+varredura ingênua dos aluguéis pelo ORM para janelas aleatórias.
+
+Uso:
+    python -m benchmarks.availability --rentals 100000 --vehicles 500 --queries 50
+"""
+import argparse
+import random
+import statistics
+from collections import Counter
+from datetime import date, timedelta
+
+from benchmarks.utils import setup_django, test_database, timer
+
+
+def seed(total_rentals, total_vehicles, total_clients, days_of_history):
+    """
+    Popula veículos, clientes e aluguéis com intervalos aleatórios.
+
+    Args:
+        total_rentals: Quantidade de aluguéis gerados.
+        total_vehicles: Quantidade de veículos.
+        total_clients: Quantidade de clientes.
+        days_of_history: Extensão do histórico em dias até hoje.
+    """
+    from django.db import connection
+    from api.accounts.models import User
+    from api.client.models import Client
+    from api.rent.models import Rental
+    from api.vehicle.models import TypeVehicle, Vehicle
+
+    rng = random.Random(42)
+    vehicles = Vehicle.objects.bulk_create([
+        Vehicle(
+            brand=f'marca{index % 40}', model=f'modelo{index}', year=2020 + index % 5,
+            quantity=rng.randint(1, 10), type_vehicle=rng.choice(TypeVehicle.values),
+        )
+        for index in range(total_vehicles)
+    ])
+    users = User.objects.bulk_create([
+        User(email=f'bench{index}@example.com', name=f'Bench {index}', cpf=f'{index:011d}')
+        for index in range(total_clients)
+    ])
+    clients = Client.objects.bulk_create([Client(user=user) for user in users])
+
+    today = date.today()
+    origin = today - timedelta(days=days_of_history)
+    batch = []
+    for _ in range(total_rentals):
+        start = origin + timedelta(days=rng.randint(0, days_of_history + 60))
+        duration = timedelta(days=rng.randint(0, 13))
+        returned = start + duration < today and rng.random() < 0.98
+        batch.append(Rental(
+            client=rng.choice(clients),
+            vehicle=rng.choice(vehicles),
+            start_date=start,
+            expected_end_date=start + duration if not returned and rng.random() < 0.8 else None,
+            end_date=start + duration if returned else None,
+            returned=returned,
+        ))
+        if len(batch) == 5000:
+            Rental.objects.bulk_create(batch)
+            batch = []
+    Rental.objects.bulk_create(batch)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def naive_fleet_availability(start_date, end_date):
+    """
+    Calcula a disponibilidade varrendo os aluguéis que tocam o período.
+
+    Args:
+        start_date: Primeiro dia do período.
+        end_date: Último dia do período.
+
+    Returns:
+        Dicionário vehicle_id -> unidades livres.
+    """
+    from django.db.models import Q
+    from django.utils import timezone
+    from api.rent.models import Rental
+    from api.vehicle.models import Vehicle
+
+    days = (end_date - start_date).days + 1
+    today = timezone.localdate()
+    booked = {}
+    open_rentals = Counter()
+    rentals = Rental.objects.filter(start_date__lte=end_date).filter(
+        Q(returned=False) | Q(end_date__gte=start_date)
+    ).values_list('vehicle_id', 'start_date', 'expected_end_date', 'end_date', 'returned')
+    for vehicle_id, rental_start, expected_end_date, rental_end, returned in rentals:
+        if not returned:
+            open_rentals[vehicle_id] += 1
+            if expected_end_date is None or expected_end_date < today:
+                rental_end = end_date
+            else:
+                rental_end = expected_end_date
+        daily = booked.setdefault(vehicle_id, [0] * days)
+        first = max((rental_start - start_date).days, 0)
+        last = min((rental_end - start_date).days, days - 1)
+        for offset in range(first, last + 1):
+            daily[offset] += 1
+
+    open_rentals.update(
+        Rental.objects.filter(returned=False, start_date__gt=end_date).values_list('vehicle_id', flat=True)
+    )
+    return {
+        vehicle_id: max(quantity + open_rentals[vehicle_id] - max(booked.get(vehicle_id, [0])), 0)
+        for vehicle_id, quantity in Vehicle.objects.values_list('id', 'quantity')
+    }
+
+
+def percentile(samples, fraction):
+    """
+    Retorna o percentil informado de uma lista de amostras.
+    """
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rentals', type=int, default=100_000)
+    parser.add_argument('--vehicles', type=int, default=500)
+    parser.add_argument('--clients', type=int, default=2_000)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.rent.service import AvailabilityService
+
+    with test_database():
+        with timer() as elapsed:
+            seed(args.rentals, args.vehicles, args.clients, args.days)
+        print(f'carga: {args.rentals} aluguéis em {elapsed["elapsed"]:.1f}s')
+
+        service = AvailabilityService()
+        with timer() as elapsed:
+            rows = service.rebuild()
+        print(f'índice: {rows} linhas de ocupação em {elapsed["elapsed"]:.1f}s')
+
+        rng = random.Random(7)
+        today = date.today()
+        samples = {'índice': [], 'varredura ORM': []}
+        for _ in range(args.queries):
+            start = today + timedelta(days=rng.randint(-args.days, 30))
+            end = start + timedelta(days=rng.randint(0, 13))
+
+            with timer() as elapsed:
+                indexed = {item['id']: item['available_units'] for item in service.fleet_availability(start, end)}
+            samples['índice'].append(elapsed['elapsed'] * 1000)
+
+            with timer() as elapsed:
+                naive = naive_fleet_availability(start, end)
+            samples['varredura ORM'].append(elapsed['elapsed'] * 1000)
+
+            if indexed != naive:
+                raise AssertionError(f'Resultados divergentes para {start} - {end}')
+
+        print(f"{'estratégia':<14} {'média(ms)':>10} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+        for name, values in samples.items():
+            print(f"{name:<14} {statistics.mean(values):>10.2f} {percentile(values, 0.5):>9.2f} "
+                  f"{percentile(values, 0.95):>9.2f} {percentile(values, 0.99):>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
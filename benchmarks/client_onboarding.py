@@ -0,0 +1,114 @@
+"""
+Benchmark do cadastro de clientes em lote (ClientOnboardingService).
+
+Gera uma base de parceiro com usuários novos e uma fração de linhas em
+conflito com clientes já cadastrados (mesmo email ou CPF, com e sem
+pontuação) e mede a vazão em usuários por segundo de três formas: um
+create_user e um Client.objects.create por linha, como o cadastro
+individual; o serviço com o hash no próprio processo; e o serviço com
+o hash em um pool de processos.
+
+Uso:
+    python -m benchmarks.client_onboarding --rows 5000 --conflicts 0.05 --workers 8
+"""
+import argparse
+import os
+
+from benchmarks.utils import setup_django, test_database, timer
+
+
+def rows_for(start, total, conflicts):
+    """
+    Monta as linhas de uma rodada, com uma fração em conflito.
+
+    Args:
+        start: Primeiro número de cliente da rodada.
+        total: Quantidade de linhas.
+        conflicts: Fração das linhas que repete um cliente da base.
+
+    Returns:
+        Lista de linhas no formato do cadastro em lote.
+    """
+    every = int(1 / conflicts) if conflicts else 0
+    rows = []
+    for number in range(start, start + total):
+        if every and number % every == 0:
+            cpf = f'{number % 1000:011d}'
+            rows.append({
+                'name': 'Repetido', 'email': f'base{number % 1000}@example.com',
+                'cpf': f'{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}', 'password': 'senha-forte',
+            })
+        else:
+            rows.append({
+                'name': f'Cliente {number}', 'email': f'cliente{number}@example.com',
+                'cpf': f'{10_000_000 + number:011d}', 'password': f'senha-{number}',
+            })
+    return rows
+
+
+def sequential(rows):
+    """
+    Cadastro linha a linha, com create_user e Client.objects.create.
+
+    Returns:
+        Quantidade de clientes criados.
+    """
+    from django.db import IntegrityError, transaction
+    from api.accounts.models import User
+    from api.client.models import Client
+
+    created = 0
+    for row in rows:
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(**row)
+                Client.objects.create(user=user)
+            created += 1
+        except IntegrityError:
+            pass
+    return created
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--conflicts', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    setup_django()
+    from api.accounts.models import User
+    from api.client.models import Client
+    from api.client.service import ClientOnboardingService
+
+    with test_database():
+        users = User.objects.bulk_create([
+            User(name=f'Base {number}', email=f'base{number}@example.com', cpf=f'{number:011d}', password='!')
+            for number in range(1000)
+        ])
+        Client.objects.bulk_create([Client(user=user) for user in users])
+        service = ClientOnboardingService()
+
+        scenarios = (
+            ('create_user por linha', sequential),
+            ('serviço, hash no processo', lambda rows: sum(
+                row['status'] == 'created' for row in service.onboard(rows, workers=1)
+            )),
+            (f'serviço, pool de {args.workers} processos', lambda rows: sum(
+                row['status'] == 'created' for row in service.onboard(rows, workers=args.workers)
+            )),
+        )
+        print(f"{'cenário':<32} {'linhas':>7} {'criados':>8} {'tempo(s)':>9} {'usuários/s':>11}")
+        for offset, (name, call) in enumerate(scenarios, start=1):
+            rows = rows_for(offset * 1_000_000, args.rows, args.conflicts)
+            with timer() as elapsed:
+                created = call(rows)
+            print(f"{name:<32} {len(rows):>7} {created:>8} {elapsed['elapsed']:>9.2f} "
+                  f"{created / elapsed['elapsed']:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
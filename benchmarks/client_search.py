@@ -0,0 +1,154 @@
+"""
+Benchmark da busca de clientes (ClientSearchService).
+
+Gera um cadastro grande de clientes (1M por padrão) com nomes, emails,
+CPFs e telefones variados e mede p50/p95/p99 de client/search/ pela
+view para nomes parciais, emails, CPFs e telefones com e sem
+pontuação, além do plano da consulta da página. Para comparação, mede
+o filtro icontains sobre nome e email que a interface precisaria sem
+os índices de trigramas e de prefixo.
+
+Requer a extensão pg_trgm (contrib do PostgreSQL).
+
+Uso:
+    python -m benchmarks.client_search --clients 1000000 --samples 100
+"""
+import argparse
+import statistics
+
+from benchmarks.availability import percentile
+from benchmarks.utils import create_client, setup_django, test_database, timer
+
+FIRST_NAMES = [
+    'maria', 'jose', 'ana', 'joao', 'antonio', 'francisca', 'carlos', 'paulo', 'pedro', 'lucas',
+    'luiz', 'marcos', 'luis', 'gabriel', 'rafael', 'daniel', 'marcelo', 'bruno', 'eduardo', 'felipe',
+    'juliana', 'adriana', 'marcia', 'fernanda', 'patricia', 'aline', 'sandra', 'camila', 'amanda', 'bruna',
+]
+LAST_NAMES = [
+    'silva', 'santos', 'oliveira', 'souza', 'rodrigues', 'ferreira', 'alves', 'pereira', 'lima', 'gomes',
+    'costa', 'ribeiro', 'martins', 'carvalho', 'almeida', 'lopes', 'soares', 'fernandes', 'vieira', 'barbosa',
+    'rocha', 'dias', 'nascimento', 'andrade', 'moreira', 'nunes', 'marques', 'machado', 'mendes', 'freitas',
+]
+TERMS = [
+    'fernanda nascimento',
+    'nasciment',
+    'sil',
+    'marcelo.rocha123',
+    'pedro.carvalho1@',
+    '123.456.789-01',
+    '12345678901',
+    '987654',
+    '(11) 90000-0480',
+    'inexistente',
+]
+
+
+def seed(total_clients):
+    """
+    Popula usuários e clientes em SQL, em uma instrução cada.
+
+    Nomes combinam primeiro nome e um ou dois sobrenomes, para que haja
+    muitos nomes parecidos; o email leva o número do cliente, o CPF é
+    formatado com pontuação e o telefone segue o formato (DD) 9XXXX-XXXX.
+
+    Args:
+        total_clients: Quantidade de clientes.
+    """
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO accounts_user (
+                password, is_superuser, avatar, name, email, cpf, phone,
+                created_at, updated_at, is_active, is_staff
+            )
+            SELECT '!', false, 'avatars/default.png',
+                   initcap(first_name || ' ' || last_name || CASE WHEN n %% 3 = 0 THEN ' ' || other_name ELSE '' END),
+                   first_name || '.' || last_name || n || '@example.com',
+                   substr(cpf, 1, 3) || '.' || substr(cpf, 4, 3) || '.' || substr(cpf, 7, 3) || '-' || substr(cpf, 10, 2),
+                   '(' || (11 + n %% 80) || ') 9' || substr(phone, 1, 4) || '-' || substr(phone, 5, 4),
+                   now(), now(), true, false
+            FROM generate_series(1, %s) AS n,
+                LATERAL (SELECT
+                    (%s::text[])[1 + (n * 7) %% %s] AS first_name,
+                    (%s::text[])[1 + (n * 13) %% %s] AS last_name,
+                    (%s::text[])[1 + (n * 17) %% %s] AS other_name,
+                    lpad((12345678900 + n)::text, 11, '0') AS cpf,
+                    lpad((n %% 100000000)::text, 8, '0') AS phone
+                ) AS generated
+        """, [
+            total_clients,
+            FIRST_NAMES, len(FIRST_NAMES),
+            LAST_NAMES, len(LAST_NAMES),
+            LAST_NAMES, len(LAST_NAMES),
+        ])
+        cursor.execute("""
+            INSERT INTO client_client (id, user_id, total_rentals, open_rentals, returned_rentals, updated_at)
+            SELECT gen_random_uuid(), id, 0, 0, 0, now() FROM accounts_user
+        """)
+        cursor.execute('VACUUM ANALYZE accounts_user')
+        cursor.execute('VACUUM ANALYZE client_client')
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=1_000_000)
+    parser.add_argument('--samples', type=int, default=100)
+    parser.add_argument('--naive-samples', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.db.models import Q
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from api.client.models import Client
+    from api.client.views import ClientSearchView
+
+    with test_database():
+        seed(args.clients)
+        user = create_client(0).user
+        factory = APIRequestFactory()
+
+        def search(term):
+            request = factory.get('/api/v1/client/search/', {'q': term})
+            force_authenticate(request, user=user)
+            response = ClientSearchView.as_view()(request)
+            response.render()
+            return response
+
+        def naive(term):
+            return list(
+                Client.objects.select_related('user')
+                .filter(Q(user__name__icontains=term) | Q(user__email__icontains=term) | Q(user__cpf__icontains=term))
+                .order_by('id')[:11]
+            )
+
+        print(f"{'termo':<22} {'itens':>5} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} {'icontains':>10}  plano")
+        for term in TERMS:
+            with CaptureQueriesContext(connection) as captured:
+                found = len(search(term).data['results'])
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {captured.captured_queries[-1]['sql']}")
+                nodes = [row[0].strip(' ->') for row in cursor.fetchall()]
+            access = next((node for node in nodes if 'Scan' in node), '').split('  (')[0]
+            latencies = []
+            for _ in range(args.samples):
+                with timer() as elapsed:
+                    search(term)
+                latencies.append(elapsed['elapsed'] * 1000)
+            baseline = []
+            for _ in range(args.naive_samples):
+                with timer() as elapsed:
+                    naive(term)
+                baseline.append(elapsed['elapsed'] * 1000)
+            print(f"{term:<22} {found:>5} {statistics.median(latencies):>8.2f} "
+                  f"{percentile(latencies, 0.95):>8.2f} {percentile(latencies, 0.99):>8.2f} "
+                  f"{statistics.median(baseline):>10.1f}  {access}")
+
+
+if __name__ == '__main__':
+    main()
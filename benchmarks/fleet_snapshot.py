@@ -0,0 +1,142 @@
+"""
+Benchmark do snapshot da frota (FleetCounter).
+
+Gera uma frota grande com aluguéis em aberto e compara a leitura do
+snapshot (soma das faixas de contadores) com o cálculo do zero sobre
+veículos e aluguéis. Em seguida mede o custo dos triggers na escrita:
+reservas simultâneas em veículos distintos com os triggers ativos e
+desativados.
+
+Uso:
+    python -m benchmarks.fleet_snapshot --vehicles 100000 --rentals 100000 --samples 50
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from benchmarks.availability import percentile
+from benchmarks.utils import create_client, setup_django, test_database, timer
+
+
+def seed(client, total_vehicles, total_rentals):
+    """
+    Popula a frota e abre aluguéis em veículos aleatórios.
+
+    Args:
+        client: Cliente dos aluguéis.
+        total_vehicles: Quantidade de veículos.
+        total_rentals: Quantidade de aluguéis em aberto.
+
+    Returns:
+        Lista de ids dos veículos.
+    """
+    from django.db import connection
+    from api.rent.models import Rental
+    from api.vehicle.models import TypeVehicle, Vehicle
+
+    rng = random.Random(42)
+    vehicles = [
+        Vehicle(
+            brand=f'marca{index % 300}', model=f'modelo{index}', year=2000 + index % 25,
+            quantity=rng.randint(0, 10),
+            type_vehicle=TypeVehicle.MOTORCYCLE if index % 5 == 0 else TypeVehicle.CAR,
+        )
+        for index in range(total_vehicles)
+    ]
+    for vehicle in vehicles:
+        vehicle.is_available = vehicle.quantity > 0
+    Vehicle.objects.bulk_create(vehicles, batch_size=5000)
+    ids = [vehicle.id for vehicle in vehicles]
+    Rental.objects.bulk_create(
+        [Rental(client=client, vehicle_id=rng.choice(ids), start_date=date.today()) for _ in range(total_rentals)],
+        batch_size=5000,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM ANALYZE vehicle_vehicle')
+        cursor.execute('VACUUM ANALYZE rent_rental')
+    return ids
+
+
+def measure(call, samples):
+    """
+    Executa call várias vezes e retorna as latências em ms.
+    """
+    latencies = []
+    for _ in range(samples):
+        with timer() as elapsed:
+            call()
+        latencies.append(elapsed['elapsed'] * 1000)
+    return latencies
+
+
+def reserve(client, vehicle_ids, requests, workers):
+    """
+    Dispara reservas simultâneas, cada thread em um veículo diferente.
+
+    Returns:
+        Reservas por segundo.
+    """
+    from django.db import connection
+    from api.rent.service import RentService
+    from api.vehicle.models import Vehicle
+
+    barrier = threading.Barrier(workers)
+
+    def worker(vehicle_id):
+        try:
+            barrier.wait()
+            for _ in range(requests // workers):
+                RentService().create_rental(client, Vehicle(pk=vehicle_id), date.today())
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(worker, vehicle_ids[:workers]))
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--vehicles', type=int, default=100_000)
+    parser.add_argument('--rentals', type=int, default=100_000)
+    parser.add_argument('--samples', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=1600)
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from api.rent.service import FleetSnapshotService
+    from api.vehicle.models import Vehicle
+
+    with test_database():
+        client = create_client(0)
+        ids = seed(client, args.vehicles, args.rentals)
+        service = FleetSnapshotService()
+        assert {key: {f: int(v) for f, v in value.items()} for key, value in service.read().items()} == service.compute()
+
+        print(f"{'leitura':<28} {'p50(ms)':>8} {'p99(ms)':>8}")
+        for name, call in (('snapshot (contadores)', service.snapshot), ('cálculo do zero', service.compute)):
+            latencies = measure(call, args.samples)
+            print(f"{name:<28} {statistics.median(latencies):>8.2f} {percentile(latencies, 0.99):>8.2f}")
+
+        stocked = list(Vehicle.objects.filter(pk__in=ids, quantity__gt=0).values_list('pk', flat=True)[:args.workers])
+        Vehicle.objects.filter(pk__in=stocked).update(quantity=args.requests, is_available=True)
+        print(f"\n{'escrita':<28} {'req/s':>8}")
+        print(f"{'com triggers':<28} {reserve(client, stocked, args.requests, args.workers):>8.1f}")
+        with connection.cursor() as cursor:
+            cursor.execute('ALTER TABLE vehicle_vehicle DISABLE TRIGGER USER')
+            cursor.execute('ALTER TABLE rent_rental DISABLE TRIGGER USER')
+        print(f"{'sem triggers':<28} {reserve(client, stocked, args.requests, args.workers):>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark do arquivamento de aluguéis devolvidos.
+
+Gera um histórico de aluguéis (200k por padrão, ao longo de três anos),
+mede a latência das leituras da tabela quente, arquiva os aluguéis
+devolvidos há mais de --days dias com ArchiveService e mede de novo.
+
+Cenários medidos:
+    lista: primeira página de rent/list/ pela view.
+    lista profunda: página de rent/list/ a partir de um cursor no meio da tabela quente.
+    histórico: últimos 20 aluguéis de um cliente (Rental.objects.filter(client=...)).
+    em aberto: contagem de aluguéis não devolvidos.
+
+Uso:
+    python -m benchmarks.rent_archive --rentals 200000 --days 365 --samples 50
+"""
+import argparse
+import random
+import statistics
+from datetime import date, timedelta
+
+from benchmarks.availability import percentile
+from benchmarks.utils import setup_django, test_database, timer
+
+
+def seed(total_rentals, total_vehicles, total_clients, days_of_history):
+    """
+    Popula veículos, clientes e aluguéis, quase todos já devolvidos.
+
+    Args:
+        total_rentals: Quantidade de aluguéis gerados.
+        total_vehicles: Quantidade de veículos.
+        total_clients: Quantidade de clientes.
+        days_of_history: Extensão do histórico em dias até hoje.
+
+    Returns:
+        Lista com os clientes criados.
+    """
+    from django.db import connection
+    from api.accounts.models import User
+    from api.client.models import Client
+    from api.rent.models import Rental
+    from api.vehicle.models import TypeVehicle, Vehicle
+
+    rng = random.Random(42)
+    vehicles = Vehicle.objects.bulk_create([
+        Vehicle(
+            brand=f'marca{index % 40}', model=f'modelo{index}', year=2020 + index % 5,
+            quantity=rng.randint(1, 10), type_vehicle=rng.choice(TypeVehicle.values),
+        )
+        for index in range(total_vehicles)
+    ])
+    users = User.objects.bulk_create([
+        User(email=f'bench{index}@example.com', name=f'Bench {index}', cpf=f'{index:011d}')
+        for index in range(total_clients)
+    ])
+    clients = Client.objects.bulk_create([Client(user=user) for user in users])
+
+    today = date.today()
+    batch = []
+    for _ in range(total_rentals):
+        start = today - timedelta(days=rng.randint(0, days_of_history))
+        end = start + timedelta(days=rng.randint(0, 13))
+        returned = end < today and rng.random() < 0.99
+        batch.append(Rental(
+            client=rng.choice(clients),
+            vehicle=rng.choice(vehicles),
+            start_date=start,
+            end_date=end if returned else None,
+            returned=returned,
+        ))
+        if len(batch) == 5000:
+            Rental.objects.bulk_create(batch)
+            batch = []
+    Rental.objects.bulk_create(batch)
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM ANALYZE')
+    return clients
+
+
+def measure(clients, samples):
+    """
+    Mede a latência dos cenários de leitura da tabela quente.
+
+    Args:
+        clients: Clientes usados no cenário de histórico.
+        samples: Quantidade de execuções por cenário.
+
+    Returns:
+        Dicionário cenário -> lista de latências em ms.
+    """
+    from django.db.models import Count
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from api.rent.models import Rental
+    from api.rent.pagination import RentCursorPagination
+    from api.rent.views import RentListView
+
+    factory = APIRequestFactory()
+    user = clients[0].user
+    paginator = RentCursorPagination()
+    paginator.base_url = '/api/v1/rent/list/'
+    middle = Rental.objects.order_by(*paginator.ordering).values('start_date', 'id')[
+        Rental.objects.count() // 2
+    ]
+    deep_url = paginator.encode_cursor(paginator.get_position(middle), reverse=False)
+
+    def list_page(url):
+        request = factory.get(url)
+        force_authenticate(request, user=user)
+        response = RentListView.as_view()(request)
+        response.render()
+
+    rng = random.Random(7)
+    scenarios = {
+        'lista': lambda: list_page('/api/v1/rent/list/'),
+        'lista profunda': lambda: list_page(deep_url),
+        'histórico': lambda: list(Rental.objects.filter(client=rng.choice(clients))[:20]),
+        'em aberto': lambda: Rental.objects.filter(returned=False).aggregate(total=Count('pk')),
+    }
+    results = {name: [] for name in scenarios}
+    for name, scenario in scenarios.items():
+        scenario()
+        for _ in range(samples):
+            with timer() as elapsed:
+                scenario()
+            results[name].append(elapsed['elapsed'] * 1000)
+    return results
+
+
+def table_size():
+    """
+    Retorna o tamanho da tabela quente com índices, em MB.
+    """
+    from django.db import connection
+    from api.rent.models import Rental
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_total_relation_size(%s)', [Rental._meta.db_table])
+        return cursor.fetchone()[0] / 1024 / 1024
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rentals', type=int, default=200_000)
+    parser.add_argument('--vehicles', type=int, default=500)
+    parser.add_argument('--clients', type=int, default=2_000)
+    parser.add_argument('--history', type=int, default=3 * 365)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--samples', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from api.rent.models import ArchivedRental, Rental
+    from api.rent.service import ArchiveService
+
+    with test_database():
+        clients = seed(args.rentals, args.vehicles, args.clients, args.history)
+        before = measure(clients, args.samples)
+        before_size = table_size()
+        before_rows = Rental.objects.count()
+
+        with timer() as elapsed:
+            moved = ArchiveService().archive(days=args.days)
+        print(f'arquivados: {moved} aluguéis em {elapsed["elapsed"]:.1f}s '
+              f'({ArchivedRental.objects.count()} no arquivo)')
+        with connection.cursor() as cursor:
+            cursor.execute('VACUUM ANALYZE')
+
+        after = measure(clients, args.samples)
+        print(f'tabela quente: {before_rows} -> {Rental.objects.count()} linhas, '
+              f'{before_size:.1f} -> {table_size():.1f} MB')
+        print(f"{'cenário':<15} {'antes p50':>10} {'antes p95':>10} {'depois p50':>11} {'depois p95':>11}")
+        for name in before:
+            print(f"{name:<15} {statistics.median(before[name]):>10.2f} {percentile(before[name], 0.95):>10.2f} "
+                  f"{statistics.median(after[name]):>11.2f} {percentile(after[name], 0.95):>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+Benchmark de concorrência na reserva de estoque de aluguéis.
+
+Dispara centenas de criações de aluguel simultâneas contra um único
+veículo e compara a estratégia antiga (ler, decrementar em Python e
+salvar), o decremento condicional atômico do RentService sobre a linha
+do veículo e a reserva por unidade física (VehicleUnit) com SKIP LOCKED.
+Além da vazão, mede a latência por reserva e a média de transações
+esperando bloqueios (amostras de pg_locks). --hold-ms simula trabalho
+adicional dentro da transação da reserva (pg_sleep após inserir o
+aluguel), como acontece quando a reserva grava outras tabelas.
+
+Uso:
+    python -m benchmarks.rent_reservation --requests 300 --stock 100 --workers 32 --hold-ms 5
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from benchmarks.availability import percentile
+from benchmarks.utils import create_client, setup_django, test_database, timer
+
+
+def legacy_create_rental(client, vehicle_id, start_date):
+    """
+    Reproduz o fluxo anterior do RentCreateView (ler-modificar-salvar).
+
+    Args:
+        client: Cliente do aluguel.
+        vehicle_id: Identificador do veículo.
+        start_date: Data de início do aluguel.
+
+    Returns:
+        True se o aluguel foi criado.
+    """
+    from django.db import transaction
+    from api.rent.models import Rental
+    from api.vehicle.models import Vehicle
+
+    with transaction.atomic():
+        vehicle = Vehicle.objects.get(id=vehicle_id)
+        if vehicle.quantity <= 0:
+            return False
+        vehicle.quantity -= 1
+        vehicle.save()
+        Rental.objects.create(client=client, vehicle=vehicle, start_date=start_date)
+    return True
+
+
+def atomic_create_rental(client, vehicle_id, start_date):
+    """
+    Cria o aluguel usando o RentService.
+
+    Args:
+        client: Cliente do aluguel.
+        vehicle_id: Identificador do veículo.
+        start_date: Data de início do aluguel.
+
+    Returns:
+        True se o aluguel foi criado.
+    """
+    from api.exceptions import ValidationError
+    from api.rent.service import RentService
+    from api.vehicle.models import Vehicle
+
+    try:
+        RentService().create_rental(client, Vehicle(pk=vehicle_id), start_date)
+    except ValidationError:
+        return False
+    return True
+
+
+def units_create_rental(client, vehicle_id, start_date):
+    """
+    Cria o aluguel reservando uma unidade física com SKIP LOCKED.
+
+    Args:
+        client: Cliente do aluguel.
+        vehicle_id: Identificador do veículo (com tracks_units).
+        start_date: Data de início do aluguel.
+
+    Returns:
+        True se o aluguel foi criado.
+    """
+    from api.exceptions import ValidationError
+    from api.rent.service import RentService
+    from api.vehicle.models import Vehicle
+
+    try:
+        RentService().create_rental(client, Vehicle(pk=vehicle_id, tracks_units=True), start_date)
+    except ValidationError:
+        return False
+    return True
+
+
+STRATEGIES = {
+    'legacy': legacy_create_rental,
+    'atomic': atomic_create_rental,
+    'units': units_create_rental,
+}
+
+
+def watch_lock_waits(stop, samples, interval=0.002):
+    """
+    Amostra pg_locks e acumula o tempo de espera por bloqueios.
+
+    Args:
+        stop: threading.Event que encerra a amostragem.
+        samples: Lista onde cada amostra adiciona o número de esperas.
+        interval: Intervalo entre amostras em segundos.
+    """
+    from django.db import connection
+
+    try:
+        with connection.cursor() as cursor:
+            while not stop.is_set():
+                cursor.execute('SELECT count(*) FROM pg_locks WHERE NOT granted')
+                samples.append(cursor.fetchone()[0])
+                time.sleep(interval)
+    finally:
+        connection.close()
+
+
+def run_strategy(name, client, total_requests, stock, workers):
+    """
+    Executa uma rodada de criações concorrentes para uma estratégia.
+
+    Args:
+        name: Nome da estratégia em STRATEGIES.
+        client: Cliente usado em todos os aluguéis.
+        total_requests: Quantidade de criações disparadas.
+        stock: Estoque inicial do veículo.
+        workers: Quantidade de threads simultâneas.
+
+    Returns:
+        Dicionário com métricas da rodada.
+    """
+    from django.db import DatabaseError, connection
+    from api.rent.models import Rental
+    from api.vehicle.models import TypeVehicle, Vehicle
+    from api.vehicle.service import VehicleUnitService
+
+    vehicle = Vehicle.objects.create(
+        brand='bench', model=name, year=2024, quantity=stock,
+        type_vehicle=TypeVehicle.CAR,
+    )
+    if name == 'units':
+        VehicleUnitService().add_units(vehicle, [f'U{index:06d}' for index in range(stock)])
+    create_rental = STRATEGIES[name]
+    barrier = threading.Barrier(workers)
+    start_date = date.today()
+    latencies = []
+
+    def worker(chunk):
+        created = 0
+        try:
+            barrier.wait()
+            for _ in range(chunk):
+                started = time.perf_counter()
+                try:
+                    created += create_rental(client, vehicle.id, start_date)
+                except DatabaseError:
+                    continue
+                finally:
+                    latencies.append((time.perf_counter() - started) * 1000)
+            return created
+        finally:
+            connection.close()
+
+    chunks = [total_requests // workers + (1 if i < total_requests % workers else 0) for i in range(workers)]
+    stop = threading.Event()
+    lock_samples = []
+    watcher = threading.Thread(target=watch_lock_waits, args=(stop, lock_samples))
+    watcher.start()
+    with timer() as elapsed:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            created = sum(executor.map(worker, chunks))
+    stop.set()
+    watcher.join()
+
+    vehicle.refresh_from_db()
+    inserted = Rental.objects.filter(vehicle=vehicle).count()
+    return {
+        'strategy': name,
+        'requests': total_requests,
+        'created': created,
+        'inserted': inserted,
+        'oversold': max(inserted - stock, 0),
+        'final_quantity': vehicle.quantity,
+        'drift': stock - inserted - vehicle.quantity,
+        'throughput': total_requests / elapsed['elapsed'],
+        'elapsed': elapsed['elapsed'],
+        'p50': statistics.median(latencies),
+        'p99': percentile(latencies, 0.99),
+        'lock_waits': statistics.mean(lock_samples) if lock_samples else 0,
+    }
+
+
+def hold_transaction(hold_ms):
+    """
+    Mantém a transação do aluguel aberta por hold_ms após o INSERT.
+
+    Args:
+        hold_ms: Tempo extra em milissegundos (0 desativa).
+    """
+    from django.db import connection
+    from django.db.models.signals import post_save
+    from api.rent.models import Rental
+
+    def sleep(**kwargs):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_sleep(%s)', [hold_ms / 1000])
+
+    if hold_ms:
+        post_save.connect(sleep, sender=Rental, weak=False)
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--stock', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--strategy', choices=[*STRATEGIES, 'all'], default='all')
+    parser.add_argument('--hold-ms', type=float, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    hold_transaction(args.hold_ms)
+    with test_database():
+        client = create_client(1)
+        names = list(STRATEGIES) if args.strategy == 'all' else [args.strategy]
+        print(f"{'estratégia':<10} {'req':>6} {'criados':>8} {'oversell':>9} "
+              f"{'estoque':>8} {'drift':>6} {'req/s':>9} {'tempo(s)':>9} "
+              f"{'p50(ms)':>8} {'p99(ms)':>8} {'esperas':>8}")
+        for name in names:
+            result = run_strategy(name, client, args.requests, args.stock, args.workers)
+            print(f"{result['strategy']:<10} {result['requests']:>6} {result['inserted']:>8} "
+                  f"{result['oversold']:>9} {result['final_quantity']:>8} {result['drift']:>6} "
+                  f"{result['throughput']:>9.1f} {result['elapsed']:>9.3f} "
+                  f"{result['p50']:>8.2f} {result['p99']:>8.2f} {result['lock_waits']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark da serialização da listagem de aluguéis.
+
+Carrega 10k aluguéis (por padrão) e compara o RentListSerializer com
+select_related contra o RentalReader sobre linhas de values(), medindo
+consulta, montagem dos dicionários e renderização JSON, e confere que
+as duas saídas renderizadas são idênticas byte a byte.
+
+Uso:
+    python -m benchmarks.rent_serialization --rentals 10000 --rounds 5
+"""
+import argparse
+import random
+import statistics
+from datetime import date, timedelta
+
+from benchmarks.utils import setup_django, test_database, timer
+
+
+def seed(total_rentals, total_vehicles, total_clients):
+    """
+    Popula veículos, clientes e aluguéis.
+
+    Args:
+        total_rentals: Quantidade de aluguéis gerados.
+        total_vehicles: Quantidade de veículos.
+        total_clients: Quantidade de clientes.
+    """
+    from api.accounts.models import User
+    from api.client.models import Client
+    from api.rent.models import Rental
+    from api.vehicle.models import TypeVehicle, Vehicle
+
+    rng = random.Random(42)
+    vehicles = Vehicle.objects.bulk_create([
+        Vehicle(
+            brand=f'marca{index % 40}', model=f'modelo{index}', year=2020 + index % 5,
+            quantity=rng.randint(0, 10), type_vehicle=rng.choice(TypeVehicle.values),
+            description=f'Descrição do veículo {index}',
+        )
+        for index in range(total_vehicles)
+    ])
+    users = User.objects.bulk_create([
+        User(email=f'bench{index}@example.com', name=f'Bench {index}', cpf=f'{index:011d}')
+        for index in range(total_clients)
+    ])
+    clients = Client.objects.bulk_create([Client(user=user) for user in users])
+
+    today = date.today()
+    rentals = []
+    for _ in range(total_rentals):
+        start = today - timedelta(days=rng.randint(0, 365))
+        returned = rng.random() < 0.7
+        rentals.append(Rental(
+            client=rng.choice(clients),
+            vehicle=rng.choice(vehicles),
+            start_date=start,
+            expected_end_date=start + timedelta(days=7),
+            end_date=start + timedelta(days=rng.randint(0, 13)) if returned else None,
+            returned=returned,
+        ))
+    Rental.objects.bulk_create(rentals, batch_size=5000)
+
+
+def serializer_payload(request):
+    """
+    Monta a listagem com RentListSerializer, como antes do RentalReader.
+
+    Args:
+        request: Requisição usada no contexto do serializer.
+
+    Returns:
+        Bytes do JSON renderizado.
+    """
+    from rest_framework.renderers import JSONRenderer
+    from api.rent.models import Rental
+    from api.rent.serializer import RentListSerializer
+
+    queryset = Rental.objects.select_related('client__user', 'vehicle').order_by('-start_date', 'id')
+    return JSONRenderer().render(RentListSerializer(queryset, many=True, context={'request': request}).data)
+
+
+def reader_payload(request):
+    """
+    Monta a listagem com RentalReader sobre linhas de values().
+
+    Args:
+        request: Requisição usada para as URLs de avatar.
+
+    Returns:
+        Bytes do JSON renderizado.
+    """
+    from rest_framework.renderers import JSONRenderer
+    from api.rent.models import Rental
+    from api.rent.readers import RentalReader
+
+    reader = RentalReader(request)
+    rows = reader.values(Rental.objects.order_by('-start_date', 'id'))
+    return JSONRenderer().render(reader.list_items(rows))
+
+
+STRATEGIES = {
+    'serializer': serializer_payload,
+    'reader': reader_payload,
+}
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rentals', type=int, default=10_000)
+    parser.add_argument('--vehicles', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=1_000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIRequestFactory
+
+    with test_database():
+        seed(args.rentals, args.vehicles, args.clients)
+        request = APIRequestFactory().get('/api/v1/rent/list/')
+
+        samples = {name: [] for name in STRATEGIES}
+        outputs = {}
+        for _ in range(args.rounds):
+            for name, build in STRATEGIES.items():
+                with timer() as elapsed:
+                    outputs[name] = build(request)
+                samples[name].append(elapsed['elapsed'] * 1000)
+
+        if outputs['serializer'] != outputs['reader']:
+            raise AssertionError('As saídas do serializer e do reader divergem')
+
+        baseline = statistics.median(samples['serializer'])
+        print(f"{'estratégia':<11} {'linhas':>7} {'mediana(ms)':>12} {'mínimo(ms)':>11} {'bytes':>10} {'speedup':>8}")
+        for name, values in samples.items():
+            median = statistics.median(values)
+            print(f"{name:<11} {args.rentals:>7} {median:>12.1f} {min(values):>11.1f} "
+                  f"{len(outputs[name]):>10} {baseline / median:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
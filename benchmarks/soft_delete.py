@@ -0,0 +1,101 @@
+"""
+Benchmark da exclusão de um veículo com histórico longo.
+
+Cria um veículo com dezenas de milhares de aluguéis (e sua ocupação) e
+compara a exclusão física antiga, com o CASCADE dentro da requisição,
+com a exclusão lógica da view seguida do PurgeService. Para a limpeza,
+mede o tempo total e o lote mais longo, que é o maior tempo em que as
+linhas ficam bloqueadas de uma vez.
+
+Uso:
+    python -m benchmarks.soft_delete --rentals 50000 --batch-size 500
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks.utils import create_client, setup_django, test_database, timer
+
+
+def seed(client, total_rentals, model):
+    """
+    Cria um veículo com aluguéis devolvidos ao longo de alguns anos.
+
+    Args:
+        client: Cliente dos aluguéis.
+        total_rentals: Quantidade de aluguéis do veículo.
+        model: Modelo do veículo criado.
+
+    Returns:
+        Veículo criado.
+    """
+    from api.rent.models import Rental
+    from api.rent.service import AvailabilityService
+    from api.vehicle.models import TypeVehicle, Vehicle
+
+    rng = random.Random(42)
+    vehicle = Vehicle.objects.create(
+        brand='bench', model=model, year=2020, quantity=10, type_vehicle=TypeVehicle.CAR
+    )
+    rentals = []
+    for _ in range(total_rentals):
+        start_date = date(2022, 1, 1) + timedelta(days=rng.randint(0, 1000))
+        end_date = start_date + timedelta(days=rng.randint(0, 7))
+        rentals.append(Rental(
+            client=client, vehicle=vehicle, start_date=start_date,
+            expected_end_date=end_date, end_date=end_date, returned=True,
+        ))
+    Rental.objects.bulk_create(rentals, batch_size=5000)
+    AvailabilityService().rebuild()
+    return vehicle
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rentals', type=int, default=50_000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from api.rent.service import PurgeService
+    from api.vehicle.views import VehicleDeleteView
+
+    with test_database():
+        client = create_client(0)
+
+        hard = seed(client, args.rentals, 'hard')
+        with timer() as hard_elapsed:
+            hard.delete()
+
+        soft = seed(client, args.rentals, 'soft')
+        request = APIRequestFactory().delete(f'/api/v1/vehicle/delete/{soft.id}')
+        force_authenticate(request, user=client.user)
+        with timer() as soft_elapsed:
+            VehicleDeleteView.as_view()(request, pk=soft.id)
+
+        batches = []
+
+        class TimedPurgeService(PurgeService):
+            def purge_batch(self, *batch_args, **batch_kwargs):
+                with timer() as elapsed:
+                    removed = super().purge_batch(*batch_args, **batch_kwargs)
+                batches.append(elapsed['elapsed'] * 1000)
+                return removed
+
+        with timer() as purge_elapsed:
+            totals = TimedPurgeService().purge(batch_size=args.batch_size)
+
+        print(f"{'cenário':<32} {'tempo(ms)':>10}")
+        print(f"{'exclusão física (CASCADE)':<32} {hard_elapsed['elapsed'] * 1000:>10.1f}")
+        print(f"{'exclusão lógica (requisição)':<32} {soft_elapsed['elapsed'] * 1000:>10.1f}")
+        print(f"{'limpeza em lotes (total)':<32} {purge_elapsed['elapsed'] * 1000:>10.1f}")
+        print(f"{'limpeza: lote mais longo':<32} {max(batches):>10.1f}")
+        print(f"lotes: {len(batches)}; removidos: {totals}")
+
+
+if __name__ == '__main__':
+    main()
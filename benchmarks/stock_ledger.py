@@ -0,0 +1,185 @@
+"""
+Benchmark do razão de movimentos do estoque (StockLedgerService).
+
+Gera um ano de movimentos para a frota e compara a consulta do estoque
+em uma data a partir da última fotografia e dos movimentos seguintes
+com a soma de todo o histórico. Mede também a auditoria de um veículo
+(primeira página de movimentos) e o custo do trigger do razão nas
+reservas simultâneas.
+
+Uso:
+    python -m benchmarks.stock_ledger --vehicles 5000 --movements 1000000 --samples 20
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from benchmarks.availability import percentile
+from benchmarks.utils import create_client, setup_django, test_database, timer
+
+REPLAY_SQL = """
+    SELECT vehicle_id, SUM(delta) FROM vehicle_stockmovement
+    WHERE created_at <= %s GROUP BY vehicle_id
+"""
+
+
+def seed(total_vehicles, total_movements, days):
+    """
+    Cria a frota e os movimentos, em ordem de data, e uma fotografia.
+
+    A fotografia é montada a partir dos próprios movimentos, cinco dias
+    antes do fim do período, como faria o snapshot_stock diário, e
+    substitui a fotografia inicial da migração (frota vazia).
+
+    Args:
+        total_vehicles: Quantidade de veículos.
+        total_movements: Quantidade de movimentos.
+        days: Período coberto pelos movimentos, em dias.
+
+    Returns:
+        Tupla (ids dos veículos, fim do período).
+    """
+    from django.db import connection
+    from django.utils import timezone
+    from api.vehicle.models import StockSnapshot, Vehicle
+
+    vehicles = Vehicle.objects.bulk_create([
+        Vehicle(brand=f'marca{index % 300}', model=f'modelo{index}', year=2020, quantity=0, is_available=False)
+        for index in range(total_vehicles)
+    ], batch_size=5000)
+    ids = [vehicle.id for vehicle in vehicles]
+    end = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO vehicle_stockmovement (vehicle_id, reason, delta, created_at)
+            SELECT (%s::uuid[])[1 + (n * 7919) %% %s],
+                   CASE WHEN (n / %s) %% 2 = 0 THEN 'return' ELSE 'rent_out' END,
+                   CASE WHEN (n / %s) %% 2 = 0 THEN 1 ELSE -1 END + CASE WHEN n %% 97 = 0 THEN 3 ELSE 0 END,
+                   %s - (%s * (%s - n) / %s) * interval '1 second'
+            FROM generate_series(1::bigint, %s) AS n
+            ORDER BY n
+        """, [
+            ids, total_vehicles, total_vehicles, total_vehicles,
+            end, days * 86400, total_movements, total_movements, total_movements,
+        ])
+        cursor.execute('ALTER TABLE vehicle_vehicle DISABLE TRIGGER USER')
+        cursor.execute("""
+            UPDATE vehicle_vehicle AS vehicle SET quantity = stock.quantity, is_available = stock.quantity > 0
+            FROM (SELECT vehicle_id, SUM(delta) AS quantity FROM vehicle_stockmovement GROUP BY vehicle_id) AS stock
+            WHERE stock.vehicle_id = vehicle.id
+        """)
+        cursor.execute('ALTER TABLE vehicle_vehicle ENABLE TRIGGER USER')
+
+        StockSnapshot.objects.all().delete()
+        taken_at = end - timedelta(days=5)
+        cursor.execute('SELECT MAX(id) FROM vehicle_stockmovement WHERE created_at <= %s', [taken_at])
+        snapshot = StockSnapshot.objects.create(taken_at=taken_at, last_movement_id=cursor.fetchone()[0])
+        cursor.execute("""
+            INSERT INTO vehicle_stocksnapshotitem (snapshot_id, vehicle_id, quantity)
+            SELECT %s, vehicle_id, SUM(delta) FROM vehicle_stockmovement WHERE id <= %s GROUP BY vehicle_id
+        """, [snapshot.pk, snapshot.last_movement_id])
+        cursor.execute('VACUUM ANALYZE vehicle_stockmovement')
+        cursor.execute('VACUUM ANALYZE vehicle_stocksnapshotitem')
+    return ids, end
+
+
+def replay(at):
+    """
+    Estoque em uma data somando todo o histórico de movimentos.
+    """
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(REPLAY_SQL, [at])
+        return {vehicle_id: int(quantity) for vehicle_id, quantity in cursor.fetchall()}
+
+
+def measure(call, samples):
+    """
+    Executa call várias vezes e retorna as latências em ms.
+    """
+    latencies = []
+    for _ in range(samples):
+        with timer() as elapsed:
+            call()
+        latencies.append(elapsed['elapsed'] * 1000)
+    return latencies
+
+
+def reserve(client, vehicle_ids, requests, workers):
+    """
+    Dispara reservas simultâneas, cada thread em um veículo diferente.
+
+    Returns:
+        Reservas por segundo.
+    """
+    from django.db import connection
+    from api.rent.service import RentService
+    from api.vehicle.models import Vehicle
+
+    barrier = threading.Barrier(workers)
+
+    def worker(vehicle_id):
+        try:
+            barrier.wait()
+            for _ in range(requests // workers):
+                RentService().create_rental(client, Vehicle(pk=vehicle_id), date.today())
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(worker, vehicle_ids[:workers]))
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--vehicles', type=int, default=5000)
+    parser.add_argument('--movements', type=int, default=1_000_000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=1600)
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from api.vehicle.models import Vehicle
+    from api.vehicle.service import StockLedgerService
+
+    with test_database():
+        client = create_client(0)
+        ids, end = seed(args.vehicles, args.movements, args.days)
+        ledger = StockLedgerService()
+        for at in (end, end - timedelta(days=2), end - timedelta(days=40)):
+            expected = {pk: quantity for pk, quantity in replay(at).items() if quantity}
+            assert {pk: quantity for pk, quantity in ledger.stock(at=at).items() if quantity} == expected
+
+        print(f"{'consulta':<36} {'p50(ms)':>8} {'p99(ms)':>8}")
+        scenarios = (
+            ('frota agora (fotografia + cauda)', lambda: ledger.stock(at=end)),
+            ('frota agora (histórico completo)', lambda: replay(end)),
+            ('veículo há 2 dias (fotografia)', lambda: ledger.stock([ids[0]], end - timedelta(days=2))),
+            ('auditoria: 10 movimentos', lambda: list(ledger.movements(Vehicle(pk=ids[0]))[:10])),
+        )
+        for name, call in scenarios:
+            latencies = measure(call, args.samples)
+            print(f"{name:<36} {statistics.median(latencies):>8.2f} {percentile(latencies, 0.99):>8.2f}")
+
+        Vehicle.objects.filter(pk__in=ids[:args.workers]).update(quantity=args.requests, is_available=True)
+        print(f"\n{'escrita':<36} {'req/s':>8}")
+        print(f"{'reservas com o razão':<36} {reserve(client, ids, args.requests, args.workers):>8.1f}")
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER vehicle_vehicle_stock_update ON vehicle_vehicle')
+        print(f"{'reservas sem o trigger do razão':<36} {reserve(client, ids, args.requests, args.workers):>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark da conciliação do estoque (StockReconciliationService).
+
+Gera uma frota com um histórico grande de aluguéis, parte deles em
+aberto, e desajusta o estoque de uma fração dos veículos. Compara a
+verificação veículo a veículo pelo ORM (uma contagem por veículo) com
+a consulta agrupada da conciliação, e mede a correção em uma única
+instrução.
+
+Uso:
+    python -m benchmarks.stock_reconciliation --rentals 1000000 --vehicles 20000 --drift 0.02
+"""
+import argparse
+import random
+from datetime import date, timedelta
+
+from benchmarks.utils import create_client, setup_django, test_database, timer
+
+
+def seed(client, total_vehicles, total_rentals, drift):
+    """
+    Popula a frota e os aluguéis e desajusta parte do estoque.
+
+    Args:
+        client: Cliente dos aluguéis.
+        total_vehicles: Quantidade de veículos.
+        total_rentals: Quantidade total de aluguéis.
+        drift: Fração dos veículos com estoque desajustado.
+
+    Returns:
+        Quantidade de veículos desajustados.
+    """
+    from django.db import connection
+    from api.rent.models import Rental
+    from api.vehicle.models import Vehicle
+
+    rng = random.Random(42)
+    capacities = [rng.randint(1, 20) for _ in range(total_vehicles)]
+    opened = [rng.randint(0, capacity) for capacity in capacities]
+    vehicles = [
+        Vehicle(
+            brand=f'marca{index % 300}', model=f'modelo{index}', year=2000 + index % 25,
+            capacity=capacity, quantity=capacity - open_rentals, is_available=capacity > open_rentals,
+        )
+        for index, (capacity, open_rentals) in enumerate(zip(capacities, opened))
+    ]
+    Vehicle.objects.bulk_create(vehicles, batch_size=5000)
+
+    batch = []
+    for vehicle, open_rentals in zip(vehicles, opened):
+        for _ in range(open_rentals):
+            batch.append(Rental(client=client, vehicle=vehicle, start_date=date.today()))
+    returned = total_rentals - len(batch)
+    for _ in range(returned):
+        start_date = date(2022, 1, 1) + timedelta(days=rng.randint(0, 1000))
+        batch.append(Rental(
+            client=client, vehicle=rng.choice(vehicles), start_date=start_date,
+            end_date=start_date + timedelta(days=3), returned=True,
+        ))
+        if len(batch) >= 50_000:
+            Rental.objects.bulk_create(batch, batch_size=5000)
+            batch = []
+    Rental.objects.bulk_create(batch, batch_size=5000)
+
+    drifted = rng.sample(vehicles, int(total_vehicles * drift))
+    for vehicle in drifted:
+        vehicle.quantity += rng.choice((-1, 1, 2)) if vehicle.quantity else 1
+    Vehicle.objects.bulk_update(drifted, ['quantity'], batch_size=5000)
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM ANALYZE vehicle_vehicle')
+        cursor.execute('VACUUM ANALYZE rent_rental')
+    return len(drifted)
+
+
+def naive_drift():
+    """
+    Verificação veículo a veículo: uma contagem de aluguéis por veículo.
+
+    Returns:
+        Quantidade de veículos com divergência.
+    """
+    from api.vehicle.models import Vehicle
+
+    found = 0
+    for vehicle in Vehicle.objects.only('id', 'capacity', 'quantity', 'is_available'):
+        expected = max(vehicle.capacity - vehicle.rentals.filter(returned=False).count(), 0)
+        if vehicle.quantity != expected or vehicle.is_available != (expected > 0):
+            found += 1
+    return found
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rentals', type=int, default=1_000_000)
+    parser.add_argument('--vehicles', type=int, default=20_000)
+    parser.add_argument('--drift', type=float, default=0.02)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.rent.service import StockReconciliationService
+
+    with test_database():
+        client = create_client(0)
+        drifted = seed(client, args.vehicles, args.rentals, args.drift)
+        service = StockReconciliationService()
+
+        with timer() as naive_elapsed:
+            naive = naive_drift()
+        with timer() as grouped_elapsed:
+            grouped = len(service.reconcile(dry_run=True))
+        with timer() as fix_elapsed:
+            fixed = len(service.reconcile())
+        remaining = len(service.drift())
+
+        print(f"{'cenário':<34} {'tempo(ms)':>10} {'veículos':>9}")
+        print(f"{'verificação por veículo (ORM)':<34} {naive_elapsed['elapsed'] * 1000:>10.1f} {naive:>9}")
+        print(f"{'verificação agrupada (dry-run)':<34} {grouped_elapsed['elapsed'] * 1000:>10.1f} {grouped:>9}")
+        print(f"{'conciliação (lock + UPDATE)':<34} {fix_elapsed['elapsed'] * 1000:>10.1f} {fixed:>9}")
+        print(f"desajustados: {drifted}; divergências após a correção: {remaining}")
+
+
+if __name__ == '__main__':
+    main()
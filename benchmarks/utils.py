@@ -0,0 +1,71 @@
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    """
+    Inicializa o Django com as configurações do projeto.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Cria um banco de testes descartável durante o benchmark.
+
+    Yields:
+        Nome do banco de testes criado.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    test_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield test_name
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def timer():
+    """
+    Mede o tempo de execução de um bloco.
+
+    Yields:
+        Dicionário cujo campo 'elapsed' recebe a duração em segundos.
+    """
+    result = {'elapsed': 0.0}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['elapsed'] = time.perf_counter() - start
+
+
+def create_client(index: int):
+    """
+    Cria um usuário e o cliente associado para os cenários de benchmark.
+
+    Args:
+        index: Sufixo numérico usado para gerar email e CPF únicos.
+
+    Returns:
+        Instância de Client criada.
+    """
+    from api.accounts.models import User
+    from api.client.models import Client
+
+    user = User.objects.create(
+        email=f'bench{index}@example.com',
+        name=f'Bench {index}',
+        cpf=f'{index:011d}',
+    )
+    return Client.objects.create(user=user)
@@ -0,0 +1,131 @@
+"""
+Benchmark do catálogo de veículos com e sem os índices compostos.
+
+Gera uma frota (50k modelos por padrão), executa as combinações comuns
+de filtro do catálogo pela view e mede a latência e o plano da consulta
+da página. Em seguida remove os índices veh_* no banco de testes e
+repete as mesmas requisições.
+
+Uso:
+    python -m benchmarks.vehicle_catalog --vehicles 50000 --samples 30
+"""
+import argparse
+import random
+import statistics
+
+from benchmarks.availability import percentile
+from benchmarks.utils import setup_django, test_database, timer
+
+QUERIES = [
+    '',
+    '?type_vehicle=Moto',
+    '?is_available=false',
+    '?type_vehicle=Carro&is_available=true',
+    '?brand=MARCA7&model=modelo700',
+    '?year_min=2024&year_max=2024',
+]
+
+
+def seed(total_vehicles):
+    """
+    Popula a frota com marcas, tipos, anos e estoques variados.
+
+    Args:
+        total_vehicles: Quantidade de veículos.
+    """
+    from django.db import connection
+    from api.vehicle.models import TypeVehicle, Vehicle
+
+    rng = random.Random(42)
+    vehicles = []
+    for index in range(total_vehicles):
+        quantity = 0 if rng.random() < 0.05 else rng.randint(1, 10)
+        vehicles.append(Vehicle(
+            brand=f'marca{index % 300}', model=f'modelo{index}', year=2000 + index % 25,
+            quantity=quantity, is_available=quantity > 0,
+            type_vehicle=TypeVehicle.MOTORCYCLE if rng.random() < 0.2 else TypeVehicle.CAR,
+        ))
+    Vehicle.objects.bulk_create(vehicles, batch_size=5000)
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM ANALYZE vehicle_vehicle')
+
+
+def measure(user, samples):
+    """
+    Executa cada consulta do catálogo e mede latência e plano.
+
+    Args:
+        user: Usuário autenticado nas requisições.
+        samples: Quantidade de execuções por consulta.
+
+    Returns:
+        Dicionário consulta -> (latências em ms, nó de acesso do plano).
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from api.vehicle.views import VehicleCatalogView
+
+    factory = APIRequestFactory()
+
+    def request(query):
+        request = factory.get(f'/api/v1/vehicle/catalog/{query}')
+        force_authenticate(request, user=user)
+        VehicleCatalogView.as_view()(request).render()
+
+    results = {}
+    for query in QUERIES:
+        with CaptureQueriesContext(connection) as captured:
+            request(query)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {captured.captured_queries[-1]['sql']}")
+            nodes = [row[0].strip(' ->') for row in cursor.fetchall()]
+        access = next(node for node in nodes if 'Scan' in node).split('  (')[0]
+        latencies = []
+        for _ in range(samples):
+            with timer() as elapsed:
+                request(query)
+            latencies.append(elapsed['elapsed'] * 1000)
+        results[query] = (latencies, access)
+    return results
+
+
+def report(title, results):
+    """
+    Imprime a tabela de resultados de uma rodada.
+    """
+    print(title)
+    print(f"{'consulta':<40} {'p50(ms)':>8} {'p95(ms)':>8}  plano")
+    for query, (latencies, access) in results.items():
+        print(f"{query or '(sem filtros)':<40} {statistics.median(latencies):>8.2f} "
+              f"{percentile(latencies, 0.95):>8.2f}  {access}")
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--vehicles', type=int, default=50_000)
+    parser.add_argument('--samples', type=int, default=30)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from api.vehicle.models import Vehicle
+    from benchmarks.utils import create_client
+
+    with test_database():
+        seed(args.vehicles)
+        user = create_client(0).user
+        report('com índices', measure(user, args.samples))
+
+        with connection.cursor() as cursor:
+            for index in Vehicle._meta.indexes:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+            cursor.execute('ANALYZE vehicle_vehicle')
+        report('sem índices', measure(user, args.samples))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark da importação em massa de veículos.
+
+Compara o cadastro de um catálogo de fornecedor (5k veículos por
+padrão, parte deles já cadastrada) com uma requisição de
+VehicleCreateView por veículo contra uma única requisição de
+VehicleImportView, contando consultas e medindo o tempo total.
+
+Uso:
+    python -m benchmarks.vehicle_import --vehicles 5000 --existing 1000
+"""
+import argparse
+import random
+
+from benchmarks.utils import create_client, setup_django, test_database, timer
+
+
+def catalog(total_vehicles):
+    """
+    Gera as linhas do catálogo do fornecedor.
+
+    Args:
+        total_vehicles: Quantidade de linhas.
+
+    Returns:
+        Lista de dicionários no formato da importação.
+    """
+    rng = random.Random(42)
+    return [
+        {
+            'brand': f'Marca {index % 50}',
+            'model': f'Modelo {index}',
+            'year': 2015 + index % 10,
+            'quantity': rng.randint(0, 10),
+            'description': f'Veículo {index} do catálogo',
+        }
+        for index in range(total_vehicles)
+    ]
+
+
+def seed_existing(rows):
+    """
+    Cadastra parte do catálogo antes da importação.
+
+    Args:
+        rows: Linhas que já devem existir na frota.
+    """
+    from api.vehicle.models import Vehicle
+    from api.vehicle.service import normalize_name
+
+    Vehicle.objects.bulk_create([
+        Vehicle(brand=normalize_name(row['brand']), model=normalize_name(row['model']), year=row['year'],
+                quantity=row['quantity'], is_available=row['quantity'] > 0)
+        for row in rows
+    ])
+
+
+def run(name, user, rows, send):
+    """
+    Executa uma estratégia e imprime tempo e consultas.
+    """
+    from django.db import connection
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count), timer() as elapsed:
+        send(factory, user, rows)
+    print(f"{name:<12} {len(rows):>7} {elapsed['elapsed']:>9.2f} {len(queries):>9}")
+
+
+def per_row(factory, user, rows):
+    """
+    Uma requisição de VehicleCreateView por veículo.
+    """
+    from rest_framework.test import force_authenticate
+    from api.vehicle.views import VehicleCreateView
+
+    view = VehicleCreateView.as_view()
+    for row in rows:
+        request = factory.post('/api/v1/vehicle/create/', row, format='json')
+        force_authenticate(request, user=user)
+        view(request)
+
+
+def bulk(factory, user, rows):
+    """
+    Uma única requisição de VehicleImportView com todo o catálogo.
+    """
+    from rest_framework.test import force_authenticate
+    from api.vehicle.views import VehicleImportView
+
+    request = factory.post('/api/v1/vehicle/import/', rows, format='json')
+    force_authenticate(request, user=user)
+    VehicleImportView.as_view()(request)
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--vehicles', type=int, default=5_000)
+    parser.add_argument('--existing', type=int, default=1_000)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.vehicle.models import Vehicle
+
+    rows = catalog(args.vehicles)
+    print(f"{'estratégia':<12} {'linhas':>7} {'total(s)':>9} {'consultas':>9}")
+    for name, send in (('por linha', per_row), ('importação', bulk)):
+        with test_database():
+            seed_existing(rows[:args.existing])
+            user = create_client(0).user
+            run(name, user, rows, send)
+            print(f"{'':<12} veículos na frota: {Vehicle.objects.count()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark da busca textual no catálogo de veículos.
+
+Gera um catálogo grande (300k veículos por padrão) com marcas, modelos
+e descrições variados e mede p50/p95/p99 de vehicle/search/ pela view
+para termos seletivos, termos comuns e prefixos curtos, além do plano
+da consulta da página.
+
+Uso:
+    python -m benchmarks.vehicle_search --vehicles 300000 --samples 100
+"""
+import argparse
+import random
+import statistics
+
+from benchmarks.availability import percentile
+from benchmarks.utils import create_client, setup_django, test_database, timer
+
+BRANDS = [
+    'toyota', 'honda', 'volkswagen', 'chevrolet', 'fiat', 'ford', 'hyundai', 'renault',
+    'nissan', 'jeep', 'peugeot', 'citroen', 'yamaha', 'suzuki', 'kawasaki', 'bmw',
+]
+WORDS = [
+    'sedan', 'hatch', 'econômico', 'automático', 'manual', 'flex', 'diesel', 'elétrico',
+    'híbrido', 'completo', 'couro', 'teto', 'solar', 'turbo', 'compacto', 'espaçoso',
+    'urbano', 'viagem', 'família', 'esportivo', 'conforto', 'multimídia', 'câmera', 'sensor',
+]
+TERMS = [
+    'toyota corolla1234',
+    'modelo99999',
+    'hon',
+    'sedan automático',
+    'turbo',
+    'fia uno',
+    'inexistente',
+]
+
+
+def seed(total_vehicles):
+    """
+    Popula o catálogo com veículos de descrições aleatórias.
+
+    Args:
+        total_vehicles: Quantidade de veículos.
+    """
+    from django.db import connection
+    from api.vehicle.models import TypeVehicle, Vehicle
+
+    rng = random.Random(42)
+    batch = []
+    for index in range(total_vehicles):
+        brand = BRANDS[index % len(BRANDS)]
+        model = 'corolla' if brand == 'toyota' and index % 3 == 0 else 'uno' if brand == 'fiat' else 'modelo'
+        batch.append(Vehicle(
+            brand=brand, model=f'{model}{index}', year=2000 + index % 25, quantity=rng.randint(0, 5),
+            type_vehicle=TypeVehicle.MOTORCYCLE if index % 5 == 0 else TypeVehicle.CAR,
+            description=' '.join(rng.sample(WORDS, 6)),
+        ))
+        if len(batch) == 10000:
+            Vehicle.objects.bulk_create(batch)
+            batch = []
+    Vehicle.objects.bulk_create(batch)
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM ANALYZE vehicle_vehicle')
+
+
+def main():
+    """
+    Ponto de entrada do benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--vehicles', type=int, default=300_000)
+    parser.add_argument('--samples', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from api.vehicle.views import VehicleSearchView
+
+    with test_database():
+        seed(args.vehicles)
+        user = create_client(0).user
+        factory = APIRequestFactory()
+
+        def search(term):
+            request = factory.get('/api/v1/vehicle/search/', {'q': term})
+            force_authenticate(request, user=user)
+            response = VehicleSearchView.as_view()(request)
+            response.render()
+            return response
+
+        print(f"{'termo':<20} {'total':>7} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8}  plano")
+        for term in TERMS:
+            with CaptureQueriesContext(connection) as captured:
+                total = search(term).data['count']
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {captured.captured_queries[-1]['sql']}")
+                nodes = [row[0].strip(' ->') for row in cursor.fetchall()]
+            access = next((node for node in nodes if 'Scan' in node), '').split('  (')[0]
+            latencies = []
+            for _ in range(args.samples):
+                with timer() as elapsed:
+                    search(term)
+                latencies.append(elapsed['elapsed'] * 1000)
+            print(f"{term:<20} {total:>7} {statistics.median(latencies):>8.2f} "
+                  f"{percentile(latencies, 0.95):>8.2f} {percentile(latencies, 0.99):>8.2f}  {access}")
+
+
+if __name__ == '__main__':
+    main()
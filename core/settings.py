@@ -45,7 +45,9 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
+    'django_filters',
     "corsheaders",
     "api",
     "api.accounts.apps.AccountsConfig",
@@ -116,6 +118,20 @@ MONGO_PASSWORD = os.getenv("MONGO_PASSWORD", default="")
 MONGO_HOST = os.getenv("MONGO_HOST", default="localhost")
 MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", default="ativosdb")
 
+# Arquivamento de aluguéis devolvidos (dias após a devolução)
+
+RENT_ARCHIVE_AFTER_DAYS = int(os.getenv("RENT_ARCHIVE_AFTER_DAYS", default=365))
+
+# Log amostrado de payloads das respostas (0 desativa)
+
+PAYLOAD_LOG_SAMPLE_RATE = float(os.getenv("PAYLOAD_LOG_SAMPLE_RATE", default=0))
+PAYLOAD_LOG_MAX_BYTES = int(os.getenv("PAYLOAD_LOG_MAX_BYTES", default=2048))
+
+# Idempotency-Key nas rotas de criação (backend e validade em segundos)
+
+IDEMPOTENCY_BACKEND = os.getenv("IDEMPOTENCY_BACKEND", default="api.utils.idempotency.DatabaseIdempotencyBackend")
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", default=24 * 60 * 60))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 